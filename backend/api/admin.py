@@ -17,6 +17,7 @@ import subprocess
 from backend.database import get_db
 from backend.database.models import User, Project, Account, GeoArticle, ScheduledTask
 from backend.api.user import require_admin
+from backend.services.user_auth_cache import AuthUser
 from backend.schemas import ApiResponse
 from pydantic import BaseModel, Field
 
@@ -133,13 +134,13 @@ def check_scheduler_service() -> ServiceStatus:
         )
 
 
-def check_ragflow_connection() -> ServiceStatus:
+async def check_ragflow_connection() -> ServiceStatus:
     """检查RAGFlow连接"""
     try:
-        from backend.config import RAGFLOW_BASE_URL, RAGFLOW_API_KEY
-        import httpx
+        from backend.services.ragflow_client import get_ragflow_client
 
-        if not RAGFLOW_API_KEY:
+        ragflow_client = get_ragflow_client()
+        if not ragflow_client.is_configured():
             return ServiceStatus(
                 name="ragflow",
                 status="stopped",
@@ -147,11 +148,7 @@ def check_ragflow_connection() -> ServiceStatus:
                 last_check=datetime.now().isoformat()
             )
 
-        response = httpx.get(
-            f"{RAGFLOW_BASE_URL}/api/v1/user",
-            headers={"Authorization": f"Bearer {RAGFLOW_API_KEY}"},
-            timeout=5.0
-        )
+        response = await ragflow_client.client.get("/api/v1/user", timeout=5.0)
 
         if response.status_code == 200:
             return ServiceStatus(
@@ -218,7 +215,7 @@ def check_n8n_connection() -> ServiceStatus:
 
 # ==================== API端点 ====================
 @router.get("/config", response_model=ApiResponse)
-async def get_system_config(current_user: User = Depends(require_admin)):
+async def get_system_config(current_user: AuthUser = Depends(require_admin)):
     """
     获取系统配置（仅管理员）
     返回当前系统的配置信息
@@ -265,7 +262,7 @@ async def get_system_config(current_user: User = Depends(require_admin)):
 @router.put("/config", response_model=ApiResponse)
 async def update_system_config(
     request: SystemConfigUpdate,
-    current_user: User = Depends(require_admin)
+    current_user: AuthUser = Depends(require_admin)
 ):
     """
     更新系统配置（仅管理员）
@@ -356,7 +353,7 @@ async def update_system_config(
 @router.get("/status", response_model=ApiResponse)
 async def get_system_status(
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_admin)
+    current_user: AuthUser = Depends(require_admin)
 ):
     """
     获取系统状态（仅管理员）
@@ -368,7 +365,7 @@ async def get_system_status(
         services = {
             "database": check_database_connection(db),
             "scheduler": check_scheduler_service(),
-            "ragflow": check_ragflow_connection(),
+            "ragflow": await check_ragflow_connection(),
             "n8n": check_n8n_connection(),
         }
 
@@ -421,7 +418,7 @@ async def get_system_status(
 @router.post("/restart", response_model=ApiResponse)
 async def restart_service(
     request: RestartRequest,
-    current_user: User = Depends(require_admin)
+    current_user: AuthUser = Depends(require_admin)
 ):
     """
     重启服务（仅管理员）
@@ -467,7 +464,7 @@ async def restart_service(
 @router.get("/stats", response_model=ApiResponse)
 async def get_detailed_stats(
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_admin)
+    current_user: AuthUser = Depends(require_admin)
 ):
     """
     获取详细统计数据（仅管理员）
@@ -542,7 +539,7 @@ async def get_detailed_stats(
 @router.post("/cleanup", response_model=ApiResponse)
 async def cleanup_system(
     days: int = 30,
-    current_user: User = Depends(require_admin)
+    current_user: AuthUser = Depends(require_admin)
 ):
     """
     系统清理（仅管理员）
@@ -4,15 +4,20 @@
 写的文章API，简单明了！
 """
 
-from typing import Optional
+from typing import Optional, Tuple
 from datetime import datetime
 import json
 from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from backend.database import get_db
+from backend.database import get_db, get_async_db
 from backend.database.models import GeoArticle
 from backend.schemas import ApiResponse
+from backend.services.field_selection import defer_options, deferred_fields, parse_fields
+from backend.services.fulltext_search import match_condition, search_statement
+from backend.services.pagination import apply_keyset, list_count_cache, split_page
 from loguru import logger
 from pydantic import BaseModel
 
@@ -25,7 +30,7 @@ class GeoArticleResponse(BaseModel):
     keyword_id: int
     project_id: int | None
     title: str | None
-    content: str
+    content: str | None
     quality_score: int | None
     ai_score: int | None
     readability_score: int | None
@@ -69,10 +74,15 @@ class ArticleUpdateRequest(BaseModel):
 class GeoArticleListResponse(BaseModel):
     total: int
     items: list[GeoArticleResponse]
+    next_cursor: str | None = None
 
 
-def _convert_article_to_dict(article: GeoArticle) -> dict:
-    """将GeoArticle模型转换为字典，处理datetime和target_platforms类型转换，并处理NULL值"""
+def _convert_article_to_dict(article: GeoArticle, exclude: Tuple[str, ...] = ()) -> dict:
+    """
+    将GeoArticle模型转换为字典，处理datetime和target_platforms类型转换，并处理NULL值
+
+    exclude 中的大字段（列表未加载）置为 None，不访问
+    """
     # 处理target_platforms字段
     target_platforms = []
     if article.target_platforms is not None:
@@ -100,7 +110,7 @@ def _convert_article_to_dict(article: GeoArticle) -> dict:
         "keyword_id": article.keyword_id or 1,
         "project_id": article.project_id,
         "title": article.title or "",
-        "content": article.content or "",
+        "content": None if "content" in exclude else article.content or "",
         "quality_score": article.quality_score,
         "ai_score": article.ai_score,
         "readability_score": article.readability_score,
@@ -114,11 +124,11 @@ def _convert_article_to_dict(article: GeoArticle) -> dict:
         "publish_strategy": article.publish_strategy or "draft",
         "retry_count": article.retry_count or 0,
         "error_msg": article.error_msg,
-        "publish_logs": article.publish_logs,
+        "publish_logs": None if "publish_logs" in exclude else article.publish_logs,
         "platform_url": article.platform_url,
         "index_status": article.index_status or "uncheck",
         "last_check_time": dt_to_str(article.last_check_time),
-        "index_details": article.index_details,
+        "index_details": None if "index_details" in exclude else article.index_details,
         "created_at": dt_to_str(article.created_at) or "",
         "updated_at": dt_to_str(article.updated_at) or "",
     }
@@ -133,39 +143,96 @@ async def get_articles(
     limit: int = Query(20, ge=1, le=100, description="每页数量"),
     publish_status: Optional[str] = Query(None, description="发布状态筛选"),
     keyword: Optional[str] = Query(None, description="关键词搜索"),
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(None, description="分页游标（上一页返回的 next_cursor，传了就忽略 page）"),
+    fields: Optional[str] = Query(None, description="额外返回的大字段（content,publish_logs,index_details 或 all）"),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     获取文章列表（使用 GeoArticle 模型）
+
+    按 (created_at, id) 倒序游标分页，total 为短时缓存的总数；
+    正文等大字段默认不返回（为 null），需要时用 fields 指定或调用详情接口
     """
-    query = db.query(GeoArticle)
+    try:
+        include = parse_fields(GeoArticle, fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    exclude = deferred_fields(GeoArticle, include)
+
+    conditions = []
 
     if publish_status is not None:
-        query = query.filter(GeoArticle.publish_status == publish_status)
+        conditions.append(GeoArticle.publish_status == publish_status)
 
     if keyword:
-        query = query.filter((GeoArticle.title.contains(keyword)) | (GeoArticle.content.contains(keyword)))
+        conditions.append(match_condition(GeoArticle, keyword))
 
-    # 统计总数
-    total = query.count()
+    # 统计总数（短时缓存）
+    count_key = list_count_cache.key("geo_articles", publish_status=publish_status, keyword=keyword)
+    total = list_count_cache.get(count_key)
+    if total is None:
+        total = await db.scalar(select(func.count(GeoArticle.id)).where(*conditions))
+        list_count_cache.set(count_key, total)
 
     # 分页查询
-    articles = query.order_by(GeoArticle.created_at.desc()).offset((page - 1) * limit).limit(limit).all()
+    try:
+        query = apply_keyset(
+            select(GeoArticle).options(*defer_options(GeoArticle, include)).where(*conditions),
+            GeoArticle.created_at,
+            GeoArticle.id,
+            cursor,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not cursor and page > 1:
+        # 兼容按页码翻页的旧调用
+        query = query.offset((page - 1) * limit)
+    rows = (await db.scalars(query.limit(limit + 1))).all()
+    articles, next_cursor = split_page(rows, limit, "created_at")
 
     # 手动转换数据类型
-    article_dicts = [_convert_article_to_dict(article) for article in articles]
+    article_dicts = [_convert_article_to_dict(article, exclude) for article in articles]
 
     # 为每篇文章添加前端期望的数字status字段
     for article_dict in article_dicts:
         article_dict["status"] = 1 if article_dict.get("publish_status") == "published" else 0
 
-    return GeoArticleListResponse(total=total, items=article_dicts)
+    return GeoArticleListResponse(total=total, items=article_dicts, next_cursor=next_cursor)
+
+
+@router.get("/search", response_model=ApiResponse)
+async def search_articles(
+    q: str = Query(..., min_length=1, description="搜索词（空格分隔多个词，需同时命中）"),
+    publish_status: Optional[str] = Query(None, description="发布状态筛选"),
+    limit: int = Query(20, ge=1, le=100, description="返回数量"),
+    fields: Optional[str] = Query(None, description="额外返回的大字段（content,publish_logs,index_details 或 all）"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """按相关度搜索文章（标题命中权重高于正文；大字段默认不返回，同列表接口）"""
+    try:
+        include = parse_fields(GeoArticle, fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    exclude = deferred_fields(GeoArticle, include)
+
+    conditions = [GeoArticle.publish_status == publish_status] if publish_status is not None else []
+    statement = search_statement(GeoArticle, q, *conditions, limit=limit).options(*defer_options(GeoArticle, include))
+    rows = (await db.execute(statement)).all()
+
+    items = []
+    for article, score in rows:
+        article_dict = _convert_article_to_dict(article, exclude)
+        article_dict["status"] = 1 if article_dict.get("publish_status") == "published" else 0
+        article_dict["score"] = float(score or 0.0)
+        items.append(article_dict)
+
+    return ApiResponse(success=True, message="搜索成功", data={"total": len(items), "items": items})
 
 
 @router.get("/{article_id}", response_model=ApiResponse)
-async def get_article(article_id: int, db: Session = Depends(get_db)):
+async def get_article(article_id: int, db: AsyncSession = Depends(get_async_db)):
     """获取文章详情（使用 GeoArticle 模型）"""
-    article = db.query(GeoArticle).filter(GeoArticle.id == article_id).first()
+    article = await db.get(GeoArticle, article_id)
     if not article:
         raise HTTPException(status_code=404, detail="文章不存在")
 
@@ -210,6 +277,7 @@ async def create_article(request: ArticleCreateRequest, db: Session = Depends(ge
         db.add(new_article)
         db.commit()
         db.refresh(new_article)
+        list_count_cache.invalidate("geo_articles")
 
         logger.info(f"文章已创建: {new_article.id}, 标题: {new_article.title}, 状态: {publish_status}")
 
@@ -251,6 +319,7 @@ async def update_article_api(article_id: int, request: ArticleUpdateRequest, db:
 
         db.commit()
         db.refresh(article)
+        list_count_cache.invalidate("geo_articles")
 
         logger.info(f"文章已更新: {article_id}, 标题: {article.title}")
 
@@ -278,6 +347,7 @@ async def delete_article(article_id: int, db: Session = Depends(get_db)):
 
     db.delete(article)
     db.commit()
+    list_count_cache.invalidate("geo_articles")
 
     logger.info(f"文章已删除: {article_id}")
     return ApiResponse(success=True, message="文章已删除")
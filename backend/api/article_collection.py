@@ -7,13 +7,15 @@
 import uuid
 from typing import List, Optional
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Query
 from pydantic import BaseModel, Field, field_serializer
 from sqlalchemy.orm import Session
 
 from backend.database import get_db
 from backend.database.models import ReferenceArticle
 from backend.services.article_collector_service import ArticleCollectorService
+from backend.services.fulltext_search import match_condition, search_statement
+from backend.services.pagination import apply_keyset, list_count_cache, split_page
 from backend.schemas import ApiResponse
 from loguru import logger
 
@@ -56,6 +58,7 @@ class CollectResultResponse(BaseModel):
     saved_count: int = 0
     ragflow_synced_count: int = 0
     results: dict = {}
+    pipeline: Optional[dict] = None  # 各阶段处理量、队列深度等统计
     error_msg: Optional[str] = None
     completed_at: Optional[datetime] = None
 
@@ -89,6 +92,20 @@ class ReferenceArticleListResponse(BaseModel):
 
     total: int
     items: List[ReferenceArticleResponse]
+    next_cursor: Optional[str] = None
+
+
+class ReferenceArticleSearchItem(ReferenceArticleResponse):
+    """参考文章搜索结果"""
+
+    score: float = 0.0
+
+
+class ReferenceArticleSearchResponse(BaseModel):
+    """参考文章搜索响应（按相关度从高到低）"""
+
+    total: int
+    items: List[ReferenceArticleSearchItem]
 
 
 class DuplicateCheckRequest(BaseModel):
@@ -225,6 +242,7 @@ async def _execute_collect_task(
                     "saved_count": result.get("saved_count", 0),
                     "ragflow_synced_count": result.get("ragflow_synced_count", 0),
                     "results": result.get("results", {}),
+                    "pipeline": result.get("pipeline"),
                     "error_msg": result.get("error_msg"),
                     "completed_at": datetime.now(),
                 }
@@ -265,6 +283,7 @@ async def get_collect_status(task_id: str):
         saved_count=task.get("saved_count", 0),
         ragflow_synced_count=task.get("ragflow_synced_count", 0),
         results=task.get("results", {}),
+        pipeline=task.get("pipeline"),
         error_msg=task.get("error_msg"),
         completed_at=task.get("completed_at"),
     )
@@ -311,12 +330,15 @@ async def list_reference_articles(
     keyword: Optional[str] = None,
     page: int = 1,
     page_size: int = 20,
+    cursor: Optional[str] = Query(None, description="分页游标（上一页返回的 next_cursor，传了就忽略 page）"),
+    q: Optional[str] = Query(None, description="标题 / 正文全文检索"),
     db: Session = Depends(get_db),
 ):
     """
     获取已采集的参考文章列表
 
-    支持按平台和关键词筛选。
+    支持按平台、采集关键词筛选和标题正文全文检索（q），按 (collected_at, id) 倒序游标分页，
+    total 为短时缓存的总数。按相关度排序请用 /articles/search。
     """
     query = db.query(ReferenceArticle).filter(ReferenceArticle.status == 1)
 
@@ -324,16 +346,49 @@ async def list_reference_articles(
         query = query.filter(ReferenceArticle.platform == platform)
     if keyword:
         query = query.filter(ReferenceArticle.keyword.contains(keyword))
+    if q:
+        query = query.filter(match_condition(ReferenceArticle, q))
 
-    # 总数
-    total = query.count()
+    # 总数（短时缓存）
+    count_key = list_count_cache.key("reference_articles", platform=platform, keyword=keyword, q=q)
+    total = list_count_cache.get(count_key)
+    if total is None:
+        total = query.count()
+        list_count_cache.set(count_key, total)
 
     # 分页
-    articles = (
-        query.order_by(ReferenceArticle.collected_at.desc()).offset((page - 1) * page_size).limit(page_size).all()
-    )
+    try:
+        query = apply_keyset(query, ReferenceArticle.collected_at, ReferenceArticle.id, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not cursor and page > 1:
+        # 兼容按页码翻页的旧调用
+        query = query.offset((page - 1) * page_size)
+    articles, next_cursor = split_page(query.limit(page_size + 1).all(), page_size, "collected_at")
+
+    return ReferenceArticleListResponse(total=total, items=articles, next_cursor=next_cursor)
 
-    return ReferenceArticleListResponse(total=total, items=articles)
+
+@router.get("/articles/search", response_model=ReferenceArticleSearchResponse)
+async def search_reference_articles(
+    q: str = Query(..., min_length=1, description="搜索词（空格分隔多个词，需同时命中）"),
+    platform: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+):
+    """
+    按相关度搜索参考文章（标题命中权重高于正文）
+    """
+    conditions = [ReferenceArticle.status == 1]
+    if platform:
+        conditions.append(ReferenceArticle.platform == platform)
+    rows = db.execute(search_statement(ReferenceArticle, q, *conditions, limit=limit)).all()
+
+    items = [
+        ReferenceArticleSearchItem.model_validate(article).model_copy(update={"score": score or 0.0})
+        for article, score in rows
+    ]
+    return ReferenceArticleSearchResponse(total=len(items), items=items)
 
 
 @router.get("/articles/{article_id}", response_model=ReferenceArticleResponse)
@@ -382,6 +437,7 @@ async def delete_reference_article(article_id: int, db: Session = Depends(get_db
 
     article.status = 0
     db.commit()
+    list_count_cache.invalidate("reference_articles")
 
     logger.info(f"参考文章已删除: {article_id}")
     return ApiResponse(success=True, message="文章已删除")
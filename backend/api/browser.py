@@ -10,6 +10,7 @@ from typing import Optional, Dict, Any
 from loguru import logger
 
 from backend.services.local_browser_bridge import local_browser_bridge
+from backend.services.resource_blocker import resource_blocker
 
 router = APIRouter(prefix="/api/browser", tags=["本地浏览器"])
 
@@ -159,3 +160,15 @@ async def health_check() -> Dict[str, Any]:
         "chrome_available": status["chrome_found"],
         "cdp_enabled": status["cdp_url"] is not None,
     }
+
+
+@router.get("/resource-blocking/stats")
+async def get_resource_blocking_stats() -> Dict[str, Any]:
+    """
+    获取采集/收录检测的资源拦截统计
+
+    返回：
+    - enabled: 是否启用拦截
+    - platforms: 各平台放行/拦截请求数、按类型的拦截数和估算节省字节数
+    """
+    return {"success": True, "stats": resource_blocker.get_stats()}
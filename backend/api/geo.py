@@ -6,7 +6,7 @@ GEO文章管理 API - 工业加固版
 
 import asyncio
 import json
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks
 from pydantic import BaseModel, ConfigDict, Field
@@ -14,6 +14,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy import desc
 
 from backend.database import get_db, SessionLocal
+from backend.services.field_selection import defer_options, deferred_fields, parse_fields
 from backend.services.geo_article_service import GeoArticleService
 from backend.database.models import GeoArticle, Project, Keyword
 from backend.schemas import ApiResponse
@@ -25,10 +26,11 @@ router = APIRouter(prefix="/api/geo", tags=["GEO文章"])
 # ==================== 辅助函数 ====================
 
 
-def _convert_article_to_dict(article: GeoArticle) -> dict:
+def _convert_article_to_dict(article: GeoArticle, exclude: Tuple[str, ...] = ()) -> dict:
     """
     将GeoArticle模型转换为字典，处理target_platforms和datetime类型转换
     修复Pydantic验证错误：target_platforms字符串需要转换为列表
+    exclude 中的大字段（列表未加载）置为 None，不访问
     """
     # 处理target_platforms字段
     target_platforms = None
@@ -55,7 +57,7 @@ def _convert_article_to_dict(article: GeoArticle) -> dict:
         "id": article.id,
         "keyword_id": article.keyword_id,
         "title": article.title,
-        "content": article.content,
+        "content": None if "content" in exclude else article.content,
         "quality_status": article.quality_status,
         "publish_status": article.publish_status,
         "index_status": article.index_status,
@@ -68,9 +70,9 @@ def _convert_article_to_dict(article: GeoArticle) -> dict:
         "readability_score": article.readability_score,
         "retry_count": article.retry_count,
         "error_msg": article.error_msg,
-        "publish_logs": article.publish_logs,
+        "publish_logs": None if "publish_logs" in exclude else article.publish_logs,
         "platform_url": article.platform_url,
-        "index_details": article.index_details,
+        "index_details": None if "index_details" in exclude else article.index_details,
         "publish_time": dt_to_str(article.publish_time),
         "scheduled_at": dt_to_str(article.scheduled_at),
         "last_check_time": dt_to_str(article.last_check_time),
@@ -224,6 +226,7 @@ async def list_articles(
     publish_status: Optional[str] = Query(
         None, description="发布状态过滤: generating/completed/scheduled/publishing/published/failed"
     ),
+    fields: Optional[str] = Query(None, description="额外返回的大字段（content,publish_logs,index_details 或 all）"),
     db: Session = Depends(get_db),
 ):
     """
@@ -240,8 +243,15 @@ async def list_articles(
     - failed: 失败
 
     批量发布页面应使用 publish_status=completed 获取待配置发布的文章。
+
+    正文、发布日志、收录详情默认不返回（为 null），需要时用 fields 指定，单篇完整内容用 GET /articles/{id}。
     """
-    query = db.query(GeoArticle).order_by(desc(GeoArticle.created_at))
+    try:
+        include = parse_fields(GeoArticle, fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    query = db.query(GeoArticle).options(*defer_options(GeoArticle, include)).order_by(desc(GeoArticle.created_at))
 
     # 如果指定了项目，进行过滤
     if project_id:
@@ -261,7 +271,17 @@ async def list_articles(
 
     articles = query.all()
     # 手动转换数据类型，修复Pydantic验证错误
-    return [_convert_article_to_dict(article) for article in articles]
+    exclude = deferred_fields(GeoArticle, include)
+    return [_convert_article_to_dict(article, exclude) for article in articles]
+
+
+@router.get("/articles/{article_id}", response_model=ApiResponse)
+async def get_article_detail(article_id: int, db: Session = Depends(get_db)):
+    """获取文章完整内容（含正文、发布日志、收录详情）"""
+    article = db.query(GeoArticle).filter(GeoArticle.id == article_id).first()
+    if not article:
+        raise HTTPException(status_code=404, detail="文章不存在")
+    return ApiResponse(success=True, data=_convert_article_to_dict(article))
 
 
 @router.post("/articles/{article_id}/check-quality", response_model=ApiResponse)
@@ -8,12 +8,17 @@ from typing import List, Optional
 from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks
 from pydantic import BaseModel, field_serializer
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from backend.database import get_db
+from backend.database import get_db, get_async_db
+from backend.services.field_selection import defer_options, parse_fields
 from backend.services.index_check_service import IndexCheckService
+from backend.services.browser_pool import index_check_browser_pool
+from backend.services.playwright.ai_platforms import get_answer_wait_stats
 from backend.database.models import IndexCheckRecord
 from backend.schemas import ApiResponse
+from backend.services.pagination import decode_cursor, list_count_cache
 from loguru import logger
 
 
@@ -138,6 +143,26 @@ async def batch_check_index(
         return ApiResponse(success=False, message=f"批量检测失败: {str(e)}")
 
 
+@router.get("/pool/stats", response_model=ApiResponse)
+async def get_browser_pool_stats():
+    """
+    获取收录检测浏览器池状态
+
+    返回在用/空闲浏览器数量、重建次数以及租用等待时间，用于评估池容量。
+    """
+    return ApiResponse(success=True, message="获取浏览器池状态成功", data=index_check_browser_pool.get_stats())
+
+
+@router.get("/answer-wait/stats", response_model=ApiResponse)
+async def get_answer_wait_statistics():
+    """
+    获取各AI平台回答完成检测的耗时统计
+
+    区分事件驱动（observer）、轮询（polling）和注入失败回退（fallback）的次数。
+    """
+    return ApiResponse(success=True, message="获取回答检测统计成功", data=get_answer_wait_stats())
+
+
 @router.get("/records")
 async def get_records(
     keyword_id: Optional[int] = Query(None, description="关键词ID筛选"),
@@ -149,14 +174,24 @@ async def get_records(
     start_date: Optional[str] = Query(None, description="开始时间 YYYY-MM-DD"),
     end_date: Optional[str] = Query(None, description="结束时间 YYYY-MM-DD"),
     question: Optional[str] = Query(None, description="问题搜索"),
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(None, description="分页游标（上一页返回的 next_cursor，传了就忽略 skip）"),
+    fields: Optional[str] = Query(None, description="额外返回的大字段（answer 或 all）"),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     获取检测记录（支持分页和筛选）
+
+    按 (check_time, id) 倒序游标分页，total 为短时缓存的总数；
+    AI 回答默认不返回（为 null），需要时用 fields=answer 或调用 /records/{record_id}
     """
     try:
-        service = IndexCheckService(db)
+        if cursor:
+            decode_cursor(cursor)
+        include = parse_fields(IndexCheckRecord, fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
+    try:
         # 处理日期
         start_dt = None
         end_dt = None
@@ -165,16 +200,20 @@ async def get_records(
         if end_date:
             end_dt = datetime.strptime(end_date, "%Y-%m-%d").replace(hour=23, minute=59, second=59)
 
-        records, total = service.get_check_records(
-            keyword_id=keyword_id,
-            platform=platform,
-            limit=limit,
-            skip=skip,
-            keyword_found=keyword_found,
-            company_found=company_found,
-            start_date=start_dt,
-            end_date=end_dt,
-            question=question,
+        records, total, next_cursor = await db.run_sync(
+            lambda session: IndexCheckService(session).get_check_records(
+                keyword_id=keyword_id,
+                platform=platform,
+                limit=limit,
+                skip=skip,
+                keyword_found=keyword_found,
+                company_found=company_found,
+                start_date=start_dt,
+                end_date=end_dt,
+                question=question,
+                cursor=cursor,
+                load_options=defer_options(IndexCheckRecord, include),
+            )
         )
 
         result = []
@@ -184,14 +223,14 @@ async def get_records(
                 "keyword_id": record.keyword_id,
                 "platform": record.platform,
                 "question": record.question,
-                "answer": record.answer,
+                "answer": record.answer if "answer" in include else None,
                 "keyword_found": record.keyword_found,
                 "company_found": record.company_found,
                 "check_time": record.check_time.isoformat() if record.check_time else "",
             }
             result.append(record_dict)
 
-        return {"total": total, "items": result, "limit": limit, "skip": skip}
+        return {"total": total, "items": result, "limit": limit, "skip": skip, "next_cursor": next_cursor}
     except Exception as e:
         logger.error(f"获取检测记录失败: {e}")
         return {"total": 0, "items": []}
@@ -210,7 +249,7 @@ async def batch_delete_records(request: BatchDeleteRequest, db: Session = Depend
 
 
 @router.get("/keywords/{keyword_id}/hit-rate", response_model=HitRateResponse)
-async def get_hit_rate(keyword_id: int, db: Session = Depends(get_db)):
+async def get_hit_rate(keyword_id: int, db: AsyncSession = Depends(get_async_db)):
     """
     获取关键词命中率
 
@@ -219,17 +258,18 @@ async def get_hit_rate(keyword_id: int, db: Session = Depends(get_db)):
     # 验证关键词存在
     from backend.database.models import Keyword as KwModel
 
-    keyword = db.query(KwModel).filter(KwModel.id == keyword_id).first()
+    keyword = await db.get(KwModel, keyword_id)
     if not keyword:
         raise HTTPException(status_code=404, detail="关键词不存在")
 
-    service = IndexCheckService(db)
-    return service.get_hit_rate(keyword_id)
+    return await db.run_sync(lambda session: IndexCheckService(session).get_hit_rate(keyword_id))
 
 
 @router.get("/keywords/{keyword_id}/trend")
 async def get_keyword_trend(
-    keyword_id: int, days: int = Query(7, ge=1, le=30, description="统计天数"), db: Session = Depends(get_db)
+    keyword_id: int,
+    days: int = Query(7, ge=1, le=30, description="统计天数"),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     获取关键词收录趋势
@@ -239,19 +279,20 @@ async def get_keyword_trend(
     # 验证关键词存在
     from backend.database.models import Keyword as KwModel
 
-    keyword = db.query(KwModel).filter(KwModel.id == keyword_id).first()
+    keyword = await db.get(KwModel, keyword_id)
     if not keyword:
         raise HTTPException(status_code=404, detail="关键词不存在")
 
-    service = IndexCheckService(db)
-    trend_data = service.get_keyword_trend(keyword_id, days)
+    trend_data = await db.run_sync(lambda session: IndexCheckService(session).get_keyword_trend(keyword_id, days))
 
     return ApiResponse(success=True, message=f"获取{days}天趋势数据成功", data=trend_data)
 
 
 @router.get("/projects/{project_id}/analytics")
 async def get_project_analytics(
-    project_id: int, days: int = Query(7, ge=1, le=30, description="统计天数"), db: Session = Depends(get_db)
+    project_id: int,
+    days: int = Query(7, ge=1, le=30, description="统计天数"),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     获取项目综合分析
@@ -261,12 +302,11 @@ async def get_project_analytics(
     # 验证项目存在
     from backend.database.models import Project
 
-    project = db.query(Project).filter(Project.id == project_id).first()
+    project = await db.get(Project, project_id)
     if not project:
         raise HTTPException(status_code=404, detail="项目不存在")
 
-    service = IndexCheckService(db)
-    analytics = service.get_project_analytics(project_id, days)
+    analytics = await db.run_sync(lambda session: IndexCheckService(session).get_project_analytics(project_id, days))
 
     return ApiResponse(success=True, message="获取项目分析数据成功", data=analytics)
 
@@ -275,22 +315,25 @@ async def get_project_analytics(
 async def get_platform_performance(
     project_id: Optional[int] = Query(None, description="项目ID，可选"),
     days: int = Query(7, ge=1, le=30, description="统计天数"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     获取平台表现分析
 
     返回各AI平台的收录表现数据，包括命中率、成功率等指标。
     """
-    service = IndexCheckService(db)
-    performance = service.get_platform_performance(project_id, days)
+    performance = await db.run_sync(
+        lambda session: IndexCheckService(session).get_platform_performance(project_id, days)
+    )
 
     return ApiResponse(success=True, message="获取平台表现数据成功", data=performance)
 
 
 @router.get("/projects/{project_id}/summary")
 async def get_project_summary(
-    project_id: int, days: int = Query(7, ge=1, le=30, description="统计天数"), db: Session = Depends(get_db)
+    project_id: int,
+    days: int = Query(7, ge=1, le=30, description="统计天数"),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     获取项目收录摘要
@@ -300,12 +343,11 @@ async def get_project_summary(
     # 验证项目存在
     from backend.database.models import Project
 
-    project = db.query(Project).filter(Project.id == project_id).first()
+    project = await db.get(Project, project_id)
     if not project:
         raise HTTPException(status_code=404, detail="项目不存在")
 
-    service = IndexCheckService(db)
-    analytics = service.get_project_analytics(project_id, days)
+    analytics = await db.run_sync(lambda session: IndexCheckService(session).get_project_analytics(project_id, days))
 
     # 只返回摘要信息
     return ApiResponse(
@@ -322,9 +364,9 @@ async def get_project_summary(
 
 
 @router.get("/records/{record_id}", response_model=RecordResponse)
-async def get_record(record_id: int, db: Session = Depends(get_db)):
+async def get_record(record_id: int, db: AsyncSession = Depends(get_async_db)):
     """获取检测记录详情"""
-    record = db.query(IndexCheckRecord).filter(IndexCheckRecord.id == record_id).first()
+    record = await db.get(IndexCheckRecord, record_id)
     if not record:
         raise HTTPException(status_code=404, detail="记录不存在")
     return record
@@ -343,6 +385,7 @@ async def delete_record(record_id: int, db: Session = Depends(get_db)):
 
     db.delete(record)
     db.commit()
+    list_count_cache.invalidate("index_check_records")
 
     logger.info(f"检测记录已删除: {record_id}")
     return ApiResponse(success=True, message="记录已删除")
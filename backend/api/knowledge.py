@@ -8,11 +8,16 @@ from datetime import datetime
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File, Form
 from pydantic import BaseModel
+from sqlalchemy import func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from backend.database import get_db
+from backend.database import get_db, get_async_db
 from backend.database.models import KnowledgeCategory, Knowledge
 from backend.schemas import ApiResponse, PaginatedResponse
+from backend.services.fulltext_search import search_statement
+from backend.services.document_content_fetcher import document_content_fetcher, summarize
+from backend.services.ragflow_listing_cache import ragflow_listing_cache
 from loguru import logger
 
 
@@ -94,28 +99,29 @@ async def get_categories(
     page: int = Query(1, ge=1, description="页码"),
     limit: int = Query(20, ge=1, le=100, description="每页数量"),
     search: Optional[str] = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     获取知识库分类列表（支持分页）
     """
-    # ... 同步RAGFlow的代码保持不变 ...
-    from backend.services.ragflow_client import get_ragflow_client
-
+    # 同步RAGFlow知识库（列表走缓存，内容没变化时跳过回写）
     try:
-        ragflow_client = get_ragflow_client()
-        ragflow_result = ragflow_client.list_datasets()
-
-        if ragflow_result.get("code") == 0:
-            ragflow_datasets = ragflow_result.get("data", [])
+        listing = await ragflow_listing_cache.get_datasets()
+
+        if ragflow_listing_cache.needs_sync(listing):
+            ragflow_datasets = [ds for ds in listing.items if ds.get("id")]
+            existing = {
+                cat.ragflow_dataset_id: cat
+                for cat in await db.scalars(
+                    select(KnowledgeCategory).where(
+                        KnowledgeCategory.ragflow_dataset_id.in_([ds["id"] for ds in ragflow_datasets])
+                    )
+                )
+            }
 
             for dataset in ragflow_datasets:
                 ragflow_dataset_id = dataset.get("id")
-                category = (
-                    db.query(KnowledgeCategory)
-                    .filter(KnowledgeCategory.ragflow_dataset_id == ragflow_dataset_id)
-                    .first()
-                )
+                category = existing.get(ragflow_dataset_id)
 
                 if category:
                     category.name = dataset.get("name")
@@ -132,38 +138,53 @@ async def get_categories(
                     )
                     db.add(category)
 
-            db.commit()
+            await db.commit()
+            ragflow_listing_cache.mark_synced(listing)
     except Exception as e:
+        await db.rollback()
         logger.warning(f"从RAGFlow同步分类失败，使用SQLite缓存: {e}")
 
     # 查询（带搜索）
-    query = db.query(KnowledgeCategory).filter(KnowledgeCategory.status == 1)
+    conditions = [KnowledgeCategory.status == 1]
 
     if search:
-        query = query.filter(
-            (KnowledgeCategory.name.like(f"%{search}%"))
-            | (KnowledgeCategory.industry.like(f"%{search}%"))
-            | (KnowledgeCategory.tags.like(f"%{search}%"))
+        conditions.append(
+            or_(
+                KnowledgeCategory.name.like(f"%{search}%"),
+                KnowledgeCategory.industry.like(f"%{search}%"),
+                KnowledgeCategory.tags.like(f"%{search}%"),
+            )
         )
 
     # 统计总数
-    total = query.count()
+    total = await db.scalar(select(func.count(KnowledgeCategory.id)).where(*conditions))
 
     # 分页查询
-    categories = query.order_by(KnowledgeCategory.updated_at.desc()).offset((page - 1) * limit).limit(limit).all()
+    categories = (
+        await db.scalars(
+            select(KnowledgeCategory)
+            .where(*conditions)
+            .order_by(KnowledgeCategory.updated_at.desc())
+            .offset((page - 1) * limit)
+            .limit(limit)
+        )
+    ).all()
 
     # 构建响应
+    from backend.database.models import Project
+
     result = []
     for cat in categories:
-        knowledge_count = (
-            db.query(Knowledge)
-            .filter(Knowledge.ragflow_dataset_id == cat.ragflow_dataset_id, Knowledge.status == 1)
-            .count()
+        knowledge_count = await db.scalar(
+            select(func.count(Knowledge.id)).where(
+                Knowledge.ragflow_dataset_id == cat.ragflow_dataset_id, Knowledge.status == 1
+            )
         )
 
-        from backend.database.models import Project
         project_count = (
-            db.query(Project).filter(Project.industry == cat.industry, Project.status == 1).count()
+            await db.scalar(
+                select(func.count(Project.id)).where(Project.industry == cat.industry, Project.status == 1)
+            )
             if cat.industry
             else 0
         )
@@ -215,7 +236,7 @@ async def create_category(data: KnowledgeCategoryCreate, db: Session = Depends(g
     try:
         # 1. 在RAGFlow创建知识库
         ragflow_client = get_ragflow_client()
-        ragflow_result = ragflow_client.create_dataset(
+        ragflow_result = await ragflow_client.create_dataset(
             name=data.name, description=data.description or f"{data.name} - AutoGeo知识库"
         )
 
@@ -261,6 +282,7 @@ async def create_category(data: KnowledgeCategoryCreate, db: Session = Depends(g
         db.add(category)
         db.commit()
         db.refresh(category)
+        ragflow_listing_cache.invalidate_datasets()
         logger.info(f"数据库记录创建成功，category.id: {category.id}")
 
         logger.info(f"分类创建成功（RAGFlow ID: {dataset_id}）: {category.name}")
@@ -350,8 +372,21 @@ async def delete_category(category_id: int, db: Session = Depends(get_db)):
 # ==================== 知识条目API ====================
 
 
+def _document_version(knowledge: Knowledge, doc_versions: dict) -> str:
+    """文档版本：优先用RAGFlow的更新时间，取不到时用本地更新时间"""
+    version = doc_versions.get(knowledge.ragflow_document_id)
+    if version:
+        return version
+    return knowledge.updated_at.isoformat() if knowledge.updated_at else ""
+
+
 @router.get("/categories/{category_id}/knowledge", response_model=List[KnowledgeResponse])
-async def get_knowledge_list(category_id: int, search: Optional[str] = None, db: Session = Depends(get_db)):
+async def get_knowledge_list(
+    category_id: int,
+    search: Optional[str] = None,
+    full_content: bool = Query(False, description="是否返回完整内容（默认只返回摘要）"),
+    db: AsyncSession = Depends(get_async_db),
+):
     """
     获取指定分类的知识列表
     从RAGFlow获取文档并更新SQLite缓存
@@ -359,6 +394,7 @@ async def get_knowledge_list(category_id: int, search: Optional[str] = None, db:
     Args:
         category_id: 分类ID
         search: 搜索关键词（可选）
+        full_content: 是否从RAGFlow批量获取完整内容，默认返回本地摘要
         db: 数据库会话
 
     Returns:
@@ -367,55 +403,70 @@ async def get_knowledge_list(category_id: int, search: Optional[str] = None, db:
     from backend.services.ragflow_client import get_ragflow_client
 
     # 1. 获取分类的RAGFlow知识库ID
-    category = db.query(KnowledgeCategory).filter(KnowledgeCategory.id == category_id).first()
+    category = await db.get(KnowledgeCategory, category_id)
     if not category:
         raise HTTPException(status_code=404, detail="分类不存在")
 
     if not category.ragflow_dataset_id:
         raise HTTPException(status_code=400, detail="分类未关联RAGFlow知识库")
 
+    # 先取出来：同步失败回滚后 category 会过期，异步会话里不能再隐式加载
+    dataset_id = category.ragflow_dataset_id
+
+    # 文档版本（RAGFlow 更新时间），用于内容缓存
+    doc_versions = {}
+
     try:
-        # 2. 从RAGFlow获取文档列表
-        ragflow_client = get_ragflow_client()
-        ragflow_result = ragflow_client.list_documents(category.ragflow_dataset_id)
+        # 2. 从RAGFlow获取文档列表（走缓存，内容没变化时跳过回写）
+        listing = await ragflow_listing_cache.get_documents(dataset_id)
+        doc_versions = {
+            doc["id"]: str(doc.get("update_time") or doc.get("update_date") or "")
+            for doc in listing.items
+            if doc.get("id")
+        }
 
-        if ragflow_result.get("code") == 0:
-            ragflow_docs = ragflow_result.get("data", [])
+        if ragflow_listing_cache.needs_sync(listing):
+            ragflow_docs = [doc for doc in listing.items if doc.get("id")]
+            existing_ids = set(
+                await db.scalars(
+                    select(Knowledge.ragflow_document_id).where(
+                        Knowledge.ragflow_document_id.in_([doc["id"] for doc in ragflow_docs])
+                    )
+                )
+            )
 
-            # 3. 同步到SQLite缓存
+            # 3. 同步到SQLite缓存（只补充新文档）
             for doc in ragflow_docs:
                 ragflow_doc_id = doc.get("id")
 
-                # 检查是否存在
-                knowledge = db.query(Knowledge).filter(Knowledge.ragflow_document_id == ragflow_doc_id).first()
-
-                if not knowledge:
+                if ragflow_doc_id not in existing_ids:
                     # 创建缓存
                     knowledge = Knowledge(
                         ragflow_document_id=ragflow_doc_id,
-                        ragflow_dataset_id=category.ragflow_dataset_id,
+                        ragflow_dataset_id=dataset_id,
                         title=doc.get("name", ""),
+                        content=doc.get("name", ""),
                         type="other",
                         sync_status="synced",
                         last_sync_at=datetime.now(),
                     )
                     db.add(knowledge)
 
-            db.commit()
+            await db.commit()
+            ragflow_listing_cache.mark_synced(listing)
     except Exception as e:
+        await db.rollback()
         logger.warning(f"从RAGFlow同步知识失败，使用SQLite缓存: {e}")
 
     # 4. 从SQLite返回（带搜索）
-    query = db.query(Knowledge).filter(
-        Knowledge.ragflow_dataset_id == category.ragflow_dataset_id, Knowledge.status == 1
-    )
+    query = select(Knowledge).where(Knowledge.ragflow_dataset_id == dataset_id, Knowledge.status == 1)
 
     if search:
         # 从RAGFlow搜索
         try:
             ragflow_client = get_ragflow_client()
-            search_result = ragflow_client.retrieve(
-                question=search, dataset_ids=[category.ragflow_dataset_id], top_k=100, similarity_threshold=0.0
+            search_result = await ragflow_client.retrieve(
+                question=search, dataset_ids=[dataset_id], top_k=100, similarity_threshold=0.0
             )
 
             if search_result.get("code") == 0:
@@ -424,26 +475,25 @@ async def get_knowledge_list(category_id: int, search: Optional[str] = None, db:
 
                 # 过滤出搜索到的文档
                 if doc_ids:
-                    query = query.filter(Knowledge.ragflow_document_id.in_(doc_ids))
+                    query = query.where(Knowledge.ragflow_document_id.in_(doc_ids))
         except Exception as e:
             logger.warning(f"RAGFlow搜索失败，使用本地搜索: {e}")
             # 降级到本地标题搜索
-            query = query.filter(Knowledge.title.like(f"%{search}%"))
+            query = query.where(Knowledge.title.like(f"%{search}%"))
+
+    items = (await db.scalars(query.order_by(Knowledge.updated_at.desc()))).all()
 
-    items = query.order_by(Knowledge.updated_at.desc()).all()
+    # 5. 获取文档内容：默认用本地摘要；需要完整内容时从RAGFlow并发批量获取（带缓存）
+    contents = {}
+    if full_content:
+        contents = await document_content_fetcher.fetch_many(
+            dataset_id,
+            [(item.ragflow_document_id, _document_version(item, doc_versions)) for item in items],
+        )
 
-    # 5. 获取文档内容（从RAGFlow）
     result = []
     for item in items:
-        content = item.title  # 默认使用标题
-
-        try:
-            # 从RAGFlow获取完整内容
-            content_result = ragflow_client.get_document_content(category.ragflow_dataset_id, item.ragflow_document_id)
-            if content_result.get("code") == 0:
-                content = content_result.get("data", {}).get("content", item.title)
-        except Exception as e:
-            logger.warning(f"获取文档内容失败: {e}")
+        content = contents.get(item.ragflow_document_id) or summarize(item.content or item.title)
 
         result.append(
             KnowledgeResponse(
@@ -486,7 +536,7 @@ async def create_knowledge(data: KnowledgeCreate, db: Session = Depends(get_db))
 
         # 2. 在RAGFlow上传文档
         ragflow_client = get_ragflow_client()
-        ragflow_result = ragflow_client.upload_document_content(
+        ragflow_result = await ragflow_client.upload_document_content(
             dataset_id=category.ragflow_dataset_id, title=data.title, content=data.content
         )
 
@@ -515,6 +565,7 @@ async def create_knowledge(data: KnowledgeCreate, db: Session = Depends(get_db))
         db.add(knowledge)
         db.commit()
         db.refresh(knowledge)
+        ragflow_listing_cache.invalidate_documents(category.ragflow_dataset_id)
 
         logger.info(f"知识创建成功（RAGFlow ID: {doc_id}）: {knowledge.title}")
 
@@ -567,7 +618,7 @@ async def upload_knowledge_file(
 
         # 3. 在RAGFlow上传文件
         ragflow_client = get_ragflow_client()
-        ragflow_result = ragflow_client.upload_document_bytes(
+        ragflow_result = await ragflow_client.upload_document_bytes(
             dataset_id=category.ragflow_dataset_id,
             file_content=file_content,
             file_name=file_name,
@@ -598,6 +649,7 @@ async def upload_knowledge_file(
         db.add(knowledge)
         db.commit()
         db.refresh(knowledge)
+        ragflow_listing_cache.invalidate_documents(category.ragflow_dataset_id)
 
         logger.info(f"文件上传成功（RAGFlow ID: {doc_id}）: {file_name}")
 
@@ -680,8 +732,38 @@ async def delete_knowledge(knowledge_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/knowledge/{knowledge_id}/content", response_model=ApiResponse)
+async def get_knowledge_content(knowledge_id: int, db: AsyncSession = Depends(get_async_db)):
+    """
+    按需获取单条知识的完整内容（从RAGFlow获取，带缓存）
+
+    Args:
+        knowledge_id: 知识ID
+        db: 数据库会话
+
+    Returns:
+        完整内容；RAGFlow获取失败时返回本地摘要
+    """
+    knowledge = await db.get(Knowledge, knowledge_id)
+    if not knowledge:
+        raise HTTPException(status_code=404, detail="知识不存在")
+
+    content = None
+    if knowledge.ragflow_dataset_id and knowledge.ragflow_document_id:
+        contents = await document_content_fetcher.fetch_many(
+            knowledge.ragflow_dataset_id,
+            [(knowledge.ragflow_document_id, _document_version(knowledge, {}))],
+        )
+        content = contents.get(knowledge.ragflow_document_id)
+
+    return ApiResponse(
+        success=True,
+        data={"id": knowledge.id, "content": content or knowledge.content or knowledge.title, "full": content is not None},
+    )
+
+
 @router.get("/knowledge/search", response_model=List[KnowledgeResponse])
-async def search_knowledge(keyword: str = Query(..., min_length=1), db: Session = Depends(get_db)):
+async def search_knowledge(keyword: str = Query(..., min_length=1), db: AsyncSession = Depends(get_async_db)):
     """
     全局搜索知识
 
@@ -690,17 +772,10 @@ async def search_knowledge(keyword: str = Query(..., min_length=1), db: Session
         db: 数据库会话
 
     Returns:
-        知识条目列表
+        知识条目列表（相关度从高到低）
     """
-    items = (
-        db.query(Knowledge)
-        .filter(
-            Knowledge.status == 1, (Knowledge.title.like(f"%{keyword}%")) | (Knowledge.content.like(f"%{keyword}%"))
-        )
-        .order_by(Knowledge.updated_at.desc())
-        .limit(50)
-        .all()
-    )
+    # 全文索引检索，按相关度排序
+    items = (await db.scalars(search_statement(Knowledge, keyword, Knowledge.status == 1, limit=50))).all()
 
     return [
         KnowledgeResponse(
@@ -824,7 +899,7 @@ async def sync_all(db: Session = Depends(get_db)):
 
 
 @router.get("/sync/status/{category_id}", response_model=ApiResponse)
-async def get_sync_status(category_id: int, db: Session = Depends(get_db)):
+async def get_sync_status(category_id: int, db: AsyncSession = Depends(get_async_db)):
     """
     获取分类的同步状态
 
@@ -838,9 +913,7 @@ async def get_sync_status(category_id: int, db: Session = Depends(get_db)):
     try:
         from backend.services.knowledge_sync_service import get_sync_service
 
-        sync_service = get_sync_service(db)
-
-        status = sync_service.get_sync_status(category_id)
+        status = await db.run_sync(lambda session: get_sync_service(session).get_sync_status(category_id))
         return ApiResponse(success=True, data=status)
 
     except Exception as e:
@@ -902,7 +975,7 @@ async def semantic_search(
             return ApiResponse(success=True, data=[], message="没有可搜索的知识库")
 
         # 执行搜索
-        results = sync_service.search_in_ragflow(
+        results = await sync_service.search_in_ragflow(
             query=query, dataset_ids=dataset_ids, top_k=top_k, similarity_threshold=similarity_threshold
         )
 
@@ -952,7 +1025,7 @@ async def extract_document_info(
         ragflow_client = get_ragflow_client()
         extractor = get_document_extractor()
 
-        extracted_info = extractor.extract_from_ragflow_document(
+        extracted_info = await extractor.extract_from_ragflow_document(
             dataset_id=knowledge.ragflow_dataset_id,
             document_id=knowledge.ragflow_document_id,
             ragflow_client=ragflow_client,
@@ -1135,7 +1208,7 @@ async def get_ragflow_status():
             )
 
         # 测试连接
-        result = ragflow_client.list_datasets()
+        result = await ragflow_client.list_datasets()
 
         if result.get("code") == 0:
             datasets = result.get("data", [])
@@ -1173,6 +1246,21 @@ async def get_ragflow_status():
         )
 
 
+@router.get("/ragflow/cache/stats", response_model=ApiResponse)
+async def get_ragflow_cache_stats():
+    """
+    获取 RAGFlow 缓存统计
+
+    Returns:
+        listings: 列表缓存的命中/未命中/后台刷新次数和各缓存条目
+        contents: 文档内容缓存的命中/未命中/失败次数
+    """
+    return ApiResponse(
+        success=True,
+        data={"listings": ragflow_listing_cache.get_stats(), "contents": document_content_fetcher.get_stats()},
+    )
+
+
 @router.get("/ragflow/datasets", response_model=ApiResponse)
 async def list_ragflow_datasets(
     page: int = Query(1, ge=1),
@@ -1199,7 +1287,7 @@ async def list_ragflow_datasets(
             raise HTTPException(status_code=400, detail="RAGFlow 未配置")
 
         # 调用 RAGFlow API
-        result = ragflow_client.list_datasets(name=search)
+        result = await ragflow_client.list_datasets(name=search)
 
         if result.get("code") != 0:
             raise HTTPException(status_code=500, detail=result.get("message", "获取知识库列表失败"))
@@ -1268,10 +1356,11 @@ async def create_ragflow_dataset(data: RAGFlowDatasetCreate):
             raise HTTPException(status_code=400, detail="RAGFlow 未配置")
 
         # 创建知识库
-        result = ragflow_client.create_dataset(name=data.name, description=data.description)
+        result = await ragflow_client.create_dataset(name=data.name, description=data.description)
 
         if result.get("code") != 0:
             raise HTTPException(status_code=500, detail=result.get("message", "创建知识库失败"))
+        ragflow_listing_cache.invalidate_datasets()
 
         dataset_info = result.get("data", {})
         dataset_id = dataset_info.get("id")
@@ -1312,7 +1401,7 @@ async def get_ragflow_dataset(dataset_id: str):
         if not ragflow_client.is_configured():
             raise HTTPException(status_code=400, detail="RAGFlow 未配置")
 
-        result = ragflow_client.get_dataset(dataset_id)
+        result = await ragflow_client.get_dataset(dataset_id)
 
         if result.get("code") != 0:
             raise HTTPException(status_code=404, detail=result.get("message", "知识库不存在"))
@@ -1360,10 +1449,11 @@ async def update_ragflow_dataset(dataset_id: str, data: RAGFlowDatasetUpdate):
         if not ragflow_client.is_configured():
             raise HTTPException(status_code=400, detail="RAGFlow 未配置")
 
-        result = ragflow_client.update_dataset(dataset_id, name=data.name, description=data.description)
+        result = await ragflow_client.update_dataset(dataset_id, name=data.name, description=data.description)
 
         if result.get("code") != 0:
             raise HTTPException(status_code=500, detail=result.get("message", "更新知识库失败"))
+        ragflow_listing_cache.invalidate_datasets()
 
         return ApiResponse(
             success=True,
@@ -1397,10 +1487,12 @@ async def delete_ragflow_dataset(dataset_id: str):
         if not ragflow_client.is_configured():
             raise HTTPException(status_code=400, detail="RAGFlow 未配置")
 
-        result = ragflow_client.delete_dataset(dataset_id)
+        result = await ragflow_client.delete_dataset(dataset_id)
 
         if result.get("code") != 0:
             raise HTTPException(status_code=500, detail=result.get("message", "删除知识库失败"))
+        ragflow_listing_cache.invalidate_datasets()
+        ragflow_listing_cache.invalidate_documents(dataset_id)
 
         return ApiResponse(
             success=True,
@@ -1457,7 +1549,7 @@ async def list_ragflow_documents(
         if run_status:
             params["run"] = run_status
 
-        result = ragflow_client.list_documents(dataset_id, **params)
+        result = await ragflow_client.list_documents(dataset_id, **params)
 
         if result.get("code") != 0:
             raise HTTPException(status_code=500, detail=result.get("message", "获取文档列表失败"))
@@ -1527,7 +1619,7 @@ async def get_ragflow_document(dataset_id: str, document_id: str):
         if not ragflow_client.is_configured():
             raise HTTPException(status_code=400, detail="RAGFlow 未配置")
 
-        result = ragflow_client.get_document(dataset_id, document_id)
+        result = await ragflow_client.get_document(dataset_id, document_id)
 
         if result.get("code") != 0:
             raise HTTPException(status_code=404, detail=result.get("message", "文档不存在"))
@@ -1617,10 +1709,12 @@ async def delete_ragflow_document(dataset_id: str, document_id: str):
         if not ragflow_client.is_configured():
             raise HTTPException(status_code=400, detail="RAGFlow 未配置")
 
-        result = ragflow_client.delete_document(dataset_id, document_id)
+        result = await ragflow_client.delete_document(dataset_id, document_id)
 
         if result.get("code") != 0:
             raise HTTPException(status_code=500, detail=result.get("message", "删除文档失败"))
+        ragflow_listing_cache.invalidate_documents(dataset_id)
+        document_content_fetcher.invalidate(document_id)
 
         return ApiResponse(
             success=True,
@@ -1655,10 +1749,11 @@ async def parse_ragflow_document(dataset_id: str, document_id: str):
         if not ragflow_client.is_configured():
             raise HTTPException(status_code=400, detail="RAGFlow 未配置")
 
-        result = ragflow_client.parse_documents(dataset_id, [document_id])
+        result = await ragflow_client.parse_documents(dataset_id, [document_id])
 
         if result.get("code") != 0:
             raise HTTPException(status_code=500, detail=result.get("message", "解析文档失败"))
+        ragflow_listing_cache.invalidate_documents(dataset_id)
 
         return ApiResponse(
             success=True,
@@ -1705,7 +1800,7 @@ async def upload_ragflow_document(
         file_name = title or file.filename
 
         # 上传到 RAGFlow
-        result = ragflow_client.upload_document_bytes(
+        result = await ragflow_client.upload_document_bytes(
             dataset_id=dataset_id,
             file_content=file_content,
             file_name=file_name
@@ -1713,6 +1808,7 @@ async def upload_ragflow_document(
 
         if result.get("code") != 0:
             raise HTTPException(status_code=500, detail=result.get("message", "上传文件失败"))
+        ragflow_listing_cache.invalidate_documents(dataset_id)
 
         docs = result.get("data", [])
         if not docs:
@@ -1764,15 +1860,11 @@ async def get_ragflow_chunks(
         if not ragflow_client.is_configured():
             raise HTTPException(status_code=400, detail="RAGFlow 未配置")
 
-        # RAGFlow chunks API 端点
-        url = f"{ragflow_client.base_url}/api/v1/datasets/{dataset_id}/chunks"
         params = {"page": page, "page_size": limit}
         if document_id:
             params["document_id"] = document_id
 
-        resp = ragflow_client.session.get(url, params=params, timeout=ragflow_client.timeout)
-        resp.raise_for_status()
-        result = resp.json()
+        result = await ragflow_client.list_chunks(dataset_id, **params)
 
         if result.get("code") != 0:
             raise HTTPException(status_code=500, detail=result.get("message", "获取文档块失败"))
@@ -145,6 +145,16 @@ async def get_supported_platforms():
     return ApiResponse(data={"platforms": platforms})
 
 
+@router.get("/context-cache/stats", response_model=ApiResponse)
+async def get_context_cache_stats():
+    """
+    获取发布上下文缓存统计
+
+    返回缓存命中/未命中、回收和会话写回次数
+    """
+    return ApiResponse(data=get_playwright_mgr().get_publish_context_stats())
+
+
 @router.post("/create", response_model=ApiResponse)
 async def create_publish_task(
     request: PublishTaskCreate,
@@ -3,11 +3,13 @@ from typing import List, Optional, Dict
 from datetime import datetime, timedelta
 from fastapi import APIRouter, Depends, Query, BackgroundTasks
 from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import func, cast, Integer, case
-from backend.database import get_db
-from backend.database.models import Project, Keyword, IndexCheckRecord, GeoArticle, QuestionVariant
+from sqlalchemy import func, select
+from backend.database import get_db, get_async_db
+from backend.database.models import Project, Keyword, GeoArticle, QuestionVariant
 from backend.schemas import ApiResponse
+from backend.services import index_check_stats
 from loguru import logger
 
 router = APIRouter(prefix="/api/reports", tags=["数据报表"])
@@ -85,11 +87,17 @@ class ArticleStatsResponse(BaseModel):
 
 
 # ==================== 报表API ====================
+# 只读报表走异步会话；日汇总统计复用 index_check_stats 的同步函数，通过 run_sync 执行
+
+
+async def _count(db: AsyncSession, stmt) -> int:
+    """统计查询结果行数（等价于 Query.count()）"""
+    return await db.scalar(select(func.count()).select_from(stmt.subquery())) or 0
 
 
 @router.get("/article-stats", response_model=ArticleStatsResponse)
 async def get_article_stats(
-    project_id: Optional[int] = Query(None, description="项目ID筛选"), db: Session = Depends(get_db)
+    project_id: Optional[int] = Query(None, description="项目ID筛选"), db: AsyncSession = Depends(get_async_db)
 ):
     """
     获取 GeoArticle 文章统计信息
@@ -102,25 +110,24 @@ async def get_article_stats(
     - failed: 生成失败
     """
     # 构建基础查询
-    query = db.query(GeoArticle)
+    query = select(GeoArticle.id)
 
     # 如果指定了项目，则通过关键词关联筛选
     if project_id:
-        query = query.join(Keyword).filter(Keyword.project_id == project_id)
+        query = query.join(Keyword).where(Keyword.project_id == project_id)
 
     # 统计各状态数量（使用聚合查询提高性能）
-    stats = (
-        db.query(GeoArticle.publish_status, func.count(GeoArticle.id).label("count"))
-        .filter(GeoArticle.publish_status.in_(["generating", "completed", "scheduled", "published", "failed"]))
+    stats = await db.execute(
+        select(GeoArticle.publish_status, func.count(GeoArticle.id).label("count"))
+        .where(GeoArticle.publish_status.in_(["generating", "completed", "scheduled", "published", "failed"]))
         .group_by(GeoArticle.publish_status)
-        .all()
     )
 
     # 将查询结果转换为字典
     stats_dict = {row.publish_status: row.count for row in stats}
 
     # 统计总数（包含其他状态如 draft）
-    total = query.count()
+    total = await _count(db, query)
 
     return ArticleStatsResponse(
         total=total,
@@ -132,43 +139,32 @@ async def get_article_stats(
 
 
 @router.get("/projects", response_model=List[ProjectStatsResponse])
-async def get_project_stats(db: Session = Depends(get_db)):
+async def get_project_stats(db: AsyncSession = Depends(get_async_db)):
     """
     获取所有项目的统计数据
 
     注意：返回每个项目的关键词数量、命中率等！
     """
-    projects = db.query(Project).filter(Project.status == 1).all()
+    projects = (await db.scalars(select(Project).where(Project.status == 1))).all()
 
     results = []
     for project in projects:
         # 统计关键词数量
-        total_keywords = db.query(Keyword).filter(Keyword.project_id == project.id).count()
-        active_keywords = db.query(Keyword).filter(Keyword.project_id == project.id, Keyword.status == "active").count()
+        keyword_ids = select(Keyword.id).where(Keyword.project_id == project.id)
+        total_keywords = await _count(db, keyword_ids)
+        active_keywords = await _count(db, keyword_ids.where(Keyword.status == "active"))
 
         # 统计问题变体数量
-        keyword_ids = db.query(Keyword.id).filter(Keyword.project_id == project.id).subquery()
-        total_questions = db.query(QuestionVariant).filter(QuestionVariant.keyword_id.in_(keyword_ids)).count()
-
-        # 统计检测记录
-        keyword_ids_active = (
-            db.query(Keyword.id).filter(Keyword.project_id == project.id, Keyword.status == "active").subquery()
+        total_questions = await _count(
+            db, select(QuestionVariant.id).where(QuestionVariant.keyword_id.in_(keyword_ids))
         )
 
-        total_checks = db.query(IndexCheckRecord).filter(IndexCheckRecord.keyword_id.in_(keyword_ids_active)).count()
-
-        # 计算命中率
-        stats = (
-            db.query(
-                func.sum(case((IndexCheckRecord.keyword_found == True, 1), else_=0)).label("keyword_found"),
-                func.sum(case((IndexCheckRecord.company_found == True, 1), else_=0)).label("company_found"),
-            )
-            .filter(IndexCheckRecord.keyword_id.in_(keyword_ids_active))
-            .first()
-        )
+        # 统计检测记录（读日汇总）
+        stats = await db.run_sync(index_check_stats.get_totals, project_id=project.id, active_only=True)
 
-        keyword_found = stats.keyword_found or 0
-        company_found = stats.company_found or 0
+        total_checks = stats["total"]
+        keyword_found = stats["keyword_found"]
+        company_found = stats["company_found"]
 
         keyword_hit_rate = round(keyword_found / total_checks * 100, 2) if total_checks > 0 else 0
         company_hit_rate = round(company_found / total_checks * 100, 2) if total_checks > 0 else 0
@@ -191,22 +187,24 @@ async def get_project_stats(db: Session = Depends(get_db)):
 
 
 @router.get("/platforms", response_model=List[PlatformStatsResponse])
-async def get_platform_stats(db: Session = Depends(get_db)):
+async def get_platform_stats(db: AsyncSession = Depends(get_async_db)):
     """
     获取各平台的统计数据
 
     注意：比较不同平台的收录效果！
     """
     platforms = ["doubao", "qianwen", "deepseek"]
+    empty = {"total": 0, "keyword_found": 0, "company_found": 0}
+    stats_by_platform = await db.run_sync(index_check_stats.get_totals_by_platform)
 
     results = []
     for platform in platforms:
         # 统计该平台的检测记录
-        records = db.query(IndexCheckRecord).filter(IndexCheckRecord.platform == platform).all()
+        stats = stats_by_platform.get(platform, empty)
 
-        total_checks = len(records)
-        keyword_found = sum(1 for r in records if r.keyword_found)
-        company_found = sum(1 for r in records if r.company_found)
+        total_checks = stats["total"]
+        keyword_found = stats["keyword_found"]
+        company_found = stats["company_found"]
 
         keyword_hit_rate = round(keyword_found / total_checks * 100, 2) if total_checks > 0 else 0
         company_hit_rate = round(company_found / total_checks * 100, 2) if total_checks > 0 else 0
@@ -232,41 +230,29 @@ async def get_platform_stats(db: Session = Depends(get_db)):
 async def get_trends(
     days: int = Query(30, ge=1, le=90, description="统计天数"),
     platform: Optional[str] = Query(None, description="平台筛选"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     获取收录趋势数据
 
     注意：用于绘制趋势图表！
     """
-    start_date = datetime.now() - timedelta(days=days)
-
-    # 构建查询
-    query = db.query(
-        func.date(IndexCheckRecord.check_time).label("date"),
-        func.sum(case((IndexCheckRecord.keyword_found == True, 1), else_=0)).label("keyword_found"),
-        func.sum(case((IndexCheckRecord.company_found == True, 1), else_=0)).label("company_found"),
-        func.count().label("total_checks"),
-    ).filter(IndexCheckRecord.check_time >= start_date)
-
-    # 增加平台筛选
-    if platform:
-        query = query.filter(IndexCheckRecord.platform == platform)
-
-    # 按日期分组统计
-    trends = (
-        query.group_by(func.date(IndexCheckRecord.check_time)).order_by(func.date(IndexCheckRecord.check_time)).all()
+    # 按日期分组统计（读日汇总）
+    trends = await db.run_sync(
+        index_check_stats.get_daily_totals, platform=platform, since=index_check_stats.since_days(days)
     )
 
     # 转换为响应模型
     result = []
     for trend in trends:
+        if trend["total"] == 0:
+            continue
         result.append(
             TrendDataPoint(
-                date=str(trend.date),
-                keyword_found_count=trend.keyword_found or 0,
-                company_found_count=trend.company_found or 0,
-                total_checks=trend.total_checks,
+                date=str(trend["date"]),
+                keyword_found_count=trend["keyword_found"],
+                company_found_count=trend["company_found"],
+                total_checks=trend["total"],
             )
         )
 
@@ -275,34 +261,34 @@ async def get_trends(
 
 @router.get("/stats", response_model=SummaryStats)
 async def get_summary_stats(
-    project_id: Optional[int] = Query(None), days: int = Query(7), db: Session = Depends(get_db)
+    project_id: Optional[int] = Query(None), days: int = Query(7), db: AsyncSession = Depends(get_async_db)
 ):
     """获取数据总览卡片数据"""
     start_date = datetime.now() - timedelta(days=days)
 
     # 1. 文章生成数（仅统计 GeoArticle）
-    geo_query = db.query(GeoArticle).filter(GeoArticle.created_at >= start_date)
+    geo_query = select(GeoArticle.id).where(GeoArticle.created_at >= start_date)
 
     if project_id:
         # GeoArticle 有关联 Keyword -> Project
-        geo_query = geo_query.join(Keyword).filter(Keyword.project_id == project_id)
+        geo_query = geo_query.join(Keyword).where(Keyword.project_id == project_id)
 
-    total_articles = geo_query.count()
+    total_articles = await _count(db, geo_query)
 
     # 2. 发布成功率（仅统计 GeoArticle）
     # 统计 GeoArticle 的发布状态
-    geo_pub_published = geo_query.filter(GeoArticle.publish_status == "published").count()
-    geo_pub_total = geo_query.filter(GeoArticle.publish_status.in_(["published", "failed"])).count()
+    geo_pub_published = await _count(db, geo_query.where(GeoArticle.publish_status == "published"))
+    geo_pub_total = await _count(db, geo_query.where(GeoArticle.publish_status.in_(["published", "failed"])))
     pub_rate = round((geo_pub_published / geo_pub_total * 100), 2) if geo_pub_total > 0 else 0
 
-    # 3. 关键词/公司名命中率
-    idx_query = db.query(IndexCheckRecord).filter(IndexCheckRecord.check_time >= start_date)
-    if project_id:
-        idx_query = idx_query.join(Keyword).filter(Keyword.project_id == project_id)
+    # 3. 关键词/公司名命中率（读日汇总）
+    idx_stats = await db.run_sync(
+        index_check_stats.get_totals, project_id=project_id or None, since=index_check_stats.since_days(days)
+    )
 
-    idx_total = idx_query.count()
-    kw_hit_count = idx_query.filter(IndexCheckRecord.keyword_found == True).count()
-    co_hit_count = idx_query.filter(IndexCheckRecord.company_found == True).count()
+    idx_total = idx_stats["total"]
+    kw_hit_count = idx_stats["keyword_found"]
+    co_hit_count = idx_stats["company_found"]
 
     kw_rate = round((kw_hit_count / idx_total * 100), 2) if idx_total > 0 else 0
     co_rate = round((co_hit_count / idx_total * 100), 2) if idx_total > 0 else 0
@@ -328,60 +314,50 @@ async def get_platform_comparison(
     project_id: Optional[int] = Query(None),
     days: int = Query(7),
     platform: Optional[str] = Query(None),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """AI平台对比分析"""
-    start_date = datetime.now() - timedelta(days=days)
-    query = db.query(
-        IndexCheckRecord.platform,
-        func.count(IndexCheckRecord.id).label("total"),
-        func.sum(cast(IndexCheckRecord.keyword_found, Integer)).label("kw_hits"),
-    ).filter(IndexCheckRecord.check_time >= start_date)
-
-    if project_id:
-        query = query.join(Keyword).filter(Keyword.project_id == project_id)
-
-    if platform:
-        query = query.filter(IndexCheckRecord.platform == platform)
-
-    stats = query.group_by(IndexCheckRecord.platform).all()
+    stats = await db.run_sync(
+        index_check_stats.get_totals_by_platform,
+        project_id=project_id or None,
+        platform=platform,
+        since=index_check_stats.since_days(days),
+    )
 
     return [
         PlatformStat(
-            platform=s.platform,
-            total_count=s.total,
-            hit_count=int(s.kw_hits or 0),
-            hit_rate=round((int(s.kw_hits or 0) / s.total * 100), 2) if s.total > 0 else 0,
+            platform=name,
+            total_count=s["total"],
+            hit_count=s["keyword_found"],
+            hit_rate=index_check_stats.pct(s["keyword_found"], s["total"]),
         )
-        for s in stats
+        for name, s in stats.items()
+        if s["total"] > 0
     ]
 
 
 @router.get("/project-leaderboard", response_model=List[ProjectRank])
-async def get_project_leaderboard(days: int = Query(7), db: Session = Depends(get_db)):
+async def get_project_leaderboard(days: int = Query(7), db: AsyncSession = Depends(get_async_db)):
     """项目影响力排行榜"""
     start_date = datetime.now() - timedelta(days=days)
-    projects = db.query(Project).filter(Project.status == 1).all()
+    projects = (await db.scalars(select(Project).where(Project.status == 1))).all()
+    checks_by_project = await db.run_sync(
+        index_check_stats.get_totals_by_project, since=index_check_stats.since_days(days)
+    )
 
     result = []
     for i, p in enumerate(projects):
         # 统计该项目的文章数
-        content_volume = (
-            db.query(GeoArticle)
+        content_volume = await _count(
+            db,
+            select(GeoArticle.id)
             .join(Keyword)
-            .filter(Keyword.project_id == p.id, GeoArticle.created_at >= start_date)
-            .count()
+            .where(Keyword.project_id == p.id, GeoArticle.created_at >= start_date),
         )
 
         # 统计收录率作为提及率参考
-        idx_query = (
-            db.query(IndexCheckRecord)
-            .join(Keyword)
-            .filter(Keyword.project_id == p.id, IndexCheckRecord.check_time >= start_date)
-        )
-        total_checks = idx_query.count()
-        hits = idx_query.filter(IndexCheckRecord.keyword_found == True).count()
-        mention_rate = round((hits / total_checks * 100), 2) if total_checks > 0 else 0
+        checks = checks_by_project.get(p.id)
+        mention_rate = index_check_stats.pct(checks["keyword_found"], checks["total"]) if checks else 0
 
         result.append(
             ProjectRank(
@@ -403,20 +379,18 @@ async def get_project_leaderboard(days: int = Query(7), db: Session = Depends(ge
 
 
 @router.get("/overview")
-async def get_overview(db: Session = Depends(get_db)):
+async def get_overview(db: AsyncSession = Depends(get_async_db)):
     """获取数据总览"""
     # 统计关键词数量
-    total_keywords = db.query(Keyword).count()
+    total_keywords = await db.scalar(select(func.count(Keyword.id))) or 0
 
-    # 统计检测记录
-    total_records = db.query(IndexCheckRecord).count()
-    keyword_found = db.query(IndexCheckRecord).filter(IndexCheckRecord.keyword_found == True).count()
-    company_found = db.query(IndexCheckRecord).filter(IndexCheckRecord.company_found == True).count()
+    # 统计检测记录（读日汇总）
+    stats = await db.run_sync(index_check_stats.get_totals)
+    keyword_found = stats["keyword_found"]
+    company_found = stats["company_found"]
 
     # 计算总体命中率
-    overall_hit_rate = 0
-    if total_records > 0:
-        overall_hit_rate = round(((keyword_found + company_found) / (total_records * 2)) * 100, 2)
+    overall_hit_rate = index_check_stats.hit_rate(stats)
 
     return {
         "total_keywords": total_keywords,
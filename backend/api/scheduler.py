@@ -6,6 +6,7 @@ from sqlalchemy.orm import Session
 from backend.database import get_db
 from backend.database.models import ScheduledTask
 from backend.services.scheduler_service import get_scheduler_service
+from backend.services.publish_job_queue import publish_job_queue
 from backend.schemas import ApiResponse
 
 router = APIRouter(prefix="/api/scheduler", tags=["定时任务管理"])
@@ -76,3 +77,16 @@ async def trigger_job(job_id: str):
         return ApiResponse(success=True, message=f"任务 [{job_id}] 已触发执行")
     else:
         raise HTTPException(status_code=404, detail=f"任务 [{job_id}] 不存在或未运行")
+
+
+@router.get("/publish-jobs/stats", response_model=ApiResponse)
+async def get_publish_job_stats(db: Session = Depends(get_db)):
+    """获取定时发布任务队列统计（各状态任务数、租约过期数）"""
+    return ApiResponse(success=True, message="获取发布队列统计成功", data=publish_job_queue.get_stats(db))
+
+
+@router.get("/index-monitor/stats", response_model=ApiResponse)
+async def get_index_monitor_stats():
+    """获取收录监测积压情况（到期文章数、落后秒数、执行中数量）"""
+    scheduler = get_scheduler_service()
+    return ApiResponse(success=True, message="获取收录监测状态成功", data=scheduler.get_index_monitor_stats())
@@ -18,6 +18,7 @@ import os
 from backend.database.models import User
 from backend.database import get_db
 from backend.schemas import ApiResponse, ErrorResponse
+from backend.services.user_auth_cache import AuthUser, user_auth_cache
 from pydantic import BaseModel, Field, EmailStr
 
 # 路由配置
@@ -136,11 +137,14 @@ def decode_token(token: str) -> Optional[dict]:
         return None
 
 
-def get_current_user_from_token(
+def get_current_principal(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db)
-) -> User:
-    """从Token获取当前用户"""
+) -> AuthUser:
+    """
+    从Token获取当前用户的鉴权信息
+    优先读缓存，未命中时只查 id / 用户名 / 角色 / 是否激活 四列
+    """
     if not credentials:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -164,20 +168,41 @@ def get_current_user_from_token(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="用户不存在",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+    principal = user_auth_cache.get(user_id)
+    if principal is None:
+        generation = user_auth_cache.generation()
+        row = db.query(User.id, User.username, User.role, User.is_active).filter(User.id == user_id).first()
+        if not row:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="用户不存在",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        principal = AuthUser(id=row.id, username=row.username, role=row.role, is_active=row.is_active)
+        user_auth_cache.set(principal, generation)
 
-    if not user.is_active:
+    if not principal.is_active:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="用户已被禁用",
         )
 
+    return principal
+
+
+def get_current_user_from_token(
+    principal: AuthUser = Depends(get_current_principal),
+    db: Session = Depends(get_db)
+) -> User:
+    """从Token获取当前用户（完整的用户记录，需要读写用户资料的接口使用）"""
+    user = db.query(User).filter(User.id == principal.id).first()
+    if not user:
+        user_auth_cache.invalidate(principal.id)
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="用户不存在",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
     return user
 
 
@@ -188,8 +213,8 @@ def get_current_active_user(current_user: User = Depends(get_current_user_from_t
     return current_user
 
 
-def require_admin(current_user: User = Depends(get_current_user_from_token)) -> User:
-    """需要管理员权限"""
+def require_admin(current_user: AuthUser = Depends(get_current_principal)) -> AuthUser:
+    """需要管理员权限（只用鉴权信息，缓存命中时不查库）"""
     if current_user.role != "admin":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -405,7 +430,7 @@ async def list_users(
     role: Optional[str] = None,
     is_active: Optional[bool] = None,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_admin)
+    current_user: AuthUser = Depends(require_admin)
 ):
     """
     获取用户列表（仅管理员）
@@ -471,7 +496,7 @@ async def update_user_status(
     user_id: int,
     request: UserUpdateRequest,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_admin)
+    current_user: AuthUser = Depends(require_admin)
 ):
     """
     更新用户状态/角色（仅管理员）
@@ -518,6 +543,7 @@ async def update_user_status(
             updated_fields.append(f"role={request.role}")
 
         db.commit()
+        user_auth_cache.invalidate(user.id)
 
         logger.info(f"管理员 {current_user.username} 更新了用户 {user.username}: {', '.join(updated_fields)}")
 
@@ -548,7 +574,7 @@ async def update_user_status(
 async def delete_user(
     user_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_admin)
+    current_user: AuthUser = Depends(require_admin)
 ):
     """
     删除用户（仅管理员）
@@ -574,6 +600,7 @@ async def delete_user(
         user_role = user.role
         db.delete(user)
         db.commit()
+        user_auth_cache.invalidate(user_id)
 
         logger.info(f"管理员 {current_user.username} 删除了用户 {username} (角色: {user_role})")
 
@@ -655,7 +682,7 @@ async def change_password(
 async def unlock_user(
     user_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_admin)
+    current_user: AuthUser = Depends(require_admin)
 ):
     """
     解锁用户账户（仅管理员）
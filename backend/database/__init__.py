@@ -3,22 +3,34 @@
 数据库连接管理 - 工业级加固版
 支持 SQLite 和 PostgreSQL 双模式
 自动检测数据库类型并应用相应优化
+
+两套会话：
+- 同步 SessionLocal / get_db：脚本、后台任务、尚未迁移的接口
+- 异步 get_async_db：API 请求处理，查询不阻塞事件循环（Playwright、WebSocket 共用这个循环）
 """
 
 from sqlalchemy import create_engine, event, inspect
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, Session, declarative_base
-from sqlalchemy.pool import NullPool, QueuePool
-from typing import Generator
+from sqlalchemy.pool import QueuePool
+from typing import Any, AsyncGenerator, Dict, Generator, Optional
 from loguru import logger
 import os
 
 from backend.config import (
     DATABASE_URL,
+    ASYNC_DATABASE_URL,
     DATABASE_DIR,
     DB_POOL_SIZE,
     DB_MAX_OVERFLOW,
     DB_POOL_TIMEOUT,
     DB_POOL_RECYCLE,
+    SQLITE_POOL_SIZE,
+    SQLITE_MAX_OVERFLOW,
+    SQLITE_MMAP_SIZE,
+    SQLITE_CACHE_SIZE,
+    SQLITE_BUSY_TIMEOUT,
     get_database_type,
 )
 
@@ -53,41 +65,120 @@ def create_database_engine():
             f"size={DB_POOL_SIZE}, overflow={DB_MAX_OVERFLOW}"
         )
     else:
-        # SQLite 配置
+        # SQLite 配置：QueuePool 复用连接（线程安全，一个连接同一时间只借给一个线程），
+        # PRAGMA 只在新建物理连接时执行一次，不再每个会话重新打开文件
+        # 默认 overflow 不设上限，借出永不等待：事件循环线程上借连接时阻塞会卡住整个循环（见 config.py）
         engine = create_engine(
             DATABASE_URL,
-            connect_args={"check_same_thread": False},
-            poolclass=NullPool,  # SQLite使用NullPool避免连接池问题
+            connect_args={"check_same_thread": False, "timeout": SQLITE_BUSY_TIMEOUT},
+            poolclass=QueuePool,
+            pool_size=SQLITE_POOL_SIZE,
+            max_overflow=SQLITE_MAX_OVERFLOW,
+            pool_timeout=DB_POOL_TIMEOUT,
             echo=False,
         )
-        logger.info("✅ SQLite引擎已创建 (WAL模式)")
+        logger.info(
+            f"✅ SQLite引擎已创建 (WAL模式): "
+            f"pool_size={SQLITE_POOL_SIZE}, overflow={SQLITE_MAX_OVERFLOW}, "
+            f"mmap_size={SQLITE_MMAP_SIZE}, cache_size={SQLITE_CACHE_SIZE}"
+        )
 
     return engine
 
 
+class PoolMetrics:
+    """
+    连接池统计
+    新建物理连接次数（即执行 PRAGMA 的次数）、借出次数、失效次数，以及当前池内连接状态
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._engine = None
+        self._stats = {"connects": 0, "checkouts": 0, "invalidated": 0}
+
+    def attach(self, target_engine):
+        """监听引擎的连接池事件（异步引擎传 async_engine.sync_engine）"""
+        self._engine = target_engine
+        event.listen(target_engine, "connect", self._on_connect)
+        event.listen(target_engine, "checkout", self._on_checkout)
+        event.listen(target_engine, "invalidate", self._on_invalidate)
+
+    def _on_connect(self, dbapi_connection, connection_record):
+        self._stats["connects"] += 1
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        self._stats["checkouts"] += 1
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception):
+        self._stats["invalidated"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats: Dict[str, Any] = {"engine": self.name, **self._stats}
+        pool = self._engine.pool if self._engine is not None else None
+        if isinstance(pool, QueuePool):
+            stats.update(
+                pool_size=pool.size(),
+                checked_out=pool.checkedout(),
+                checked_in=pool.checkedin(),
+                overflow=pool.overflow(),
+            )
+        # 借出次数远大于新建次数说明连接在复用
+        stats["reuse_ratio"] = round(stats["checkouts"] / stats["connects"], 2) if stats["connects"] else 0
+        return stats
+
+
 # 创建引擎
 engine = create_database_engine()
+pool_metrics = PoolMetrics("sync")
+pool_metrics.attach(engine)
 
 
 # ==================== SQLite 特定配置 ====================
+def sqlite_pragmas() -> Dict[str, Any]:
+    """每个物理连接都要设置的 PRAGMA（连接级参数，不保存在数据库文件中）"""
+    return {
+        "synchronous": "NORMAL",
+        "foreign_keys": "ON",
+        "temp_store": "MEMORY",
+        "mmap_size": SQLITE_MMAP_SIZE,
+        "cache_size": SQLITE_CACHE_SIZE,
+    }
+
+
+@event.listens_for(engine, "first_connect")
+def set_sqlite_journal_mode(dbapi_connection, connection_record):
+    """
+    开启 WAL 模式
+    journal_mode=WAL 会写进数据库文件，引擎第一次连接时设置一次即可
+    """
+    if DB_TYPE == "sqlite":
+        cursor = dbapi_connection.cursor()
+        try:
+            mode = cursor.execute("PRAGMA journal_mode=WAL").fetchone()
+            logger.debug(f"SQLite 日志模式: {mode[0] if mode else 'unknown'}")
+        except Exception as e:
+            logger.error(f"设置 SQLite WAL 模式失败: {e}")
+        finally:
+            cursor.close()
+
+
 @event.listens_for(engine, "connect")
 def set_sqlite_pragma(dbapi_connection, connection_record):
     """
-    SQLite 连接时设置优化参数
-    包括 WAL 模式、外键约束等
+    SQLite 新建物理连接时设置优化参数
+    包括同步级别、外键约束、内存映射和页缓存；连接归还连接池后复用，不会重复执行
     """
     if DB_TYPE == "sqlite":
         cursor = dbapi_connection.cursor()
         try:
-            cursor.execute("PRAGMA journal_mode=WAL")
-            cursor.execute("PRAGMA synchronous=NORMAL")
-            cursor.execute("PRAGMA foreign_keys=ON")
-            cursor.execute("PRAGMA temp_store=MEMORY")
-            cursor.execute("PRAGMA mmap_size=30000000")  # 30MB内存映射
-            cursor.close()
-            logger.debug("SQLite WAL模式已启用")
+            for name, value in sqlite_pragmas().items():
+                cursor.execute(f"PRAGMA {name}={value}")
+            logger.debug("SQLite 连接参数已设置")
         except Exception as e:
             logger.error(f"设置 SQLite Pragma 失败: {e}")
+        finally:
+            cursor.close()
 
 
 # ==================== PostgreSQL 特定配置 ====================
@@ -127,6 +218,97 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+# ==================== 异步引擎 ====================
+# 延迟创建：只用同步会话的脚本不需要安装异步驱动
+ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg"}
+
+_async_engine: Optional[AsyncEngine] = None
+_async_session_factory: Optional[async_sessionmaker] = None
+async_pool_metrics = PoolMetrics("async")
+
+
+def to_async_url(url: str) -> str:
+    """把同步连接串换成对应的异步驱动（已是异步驱动的原样返回）"""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    driver = ASYNC_DRIVERS.get(backend)
+    if not driver or parsed.drivername == driver:
+        return url
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+
+def create_async_database_engine() -> AsyncEngine:
+    """
+    创建异步引擎
+    连接池参数与同步引擎一致，连接时的优化参数复用同步引擎的监听函数
+    """
+    url = ASYNC_DATABASE_URL or to_async_url(DATABASE_URL)
+    if DB_TYPE == "postgresql":
+        async_engine = create_async_engine(
+            url,
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_timeout=DB_POOL_TIMEOUT,
+            pool_recycle=DB_POOL_RECYCLE,
+            pool_pre_ping=True,
+            echo=False,
+        )
+    else:
+        async_engine = create_async_engine(
+            url,
+            connect_args={"timeout": SQLITE_BUSY_TIMEOUT},
+            pool_size=SQLITE_POOL_SIZE,
+            max_overflow=SQLITE_MAX_OVERFLOW,
+            pool_timeout=DB_POOL_TIMEOUT,
+            echo=False,
+        )
+
+    event.listen(async_engine.sync_engine, "first_connect", set_sqlite_journal_mode)
+    event.listen(async_engine.sync_engine, "connect", set_sqlite_pragma)
+    event.listen(async_engine.sync_engine, "connect", set_postgresql_settings)
+    async_pool_metrics.attach(async_engine.sync_engine)
+    logger.info(f"✅ 异步数据库引擎已创建: {async_engine.dialect.name}+{async_engine.dialect.driver}")
+    return async_engine
+
+
+def get_async_engine() -> AsyncEngine:
+    """获取异步引擎（首次调用时创建）"""
+    global _async_engine
+    if _async_engine is None:
+        _async_engine = create_async_database_engine()
+    return _async_engine
+
+
+def get_async_session_factory() -> async_sessionmaker:
+    global _async_session_factory
+    if _async_session_factory is None:
+        # expire_on_commit=False：提交后访问属性不会触发隐式查询（异步会话里隐式 IO 会报错）
+        _async_session_factory = async_sessionmaker(
+            get_async_engine(), class_=AsyncSession, autoflush=False, expire_on_commit=False
+        )
+    return _async_session_factory
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    FastAPI 依赖注入：获取异步数据库会话
+
+    需要复用同步服务（IndexCheckService 等）时用 await db.run_sync(lambda session: ...)，
+    同步代码在 greenlet 里执行，IO 仍走异步驱动
+    """
+    async with get_async_session_factory()() as db:
+        yield db
+
+
+async def dispose_async_engine():
+    """释放异步引擎连接（应用退出时调用）"""
+    global _async_engine, _async_session_factory
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+        _async_session_factory = None
+
+
 def init_db():
     """
     初始化数据库表
@@ -140,8 +322,10 @@ def init_db():
         Keyword,
         QuestionVariant,
         IndexCheckRecord,
+        IndexCheckDailyStat,
         GeoArticle,
         ScheduledTask,
+        PublishJob,
         KnowledgeCategory,
         Knowledge,
         Client,
@@ -168,6 +352,16 @@ def init_db():
             if table not in existing_tables:
                 logger.info(f"✨ 新表创建成功: {table}")
 
+        # 旧库补建全文索引表并回填（新建的源表在 create_all 时已一起建好）
+        from backend.services.fulltext_search import ensure_fulltext_index
+
+        ensure_fulltext_index(engine)
+
+        # 旧库新建的收录检测日汇总表从原始记录回填
+        from backend.services.index_check_stats import ensure_daily_stats
+
+        ensure_daily_stats(engine, existing_tables)
+
         if DB_TYPE == "sqlite":
             logger.success("✅ 数据库初始化完成 (SQLite + WAL模式)")
         else:
@@ -200,5 +394,15 @@ def get_engine_info() -> dict:
             info["error"] = str(e)
     else:
         info["wal_mode"] = True
+        info["pragmas"] = sqlite_pragmas()
 
+    info["pool"] = get_pool_stats()
     return info
+
+
+def get_pool_stats() -> Dict[str, Any]:
+    """同步 / 异步引擎的连接池统计（异步引擎未创建时只有同步）"""
+    stats = {"sync": pool_metrics.get_stats()}
+    if _async_engine is not None:
+        stats["async"] = async_pool_metrics.get_stats()
+    return stats
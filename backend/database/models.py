@@ -4,7 +4,20 @@
 包含基础发布、GEO、监控、知识库及AI招聘所有表结构
 """
 
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, func, ForeignKey, JSON
+from sqlalchemy import (
+    Column,
+    Integer,
+    String,
+    Text,
+    Date,
+    DateTime,
+    Boolean,
+    func,
+    ForeignKey,
+    JSON,
+    Index,
+    UniqueConstraint,
+)
 from sqlalchemy.orm import relationship, backref
 from backend.database import Base
 from datetime import datetime
@@ -57,6 +70,47 @@ class ScheduledTask(Base):
         return f"<Task {self.name} : {self.cron_expression}>"
 
 
+class PublishJob(Base):
+    """
+    发布任务队列表
+    定时发布由调度器入队，worker 通过租约认领，保证同一篇文章只被发布一次
+    """
+
+    __tablename__ = "publish_jobs"
+    __table_args__ = (
+        Index("ix_publish_jobs_status_run_after", "status", "run_after"),
+        TABLE_ARGS,
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True, comment="主键ID")
+    article_id = Column(
+        Integer, ForeignKey("geo_articles.id", ondelete="CASCADE"), nullable=False, index=True, comment="文章ID"
+    )
+    # 活跃任务（pending/running）的去重键，结束后清空；唯一约束保证同一文章只有一个活跃任务
+    dedupe_key = Column(String(100), unique=True, nullable=True, comment="活跃任务去重键")
+    status = Column(
+        String(20),
+        default="pending",
+        nullable=False,
+        comment="任务状态：pending=待认领 running=执行中 done=完成 failed=失败",
+    )
+    attempts = Column(Integer, default=0, nullable=False, comment="已认领次数")
+    max_attempts = Column(Integer, default=3, nullable=False, comment="最大认领次数（租约过期重试）")
+    run_after = Column(DateTime, default=func.now(), nullable=False, comment="最早执行时间")
+
+    # 租约
+    locked_by = Column(String(100), nullable=True, comment="持有租约的 worker")
+    lease_expires_at = Column(DateTime, nullable=True, comment="租约过期时间")
+    heartbeat_at = Column(DateTime, nullable=True, comment="最后心跳时间")
+
+    last_error = Column(Text, nullable=True, comment="最后错误信息")
+    created_at = Column(DateTime, default=func.now(), comment="创建时间")
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), comment="更新时间")
+
+    def __repr__(self):
+        return f"<PublishJob id={self.id} article_id={self.article_id} status={self.status}>"
+
+
 # ==================== 客户管理相关表 ====================
 
 
@@ -117,7 +171,11 @@ class PublishRecord(Base):
     """
 
     __tablename__ = "publish_records"
-    __table_args__ = TABLE_ARGS
+    __table_args__ = (
+        # 发布进度回调：按文章 + 账号定位记录
+        Index("ix_publish_records_article_id_account_id", "article_id", "account_id"),
+        TABLE_ARGS,
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True, comment="主键ID")
 
@@ -256,7 +314,14 @@ class IndexCheckRecord(Base):
     """
 
     __tablename__ = "index_check_records"
-    __table_args__ = TABLE_ARGS
+    __table_args__ = (
+        # 报表/趋势：按关键词或平台 + 时间范围
+        Index("ix_index_check_records_keyword_id_check_time", "keyword_id", "check_time"),
+        Index("ix_index_check_records_platform_check_time", "platform", "check_time"),
+        # 检测记录列表游标分页
+        Index("ix_index_check_records_check_time_id", "check_time", "id"),
+        TABLE_ARGS,
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True, comment="主键ID")
     keyword_id = Column(
@@ -280,6 +345,36 @@ class IndexCheckRecord(Base):
         return f"<IndexCheckRecord keyword_id={self.keyword_id} platform={self.platform}>"
 
 
+class IndexCheckDailyStat(Base):
+    """
+    收录检测日汇总表
+    按 关键词 + 平台 + 日期 汇总检测次数，报表和预警直接读这里，不再扫描原始记录
+    由 backend.services.index_check_stats 在写入检测记录时同步维护
+    """
+
+    __tablename__ = "index_check_daily_stats"
+    __table_args__ = (
+        UniqueConstraint("keyword_id", "platform", "stat_date", name="uq_index_check_daily_stats_key"),
+        Index("ix_index_check_daily_stats_stat_date_platform", "stat_date", "platform"),
+        TABLE_ARGS,
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True, comment="主键ID")
+    keyword_id = Column(Integer, ForeignKey("keywords.id", ondelete="CASCADE"), nullable=False, comment="关键词ID")
+    platform = Column(String(50), nullable=False, comment="检测平台：doubao/qianwen/deepseek")
+    stat_date = Column(Date, nullable=False, comment="统计日期（检测时间所在日）")
+
+    total = Column(Integer, default=0, nullable=False, comment="检测次数")
+    keyword_found = Column(Integer, default=0, nullable=False, comment="包含关键词次数")
+    company_found = Column(Integer, default=0, nullable=False, comment="包含公司名次数")
+    answered = Column(Integer, default=0, nullable=False, comment="拿到回答的次数")
+
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), comment="更新时间")
+
+    def __repr__(self):
+        return f"<IndexCheckDailyStat keyword_id={self.keyword_id} platform={self.platform} date={self.stat_date}>"
+
+
 class GeoArticle(Base):
     """
     GEO文章表
@@ -287,7 +382,15 @@ class GeoArticle(Base):
     """
 
     __tablename__ = "geo_articles"
-    __table_args__ = TABLE_ARGS
+    __table_args__ = (
+        # 定时发布扫描：publish_status + scheduled_at
+        Index("ix_geo_articles_publish_status_scheduled_at", "publish_status", "scheduled_at"),
+        # 收录监测扫描：publish_status + next_check_at
+        Index("ix_geo_articles_publish_status_next_check_at", "publish_status", "next_check_at"),
+        # 文章列表游标分页
+        Index("ix_geo_articles_created_at_id", "created_at", "id"),
+        TABLE_ARGS,
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True, comment="主键ID")
     keyword_id = Column(
@@ -334,6 +437,8 @@ class GeoArticle(Base):
     index_status = Column(String(20), default="uncheck")
     last_check_time = Column(DateTime, nullable=True)
     index_details = Column(Text, nullable=True)
+    next_check_at = Column(DateTime, nullable=True, index=True, comment="下次收录检测时间：为空表示尽快检测")
+    index_check_attempts = Column(Integer, default=0, comment="连续未收录的检测次数（用于退避）")
 
     # 时间戳
     created_at = Column(DateTime, default=func.now(), comment="创建时间")
@@ -670,7 +775,11 @@ class ReferenceArticle(Base):
     """
 
     __tablename__ = "reference_articles"
-    __table_args__ = TABLE_ARGS
+    __table_args__ = (
+        # 参考文章列表游标分页
+        Index("ix_reference_articles_status_collected_at_id", "status", "collected_at", "id"),
+        TABLE_ARGS,
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True, comment="主键ID")
 
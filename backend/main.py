@@ -16,7 +16,7 @@ from loguru import logger
 
 # 导入配置和数据库
 from backend.config import APP_NAME, APP_VERSION, DEBUG, HOST, PORT, RELOAD, CORS_ORIGINS, PLATFORMS
-from backend.database import init_db, SessionLocal
+from backend.database import init_db, SessionLocal, dispose_async_engine
 from backend.scripts.fix_database import check_and_fix_database
 
 # 导入所有 API 路由模块
@@ -43,37 +43,17 @@ import backend.api.admin as admin  # 管理员配置
 
 # 导入服务组件
 from backend.services.websocket_manager import ws_manager
+from backend.services.log_stream import log_streamer
 from backend.services.scheduler_service import get_scheduler_service
 from backend.services.n8n_service import get_n8n_service
+from backend.services.ragflow_client import close_ragflow_client
+from backend.services.near_duplicate_index import near_duplicate_index
+from backend.services.html_cleaner import shutdown_clean_pool
 from backend.services.playwright_mgr import playwright_mgr
+from backend.services.browser_pool import index_check_browser_pool
 from backend.services.playwright.publishers import register_publishers
 
 
-# ==================== 日志拦截器（核心监控功能） ====================
-def socket_log_sink(message):
-    """
-    Loguru 拦截器：将每一条日志通过 WebSocket 广播出去
-    """
-    try:
-        record = message.record
-        log_payload = {
-            "time": record["time"].strftime("%H:%M:%S"),
-            "level": record["level"].name,
-            "module": record["extra"].get("module", "系统"),
-            "message": record["message"],
-        }
-        try:
-            loop = asyncio.get_event_loop()
-            if loop.is_running():
-                loop.create_task(ws_manager.broadcast(log_payload))
-        except RuntimeError:
-            pass
-        except Exception:
-            pass
-    except Exception:
-        pass
-
-
 # 艹，修复 Windows GBK 编码下的 emoji 输出问题！
 # 强制重新配置 stdout 使用 UTF-8 编码
 import io
@@ -84,7 +64,8 @@ sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding="utf-8", errors="repla
 # 配置 Loguru（stdout 已经是 UTF-8 了，不需要额外指定 encoding）
 logger.remove()
 logger.add(sys.stdout, level="INFO", colorize=True)
-logger.add(socket_log_sink, level="INFO")
+# 日志先进环形缓冲，由 log_streamer 定时成批推送到 /ws
+logger.add(log_streamer.sink, level="INFO")
 
 
 # ==================== 应用生命周期管理 ====================
@@ -107,6 +88,9 @@ async def lifespan(app: FastAPI):
     publish.set_ws_manager(ws_manager)
     notifications.set_ws_callback(ws_manager.broadcast)
 
+    # 启动日志定时推送
+    log_streamer.start()
+
     # 3. 初始化 Playwright 管理器
     playwright_mgr.set_db_factory(SessionLocal)
     playwright_mgr.set_ws_callback(ws_manager.broadcast)
@@ -130,8 +114,15 @@ async def lifespan(app: FastAPI):
     logger.info("正在关闭服务，释放资源...")
     scheduler_instance.stop()
     await playwright_mgr.stop()
+    await index_check_browser_pool.close()
     n8n_service = await get_n8n_service()
     await n8n_service.close()
+    await close_ragflow_client()
+    await log_streamer.stop()
+    await ws_manager.close()
+    near_duplicate_index.save()
+    shutdown_clean_pool()
+    await dispose_async_engine()
     logger.info("服务已安全关闭")
 
 
@@ -191,10 +182,18 @@ app.include_router(admin.router)  # 管理员配置
 
 # ==================== WebSocket 端点 ====================
 @app.websocket("/ws")
-async def websocket_endpoint(websocket: WebSocket, client_id: str = None):
+async def websocket_endpoint(websocket: WebSocket, client_id: str = None, topics: str = None):
+    """
+    实时推送通道
+
+    topics: 连接时订阅的主题，逗号分隔，如 ?topics=task:12,level:WARNING；
+    连上后也可以发送 {"action": "subscribe" | "unsubscribe", "topics": [...]} 调整，不订阅则接收全部消息
+    """
     if not client_id:
         client_id = f"client_{uuid.uuid4().hex[:8]}"
-    await ws_manager.connect(websocket, client_id)
+    await ws_manager.connect(websocket, client_id, topics.split(",") if topics else None)
+    # 先补发已推送过的最近日志，晚连上的客户端也能看到上下文（尚未推送的由下一帧送达）
+    await ws_manager.send_personal({"type": "log_batch", "history": True, "logs": log_streamer.recent()}, client_id)
     await ws_manager.send_personal(
         {
             "time": "系统",
@@ -206,12 +205,18 @@ async def websocket_endpoint(websocket: WebSocket, client_id: str = None):
     )
     try:
         while True:
-            await websocket.receive_text()
+            await ws_manager.handle_client_message(client_id, await websocket.receive_text())
     except WebSocketDisconnect:
-        ws_manager.disconnect(client_id)
+        ws_manager.disconnect(client_id, websocket)
     except Exception as e:
         logger.error(f"WebSocket 异常: {e}")
-        ws_manager.disconnect(client_id)
+        ws_manager.disconnect(client_id, websocket)
+
+
+@app.get("/api/ws/stats")
+async def websocket_stats():
+    """WebSocket 推送统计：每个客户端的队列深度、已发送和已丢弃消息数，以及日志推送统计"""
+    return {**ws_manager.get_stats(), "logs": log_streamer.get_stats()}
 
 
 # ==================== 基础健康检查 ====================
@@ -253,6 +258,10 @@ async def health():
         }
         health_status["status"] = "degraded"
 
+    # 连接池状态（新建连接数、借出次数、在用/空闲连接）
+    from backend.database import get_pool_stats
+    health_status["services"]["database"]["pool"] = get_pool_stats()
+
     # 2. RAGFlow 连接检测
     try:
         from backend.config import RAGFLOW_BASE_URL, RAGFLOW_API_KEY
@@ -0,0 +1,68 @@
+"""
+定时发布任务队列迁移
+- 创建 publish_jobs 表：持久化发布任务，支持租约认领和心跳续租
+
+Revision ID: 0004_add_publish_jobs
+Revises: 0003_add_user_auth_system_config
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = '0004_add_publish_jobs'
+down_revision = '0003_add_user_auth_system_config'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """创建发布任务队列表"""
+
+    # 检测是否为PostgreSQL
+    dialect = op.get_context().dialect.name
+    is_postgres = dialect == 'postgresql'
+
+    op.create_table(
+        'publish_jobs',
+        sa.Column('id', sa.Integer(), nullable=False, autoincrement=True),
+        sa.Column('article_id', sa.Integer(), nullable=False),
+        sa.Column('dedupe_key', sa.String(length=100), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=False, server_default='pending'),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('max_attempts', sa.Integer(), nullable=False, server_default='3'),
+        sa.Column('run_after', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.Column('locked_by', sa.String(length=100), nullable=True),
+        sa.Column('lease_expires_at', sa.DateTime(), nullable=True),
+        sa.Column('heartbeat_at', sa.DateTime(), nullable=True),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.func.now()),
+        sa.Column('updated_at', sa.DateTime(), server_default=sa.func.now(), onupdate=sa.func.now()),
+        sa.ForeignKeyConstraint(['article_id'], ['geo_articles.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('dedupe_key')
+    )
+
+    # 认领查询按 status + run_after 过滤
+    op.create_index('ix_publish_jobs_article_id', 'publish_jobs', ['article_id'])
+    op.create_index('ix_publish_jobs_status_run_after', 'publish_jobs', ['status', 'run_after'])
+
+    if is_postgres:
+        op.execute("COMMENT ON TABLE publish_jobs IS '定时发布任务队列表'")
+        op.execute("COMMENT ON COLUMN publish_jobs.dedupe_key IS '活跃任务去重键，任务结束后清空'")
+        op.execute("COMMENT ON COLUMN publish_jobs.status IS '任务状态：pending=待认领 running=执行中 done=完成 failed=失败'")
+        op.execute("COMMENT ON COLUMN publish_jobs.locked_by IS '持有租约的 worker'")
+        op.execute("COMMENT ON COLUMN publish_jobs.lease_expires_at IS '租约过期时间'")
+
+    print("✅ 发布任务队列迁移完成")
+
+
+def downgrade():
+    """回滚迁移"""
+
+    op.drop_index('ix_publish_jobs_status_run_after', table_name='publish_jobs')
+    op.drop_index('ix_publish_jobs_article_id', table_name='publish_jobs')
+    op.drop_table('publish_jobs')
+
+    print("✅ 发布任务队列回滚完成")
@@ -0,0 +1,37 @@
+"""
+收录监测退避迁移
+- geo_articles 添加 next_check_at、index_check_attempts 字段
+
+Revision ID: 0005_add_article_next_check_at
+Revises: 0004_add_publish_jobs
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = '0005_add_article_next_check_at'
+down_revision = '0004_add_publish_jobs'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """添加收录监测调度字段"""
+
+    op.add_column('geo_articles', sa.Column('next_check_at', sa.DateTime(), nullable=True))
+    op.add_column('geo_articles', sa.Column('index_check_attempts', sa.Integer(), nullable=True, server_default='0'))
+    op.create_index('ix_geo_articles_next_check_at', 'geo_articles', ['next_check_at'])
+
+    print("✅ 收录监测退避字段迁移完成")
+
+
+def downgrade():
+    """回滚迁移"""
+
+    op.drop_index('ix_geo_articles_next_check_at', table_name='geo_articles')
+    op.drop_column('geo_articles', 'index_check_attempts')
+    op.drop_column('geo_articles', 'next_check_at')
+
+    print("✅ 收录监测退避字段回滚完成")
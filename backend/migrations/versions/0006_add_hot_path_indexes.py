@@ -0,0 +1,48 @@
+"""
+热点查询复合索引迁移
+- geo_articles: (publish_status, scheduled_at)、(publish_status, next_check_at)
+- index_check_records: (keyword_id, check_time)、(platform, check_time)
+- publish_records: (article_id, account_id)
+
+查询计划对比见 backend/scripts/benchmark_indexes.py
+
+Revision ID: 0006_add_hot_path_indexes
+Revises: 0005_add_article_next_check_at
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+
+# revision identifiers
+revision = '0006_add_hot_path_indexes'
+down_revision = '0005_add_article_next_check_at'
+branch_labels = None
+depends_on = None
+
+# (索引名, 表名, 列)
+HOT_PATH_INDEXES = [
+    ('ix_geo_articles_publish_status_scheduled_at', 'geo_articles', ['publish_status', 'scheduled_at']),
+    ('ix_geo_articles_publish_status_next_check_at', 'geo_articles', ['publish_status', 'next_check_at']),
+    ('ix_index_check_records_keyword_id_check_time', 'index_check_records', ['keyword_id', 'check_time']),
+    ('ix_index_check_records_platform_check_time', 'index_check_records', ['platform', 'check_time']),
+    ('ix_publish_records_article_id_account_id', 'publish_records', ['article_id', 'account_id']),
+]
+
+
+def upgrade():
+    """添加复合索引"""
+
+    # 启动时 init_db 的 create_all 可能已经建好了索引，这里用 if_not_exists 保证可重复执行
+    for name, table, columns in HOT_PATH_INDEXES:
+        op.create_index(name, table, columns, if_not_exists=True)
+
+    print("✅ 热点查询复合索引迁移完成")
+
+
+def downgrade():
+    """回滚迁移"""
+
+    for name, table, _ in reversed(HOT_PATH_INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
+
+    print("✅ 热点查询复合索引回滚完成")
@@ -0,0 +1,83 @@
+"""
+收录检测日汇总迁移
+- 创建 index_check_daily_stats 表：按 关键词 + 平台 + 日期 汇总检测次数
+- 用现有 index_check_records 回填汇总数据
+
+Revision ID: 0007_add_index_check_daily_stats
+Revises: 0006_add_hot_path_indexes
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = '0007_add_index_check_daily_stats'
+down_revision = '0006_add_hot_path_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """创建收录检测日汇总表并回填"""
+
+    # 检测是否为PostgreSQL
+    dialect = op.get_context().dialect.name
+    is_postgres = dialect == 'postgresql'
+
+    op.create_table(
+        'index_check_daily_stats',
+        sa.Column('id', sa.Integer(), nullable=False, autoincrement=True),
+        sa.Column('keyword_id', sa.Integer(), nullable=False),
+        sa.Column('platform', sa.String(length=50), nullable=False),
+        sa.Column('stat_date', sa.Date(), nullable=False),
+        sa.Column('total', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('keyword_found', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('company_found', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('answered', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(), server_default=sa.func.now(), onupdate=sa.func.now()),
+        sa.ForeignKeyConstraint(['keyword_id'], ['keywords.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('keyword_id', 'platform', 'stat_date', name='uq_index_check_daily_stats_key')
+    )
+
+    # 报表按日期范围 + 平台过滤
+    op.create_index(
+        'ix_index_check_daily_stats_stat_date_platform', 'index_check_daily_stats', ['stat_date', 'platform']
+    )
+
+    # 回填历史数据
+    op.execute(
+        """
+        INSERT INTO index_check_daily_stats
+            (keyword_id, platform, stat_date, total, keyword_found, company_found, answered, updated_at)
+        SELECT
+            keyword_id,
+            platform,
+            date(check_time),
+            COUNT(id),
+            SUM(CASE WHEN keyword_found THEN 1 ELSE 0 END),
+            SUM(CASE WHEN company_found THEN 1 ELSE 0 END),
+            SUM(CASE WHEN length(trim(answer)) > 0 THEN 1 ELSE 0 END),
+            CURRENT_TIMESTAMP
+        FROM index_check_records
+        WHERE check_time IS NOT NULL
+        GROUP BY keyword_id, platform, date(check_time)
+        """
+    )
+
+    if is_postgres:
+        op.execute("COMMENT ON TABLE index_check_daily_stats IS '收录检测日汇总表'")
+        op.execute("COMMENT ON COLUMN index_check_daily_stats.stat_date IS '统计日期（检测时间所在日）'")
+        op.execute("COMMENT ON COLUMN index_check_daily_stats.answered IS '拿到回答的次数'")
+
+    print("✅ 收录检测日汇总迁移完成")
+
+
+def downgrade():
+    """回滚迁移"""
+
+    op.drop_index('ix_index_check_daily_stats_stat_date_platform', table_name='index_check_daily_stats')
+    op.drop_table('index_check_daily_stats')
+
+    print("✅ 收录检测日汇总回滚完成")
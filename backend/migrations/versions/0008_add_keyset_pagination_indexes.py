@@ -0,0 +1,55 @@
+"""
+游标分页索引迁移
+- 回填排序列的空值（游标分页要求排序列非空）
+- geo_articles: (created_at, id)
+- index_check_records: (check_time, id)
+- reference_articles: (status, collected_at, id)
+
+Revision ID: 0008_add_keyset_pagination_indexes
+Revises: 0007_add_index_check_daily_stats
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+
+# revision identifiers
+revision = '0008_add_keyset_pagination_indexes'
+down_revision = '0007_add_index_check_daily_stats'
+branch_labels = None
+depends_on = None
+
+# (表名, 排序列, 空值回填表达式)
+BACKFILLS = [
+    ('geo_articles', 'created_at', 'COALESCE(updated_at, CURRENT_TIMESTAMP)'),
+    ('index_check_records', 'check_time', 'CURRENT_TIMESTAMP'),
+    ('reference_articles', 'collected_at', 'COALESCE(created_at, CURRENT_TIMESTAMP)'),
+]
+
+# (索引名, 表名, 列)
+KEYSET_INDEXES = [
+    ('ix_geo_articles_created_at_id', 'geo_articles', ['created_at', 'id']),
+    ('ix_index_check_records_check_time_id', 'index_check_records', ['check_time', 'id']),
+    ('ix_reference_articles_status_collected_at_id', 'reference_articles', ['status', 'collected_at', 'id']),
+]
+
+
+def upgrade():
+    """回填空值并添加游标分页索引"""
+
+    for table, column, fill in BACKFILLS:
+        op.execute(f"UPDATE {table} SET {column} = {fill} WHERE {column} IS NULL")
+
+    # 启动时 init_db 的 create_all 可能已经建好了索引，这里用 if_not_exists 保证可重复执行
+    for name, table, columns in KEYSET_INDEXES:
+        op.create_index(name, table, columns, if_not_exists=True)
+
+    print("✅ 游标分页索引迁移完成")
+
+
+def downgrade():
+    """回滚迁移（回填的时间不恢复）"""
+
+    for name, table, _ in reversed(KEYSET_INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
+
+    print("✅ 游标分页索引回滚完成")
@@ -0,0 +1,61 @@
+"""
+全文检索索引迁移
+- SQLite: geo_articles / reference_articles / knowledge_items 的 FTS5 索引表（中文二元切分），并回填
+- PostgreSQL: pg_trgm 扩展 + title / content 的 GIN trigram 索引（加速 ILIKE '%...%'）
+
+Revision ID: 0009_add_fulltext_search
+Revises: 0008_add_keyset_pagination_indexes
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+from sqlalchemy.orm import Session
+
+# revision identifiers
+revision = '0009_add_fulltext_search'
+down_revision = '0008_add_keyset_pagination_indexes'
+branch_labels = None
+depends_on = None
+
+# (SQLite FTS 表名, 源表)
+FULLTEXT_TABLES = [
+    ('geo_articles_fts', 'geo_articles'),
+    ('reference_articles_fts', 'reference_articles'),
+    ('knowledge_items_fts', 'knowledge_items'),
+]
+
+TRGM_COLUMNS = ['title', 'content']
+
+
+def upgrade():
+    """执行迁移"""
+
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        for _, table in FULLTEXT_TABLES:
+            for col in TRGM_COLUMNS:
+                op.execute(
+                    f"CREATE INDEX IF NOT EXISTS ix_{table}_{col}_trgm ON {table} USING gin ({col} gin_trgm_ops)"
+                )
+    else:
+        # 切分规则在应用代码里，建表和回填复用同一份实现
+        from backend.services.fulltext_search import rebuild_fulltext_index
+
+        rows = rebuild_fulltext_index(Session(bind=op.get_bind()))
+        print(f"   全文索引回填: {rows}")
+
+    print("✅ 全文检索索引迁移完成")
+
+
+def downgrade():
+    """回滚迁移"""
+
+    if op.get_bind().dialect.name == 'postgresql':
+        for _, table in FULLTEXT_TABLES:
+            for col in TRGM_COLUMNS:
+                op.execute(f"DROP INDEX IF EXISTS ix_{table}_{col}_trgm")
+    else:
+        for fts_table, _ in FULLTEXT_TABLES:
+            op.execute(f"DROP TABLE IF EXISTS {fts_table}")
+
+    print("✅ 全文检索索引回滚完成")
@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+"""
+收录检测日汇总回填
+从 index_check_records 重建 index_check_daily_stats（汇总表丢失或与原始记录不一致时使用）
+
+用法：
+    python backend/scripts/backfill_index_stats.py            # 全量重建
+    python backend/scripts/backfill_index_stats.py --days 30  # 只重建最近 30 天
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from backend.database import SessionLocal, init_db
+from backend.services.index_check_stats import rebuild_daily_stats, since_days
+
+
+def main():
+    parser = argparse.ArgumentParser(description="重建收录检测日汇总")
+    parser.add_argument("--days", type=int, default=None, help="只重建最近 N 天（默认全部）")
+    args = parser.parse_args()
+
+    init_db()
+    db = SessionLocal()
+    try:
+        since = since_days(args.days) if args.days else None
+        rows = rebuild_daily_stats(db, since=since)
+        print(f"✅ 日汇总重建完成，共 {rows} 行" + (f"（{since} 起）" if since else ""))
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
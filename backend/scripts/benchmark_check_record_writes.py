@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+"""
+检测记录写入基准测试
+在临时 SQLite 库（WAL，与线上连接参数一致）中对比两种写法的吞吐：
+    逐条：每个问题 db.add(record) + db.commit()（一次检测一个事务）
+    批量：一个平台检测完后 insert_check_records() 一条 executemany INSERT + 一次提交
+两种写法都会维护 index_check_daily_stats 日汇总
+
+用法：
+    python backend/scripts/benchmark_check_record_writes.py
+    python backend/scripts/benchmark_check_record_writes.py --records 5000 --batch 20
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+from sqlalchemy import create_engine, event, func, select  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from backend.database import Base  # noqa: E402
+from backend.database.models import IndexCheckDailyStat, IndexCheckRecord  # noqa: E402
+from backend.services import index_check_stats  # noqa: E402
+
+PLATFORMS = ["doubao", "qianwen", "deepseek"]
+
+
+def make_session_factory(db_path: Path):
+    engine = create_engine(f"sqlite:///{db_path}", connect_args={"check_same_thread": False})
+
+    @event.listens_for(engine, "connect")
+    def _pragma(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.close()
+
+    Base.metadata.create_all(engine)
+    return engine, sessionmaker(bind=engine)
+
+
+def make_rows(records: int, batch: int):
+    """每 batch 条为一次平台检测：同一关键词、同一平台"""
+    rng = random.Random(42)
+    start = datetime(2026, 10, 1, 9)
+    return [
+        {
+            "keyword_id": i // batch // len(PLATFORMS) % 50 + 1,
+            "platform": PLATFORMS[i // batch % len(PLATFORMS)],
+            "question": f"什么是关键词{i}？推荐哪家公司？",
+            "answer": "回答正文" * rng.randint(50, 300),
+            "keyword_found": rng.random() < 0.5,
+            "company_found": rng.random() < 0.2,
+            "check_time": start + timedelta(minutes=i),
+        }
+        for i in range(records)
+    ]
+
+
+def write_per_row(session_factory, rows):
+    with session_factory() as db:
+        for row in rows:
+            db.add(IndexCheckRecord(**row))
+            db.commit()
+
+
+def write_bulk(session_factory, rows, batch: int):
+    with session_factory() as db:
+        for i in range(0, len(rows), batch):
+            index_check_stats.insert_check_records(db, rows[i : i + batch])
+            db.commit()
+
+
+def run(records: int, batch: int):
+    rows = make_rows(records, batch)
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, writer in [
+            ("逐条提交", lambda factory: write_per_row(factory, rows)),
+            (f"批量写入（每 {batch} 条一次）", lambda factory: write_bulk(factory, rows, batch)),
+        ]:
+            engine, factory = make_session_factory(Path(tmp) / f"{len(results)}.db")
+            start = time.perf_counter()
+            writer(factory)
+            elapsed = time.perf_counter() - start
+
+            with factory() as db:
+                written = db.scalar(select(func.count(IndexCheckRecord.id)))
+                stat_total = db.scalar(select(func.sum(IndexCheckDailyStat.total)))
+            engine.dispose()
+            assert written == records and stat_total == records, (written, stat_total)
+
+            results[name] = elapsed
+            print(f"{name:<24} {elapsed * 1000:10.1f} ms  {records / elapsed:10.0f} 条/秒")
+
+    per_row, bulk = results.values()
+    print(f"\n加速: {per_row / bulk:.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="检测记录写入基准测试")
+    parser.add_argument("--records", type=int, default=2000, help="检测记录数")
+    parser.add_argument("--batch", type=int, default=10, help="批量写入时每批条数（一个平台一次检测的问题数）")
+    args = parser.parse_args()
+    run(args.records, args.batch)
+
+
+if __name__ == "__main__":
+    main()
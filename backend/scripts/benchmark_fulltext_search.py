@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""
+全文检索基准测试
+在临时 SQLite 库中造中文文章，对比 LIKE '%关键词%' 全表扫描和 FTS5 索引（中文二元切分）的耗时与命中数
+
+用法：
+    python backend/scripts/benchmark_fulltext_search.py
+    python backend/scripts/benchmark_fulltext_search.py --articles 100000 --length 800 --repeat 10
+"""
+
+import argparse
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+from backend.services import fulltext_search  # noqa: E402
+from backend.services.fulltext_search import build_match_query, segment  # noqa: E402
+
+SCHEMA = """
+CREATE TABLE geo_articles (
+    id INTEGER PRIMARY KEY,
+    title TEXT,
+    content TEXT NOT NULL
+);
+"""
+
+VOCABULARY = [
+    "人工智能", "生成式引擎", "搜索优化", "品牌曝光", "内容营销", "用户增长", "知识库", "大模型", "推荐算法",
+    "关键词", "收录", "转化率", "私域流量", "短视频", "直播带货", "数据分析", "用户画像", "智能客服",
+    "企业服务", "云计算", "数字化转型", "供应链", "新能源", "跨境电商", "本地生活", "医疗健康", "在线教育",
+    "GEO", "SEO", "AIGC", "ChatGPT", "DeepSeek", "SaaS", "API", "2026",
+]
+FILLERS = ["的", "和", "在", "是", "了", "与", "对", "，", "。", "我们", "如何", "提升", "通过", "实现"]
+# 只在少量文章里出现的低频词
+RARE_WORDS = ["量子纠缠", "深海养殖", "古籍修复"]
+
+
+def random_text(rng: random.Random, length: int) -> str:
+    parts, size = [], 0
+    while size < length:
+        word = rng.choice(VOCABULARY) if rng.random() < 0.4 else rng.choice(FILLERS)
+        parts.append(word)
+        size += len(word)
+    return "".join(parts)
+
+
+def seed(conn: sqlite3.Connection, articles: int, length: int):
+    """造数据并建全文索引（与线上 after_flush 写入的内容一致）"""
+    rng = random.Random(42)
+    source = fulltext_search.FULLTEXT_SOURCES[0]
+    conn.execute(fulltext_search._create_sql(source))
+
+    batch = []
+    for i in range(1, articles + 1):
+        content = random_text(rng, length)
+        if rng.random() < 0.001:
+            content += rng.choice(RARE_WORDS)
+        batch.append((i, f"{rng.choice(VOCABULARY)}{rng.choice(VOCABULARY)}指南{i}", content))
+        if len(batch) >= 5000 or i == articles:
+            conn.executemany("INSERT INTO geo_articles (id, title, content) VALUES (?, ?, ?)", batch)
+            conn.executemany(
+                f"INSERT INTO {source.fts_table} (rowid, title, content) VALUES (?, ?, ?)",
+                ((row_id, segment(title), segment(content)) for row_id, title, content in batch),
+            )
+            batch = []
+    conn.commit()
+    conn.execute(f"INSERT INTO {source.fts_table}({source.fts_table}) VALUES ('optimize')")
+    conn.commit()
+
+
+def timed(conn: sqlite3.Connection, sql: str, params: tuple, repeat: int):
+    """返回 (平均耗时ms, 行数)"""
+    rows = 0
+    start = time.perf_counter()
+    for _ in range(repeat):
+        rows = len(conn.execute(sql, params).fetchall())
+    return (time.perf_counter() - start) * 1000 / repeat, rows
+
+
+def run(articles: int, length: int, repeat: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = sqlite3.connect(Path(tmp) / "benchmark.db")
+        conn.executescript(SCHEMA)
+
+        print(f"造数据: geo_articles={articles}，正文约 {length} 字")
+        start = time.perf_counter()
+        seed(conn, articles, length)
+        print(f"写入 + 建索引耗时: {time.perf_counter() - start:.1f} s")
+
+        fts = fulltext_search.FULLTEXT_SOURCES[0].fts_table
+        weights = ", ".join(str(w) for w in fulltext_search.FULLTEXT_SOURCES[0].weights)
+        for keyword in ["搜索优化", "数字化转型 供应链", RARE_WORDS[0], "古籍", "DeepSeek"]:
+            match_query = build_match_query(keyword)
+            words = keyword.split()
+            like_where = " AND ".join("(title LIKE ? OR content LIKE ?)" for _ in words)
+            like_params = tuple(p for w in words for p in (f"%{w}%", f"%{w}%"))
+
+            like_count = timed(conn, f"SELECT id FROM geo_articles WHERE {like_where}", like_params, repeat)
+            fts_count = timed(conn, f"SELECT rowid FROM {fts} WHERE {fts} MATCH ?", (match_query,), repeat)
+            like_top = timed(
+                conn, f"SELECT id FROM geo_articles WHERE {like_where} ORDER BY id DESC LIMIT 20", like_params, repeat
+            )
+            fts_top = timed(
+                conn,
+                f"SELECT rowid FROM {fts} WHERE {fts} MATCH ? ORDER BY bm25({fts}, {weights}) LIMIT 20",
+                (match_query,),
+                repeat,
+            )
+
+            print(f"\n{'=' * 80}\n搜索 {keyword!r}  (MATCH {match_query})")
+            print(
+                f"  全部命中  LIKE: {like_count[0]:9.2f} ms {like_count[1]:>7} 行 | "
+                f"FTS: {fts_count[0]:9.2f} ms {fts_count[1]:>7} 行"
+            )
+            # 高频词按相关度取前 20 条要给全部命中行打分，LIKE 按 id 取前 20 条扫到就停
+            print(f"  前 20 条  LIKE: {like_top[0]:9.2f} ms {'':>10} | FTS(bm25): {fts_top[0]:9.2f} ms")
+            if fts_count[0] > 0:
+                print(f"  加速: {like_count[0] / fts_count[0]:.1f}x")
+
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="全文检索基准测试")
+    parser.add_argument("--articles", type=int, default=20000, help="文章数")
+    parser.add_argument("--length", type=int, default=800, help="正文字数")
+    parser.add_argument("--repeat", type=int, default=5, help="每条查询执行次数")
+    args = parser.parse_args()
+    run(args.articles, args.length, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
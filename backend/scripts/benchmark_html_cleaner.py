@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+"""
+HTML 清洗基准测试
+对比旧的逐条 re.sub 清洗链和新的线性扫描清洗器，以及批量时的进程池
+
+用法：
+    python backend/scripts/benchmark_html_cleaner.py
+    python backend/scripts/benchmark_html_cleaner.py --articles 500 --paragraphs 200
+"""
+
+import argparse
+import asyncio
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+from backend.services import html_cleaner  # noqa: E402
+from backend.services.html_cleaner import clean_html, clean_html_many  # noqa: E402
+
+
+def legacy_clean_html(content: str) -> str:
+    """旧版 ArticleCollectorService._clean_html（原样保留用于对比）"""
+    if not content:
+        return ""
+    content = re.sub(r"<script[^>]*>[\s\S]*?</script>", "", content, flags=re.IGNORECASE)
+    content = re.sub(r"<style[^>]*>[\s\S]*?</style>", "", content, flags=re.IGNORECASE)
+    content = re.sub(r"<!--[\s\S]*?-->", "", content)
+    ad_patterns = [
+        r'<div[^>]*class="[^"]*ad[^"]*"[^>]*>[\s\S]*?</div>',
+        r'<div[^>]*class="[^"]*advertisement[^"]*"[^>]*>[\s\S]*?</div>',
+        r'<div[^>]*class="[^"]*sponsor[^"]*"[^>]*>[\s\S]*?</div>',
+        r'<div[^>]*class="[^"]*promotion[^"]*"[^>]*>[\s\S]*?</div>',
+        r"<ins[^>]*>[\s\S]*?</ins>",
+        r"<aside[^>]*>[\s\S]*?</aside>",
+    ]
+    for pattern in ad_patterns:
+        content = re.sub(pattern, "", content, flags=re.IGNORECASE)
+    content = re.sub(r"<br\s*/?>", "\n", content, flags=re.IGNORECASE)
+    content = re.sub(r"<p[^>]*>", "\n", content, flags=re.IGNORECASE)
+    content = re.sub(r"</p>", "\n", content, flags=re.IGNORECASE)
+    content = re.sub(r"<[^>]+>", "", content)
+    html_entities = {
+        "&nbsp;": " ", "&lt;": "<", "&gt;": ">", "&amp;": "&", "&quot;": '"', "&apos;": "'", "&#39;": "'",
+        "&ldquo;": '"', "&rdquo;": '"', "&lsquo;": "'", "&rsquo;": "'", "&mdash;": "—", "&ndash;": "–",
+        "&hellip;": "...", "&copy;": "©", "&reg;": "®", "&trade;": "™",
+    }
+    for entity, char in html_entities.items():
+        content = content.replace(entity, char)
+    content = re.sub(r"&#\d+;", "", content)
+    content = re.sub(r"&#x[0-9a-fA-F]+;", "", content)
+    content = re.sub(r"\t", " ", content)
+    content = re.sub(r" +", " ", content)
+    content = re.sub(r"\n\s*\n", "\n\n", content)
+    content = re.sub(r"\n{3,}", "\n\n", content)
+    for pattern in html_cleaner.NOISE_WORDS:
+        content = re.sub(pattern, "", content)
+    return content.strip()
+
+
+def make_article(rng: random.Random, paragraphs: int) -> str:
+    """造一篇带脚本、样式、广告块、实体的文章 HTML"""
+    parts = ['<html><head><style>.a{color:red}</style><script>var x = "<p>";</script></head><body>']
+    parts.append('<div class="header"><h1>GEO 优化实战&nbsp;&mdash;&nbsp;从入门到精通</h1></div>')
+    for i in range(paragraphs):
+        text = "生成式引擎优化让品牌内容被AI引用" * rng.randint(2, 6)
+        parts.append(f"<p>第{i}段：{text}&ldquo;引用&rdquo;&amp;分析</p>")
+        if i % 10 == 0:
+            parts.append('<div class="ad-box"><div class="ad-inner">广告 立即购买</div>推广链接</div>')
+        if i % 25 == 0:
+            parts.append("<!-- tracking --><aside>相关推荐 猜你喜欢</aside><ins class='adsbygoogle'></ins>")
+    parts.append("<p>点击展开全文</p></body></html>")
+    return "".join(parts)
+
+
+def make_feed_article(rng: random.Random, paragraphs: int) -> str:
+    """造一篇接近真实信息流页面的文章：段落里大量 span/a 行内标签，外面套多层 div"""
+    parts = ['<div class="RichContent"><div class="RichContent-inner"><div class="RichText ztext">']
+    for i in range(paragraphs):
+        words = "".join(
+            f'<span class="w{j}">{"内容营销与AI搜索" * rng.randint(1, 3)}</span><a href="/t/{j}">#话题{j}</a>'
+            for j in range(rng.randint(3, 8))
+        )
+        parts.append(f'<div class="para"><p data-pid="{i}">{words}&nbsp;</p></div>')
+        if i % 15 == 0:
+            parts.append('<div class="Card sponsor-card"><div><div>赞助内容</div></div></div>')
+    parts.append('</div></div></div><div class="ContentItem-actions">分享到 举报</div>')
+    return "".join(parts)
+
+
+def make_unbalanced_article(paragraphs: int) -> str:
+    """采集截断导致的未闭合广告 div：旧正则每个都要向后扫到文末，退化为平方复杂度"""
+    return "".join(f'<div class="ad-slot-{i}"><p>第{i}段正文内容</p>' for i in range(paragraphs))
+
+
+def run(articles: int, paragraphs: int):
+    rng = random.Random(42)
+    print("【普通文章】")
+    bench([make_article(rng, paragraphs) for _ in range(articles)])
+    print("\n【信息流文章（标签密集）】")
+    bench([make_feed_article(rng, paragraphs) for _ in range(articles)])
+    print("\n【未闭合广告块】")
+    bench([make_unbalanced_article(paragraphs * 20) for _ in range(max(1, articles // 20))], pool=False)
+
+
+def bench(docs, pool: bool = True):
+    articles = len(docs)
+    total_chars = sum(map(len, docs))
+    print(f"文章数: {articles}，总字符数: {total_chars:,}")
+
+    start = time.perf_counter()
+    for doc in docs:
+        legacy_clean_html(doc)
+    legacy = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for doc in docs:
+        clean_html(doc)
+    single = time.perf_counter() - start
+
+    print(f"  旧正则清洗链    : {legacy * 1000:9.1f} ms  ({legacy / articles * 1000:.2f} ms/篇)")
+    print(f"  新清洗器        : {single * 1000:9.1f} ms  ({single / articles * 1000:.2f} ms/篇)  {legacy / single:.1f}x")
+
+    if pool:
+        # 强制走进程池（第一轮含进程启动开销），多核机器上才有意义
+        html_cleaner.HTML_CLEAN_POOL_MIN_CHARS = 0
+        pooled = []
+        for _ in range(2):
+            start = time.perf_counter()
+            asyncio.run(clean_html_many(docs))
+            pooled.append(time.perf_counter() - start)
+        html_cleaner.shutdown_clean_pool()
+        print(f"  进程池(冷启动)  : {pooled[0] * 1000:9.1f} ms")
+        print(f"  进程池(热启动)  : {pooled[1] * 1000:9.1f} ms  {legacy / pooled[1]:.1f}x")
+
+    sample = docs[0]
+    print("  旧清洗链输出前 80 字:", legacy_clean_html(sample)[:80].replace("\n", "⏎"))
+    print("  新清洗器输出前 80 字:", clean_html(sample)[:80].replace("\n", "⏎"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTML 清洗基准测试")
+    parser.add_argument("--articles", type=int, default=200, help="文章数量")
+    parser.add_argument("--paragraphs", type=int, default=100, help="每篇文章段落数")
+    args = parser.parse_args()
+    run(args.articles, args.paragraphs)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+"""
+热点查询索引基准测试
+在临时 SQLite 库中造数据，对比加复合索引前后的查询计划和耗时
+
+用法：
+    python backend/scripts/benchmark_indexes.py
+    python backend/scripts/benchmark_indexes.py --articles 100000 --records 500000 --repeat 50
+"""
+
+import argparse
+import importlib.util
+import random
+import sqlite3
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+MIGRATION_FILE = Path(__file__).resolve().parent.parent / "migrations" / "versions" / "0006_add_hot_path_indexes.py"
+
+# 与模型一致的最小表结构，保留基线已有的单列索引（keyword_id / article_id / account_id）
+SCHEMA = """
+CREATE TABLE geo_articles (
+    id INTEGER PRIMARY KEY,
+    keyword_id INTEGER NOT NULL,
+    title TEXT,
+    content TEXT NOT NULL,
+    platform VARCHAR(50),
+    account_id INTEGER,
+    publish_status VARCHAR(20),
+    scheduled_at DATETIME,
+    index_status VARCHAR(20),
+    next_check_at DATETIME,
+    created_at DATETIME
+);
+CREATE INDEX ix_geo_articles_keyword_id ON geo_articles (keyword_id);
+
+CREATE TABLE index_check_records (
+    id INTEGER PRIMARY KEY,
+    keyword_id INTEGER NOT NULL,
+    platform VARCHAR(50) NOT NULL,
+    question TEXT NOT NULL,
+    answer TEXT,
+    keyword_found BOOLEAN,
+    company_found BOOLEAN,
+    check_time DATETIME
+);
+CREATE INDEX ix_index_check_records_keyword_id ON index_check_records (keyword_id);
+
+CREATE TABLE publish_records (
+    id INTEGER PRIMARY KEY,
+    article_id INTEGER NOT NULL,
+    account_id INTEGER NOT NULL,
+    publish_status INTEGER,
+    created_at DATETIME
+);
+CREATE INDEX ix_publish_records_article_id ON publish_records (article_id);
+CREATE INDEX ix_publish_records_account_id ON publish_records (account_id);
+"""
+
+PUBLISH_STATUSES = ["draft", "completed", "scheduled", "publishing", "published", "failed"]
+INDEX_STATUSES = ["uncheck", "not_indexed", "indexed"]
+AI_PLATFORMS = ["doubao", "qianwen", "deepseek"]
+
+
+def load_hot_path_indexes():
+    """从迁移文件读取索引定义，保证基准测试和迁移一致"""
+    spec = importlib.util.spec_from_file_location("hot_path_indexes_migration", MIGRATION_FILE)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.HOT_PATH_INDEXES
+
+
+def seed(conn: sqlite3.Connection, articles: int, records: int, keywords: int):
+    """造数据"""
+    rng = random.Random(42)
+    now = datetime.now()
+
+    def random_time(days: int) -> str:
+        return (now - timedelta(minutes=rng.randint(-days * 1440, days * 1440))).isoformat(" ")
+
+    conn.executemany(
+        "INSERT INTO geo_articles (keyword_id, title, content, platform, account_id, publish_status, "
+        "scheduled_at, index_status, next_check_at, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (
+            (
+                rng.randint(1, keywords),
+                f"文章{i}",
+                "正文" * 50,
+                rng.choice(["zhihu", "sohu", "toutiao"]),
+                rng.randint(1, 50),
+                rng.choice(PUBLISH_STATUSES),
+                random_time(30),
+                rng.choice(INDEX_STATUSES),
+                random_time(3) if rng.random() > 0.1 else None,
+                random_time(90),
+            )
+            for i in range(articles)
+        ),
+    )
+    conn.executemany(
+        "INSERT INTO index_check_records (keyword_id, platform, question, answer, keyword_found, company_found, "
+        "check_time) VALUES (?, ?, ?, ?, ?, ?, ?)",
+        (
+            (
+                rng.randint(1, keywords),
+                rng.choice(AI_PLATFORMS),
+                "什么是GEO？",
+                "回答" * 40,
+                rng.random() > 0.5,
+                rng.random() > 0.7,
+                (now - timedelta(minutes=rng.randint(0, 180 * 1440))).isoformat(" "),
+            )
+            for _ in range(records)
+        ),
+    )
+    conn.executemany(
+        "INSERT INTO publish_records (article_id, account_id, publish_status, created_at) VALUES (?, ?, ?, ?)",
+        ((rng.randint(1, articles), rng.randint(1, 50), rng.randint(0, 3), random_time(30)) for _ in range(articles)),
+    )
+    conn.commit()
+    conn.execute("ANALYZE")
+
+
+def hot_queries(keywords: int):
+    """热点查询（与调度器、报表、发布回调中的过滤条件一致）"""
+    now = datetime.now()
+    week_ago = (now - timedelta(days=7)).isoformat(" ")
+    now_str = now.isoformat(" ")
+    return [
+        (
+            "定时发布扫描 geo_articles(publish_status, scheduled_at)",
+            "SELECT id FROM geo_articles WHERE publish_status = 'scheduled' AND platform IS NOT NULL "
+            "AND account_id IS NOT NULL AND scheduled_at <= ?",
+            (now_str,),
+        ),
+        (
+            "收录监测扫描 geo_articles(publish_status, next_check_at)",
+            "SELECT id FROM geo_articles WHERE publish_status = 'published' AND index_status != 'indexed' "
+            "AND next_check_at <= ?",
+            (now_str,),
+        ),
+        (
+            "关键词趋势 index_check_records(keyword_id, check_time)",
+            "SELECT keyword_found, company_found, check_time FROM index_check_records "
+            "WHERE keyword_id = ? AND check_time >= ?",
+            (keywords // 2, week_ago),
+        ),
+        (
+            "平台表现 index_check_records(platform, check_time)",
+            "SELECT keyword_found, company_found FROM index_check_records WHERE platform = ? AND check_time >= ?",
+            ("qianwen", week_ago),
+        ),
+        (
+            "发布进度回调 publish_records(article_id, account_id)",
+            "SELECT id FROM publish_records WHERE article_id = ? AND account_id = ?",
+            (123, 7),
+        ),
+    ]
+
+
+def measure(conn: sqlite3.Connection, sql: str, params: tuple, repeat: int):
+    """返回 (查询计划, 平均耗时ms, 行数)"""
+    plan = " | ".join(row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params))
+    rows = 0
+    start = time.perf_counter()
+    for _ in range(repeat):
+        rows = len(conn.execute(sql, params).fetchall())
+    elapsed_ms = (time.perf_counter() - start) * 1000 / repeat
+    return plan, elapsed_ms, rows
+
+
+def run(articles: int, records: int, keywords: int, repeat: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = sqlite3.connect(Path(tmp) / "benchmark.db")
+        conn.executescript(SCHEMA)
+
+        print(f"造数据: geo_articles={articles}, index_check_records={records}, publish_records={articles}")
+        seed(conn, articles, records, keywords)
+
+        queries = hot_queries(keywords)
+        before = [measure(conn, sql, params, repeat) for _, sql, params in queries]
+
+        for name, table, columns in load_hot_path_indexes():
+            conn.execute(f"CREATE INDEX {name} ON {table} ({', '.join(columns)})")
+        conn.execute("ANALYZE")
+        after = [measure(conn, sql, params, repeat) for _, sql, params in queries]
+
+        for (title, _, _), (plan_b, ms_b, rows_b), (plan_a, ms_a, rows_a) in zip(queries, before, after):
+            print(f"\n{'=' * 80}\n{title}  (返回 {rows_a} 行)")
+            print(f"  加索引前: {ms_b:8.3f} ms  {plan_b}")
+            print(f"  加索引后: {ms_a:8.3f} ms  {plan_a}")
+            if ms_a > 0:
+                print(f"  加速: {ms_b / ms_a:.1f}x")
+            assert rows_a == rows_b, "索引前后结果行数不一致"
+
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="热点查询复合索引基准测试")
+    parser.add_argument("--articles", type=int, default=50000, help="geo_articles / publish_records 行数")
+    parser.add_argument("--records", type=int, default=200000, help="index_check_records 行数")
+    parser.add_argument("--keywords", type=int, default=200, help="关键词数量")
+    parser.add_argument("--repeat", type=int, default=20, help="每条查询执行次数")
+    args = parser.parse_args()
+    run(args.articles, args.records, args.keywords, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
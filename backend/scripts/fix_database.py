@@ -56,6 +56,8 @@ def check_and_fix_database():
             ("publish_logs", "TEXT"),
             ("platform_url", "TEXT"),
             ("index_status", "TEXT DEFAULT 'uncheck'"),
+            ("next_check_at", "DATETIME"),
+            ("index_check_attempts", "INTEGER DEFAULT 0"),
         ]
 
         for col_name, col_def in columns_to_check:
@@ -72,6 +74,43 @@ def check_and_fix_database():
                 # logger.debug(f"{col_name} 列已存在")
                 pass
 
+        # 游标分页要求排序列非空，先回填旧数据的空值（与迁移 0008 一致）
+        sort_columns_to_backfill = [
+            ("geo_articles", "created_at", "COALESCE(updated_at, CURRENT_TIMESTAMP)"),
+            ("index_check_records", "check_time", "CURRENT_TIMESTAMP"),
+            ("reference_articles", "collected_at", "COALESCE(created_at, CURRENT_TIMESTAMP)"),
+        ]
+        for table_name, col_name, fill in sort_columns_to_backfill:
+            try:
+                cursor.execute(f"UPDATE {table_name} SET {col_name} = {fill} WHERE {col_name} IS NULL")
+                if cursor.rowcount > 0:
+                    logger.info(f"回填 {table_name}.{col_name} 空值: {cursor.rowcount} 行")
+                conn.commit()
+            except Exception as e:
+                logger.error(f"✗ 回填 {table_name}.{col_name} 失败: {e}")
+                conn.rollback()
+
+        # 热点查询索引（create_all 不会给已存在的表补索引）
+        indexes_to_check = [
+            ("ix_geo_articles_next_check_at", "geo_articles", "next_check_at"),
+            ("ix_geo_articles_publish_status_scheduled_at", "geo_articles", "publish_status, scheduled_at"),
+            ("ix_geo_articles_publish_status_next_check_at", "geo_articles", "publish_status, next_check_at"),
+            ("ix_index_check_records_keyword_id_check_time", "index_check_records", "keyword_id, check_time"),
+            ("ix_index_check_records_platform_check_time", "index_check_records", "platform, check_time"),
+            ("ix_publish_records_article_id_account_id", "publish_records", "article_id, account_id"),
+            # 游标分页索引
+            ("ix_geo_articles_created_at_id", "geo_articles", "created_at, id"),
+            ("ix_index_check_records_check_time_id", "index_check_records", "check_time, id"),
+            ("ix_reference_articles_status_collected_at_id", "reference_articles", "status, collected_at, id"),
+        ]
+        for index_name, table_name, index_columns in indexes_to_check:
+            try:
+                cursor.execute(f"CREATE INDEX IF NOT EXISTS {index_name} ON {table_name} ({index_columns})")
+                conn.commit()
+            except Exception as e:
+                logger.error(f"✗ 创建索引 {index_name} 失败: {e}")
+                conn.rollback()
+
         # 检查knowledge_categories表结构（RAGFlow同步字段）
         cursor.execute("PRAGMA table_info(knowledge_categories)")
         cat_columns = cursor.fetchall()
@@ -3,6 +3,7 @@
 数据迁移脚本：将现有知识库数据迁移到RAGFlow
 """
 
+import asyncio
 import sys
 from pathlib import Path
 
@@ -19,7 +20,7 @@ from backend.services.ragflow_client import RAGFlowClient
 from backend.config import RAGFLOW_BASE_URL, RAGFLOW_API_KEY
 
 
-def migrate_categories(db: Session, ragflow_client: RAGFlowClient) -> dict:
+async def migrate_categories(db: Session, ragflow_client: RAGFlowClient) -> dict:
     """
     迁移所有分类到RAGFlow
 
@@ -47,7 +48,7 @@ def migrate_categories(db: Session, ragflow_client: RAGFlowClient) -> dict:
                 continue
 
             # 创建RAGFlow知识库
-            result = ragflow_client.create_dataset(
+            result = await ragflow_client.create_dataset(
                 name=cat.name, description=cat.description or f"{cat.name} - AutoGeo知识库"
             )
 
@@ -73,7 +74,7 @@ def migrate_categories(db: Session, ragflow_client: RAGFlowClient) -> dict:
     return {"success": success_count, "failed": fail_count}
 
 
-def migrate_knowledge(db: Session, ragflow_client: RAGFlowClient) -> dict:
+async def migrate_knowledge(db: Session, ragflow_client: RAGFlowClient) -> dict:
     """
     迁移所有知识条目到RAGFlow
 
@@ -109,7 +110,7 @@ def migrate_knowledge(db: Session, ragflow_client: RAGFlowClient) -> dict:
                 continue
 
             # 上传文档到RAGFlow
-            result = ragflow_client.upload_document_content(
+            result = await ragflow_client.upload_document_content(
                 dataset_id=category.ragflow_dataset_id, title=know.title, content=know.content
             )
 
@@ -122,7 +123,7 @@ def migrate_knowledge(db: Session, ragflow_client: RAGFlowClient) -> dict:
                     know.ragflow_synced_at = datetime.now()
 
                     # 触发文档解析
-                    ragflow_client.parse_documents(dataset_id=category.ragflow_dataset_id, document_ids=[doc_id])
+                    await ragflow_client.parse_documents(dataset_id=category.ragflow_dataset_id, document_ids=[doc_id])
 
                     db.commit()
 
@@ -144,7 +145,7 @@ def migrate_knowledge(db: Session, ragflow_client: RAGFlowClient) -> dict:
     return {"success": success_count, "failed": fail_count}
 
 
-def main():
+async def main():
     """主函数"""
     logger.info("=" * 60)
     logger.info("开始数据迁移到RAGFlow")
@@ -162,7 +163,7 @@ def main():
     try:
         # 检查RAGFlow连接
         logger.info("检查RAGFlow连接...")
-        datasets = ragflow_client.list_datasets()
+        datasets = await ragflow_client.list_datasets()
         if datasets.get("code") == 0:
             logger.info(f"✅ RAGFlow连接成功，当前有 {len(datasets.get('data', []))} 个知识库")
         else:
@@ -175,10 +176,10 @@ def main():
         logger.info(f"现有数据: {total_categories} 个分类, {total_knowledge} 个知识条目")
 
         # 迁移分类
-        cat_result = migrate_categories(db, ragflow_client)
+        cat_result = await migrate_categories(db, ragflow_client)
 
         # 迁移知识条目
-        know_result = migrate_knowledge(db, ragflow_client)
+        know_result = await migrate_knowledge(db, ragflow_client)
 
         # 输出总结
         logger.info("=" * 60)
@@ -191,8 +192,9 @@ def main():
         logger.error(f"迁移过程出错: {e}")
         raise
     finally:
+        await ragflow_client.close()
         db.close()
 
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
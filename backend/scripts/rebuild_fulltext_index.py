@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+"""
+全文索引重建（仅 SQLite）
+从 geo_articles / reference_articles / knowledge_items 重建 FTS5 索引表
+（批量 UPDATE / DELETE、直接改库或切分规则调整后使用）
+
+用法：
+    python backend/scripts/rebuild_fulltext_index.py                    # 全部重建
+    python backend/scripts/rebuild_fulltext_index.py --table geo_articles
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from backend.database import SessionLocal, init_db
+from backend.services.fulltext_search import FULLTEXT_SOURCES, rebuild_fulltext_index
+
+
+def main():
+    tables = [source.model.__tablename__ for source in FULLTEXT_SOURCES]
+    parser = argparse.ArgumentParser(description="重建全文索引")
+    parser.add_argument("--table", choices=tables, default=None, help="只重建该表（默认全部）")
+    args = parser.parse_args()
+
+    init_db()
+    db = SessionLocal()
+    try:
+        models = [s.model for s in FULLTEXT_SOURCES if s.model.__tablename__ == args.table] if args.table else None
+        result = rebuild_fulltext_index(db, models)
+        if not result:
+            print("ℹ️ 当前不是 SQLite 数据库，PostgreSQL 的 trgm 索引由数据库自动维护")
+        for table, rows in result.items():
+            print(f"✅ {table} 重建完成，共 {rows} 行")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
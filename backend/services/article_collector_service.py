@@ -5,24 +5,34 @@
 """
 
 import asyncio
-import re
 import random
 import os
 from datetime import datetime
 from typing import Dict, Any, List, Optional
 from dataclasses import asdict
+from functools import partial
 from loguru import logger
 from sqlalchemy.orm import Session
 from playwright.async_api import Page
 
 from backend.services.playwright_mgr import playwright_mgr
+from backend.services.resource_blocker import resource_blocker
+from backend.services.html_cleaner import clean_html, clean_html_many
+from backend.services.async_pipeline import Pipeline, PipelineStage
 from backend.services.playwright.collectors import (
     get_collector,
     list_collectors,
     register_collectors,
 )
 from backend.services.ragflow_client import get_ragflow_client
+from backend.services.near_duplicate_index import DUPLICATE, UNIQUE, near_duplicate_index, simhash
+from backend.services.pagination import list_count_cache
 from backend.config import (
+    COLLECT_DEDUPE_CONCURRENCY,
+    COLLECT_PERSIST_BATCH_SIZE,
+    COLLECT_PIPELINE_QUEUE_SIZE,
+    COLLECT_VECTORIZE_CONCURRENCY,
+    NEAR_DUPLICATE_INDEX_ENABLED,
     PLATFORMS,
     RAGFLOW_DATASET_ID,
     RAGFLOW_DATASET_NAME,
@@ -68,7 +78,7 @@ class ArticleCollectorService:
         """
         清洗 HTML 内容
 
-        去除广告、冗余标签、特殊字符等
+        去除广告、冗余标签、特殊字符等（实现见 html_cleaner.clean_html）
 
         Args:
             content: 原始内容
@@ -76,93 +86,7 @@ class ArticleCollectorService:
         Returns:
             清洗后的纯文本内容
         """
-        if not content:
-            return ""
-
-        # 1. 移除 script 和 style 标签及其内容
-        content = re.sub(r"<script[^>]*>[\s\S]*?</script>", "", content, flags=re.IGNORECASE)
-        content = re.sub(r"<style[^>]*>[\s\S]*?</style>", "", content, flags=re.IGNORECASE)
-
-        # 2. 移除 HTML 注释
-        content = re.sub(r"<!--[\s\S]*?-->", "", content)
-
-        # 3. 移除常见的广告相关标签和类
-        ad_patterns = [
-            r'<div[^>]*class="[^"]*ad[^"]*"[^>]*>[\s\S]*?</div>',
-            r'<div[^>]*class="[^"]*advertisement[^"]*"[^>]*>[\s\S]*?</div>',
-            r'<div[^>]*class="[^"]*sponsor[^"]*"[^>]*>[\s\S]*?</div>',
-            r'<div[^>]*class="[^"]*promotion[^"]*"[^>]*>[\s\S]*?</div>',
-            r"<ins[^>]*>[\s\S]*?</ins>",  # Google AdSense
-            r"<aside[^>]*>[\s\S]*?</aside>",  # 侧边栏广告
-        ]
-        for pattern in ad_patterns:
-            content = re.sub(pattern, "", content, flags=re.IGNORECASE)
-
-        # 4. 移除所有 HTML 标签，但保留文本
-        content = re.sub(r"<br\s*/?>", "\n", content, flags=re.IGNORECASE)
-        content = re.sub(r"<p[^>]*>", "\n", content, flags=re.IGNORECASE)
-        content = re.sub(r"</p>", "\n", content, flags=re.IGNORECASE)
-        content = re.sub(r"<[^>]+>", "", content)
-
-        # 5. 处理 HTML 实体
-        html_entities = {
-            "&nbsp;": " ",
-            "&lt;": "<",
-            "&gt;": ">",
-            "&amp;": "&",
-            "&quot;": '"',
-            "&apos;": "'",
-            "&#39;": "'",
-            "&ldquo;": '"',
-            "&rdquo;": '"',
-            "&lsquo;": "'",
-            "&rsquo;": "'",
-            "&mdash;": "—",
-            "&ndash;": "–",
-            "&hellip;": "...",
-            "&copy;": "©",
-            "&reg;": "®",
-            "&trade;": "™",
-        }
-        for entity, char in html_entities.items():
-            content = content.replace(entity, char)
-
-        # 6. 移除数字实体
-        content = re.sub(r"&#\d+;", "", content)
-        content = re.sub(r"&#x[0-9a-fA-F]+;", "", content)
-
-        # 7. 移除多余的空白字符
-        content = re.sub(r"\t", " ", content)
-        content = re.sub(r" +", " ", content)
-        content = re.sub(r"\n\s*\n", "\n\n", content)
-        content = re.sub(r"\n{3,}", "\n\n", content)
-
-        # 8. 移除常见的无意义内容
-        noise_patterns = [
-            r"点击展开全文",
-            r"展开全文",
-            r"收起全文",
-            r"阅读全文",
-            r"查看更多",
-            r"相关推荐",
-            r"热门推荐",
-            r"猜你喜欢",
-            r"广告",
-            r"推广",
-            r"赞助",
-            r"分享到",
-            r"转发到",
-            r"举报",
-            r"投诉",
-            r"投诉",
-        ]
-        for pattern in noise_patterns:
-            content = re.sub(pattern, "", content)
-
-        # 9. 去除首尾空白
-        content = content.strip()
-
-        return content
+        return clean_html(content)
 
     async def _sync_to_ragflow(self, article: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -190,7 +114,7 @@ class ArticleCollectorService:
             # 确保知识库存在
             dataset_id = self._dataset_id
             if not dataset_id:
-                dataset_id = self._ragflow.get_or_create_dataset(RAGFLOW_DATASET_NAME)
+                dataset_id = await self._ragflow.get_or_create_dataset(RAGFLOW_DATASET_NAME)
                 if dataset_id:
                     self._dataset_id = dataset_id
                 else:
@@ -218,7 +142,7 @@ class ArticleCollectorService:
 """
 
             # 上传到 RAGFlow
-            upload_result = self._ragflow.upload_document_content(
+            upload_result = await self._ragflow.upload_document_content(
                 dataset_id=dataset_id, title=title, content=doc_content
             )
 
@@ -238,117 +162,184 @@ class ArticleCollectorService:
 
         return result
 
-    async def _save_to_database(self, articles: List[Dict[str, Any]], keyword: str) -> List[Dict[str, Any]]:
-        """
-        保存文章到数据库
+    # ==================== 采集流水线各阶段 ====================
+    # 采集 → 清洗 → 去重 → 入库 → 向量化，各阶段通过有界队列衔接、同时工作（见 async_pipeline）
+
+    async def _clean_stage(self, results: Dict[str, Any], save: bool, batches: List[tuple]) -> List[Dict[str, Any]]:
+        """清洗阶段：条目为 (平台, 文章列表)，某个平台采集完就先清洗，不等其他平台"""
+        outputs = []
+        for platform, articles in batches:
+            # 大批量时在进程池中清洗
+            cleaned = await clean_html_many([article.get("content", "") for article in articles])
+            for article, content in zip(articles, cleaned):
+                article["content"] = content
+            results["results"][platform] = articles
+            results["total_count"] += len(articles)
+            if save:
+                outputs.extend(articles)
+        return outputs
+
+    async def _dedupe_stage(self, save_results: List[Dict[str, Any]], articles: List[Dict[str, Any]]) -> List[tuple]:
+        """去重阶段：URL 去重 + 语义去重（本地近重复索引，临界情况走 RAGFlow）"""
+        from backend.database.models import ReferenceArticle
 
-        Args:
-            articles: 文章列表
-            keyword: 采集使用的关键词
+        outputs = []
+        for article in articles:
+            url = article.get("url", "")
+            existing = self.db.query(ReferenceArticle.id).filter(ReferenceArticle.url == url).first()
+            if existing:
+                logger.debug(f"文章 URL 已存在，跳过: {url}")
+                save_results.append({"url": url, "saved": False, "reason": "url_exists", "article_id": existing.id})
+                continue
 
-        Returns:
-            保存结果列表
+            content = article.get("content", "")
+            if not content:
+                logger.warning(f"文章内容为空，跳过: {article.get('title')}")
+                continue
+
+            dup_check = await self.check_duplicate(content)
+            if dup_check.get("is_duplicate"):
+                logger.warning(f"检测到重复文章：{article.get('title', '无标题')}")
+                save_results.append(
+                    {
+                        "url": url,
+                        "saved": False,
+                        "reason": "semantic_duplicate",
+                        "similar_articles": dup_check.get("similar_articles"),
+                    }
+                )
+                continue
+
+            outputs.append((article, content))
+        return outputs
+
+    async def _persist_stage(
+        self, keyword: str, save_results: List[Dict[str, Any]], sync_to_ragflow: bool, items: List[tuple]
+    ) -> List[tuple]:
         """
-        if not self.db:
-            logger.warning("数据库会话未设置，跳过保存")
-            return []
+        入库阶段：一批文章一次提交（单 worker，独占数据库会话）
 
+        去重阶段是并发的，同一批采集里互相重复的文章可能同时通过，这里按 URL 和本地索引再查一遍
+        """
         from backend.database.models import ReferenceArticle
 
-        saved_results = []
+        urls = [article.get("url", "") for article, _ in items]
+        taken = {row[0] for row in self.db.query(ReferenceArticle.url).filter(ReferenceArticle.url.in_(urls))}
 
-        for article in articles:
-            try:
-                # 1. 检查是否已存在（根据 URL 去重）
-                url = article.get("url", "")
-                existing = self.db.query(ReferenceArticle).filter(ReferenceArticle.url == url).first()
-
-                if existing:
-                    logger.debug(f"文章 URL 已存在，跳过: {url}")
-                    saved_results.append(
-                        {"url": url, "saved": False, "reason": "url_exists", "article_id": existing.id}
-                    )
-                    continue
-
-                # 2. 清洗内容
-                cleaned_content = self._clean_html(article.get("content", ""))
-                if not cleaned_content:
-                    logger.warning(f"文章内容为空，跳过: {article.get('title')}")
-                    continue
+        fingerprints = [None] * len(items)
+        if NEAR_DUPLICATE_INDEX_ENABLED:
+            # 算指纹是纯 CPU 计算，整批放到线程里，不阻塞事件循环
+            fingerprints = await asyncio.to_thread(lambda: [simhash(content) for _, content in items])
 
-                # 3. 语义去重检测（核心逻辑）
-                dup_check = await self.check_duplicate(cleaned_content)
-                if dup_check.get("is_duplicate"):
-                    title = article.get("title", "无标题")
-                    logger.warning(f"检测到重复文章：{title}")
-                    saved_results.append(
-                        {
-                            "url": url,
-                            "saved": False,
-                            "reason": "semantic_duplicate",
-                            "similar_articles": dup_check.get("similar_articles"),
-                        }
+        rows = []
+        for (article, content), fingerprint in zip(items, fingerprints):
+            url = article.get("url", "")
+            if url in taken:
+                save_results.append({"url": url, "saved": False, "reason": "url_exists"})
+                continue
+            if NEAR_DUPLICATE_INDEX_ENABLED:
+                verdict, matches = near_duplicate_index.query(content, fingerprint)
+                if verdict == DUPLICATE:
+                    logger.warning(f"检测到重复文章：{article.get('title', '无标题')}")
+                    save_results.append(
+                        {"url": url, "saved": False, "reason": "semantic_duplicate", "similar_articles": matches}
                     )
                     continue
+            taken.add(url)
+            ref_article = ReferenceArticle(
+                title=article.get("title", "")[:500],
+                url=url,
+                content=content,
+                summary=content[:500] if content else None,
+                platform=article.get("platform", ""),
+                author=article.get("author", ""),
+                publish_time=article.get("publish_time", ""),
+                likes=article.get("likes", 0),
+                reads=article.get("reads", 0),
+                comments=article.get("comments", 0),
+                keyword=keyword,
+                collected_at=datetime.now(),
+                ragflow_synced=False,
+                status=1,
+            )
+            if NEAR_DUPLICATE_INDEX_ENABLED:
+                # 先占位，同一批后面的近重复文章能被查到；入库后换成真实 ID
+                near_duplicate_index.add("pending", len(rows), fingerprint=fingerprint)
+            rows.append((ref_article, content, fingerprint))
 
-                # 4. 创建新记录
-                ref_article = ReferenceArticle(
-                    title=article.get("title", "")[:500],
-                    url=url,
-                    content=cleaned_content,
-                    summary=cleaned_content[:500] if cleaned_content else None,
-                    platform=article.get("platform", ""),
-                    author=article.get("author", ""),
-                    publish_time=article.get("publish_time", ""),
-                    likes=article.get("likes", 0),
-                    reads=article.get("reads", 0),
-                    comments=article.get("comments", 0),
-                    keyword=keyword,
-                    collected_at=datetime.now(),
-                    ragflow_synced=False,
-                    status=1,
-                )
-
-                self.db.add(ref_article)
-                self.db.commit()
-                self.db.refresh(ref_article)
-
-                logger.info(f"文章已保存: {ref_article.title[:30]}... (ID: {ref_article.id})")
-
-                # 同步到 RAGFlow
-                sync_result = await self._sync_to_ragflow(
-                    {
-                        "title": ref_article.title,
-                        "content": cleaned_content,
-                        "platform": ref_article.platform,
-                        "url": ref_article.url,
-                        "likes": ref_article.likes,
-                        "reads": ref_article.reads,
-                    }
-                )
+        if not rows:
+            return []
 
-                if sync_result["success"]:
-                    ref_article.ragflow_synced = True
-                    ref_article.ragflow_doc_id = sync_result["doc_id"]
-                    ref_article.ragflow_sync_time = datetime.now()
+        try:
+            self.db.add_all([ref_article for ref_article, _, _ in rows])
+            self.db.flush()
+            saved = [(ref_article.id, ref_article, content, fingerprint) for ref_article, content, fingerprint in rows]
+            self.db.commit()
+        except Exception as e:
+            # 整批失败时逐条重试，只丢掉真正有问题的那篇
+            logger.warning(f"批量保存失败，改为逐条保存: {e}")
+            self.db.rollback()
+            saved = []
+            for ref_article, content, fingerprint in rows:
+                try:
+                    self.db.add(ref_article)
                     self.db.commit()
+                    saved.append((ref_article.id, ref_article, content, fingerprint))
+                except Exception as item_error:
+                    logger.error(f"保存文章失败: {item_error}")
+                    self.db.rollback()
+                    save_results.append({"url": ref_article.url, "saved": False, "reason": str(item_error)})
+        finally:
+            list_count_cache.invalidate("reference_articles")
+            if NEAR_DUPLICATE_INDEX_ENABLED:
+                for i in range(len(rows)):
+                    near_duplicate_index.remove("pending", i)
+
+        outputs = []
+        for article_id, ref_article, content, fingerprint in saved:
+            if NEAR_DUPLICATE_INDEX_ENABLED:
+                near_duplicate_index.add("reference", article_id, fingerprint=fingerprint)
+            result = {
+                "url": ref_article.url,
+                "saved": True,
+                "article_id": article_id,
+                "ragflow_synced": False,
+                "ragflow_doc_id": None,
+            }
+            save_results.append(result)
+            payload = {
+                "title": ref_article.title,
+                "content": content,
+                "platform": ref_article.platform,
+                "url": ref_article.url,
+                "likes": ref_article.likes,
+                "reads": ref_article.reads,
+            }
+            logger.info(f"文章已保存: {payload['title'][:30]}... (ID: {article_id})")
+            if sync_to_ragflow:
+                outputs.append((article_id, payload, result))
+        return outputs
 
-                saved_results.append(
-                    {
-                        "url": url,
-                        "saved": True,
-                        "article_id": ref_article.id,
-                        "ragflow_synced": sync_result["success"],
-                        "ragflow_doc_id": sync_result.get("doc_id"),
-                    }
-                )
-
-            except Exception as e:
-                logger.error(f"保存文章失败: {e}")
-                self.db.rollback()
-                saved_results.append({"url": article.get("url", ""), "saved": False, "reason": str(e)})
+    async def _vectorize_stage(self, items: List[tuple]) -> List:
+        """向量化阶段：上传到 RAGFlow 并回写同步状态"""
+        from backend.database.models import ReferenceArticle
 
-        return saved_results
+        for article_id, payload, result in items:
+            sync_result = await self._sync_to_ragflow(payload)
+            if not sync_result["success"]:
+                continue
+            self.db.query(ReferenceArticle).filter(ReferenceArticle.id == article_id).update(
+                {
+                    ReferenceArticle.ragflow_synced: True,
+                    ReferenceArticle.ragflow_doc_id: sync_result["doc_id"],
+                    ReferenceArticle.ragflow_sync_time: datetime.now(),
+                },
+                synchronize_session=False,
+            )
+            self.db.commit()
+            result["ragflow_synced"] = True
+            result["ragflow_doc_id"] = sync_result["doc_id"]
+        return []
 
     async def collect_trending_articles(
         self,
@@ -402,10 +393,59 @@ class ArticleCollectorService:
             "error_msg": None,
         }
 
+        save = bool(save_to_db and self.db)
+        save_results: List[Dict[str, Any]] = []
+
+        stages = [
+            PipelineStage(
+                "clean", partial(self._clean_stage, results, save), concurrency=1, queue_size=len(platforms) or 1
+            )
+        ]
+        if save:
+            stages += [
+                PipelineStage(
+                    "dedupe",
+                    partial(self._dedupe_stage, save_results),
+                    concurrency=COLLECT_DEDUPE_CONCURRENCY,
+                    queue_size=COLLECT_PIPELINE_QUEUE_SIZE,
+                ),
+                PipelineStage(
+                    "persist",
+                    partial(self._persist_stage, keyword, save_results, sync_to_ragflow),
+                    queue_size=COLLECT_PIPELINE_QUEUE_SIZE,
+                    batch_size=COLLECT_PERSIST_BATCH_SIZE,
+                ),
+            ]
+            if sync_to_ragflow:
+                stages.append(
+                    PipelineStage(
+                        "vectorize",
+                        self._vectorize_stage,
+                        concurrency=COLLECT_VECTORIZE_CONCURRENCY,
+                        queue_size=COLLECT_PIPELINE_QUEUE_SIZE,
+                    )
+                )
+        pipeline = Pipeline(stages)
+
         try:
             # 启动 Playwright
             await playwright_mgr.start()
 
+            if save and NEAR_DUPLICATE_INDEX_ENABLED:
+                try:
+                    await asyncio.to_thread(self._refresh_near_duplicate_index)
+                except Exception as e:
+                    logger.warning(f"近重复索引同步失败，本批去重全部走 RAGFlow: {e}")
+
+            async def collect(platform: str, collector):
+                try:
+                    articles = await self._collect_from_platform(collector, keyword, max_articles_per_platform)
+                except Exception as e:
+                    logger.error(f"[{platform}] 收集异常: {e}")
+                    articles = []
+                # 采集完立即进入清洗，后续阶段与其他平台的采集同时进行
+                await pipeline.put((platform, articles))
+
             # 并行收集各平台
             tasks = []
             for platform in platforms:
@@ -414,33 +454,17 @@ class ArticleCollectorService:
                     # 更新收集器配置
                     collector.min_likes = min_likes
                     collector.min_reads = min_reads
-                    tasks.append(self._collect_from_platform(collector, keyword, max_articles_per_platform))
+                    tasks.append(collect(platform, collector))
                 else:
                     logger.warning(f"平台收集器不存在: {platform}")
                     results["results"][platform] = []
 
-            # 等待所有任务完成
-            all_articles = []
-            if tasks:
-                platform_results = await asyncio.gather(*tasks, return_exceptions=True)
-
-                for platform, result in zip(platforms, platform_results):
-                    if isinstance(result, Exception):
-                        logger.error(f"[{platform}] 收集异常: {result}")
-                        results["results"][platform] = []
-                    else:
-                        # 清洗每篇文章的内容
-                        for article in result:
-                            article["content"] = self._clean_html(article.get("content", ""))
-                        results["results"][platform] = result
-                        results["total_count"] += len(result)
-                        all_articles.extend(result)
+            async with pipeline:
+                await asyncio.gather(*tasks)
 
             logger.info(f"收集完成: 共 {results['total_count']} 篇爆火文章")
 
-            # 保存到数据库
-            if save_to_db and self.db and all_articles:
-                save_results = await self._save_to_database(all_articles, keyword)
+            if save:
                 results["save_results"] = save_results
                 results["saved_count"] = sum(1 for r in save_results if r.get("saved"))
                 results["ragflow_synced_count"] = sum(1 for r in save_results if r.get("ragflow_synced"))
@@ -450,8 +474,24 @@ class ArticleCollectorService:
             results["success"] = False
             results["error_msg"] = str(e)
 
+        finally:
+            if save and NEAR_DUPLICATE_INDEX_ENABLED:
+                try:
+                    near_duplicate_index.save()
+                except Exception as e:
+                    logger.warning(f"近重复索引保存失败: {e}")
+
+        results["pipeline"] = pipeline.get_stats()
         return results
 
+    @staticmethod
+    def _refresh_near_duplicate_index():
+        """同步近重复索引（在线程里执行：首次同步要给全部文章算指纹，会话不能与事件循环共用）"""
+        from backend.database import SessionLocal
+
+        with SessionLocal() as db:
+            near_duplicate_index.refresh(db)
+
     async def _random_sleep(self, min_seconds: float = 2.0, max_seconds: float = 5.0):
         """随机等待，模拟真人操作"""
         await asyncio.sleep(random.uniform(min_seconds, max_seconds))
@@ -558,6 +598,9 @@ class ArticleCollectorService:
                 });
             """)
 
+            # 拦截图片/字体/视频/统计脚本，只加载正文需要的资源
+            await resource_blocker.apply(context, collector.platform_id)
+
             page = await context.new_page()
 
             try:
@@ -567,8 +610,6 @@ class ArticleCollectorService:
                 # 收集文章
                 # 这里的 collector.collect 需要传入 page，我们在调用前先做一些预处理
 
-                # 监听请求拦截（可选，这里先不做）
-
                 # 执行收集
                 articles = await collector.collect(page, keyword)
 
@@ -675,12 +716,27 @@ class ArticleCollectorService:
         if threshold is None:
             threshold = RAGFLOW_DUPLICATE_THRESHOLD
 
+        # 先查本地近重复索引，明显重复/明显不重复的不再调用 RAGFlow
+        if NEAR_DUPLICATE_INDEX_ENABLED:
+            fingerprint = await asyncio.to_thread(simhash, content)
+            verdict, matches = near_duplicate_index.query(content, fingerprint)
+            if verdict == DUPLICATE:
+                return {"checked": True, "is_duplicate": True, "similar_articles": matches, "source": "local"}
+            if verdict == UNIQUE:
+                return {"checked": True, "is_duplicate": False, "similar_articles": [], "source": "local"}
+
         if not self._ragflow.is_configured():
             return {"checked": False, "is_duplicate": False, "error_msg": "RAGFlow 未配置"}
 
-        is_dup, similar_articles = self._ragflow.check_duplicate(content=content, threshold=threshold)
+        is_dup, similar_articles = await self._ragflow.check_duplicate(content=content, threshold=threshold)
 
-        return {"checked": True, "is_duplicate": is_dup, "similar_articles": similar_articles, "threshold": threshold}
+        return {
+            "checked": True,
+            "is_duplicate": is_dup,
+            "similar_articles": similar_articles,
+            "threshold": threshold,
+            "source": "ragflow",
+        }
 
     def get_supported_platforms(self) -> List[str]:
         """获取支持的平台列表"""
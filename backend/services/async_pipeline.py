@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+"""
+基于有界 asyncio 队列的分阶段流水线
+每个阶段有自己的队列和并发 worker，上一阶段的产出直接进入下一阶段，
+下游队列满时上游自动等待（背压），各阶段可以同时工作
+
+用法：
+    pipeline = Pipeline([
+        PipelineStage("clean", clean_handler, concurrency=1),
+        PipelineStage("persist", persist_handler, batch_size=20),
+    ])
+    async with pipeline:
+        await pipeline.put(item)
+    pipeline.get_stats()
+
+handler 接收一批条目（batch_size=1 时也是列表），返回要交给下一阶段的条目列表
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from loguru import logger
+
+StageHandler = Callable[[List[Any]], Awaitable[Optional[List[Any]]]]
+
+
+class PipelineStage:
+    """流水线中的一个阶段"""
+
+    def __init__(
+        self,
+        name: str,
+        handler: StageHandler,
+        concurrency: int = 1,
+        queue_size: int = 50,
+        batch_size: int = 1,
+    ):
+        """
+        Args:
+            name: 阶段名（用于日志和统计）
+            handler: 处理函数，接收一批条目，返回交给下一阶段的条目
+            concurrency: worker 数量
+            queue_size: 输入队列容量（满了上游会等待）
+            batch_size: 单次最多取出的条目数（队列里有多少取多少，不会为凑批等待）
+        """
+        self.name = name
+        self.handler = handler
+        self.concurrency = max(1, concurrency)
+        self.queue_size = queue_size
+        self.batch_size = max(1, batch_size)
+        self.downstream: Optional["PipelineStage"] = None
+
+        self.queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._stats = {
+            "received": 0,
+            "processed": 0,
+            "emitted": 0,
+            "failed": 0,
+            "batches": 0,
+            "busy": 0,
+            "peak_queue_depth": 0,
+            "busy_seconds": 0.0,
+        }
+
+    def start(self):
+        self.queue = asyncio.Queue(maxsize=self.queue_size)
+        self._workers = [
+            asyncio.create_task(self._worker(), name=f"pipeline-{self.name}-{i}") for i in range(self.concurrency)
+        ]
+
+    async def put(self, item: Any):
+        await self.queue.put(item)
+        self._stats["received"] += 1
+        self._stats["peak_queue_depth"] = max(self._stats["peak_queue_depth"], self.queue.qsize())
+
+    async def drain(self):
+        """等待队列处理完后停止 worker"""
+        await self.queue.join()
+        await self.stop()
+
+    async def stop(self):
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    async def _worker(self):
+        while True:
+            batch = [await self.queue.get()]
+            while len(batch) < self.batch_size and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+
+            self._stats["busy"] += 1
+            started = time.perf_counter()
+            try:
+                outputs = await self.handler(batch) or []
+                self._stats["processed"] += len(batch)
+                if self.downstream:
+                    for output in outputs:
+                        await self.downstream.put(output)
+                self._stats["emitted"] += len(outputs)
+            except Exception as e:
+                self._stats["failed"] += len(batch)
+                logger.error(f"❌ 流水线阶段 [{self.name}] 处理失败: {e}")
+            finally:
+                self._stats["busy"] -= 1
+                self._stats["batches"] += 1
+                self._stats["busy_seconds"] += time.perf_counter() - started
+                for _ in batch:
+                    self.queue.task_done()
+
+    def get_stats(self) -> Dict[str, Any]:
+        batches = self._stats["batches"]
+        return {
+            **{k: v for k, v in self._stats.items() if k != "busy_seconds"},
+            "concurrency": self.concurrency,
+            "queue_depth": self.queue.qsize() if self.queue else 0,
+            "queue_size": self.queue_size,
+            "busy_seconds": round(self._stats["busy_seconds"], 3),
+            "avg_batch_ms": round(self._stats["busy_seconds"] / batches * 1000, 2) if batches else 0,
+        }
+
+
+class Pipeline:
+    """按顺序串联的阶段"""
+
+    def __init__(self, stages: List[PipelineStage]):
+        self.stages = stages
+        for upstream, downstream in zip(stages, stages[1:]):
+            upstream.downstream = downstream
+
+    async def __aenter__(self) -> "Pipeline":
+        for stage in self.stages:
+            stage.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            # 按顺序排空：上一阶段排空后它的产出都已进入下一阶段
+            for stage in self.stages:
+                await stage.drain()
+        else:
+            for stage in self.stages:
+                await stage.stop()
+
+    async def put(self, item: Any):
+        """向第一个阶段投递条目"""
+        await self.stages[0].put(item)
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        return {stage.name: stage.get_stats() for stage in self.stages}
@@ -0,0 +1,331 @@
+# -*- coding: utf-8 -*-
+"""
+浏览器池
+收录检测共用的长驻 Chromium 池：按需启动、租用/归还、超过使用次数或崩溃后自动重建
+"""
+
+import asyncio
+import os
+import sys
+import time
+from contextlib import asynccontextmanager
+from typing import Optional, List, Dict, Any, AsyncIterator
+
+from loguru import logger
+from playwright.async_api import async_playwright, Browser
+
+from backend.config import (
+    BROWSER_ARGS,
+    INDEX_CHECK_BROWSER_POOL_SIZE,
+    INDEX_CHECK_BROWSER_MAX_USES,
+    INDEX_CHECK_BROWSER_ACQUIRE_TIMEOUT,
+)
+
+
+class PooledBrowser:
+    """池中的单个浏览器实例"""
+
+    def __init__(self, browser: Browser):
+        self.browser = browser
+        self.uses = 0
+        self.created_at = time.time()
+
+    @property
+    def is_alive(self) -> bool:
+        try:
+            return self.browser.is_connected()
+        except Exception:
+            return False
+
+
+class BrowserPool:
+    """
+    浏览器池
+
+    注意：池本身不限制上下文数量，只限制同时存在的浏览器进程数！
+    """
+
+    def __init__(
+        self,
+        max_browsers: int = INDEX_CHECK_BROWSER_POOL_SIZE,
+        max_uses: int = INDEX_CHECK_BROWSER_MAX_USES,
+        acquire_timeout: float = INDEX_CHECK_BROWSER_ACQUIRE_TIMEOUT,
+        name: str = "IndexCheck",
+    ):
+        """
+        初始化浏览器池
+
+        Args:
+            max_browsers: 最大浏览器数量
+            max_uses: 单个浏览器最大租用次数，达到后重建
+            acquire_timeout: 租用等待超时（秒）
+            name: 日志前缀
+        """
+        self.max_browsers = max(1, max_browsers)
+        self.max_uses = max(1, max_uses)
+        self.acquire_timeout = acquire_timeout
+        self.name = name
+
+        self._playwright = None
+        self._start_lock: Optional[asyncio.Lock] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._idle: List[PooledBrowser] = []
+        self._in_use: List[PooledBrowser] = []
+
+        # 统计信息
+        self._stats = {
+            "leases": 0,
+            "launches": 0,
+            "recycled": 0,
+            "crashed": 0,
+            "timeouts": 0,
+            "total_wait_ms": 0.0,
+            "max_wait_ms": 0.0,
+            "last_wait_ms": 0.0,
+        }
+
+    def _ensure_primitives(self):
+        """延迟创建异步原语，确保绑定到运行中的事件循环"""
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_browsers)
+        if self._start_lock is None:
+            self._start_lock = asyncio.Lock()
+
+    async def _ensure_playwright(self):
+        """启动共享的 Playwright 驱动进程"""
+        async with self._start_lock:
+            if self._playwright is None:
+                self._playwright = await async_playwright().start()
+                logger.info(f"🚀 [{self.name}] 浏览器池 Playwright 驱动已启动")
+        return self._playwright
+
+    async def _launch_browser(self, playwright) -> Browser:
+        """
+        启动浏览器（包含自动查找本地Chrome和自动安装逻辑）
+        """
+        # 1. 尝试查找本地 Chrome 路径
+        chrome_paths = [
+            r"C:\Program Files\Google\Chrome\Application\chrome.exe",
+            r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe",
+            os.path.expandvars(r"%LOCALAPPDATA%\Google\Chrome\Application\chrome.exe"),
+        ]
+
+        # Mac OS 支持
+        if sys.platform == "darwin":
+            chrome_paths = [
+                "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+                os.path.expanduser("~/Applications/Google Chrome.app/Contents/MacOS/Google Chrome"),
+            ]
+
+        executable_path = None
+        for path in chrome_paths:
+            if os.path.exists(path):
+                executable_path = path
+                logger.info(f"✅ [{self.name}] 找到本地 Chrome 浏览器: {path}")
+                break
+
+        # 准备启动参数
+        launch_options = {"headless": False, "args": BROWSER_ARGS, "timeout": 30000}
+
+        if executable_path:
+            launch_options["executable_path"] = executable_path
+
+        # 启动浏览器
+        logger.info(f"🚀 [{self.name}] 启动浏览器... Executable: {executable_path}")
+
+        browser = None
+        try:
+            browser = await playwright.chromium.launch(**launch_options)
+        except Exception as browser_error:
+            error_msg = str(browser_error)
+            logger.warning(f"首次启动失败: {error_msg}")
+
+            # 回退尝试：不使用本地Chrome
+            if executable_path:
+                logger.info("尝试使用Playwright内置浏览器...")
+                launch_options.pop("executable_path", None)
+                try:
+                    browser = await playwright.chromium.launch(**launch_options)
+                except Exception as inner_error:
+                    error_msg = str(inner_error)
+                    logger.error(f"内置浏览器启动失败: {error_msg}")
+
+            # 自动安装逻辑
+            if not browser and "Executable doesn't exist" in error_msg:
+                logger.warning("检测到浏览器缺失，尝试自动安装...")
+                try:
+                    logger.info("正在执行: playwright install chromium")
+                    process = await asyncio.create_subprocess_exec(
+                        sys.executable,
+                        "-m",
+                        "playwright",
+                        "install",
+                        "chromium",
+                        stdout=asyncio.subprocess.PIPE,
+                        stderr=asyncio.subprocess.PIPE,
+                    )
+                    stdout, stderr = await process.communicate()
+
+                    if process.returncode == 0:
+                        logger.info("浏览器安装成功，重试启动...")
+                        browser = await playwright.chromium.launch(**launch_options)
+                    else:
+                        logger.error(f"自动安装失败: {stderr.decode()}")
+                        raise Exception("自动安装浏览器失败，请手动执行 'playwright install'")
+
+                except Exception as install_error:
+                    logger.error(f"自动安装过程异常: {install_error}")
+                    raise install_error
+
+            if not browser:
+                raise Exception(f"浏览器启动失败: {error_msg}")
+
+        return browser
+
+    async def _close_browser(self, pooled: PooledBrowser):
+        """安静地关闭浏览器"""
+        try:
+            if pooled.is_alive:
+                await pooled.browser.close()
+        except Exception as e:
+            logger.debug(f"[{self.name}] 关闭浏览器时出错（忽略）: {e}")
+
+    async def acquire(self) -> PooledBrowser:
+        """
+        租用一个浏览器
+
+        Returns:
+            池中的浏览器实例
+
+        Raises:
+            TimeoutError: 等待空闲浏览器超时
+        """
+        self._ensure_primitives()
+
+        wait_start = time.perf_counter()
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=self.acquire_timeout)
+        except asyncio.TimeoutError:
+            self._stats["timeouts"] += 1
+            raise TimeoutError(f"[{self.name}] 等待空闲浏览器超时（{self.acquire_timeout}秒）")
+
+        wait_ms = (time.perf_counter() - wait_start) * 1000
+        self._record_wait(wait_ms)
+
+        try:
+            pooled = None
+            while self._idle:
+                candidate = self._idle.pop()
+                if candidate.is_alive:
+                    pooled = candidate
+                    break
+                # 空闲期间崩溃的浏览器直接丢弃
+                self._stats["crashed"] += 1
+                logger.warning(f"⚠️ [{self.name}] 发现已断开的空闲浏览器，丢弃重建")
+
+            if pooled is None:
+                playwright = await self._ensure_playwright()
+                browser = await self._launch_browser(playwright)
+                pooled = PooledBrowser(browser)
+                self._stats["launches"] += 1
+
+            pooled.uses += 1
+            self._in_use.append(pooled)
+            self._stats["leases"] += 1
+            return pooled
+        except Exception:
+            self._slots.release()
+            raise
+
+    async def release(self, pooled: PooledBrowser, broken: bool = False):
+        """
+        归还浏览器
+
+        Args:
+            pooled: acquire() 返回的实例
+            broken: 调用方认为浏览器已不可用（强制重建）
+        """
+        try:
+            if pooled in self._in_use:
+                self._in_use.remove(pooled)
+
+            if broken or not pooled.is_alive:
+                self._stats["crashed"] += 1
+                logger.warning(f"⚠️ [{self.name}] 浏览器已崩溃或不可用，下次租用时重建")
+                await self._close_browser(pooled)
+            elif pooled.uses >= self.max_uses:
+                self._stats["recycled"] += 1
+                logger.info(f"♻️ [{self.name}] 浏览器已使用 {pooled.uses} 次，关闭重建")
+                await self._close_browser(pooled)
+            else:
+                self._idle.append(pooled)
+        finally:
+            self._slots.release()
+
+    @asynccontextmanager
+    async def lease(self) -> AsyncIterator[Browser]:
+        """
+        以上下文管理器方式租用浏览器
+
+        用法：
+            async with browser_pool.lease() as browser:
+                context = await browser.new_context()
+        """
+        pooled = await self.acquire()
+        broken = False
+        try:
+            yield pooled.browser
+        except Exception:
+            # 异常时如果浏览器已断开，标记为损坏
+            broken = not pooled.is_alive
+            raise
+        finally:
+            await self.release(pooled, broken=broken)
+
+    def _record_wait(self, wait_ms: float):
+        """记录租用等待时间"""
+        self._stats["total_wait_ms"] += wait_ms
+        self._stats["last_wait_ms"] = wait_ms
+        if wait_ms > self._stats["max_wait_ms"]:
+            self._stats["max_wait_ms"] = wait_ms
+        if wait_ms > 1000:
+            logger.info(f"⏳ [{self.name}] 等待空闲浏览器 {wait_ms:.0f}ms，可考虑调大池容量")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        获取池状态和等待时间统计（用于容量评估）
+        """
+        leases = self._stats["leases"]
+        return {
+            "max_browsers": self.max_browsers,
+            "max_uses": self.max_uses,
+            "in_use": len(self._in_use),
+            "idle": len(self._idle),
+            "leases": leases,
+            "launches": self._stats["launches"],
+            "recycled": self._stats["recycled"],
+            "crashed": self._stats["crashed"],
+            "timeouts": self._stats["timeouts"],
+            "avg_wait_ms": round(self._stats["total_wait_ms"] / leases, 2) if leases else 0,
+            "max_wait_ms": round(self._stats["max_wait_ms"], 2),
+            "last_wait_ms": round(self._stats["last_wait_ms"], 2),
+        }
+
+    async def close(self):
+        """关闭池中所有浏览器并停止 Playwright"""
+        for pooled in self._idle + self._in_use:
+            await self._close_browser(pooled)
+        self._idle.clear()
+        self._in_use.clear()
+
+        if self._playwright:
+            try:
+                await self._playwright.stop()
+            except Exception as e:
+                logger.debug(f"[{self.name}] 停止 Playwright 出错（忽略）: {e}")
+            self._playwright = None
+            logger.info(f"🛑 [{self.name}] 浏览器池已关闭")
+
+
+# 收录检测全局浏览器池
+index_check_browser_pool = BrowserPool()
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""
+RAGFlow 文档内容批量获取
+限制并发地拉取多篇文档的完整内容，并按 文档ID + 更新时间 缓存在本地（LRU）
+"""
+
+import asyncio
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from loguru import logger
+
+from backend.config import KNOWLEDGE_SUMMARY_LENGTH, RAGFLOW_CONTENT_CACHE_SIZE, RAGFLOW_CONTENT_FETCH_CONCURRENCY
+from backend.services.ragflow_client import get_ragflow_client
+
+
+def summarize(text: Optional[str], limit: int = KNOWLEDGE_SUMMARY_LENGTH) -> str:
+    """截取摘要（超长时末尾加省略号）"""
+    text = (text or "").strip()
+    return text if len(text) <= limit else text[:limit].rstrip() + "…"
+
+
+class DocumentContentFetcher:
+    """
+    文档内容批量获取器
+
+    缓存命中条件：文档ID 相同且版本（更新时间）相同；文档更新后版本变化自动失效
+    """
+
+    def __init__(
+        self,
+        concurrency: int = RAGFLOW_CONTENT_FETCH_CONCURRENCY,
+        max_entries: int = RAGFLOW_CONTENT_CACHE_SIZE,
+        client_factory: Callable[[], Any] = get_ragflow_client,
+    ):
+        """
+        初始化获取器
+
+        Args:
+            concurrency: 同时请求 RAGFlow 的最大数量（进程内共享）
+            max_entries: 本地缓存最多保存的文档数
+            client_factory: 返回 RAGFlowClient 的工厂（测试可替换）
+        """
+        self.concurrency = max(1, concurrency)
+        self.max_entries = max_entries
+        self._client_factory = client_factory
+        self._cache: "OrderedDict[str, Tuple[str, str]]" = OrderedDict()
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stats = {"hits": 0, "misses": 0, "errors": 0}
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        # 信号量绑定事件循环，循环变化时重新创建
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+            self._loop = loop
+        return self._semaphore
+
+    def get_cached(self, document_id: str, version: str) -> Optional[str]:
+        """读取缓存（版本不一致视为未命中）"""
+        cached = self._cache.get(document_id)
+        if cached and cached[0] == version:
+            self._cache.move_to_end(document_id)
+            return cached[1]
+        return None
+
+    def _store(self, document_id: str, version: str, content: str):
+        self._cache[document_id] = (version, content)
+        self._cache.move_to_end(document_id)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+
+    def invalidate(self, document_id: Optional[str]):
+        """文档删除或重新上传后调用"""
+        if document_id:
+            self._cache.pop(document_id, None)
+
+    async def _fetch_one(self, dataset_id: str, document_id: str, version: str) -> Optional[str]:
+        async with self._get_semaphore():
+            try:
+                result = await self._client_factory().get_document_content(dataset_id, document_id)
+            except Exception as e:
+                result = {"code": -1, "message": str(e)}
+
+        if result.get("code") != 0:
+            self._stats["errors"] += 1
+            logger.warning(f"⚠️ 获取文档内容失败 ({document_id}): {result.get('message')}")
+            return None
+
+        content = result.get("data", {}).get("content") or ""
+        self._store(document_id, version, content)
+        return content
+
+    async def fetch_many(
+        self, dataset_id: str, documents: Iterable[Tuple[str, str]]
+    ) -> Dict[str, Optional[str]]:
+        """
+        批量获取文档内容
+
+        Args:
+            dataset_id: 知识库 ID
+            documents: [(文档ID, 版本)]，版本一般用文档更新时间
+
+        Returns:
+            {文档ID: 内容}，获取失败的为 None
+        """
+        results: Dict[str, Optional[str]] = {}
+        pending = []
+
+        for document_id, version in documents:
+            if not document_id or document_id in results:
+                continue
+            cached = self.get_cached(document_id, version)
+            if cached is not None:
+                self._stats["hits"] += 1
+                results[document_id] = cached
+            else:
+                self._stats["misses"] += 1
+                results[document_id] = None
+                pending.append((document_id, version))
+
+        if pending:
+            contents = await asyncio.gather(
+                *(self._fetch_one(dataset_id, document_id, version) for document_id, version in pending)
+            )
+            for (document_id, _), content in zip(pending, contents):
+                results[document_id] = content
+
+        return results
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        获取统计
+
+        Returns:
+            {hits, misses, errors, hit_rate, entries, concurrency}
+        """
+        lookups = self._stats["hits"] + self._stats["misses"]
+        return {
+            **self._stats,
+            "hit_rate": round(self._stats["hits"] / lookups * 100, 2) if lookups else 0,
+            "entries": len(self._cache),
+            "concurrency": self.concurrency,
+        }
+
+
+# 全局文档内容获取器
+document_content_fetcher = DocumentContentFetcher()
@@ -215,7 +215,7 @@ class DocumentExtractor:
         logger.info(f"正则表达式提取结果: {result}")
         return result
 
-    def extract_from_ragflow_document(self, dataset_id: str, document_id: str, ragflow_client) -> Dict:
+    async def extract_from_ragflow_document(self, dataset_id: str, document_id: str, ragflow_client) -> Dict:
         """
         从RAGFlow文档中提取客户信息
 
@@ -229,7 +229,7 @@ class DocumentExtractor:
         """
         try:
             # 获取文档内容
-            doc_result = ragflow_client.get_document_content(dataset_id, document_id)
+            doc_result = await ragflow_client.get_document_content(dataset_id, document_id)
 
             if doc_result.get("code") != 0:
                 logger.error(f"获取RAGFlow文档内容失败: {doc_result.get('message')}")
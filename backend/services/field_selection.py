@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""
+列表接口的大字段按需加载
+列表页只展示标题和状态，正文、发布日志、AI 回答这类大字段默认不查（SQL 里直接不 SELECT），
+需要时用 fields 参数显式要求（逗号分隔，all 表示全部）；单条的完整内容走详情接口
+
+未加载的字段用 raiseload 延迟：转换时漏判直接报错，而不是悄悄逐行补查（N+1）
+"""
+
+from typing import List, Optional, Set, Tuple
+
+from sqlalchemy.orm import defer
+
+from backend.database.models import GeoArticle, IndexCheckRecord
+
+# 列表默认不加载的大字段
+LARGE_FIELDS = {
+    GeoArticle: ("content", "publish_logs", "index_details"),
+    IndexCheckRecord: ("answer",),
+}
+
+ALL_FIELDS = "all"
+
+
+def parse_fields(model, fields: Optional[str]) -> Set[str]:
+    """
+    解析 fields 参数，返回需要加载的大字段
+
+    Raises:
+        ValueError: 含有不支持的字段
+    """
+    allowed = LARGE_FIELDS[model]
+    requested = {name.strip() for name in (fields or "").split(",") if name.strip()}
+    if ALL_FIELDS in requested:
+        return set(allowed)
+    unknown = requested - set(allowed)
+    if unknown:
+        raise ValueError(f"不支持的字段: {', '.join(sorted(unknown))}（可选: {', '.join(allowed)}, {ALL_FIELDS}）")
+    return requested
+
+
+def deferred_fields(model, include: Set[str]) -> Tuple[str, ...]:
+    """不加载的大字段（转换结果里置为 None）"""
+    return tuple(name for name in LARGE_FIELDS[model] if name not in include)
+
+
+def defer_options(model, include: Set[str]) -> List:
+    """查询选项：延迟加载未要求的大字段（Query.options / select().options 通用）"""
+    return [defer(getattr(model, name), raiseload=True) for name in deferred_fields(model, include)]
@@ -0,0 +1,322 @@
+# -*- coding: utf-8 -*-
+"""
+全文检索
+替代 title / content 上的 LIKE '%关键词%'（长中文正文全表扫描）
+
+SQLite：FTS5 外挂索引表（rowid = 源表 id）+ 中文二元切分
+    unicode61 分词器不切中文（一整段中文算一个词），写入前先把中文切成重叠的二元组
+    （"人工智能" → "人工 工智 智能"），查询词同样切分后按短语匹配，结果等价于子串匹配；
+    英文 / 数字按单词匹配，最后一个词按前缀匹配。单个汉字无法用二元组表示，退回 LIKE
+    索引在 Session after_flush 中与源表同一事务更新；
+    注意：query(...).update() / delete() 这类批量操作不会触发，之后要 rebuild_fulltext_index()
+PostgreSQL：pg_trgm GIN 索引（迁移 0009 创建）加速 ILIKE，按 word_similarity 排序
+"""
+
+import operator
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from loguru import logger
+from sqlalchemy import Float, Integer, case, column, event, func, inspect, or_, select, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from backend.database import DB_TYPE
+from backend.database.models import GeoArticle, Knowledge, ReferenceArticle
+
+
+@dataclass(frozen=True)
+class FulltextSource:
+    """一张建了全文索引的源表"""
+
+    model: type
+    fts_table: str
+    columns: Tuple[str, ...] = ("title", "content")
+    # bm25 各列权重：标题命中比正文命中更相关
+    weights: Tuple[float, ...] = (10.0, 1.0)
+
+
+FULLTEXT_SOURCES = [
+    FulltextSource(GeoArticle, "geo_articles_fts"),
+    FulltextSource(ReferenceArticle, "reference_articles_fts"),
+    FulltextSource(Knowledge, "knowledge_items_fts"),
+]
+_SOURCES_BY_MODEL = {source.model: source for source in FULLTEXT_SOURCES}
+
+_CJK = "\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff"
+# 第 1 组为连续中文，否则为英文 / 数字单词
+_TOKEN = re.compile(rf"([{_CJK}]+)|[^\W_{_CJK}]+")
+
+# 已提示过缺少索引表的表名（只提示一次）
+_missing_tables: Set[str] = set()
+
+
+def _tokens(text_value: Optional[str]) -> List[str]:
+    tokens = []
+    for match in _TOKEN.finditer(text_value or ""):
+        word = match.group(0)
+        if match.group(1) and len(word) > 1:
+            tokens.extend(map(operator.add, word, word[1:]))
+        else:
+            tokens.append(word.lower())
+    return tokens
+
+
+def segment(text_value: Optional[str]) -> str:
+    """切分成写入 FTS 的文本（中文二元组、英文小写，空格分隔）"""
+    return " ".join(_tokens(text_value))
+
+
+def build_match_query(keyword: str) -> Optional[str]:
+    """
+    把搜索词转成 FTS5 MATCH 表达式：按空格拆成多个词，每个词是一个短语，词之间 AND
+
+    Returns:
+        MATCH 表达式；含单个汉字或没有可检索字符时返回 None（调用方退回 LIKE）
+    """
+    phrases = []
+    for part in keyword.split():
+        matches = list(_TOKEN.finditer(part))
+        if any(m.group(1) and len(m.group(0)) == 1 for m in matches):
+            return None
+        tokens = _tokens(part)
+        if not tokens:
+            continue
+        phrase = '"' + " ".join(tokens) + '"'
+        if not matches[-1].group(1):
+            # 最后一个是英文 / 数字：前缀匹配（输入 "pyth" 也能搜到 python）
+            phrase += "*"
+        phrases.append(phrase)
+    return " AND ".join(phrases) or None
+
+
+def _source(model) -> FulltextSource:
+    source = _SOURCES_BY_MODEL.get(model)
+    if source is None:
+        raise ValueError(f"{model.__name__} 没有全文索引")
+    return source
+
+
+def _like_condition(model, source: FulltextSource, keyword: str):
+    columns = [getattr(model, name) for name in source.columns]
+    if DB_TYPE == "postgresql":
+        # pg_trgm GIN 索引可以加速 ILIKE '%...%'
+        return or_(*(col.icontains(keyword, autoescape=True) for col in columns))
+    return or_(*(col.contains(keyword, autoescape=True) for col in columns))
+
+
+def _fts_rowids(source: FulltextSource, match_query: str):
+    return (
+        text(f"SELECT rowid FROM {source.fts_table} WHERE {source.fts_table} MATCH :fts_query")
+        .bindparams(fts_query=match_query)
+        .columns(column("rowid", Integer))
+    )
+
+
+def match_condition(model, keyword: str):
+    """
+    标题或正文包含关键词的过滤条件（可与其它条件组合，用于列表筛选和计数）
+
+    SQLite 走 FTS5 索引，无法走索引的搜索词（单个汉字）退回 LIKE
+    """
+    source = _source(model)
+    if DB_TYPE == "sqlite":
+        match_query = build_match_query(keyword)
+        if match_query:
+            return model.id.in_(_fts_rowids(source, match_query))
+    return _like_condition(model, source, keyword)
+
+
+def search_statement(model, keyword: str, *conditions, limit: int = 20):
+    """
+    按相关度排序的搜索语句，结果行为 (模型对象, score)
+
+    Args:
+        model: GeoArticle / ReferenceArticle / Knowledge
+        keyword: 搜索词
+        conditions: 额外过滤条件（如 status == 1）
+        limit: 返回条数
+    """
+    source = _source(model)
+    match_query = build_match_query(keyword) if DB_TYPE == "sqlite" else None
+    if match_query:
+        weights = ", ".join(str(w) for w in source.weights)
+        # bm25 越小越相关，取负数作为分数
+        ranked = (
+            text(
+                f"SELECT rowid AS id, -bm25({source.fts_table}, {weights}) AS score "
+                f"FROM {source.fts_table} WHERE {source.fts_table} MATCH :fts_query"
+            )
+            .bindparams(fts_query=match_query)
+            .columns(column("id", Integer), column("score", Float))
+            .subquery("fts_ranked")
+        )
+        return (
+            select(model, ranked.c.score)
+            .join(ranked, model.id == ranked.c.id)
+            .where(*conditions)
+            .order_by(ranked.c.score.desc(), model.id.desc())
+            .limit(limit)
+        )
+
+    if DB_TYPE == "postgresql":
+        score = func.greatest(*(func.word_similarity(keyword, getattr(model, name)) for name in source.columns))
+    else:
+        # 单字搜索：标题命中排在前面
+        score = case((getattr(model, source.columns[0]).contains(keyword, autoescape=True), 1.0), else_=0.0)
+    return (
+        select(model, score.label("score"))
+        .where(_like_condition(model, source, keyword), *conditions)
+        .order_by(score.desc(), model.id.desc())
+        .limit(limit)
+    )
+
+
+# ==================== 索引表维护（仅 SQLite） ====================
+
+
+def _create_sql(source: FulltextSource) -> str:
+    return (
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {source.fts_table} "
+        f"USING fts5({', '.join(source.columns)}, tokenize='unicode61')"
+    )
+
+
+def _register_ddl(source: FulltextSource):
+    """源表建表时一起建索引表（Base.metadata.create_all 时触发）"""
+
+    def after_create(target, connection, **kw):
+        if connection.dialect.name == "sqlite":
+            connection.exec_driver_sql(_create_sql(source))
+
+    def after_drop(target, connection, **kw):
+        if connection.dialect.name == "sqlite":
+            connection.exec_driver_sql(f"DROP TABLE IF EXISTS {source.fts_table}")
+
+    event.listen(source.model.__table__, "after_create", after_create)
+    event.listen(source.model.__table__, "after_drop", after_drop)
+
+
+for _fulltext_source in FULLTEXT_SOURCES:
+    _register_ddl(_fulltext_source)
+
+
+def _execute(connection, source: FulltextSource, sql: str, params: Sequence[Dict]):
+    if not params:
+        return
+    try:
+        connection.exec_driver_sql(sql, list(params))
+    except OperationalError as e:
+        if "no such table" not in str(e):
+            raise
+        # 旧库还没建索引表：不影响业务写入，启动时 ensure_fulltext_index() 会建表并回填
+        if source.fts_table not in _missing_tables:
+            _missing_tables.add(source.fts_table)
+            logger.warning(f"⚠️ 全文索引表 {source.fts_table} 不存在，已跳过索引更新（运行 rebuild_fulltext_index.py 重建）")
+
+
+@event.listens_for(Session, "after_flush")
+def _sync_fulltext_index(session: Session, flush_context):
+    """新增 / 修改标题正文 / 删除后同步更新全文索引（与源表在同一事务中提交或回滚）"""
+    changes: Dict[FulltextSource, Tuple[List, List, List]] = {}
+
+    for obj in session.new:
+        source = _SOURCES_BY_MODEL.get(type(obj))
+        if source:
+            changes.setdefault(source, ([], [], []))[0].append(obj)
+
+    for obj in session.dirty:
+        source = _SOURCES_BY_MODEL.get(type(obj))
+        if source and any(inspect(obj).attrs[name].history.has_changes() for name in source.columns):
+            changes.setdefault(source, ([], [], []))[1].append(obj)
+
+    for obj in session.deleted:
+        source = _SOURCES_BY_MODEL.get(type(obj))
+        if source:
+            changes.setdefault(source, ([], [], []))[2].append(obj.id)
+
+    if not changes:
+        return
+    connection = session.connection()
+    if connection.dialect.name != "sqlite":
+        return
+
+    for source, (created, updated, deleted) in changes.items():
+        table = source.fts_table
+        placeholders = ", ".join("?" for _ in source.columns)
+        # 先删后插（FTS5 的 UPDATE 本身也是删后插）；新增的也先删：
+        # 批量 delete() 后 SQLite 会复用 id，索引里可能还留着同 rowid 的旧行
+        written = created + updated
+        _execute(
+            connection, source, f"DELETE FROM {table} WHERE rowid = ?", [(i,) for i in deleted + [o.id for o in written]]
+        )
+        _execute(
+            connection,
+            source,
+            f"INSERT INTO {table} (rowid, {', '.join(source.columns)}) VALUES (?, {placeholders})",
+            [(obj.id, *(segment(getattr(obj, name)) for name in source.columns)) for obj in written],
+        )
+
+
+def rebuild_fulltext_index(
+    db: Session, models: Optional[Sequence[type]] = None, batch_size: int = 1000
+) -> Dict[str, int]:
+    """
+    从源表重建全文索引（仅 SQLite；PostgreSQL 的 trgm 索引由数据库自动维护）
+
+    Args:
+        db: 数据库会话
+        models: 只重建这些模型，默认全部
+        batch_size: 每批读取的行数
+
+    Returns:
+        {索引表名: 写入行数}
+    """
+    connection = db.connection()
+    if connection.dialect.name != "sqlite":
+        return {}
+
+    result = {}
+    for source in FULLTEXT_SOURCES:
+        if models and source.model not in models:
+            continue
+        model = source.model
+        table = source.fts_table
+        connection.exec_driver_sql(_create_sql(source))
+        connection.exec_driver_sql(f"DELETE FROM {table}")
+
+        placeholders = ", ".join("?" for _ in source.columns)
+        sql = f"INSERT INTO {table} (rowid, {', '.join(source.columns)}) VALUES (?, {placeholders})"
+        columns = [getattr(model, name) for name in source.columns]
+        last_id, written = 0, 0
+        while True:
+            rows = db.execute(
+                select(model.id, *columns).where(model.id > last_id).order_by(model.id).limit(batch_size)
+            ).all()
+            if not rows:
+                break
+            connection.exec_driver_sql(sql, [(row[0], *(segment(v) for v in row[1:])) for row in rows])
+            last_id = rows[-1][0]
+            written += len(rows)
+
+        _missing_tables.discard(table)
+        result[table] = written
+    db.commit()
+    return result
+
+
+def ensure_fulltext_index(engine) -> Dict[str, int]:
+    """启动时检查：源表已存在但还没有索引表的（旧库），建表并回填"""
+    if engine.dialect.name != "sqlite":
+        return {}
+    with engine.connect() as conn:
+        existing = {row[0] for row in conn.exec_driver_sql("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    missing = [s.model for s in FULLTEXT_SOURCES if s.model.__tablename__ in existing and s.fts_table not in existing]
+    if not missing:
+        return {}
+
+    with Session(bind=engine) as db:
+        result = rebuild_fulltext_index(db, missing)
+    logger.info(f"✨ 全文索引已建立: {result}")
+    return result
@@ -13,10 +13,11 @@ import asyncio
 import random
 import json
 from typing import Any, Dict, Optional, List
-from datetime import datetime
+from datetime import datetime, timedelta
 from loguru import logger
 from sqlalchemy.orm import Session
 
+from backend.config import INDEX_MONITOR_BASE_INTERVAL_MINUTES, INDEX_MONITOR_MAX_INTERVAL_MINUTES
 from backend.database.models import GeoArticle, Keyword, Account, PublishRecord
 from backend.services.n8n_service import get_n8n_service
 from backend.services.playwright.publishers.base import get_publisher
@@ -30,6 +31,22 @@ pub_log = logger.bind(module="发布器")
 chk_log = logger.bind(module="监测站")
 
 
+def compute_next_check_at(attempts: int, now: Optional[datetime] = None) -> datetime:
+    """
+    计算下次收录检测时间（指数退避）
+
+    Args:
+        attempts: 连续未收录的检测次数（0 表示刚发布）
+        now: 当前时间
+
+    Returns:
+        下次检测时间：基础间隔 × 2^attempts，不超过上限
+    """
+    now = now or datetime.now()
+    minutes = INDEX_MONITOR_BASE_INTERVAL_MINUTES * (2 ** min(attempts, 20))
+    return now + timedelta(minutes=min(minutes, INDEX_MONITOR_MAX_INTERVAL_MINUTES))
+
+
 class GeoArticleService:
     def __init__(self, db: Session):
         self.db = db
@@ -272,6 +289,9 @@ class GeoArticleService:
                     final_article.publish_time = now_time
                     final_article.platform_url = final_url
                     final_article.publish_logs = f"[{now_time}] ✅ 发布成功"
+                    # 安排首次收录检测
+                    final_article.index_check_attempts = 0
+                    final_article.next_check_at = compute_next_check_at(0, now_time)
                     pub_log.success(f"🎊 发布完成：{final_url}")
                 else:
                     final_article.publish_status = "failed"
@@ -367,10 +387,17 @@ class GeoArticleService:
         chk_log.info(f"🔍 [监测] 正在检索文章《{article.title[:10]}...》的收录情况")
         await asyncio.sleep(2)
         is_indexed = random.random() > 0.5
+        now = datetime.now()
         article.index_status = "indexed" if is_indexed else "not_indexed"
-        article.last_check_time = datetime.now()
+        article.last_check_time = now
+        if is_indexed:
+            # 已收录不再参与监测
+            article.next_check_at = None
+        else:
+            article.index_check_attempts = (article.index_check_attempts or 0) + 1
+            article.next_check_at = compute_next_check_at(article.index_check_attempts, now)
         self.db.commit()
-        return {"status": "success", "index_status": article.index_status}
+        return {"status": "success", "index_status": article.index_status, "next_check_at": article.next_check_at}
 
     def get_article(self, article_id: int) -> Optional[GeoArticle]:
         return self.db.query(GeoArticle).get(article_id)
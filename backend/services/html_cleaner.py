@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+"""
+采集文章 HTML 清洗
+替代旧的 40 多次 re.sub 清洗链：每一步都是一趟线性扫描、不会回溯
+
+1. 一趟去掉注释和 script/style 等原样文本元素
+2. 一趟给同名标签配对（栈），整块去掉广告容器（支持嵌套，未闭合的只去掉开始标签，不吞正文）
+3. 一趟把块级标签换成换行，一趟去掉其余标签
+4. 解码实体、过滤噪声词、整理空白各一趟
+
+大批量清洗时放进进程池，避免阻塞事件循环
+"""
+
+import asyncio
+import html
+import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+from loguru import logger
+
+from backend.config import HTML_CLEAN_POOL_MIN_CHARS, HTML_CLEAN_POOL_WORKERS
+
+# 原样文本元素（内部不是 HTML，连同内容一起去掉）
+RAW_TEXT_TAGS = ["script", "style", "noscript", "template", "iframe", "textarea"]
+
+# 整块去掉的元素
+SKIP_TAGS = ["ins", "aside"]
+
+# class / id 中出现这些独立词（按 - _ 空格分隔）即视为广告容器
+# 注意按词匹配：旧实现的 class="[^"]*ad[^"]*" 会把 header / loading 之类也当广告删掉
+AD_WORDS = ["ad", "ads", "adsbygoogle", "advert", "advertisement", "sponsor", "sponsored", "promotion", "promo"]
+
+# 块级标签：换成换行，避免相邻段落粘在一起
+BLOCK_TAGS = [
+    "p", "div", "br", "li", "ul", "ol", "tr", "table", "section", "article",
+    "h1", "h2", "h3", "h4", "h5", "h6", "blockquote", "pre", "hr", "header", "footer",
+]
+
+NOISE_WORDS = [
+    "点击展开全文", "展开全文", "收起全文", "阅读全文", "查看更多", "相关推荐", "热门推荐",
+    "猜你喜欢", "广告", "推广", "赞助", "分享到", "转发到", "举报", "投诉",
+]
+
+_RAW_TEXT = re.compile(
+    r"<!--.*?(?:-->|$)|<(%s)\b[^>]*>.*?(?:</\1\s*>|$)" % "|".join(RAW_TEXT_TAGS), re.IGNORECASE | re.DOTALL
+)
+# 先找广告词本身（前后是分隔符），再回头确认它在某个标签的 class / id 里，比逐个标签做前瞻快得多
+_AD_WORD = re.compile(
+    r"[\s_\"'=-](?:%s)(?=[\s_\"'>-])" % "|".join(sorted(AD_WORDS, key=len, reverse=True)), re.IGNORECASE
+)
+_AD_CLASS = re.compile(r"(?:^|[\s_-])(?:%s)(?:$|[\s_-])" % "|".join(AD_WORDS), re.IGNORECASE)
+_AD_ATTR = re.compile(r"""\b(?:class|id)\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+))""", re.IGNORECASE)
+_SKIP_OPEN = re.compile(r"<(%s)\b[^>]*>" % "|".join(SKIP_TAGS), re.IGNORECASE)
+_TAG_HEAD = re.compile(r"<([a-zA-Z][\w-]*)\b[^>]*>")
+_BLOCK_TAG = re.compile(r"</?(?:%s)\b[^>]*>" % "|".join(BLOCK_TAGS), re.IGNORECASE)
+_ANY_TAG = re.compile(r"<[a-zA-Z/!?][^>]*>")
+# 长词优先，保证"点击展开全文"不会只删掉"展开全文"
+_NOISE = re.compile("|".join(sorted(map(re.escape, NOISE_WORDS), key=len, reverse=True)))
+# 制表符、全角/不换行空格换成普通空格，再合并连续空格（单个空格不动，避免无谓替换）
+_ODD_SPACES = re.compile(r"[\t\r\f\v\xa0\u3000]")
+_SPACES = re.compile(r" {2,}")
+_LINE_EDGES = re.compile(r" ?\n ?")
+_BLANK_LINES = re.compile(r"\n{3,}")
+
+VOID_TAGS = {"br", "hr", "img", "input", "meta", "link", "area", "base", "col", "embed", "source", "track", "wbr"}
+
+
+@lru_cache(maxsize=64)
+def _same_name_tags(name: str) -> "re.Pattern":
+    return re.compile(rf"<(/?){name}\b[^>]*?(/?)>", re.IGNORECASE)
+
+
+def _pair_tags(content: str, name: str) -> dict:
+    """一趟扫描给同名标签配对，返回 {开始标签位置: 对应结束标签的结束位置}，未闭合的不在结果里"""
+    pairs = {}
+    stack = []
+    for match in _same_name_tags(name).finditer(content):
+        if match.group(2):  # <div/> 自闭合
+            continue
+        if match.group(1):
+            if stack:
+                pairs[stack.pop()] = match.end()
+        else:
+            stack.append(match.start())
+    return pairs
+
+
+def _ad_openings(content: str) -> List[Tuple[int, int, str]]:
+    """找出广告容器的开始标签，返回 [(开始位置, 标签结束位置, 标签名)]"""
+    found = {m.start(): (m.end(), m.group(1).lower()) for m in _SKIP_OPEN.finditer(content)}
+    for word in _AD_WORD.finditer(content):
+        start = content.rfind("<", 0, word.start())
+        if start < 0 or start in found or content.rfind(">", 0, word.start()) > start:
+            continue  # 不在标签里（正文中的英文单词）或已找到
+        tag = _TAG_HEAD.match(content, start)
+        if not tag or tag.end() <= word.start():
+            continue
+        for attr in _AD_ATTR.finditer(tag.group(0)):
+            if _AD_CLASS.search(attr.group(1) or attr.group(2) or attr.group(3) or ""):
+                found[start] = (tag.end(), tag.group(1).lower())
+                break
+    return [(start, end, name) for start, (end, name) in sorted(found.items())]
+
+
+def _strip_ad_blocks(content: str) -> str:
+    """整块去掉广告容器"""
+    openings = _ad_openings(content)
+    if not openings:
+        return content
+
+    pairs = {name: _pair_tags(content, name) for name in {name for _, _, name in openings if name not in VOID_TAGS}}
+    out = []
+    pos = 0
+    for start, tag_end, name in openings:
+        if start < pos:  # 已在外层广告块里被去掉
+            continue
+        out.append(content[pos:start])
+        # 找不到结束标签（未闭合 / 自闭合 / 空元素）时只去掉开始标签，保留后面的正文
+        pos = pairs.get(name, {}).get(start, tag_end)
+    out.append(content[pos:])
+    return "".join(out)
+
+
+def clean_html(content: Optional[str]) -> str:
+    """
+    清洗 HTML 内容
+
+    去除脚本、样式、注释、广告块和标签，解码实体，过滤噪声词并整理空白
+
+    Args:
+        content: 原始内容（HTML 或纯文本）
+
+    Returns:
+        清洗后的纯文本内容
+    """
+    if not content:
+        return ""
+
+    if "<" in content:
+        content = _RAW_TEXT.sub("", content)
+        content = _strip_ad_blocks(content)
+        content = _BLOCK_TAG.sub("\n", content)
+        content = _ANY_TAG.sub("", content)
+    if "&" in content:
+        content = html.unescape(content)
+
+    content = _NOISE.sub("", content)
+    # 整理空白：行内空白合并为一个空格，连续空行最多保留一个
+    content = _SPACES.sub(" ", _ODD_SPACES.sub(" ", content))
+    content = _BLANK_LINES.sub("\n\n", _LINE_EDGES.sub("\n", content))
+    return content.strip()
+
+
+# ==================== 批量清洗（进程池） ====================
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=HTML_CLEAN_POOL_WORKERS)
+        logger.info(f"🧹 HTML 清洗进程池已启动: {HTML_CLEAN_POOL_WORKERS} 个进程")
+    return _pool
+
+
+async def clean_html_many(contents: List[Optional[str]]) -> List[str]:
+    """
+    批量清洗
+
+    总量小于 HTML_CLEAN_POOL_MIN_CHARS 时直接在当前进程处理（进程间传输反而更慢），
+    否则分发到进程池，进程池不可用时退回当前进程
+
+    Args:
+        contents: 原始内容列表
+
+    Returns:
+        与输入顺序一致的清洗结果
+    """
+    total = sum(len(c) for c in contents if c)
+    if len(contents) < 2 or total < HTML_CLEAN_POOL_MIN_CHARS or HTML_CLEAN_POOL_WORKERS < 1:
+        return [clean_html(c) for c in contents]
+
+    loop = asyncio.get_running_loop()
+    try:
+        pool = _get_pool()
+        return list(await asyncio.gather(*(loop.run_in_executor(pool, clean_html, c) for c in contents)))
+    except Exception as e:
+        logger.warning(f"⚠️ HTML 清洗进程池不可用，改为当前进程处理: {e}")
+        shutdown_clean_pool()
+        return [clean_html(c) for c in contents]
+
+
+def shutdown_clean_pool():
+    """关闭进程池（应用退出时调用）"""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
@@ -4,20 +4,73 @@
 用这个来检测AI平台的收录情况！
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Sequence, Tuple
+from contextlib import asynccontextmanager
 from loguru import logger
 from sqlalchemy.orm import Session
-from playwright.async_api import async_playwright, Browser
 import asyncio
-import os
-import sys
 from datetime import datetime
 
 from backend.database.models import IndexCheckRecord, Keyword, QuestionVariant, Project
-from backend.config import AI_PLATFORMS, BROWSER_ARGS, DEFAULT_USER_AGENT
+from backend.config import (
+    AI_PLATFORMS,
+    DEFAULT_USER_AGENT,
+    INDEX_CHECK_MAX_CONCURRENT_CONTEXTS,
+    INDEX_CHECK_PLATFORM_CONCURRENCY,
+)
+from backend.services import index_check_stats
+from backend.services.browser_pool import index_check_browser_pool
+from backend.services.pagination import apply_keyset, list_count_cache, split_page
+from backend.services.resource_blocker import resource_blocker
 from backend.services.playwright.ai_platforms import DoubaoChecker, QianwenChecker, DeepSeekChecker
 
 
+class CheckConcurrencyLimiter:
+    """
+    检测并发限制器
+
+    同时限制全局和单个平台打开的检测上下文数量（进程内所有检测共享）
+    """
+
+    def __init__(
+        self,
+        max_total: int = INDEX_CHECK_MAX_CONCURRENT_CONTEXTS,
+        max_per_platform: int = INDEX_CHECK_PLATFORM_CONCURRENCY,
+    ):
+        self.max_total = max(1, max_total)
+        self.max_per_platform = max(1, max_per_platform)
+        self._global: Optional[asyncio.Semaphore] = None
+        self._platforms: Dict[str, asyncio.Semaphore] = {}
+        self._loop = None
+
+    def _ensure_semaphores(self):
+        """延迟创建信号量，事件循环变化时重建（测试中每个用例一个循环）"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._global = asyncio.Semaphore(self.max_total)
+            self._platforms = {}
+
+    @asynccontextmanager
+    async def slot(self, platform_id: str):
+        """
+        占用一个检测名额：先平台名额，再全局名额
+        """
+        self._ensure_semaphores()
+        platform_sem = self._platforms.get(platform_id)
+        if platform_sem is None:
+            platform_sem = asyncio.Semaphore(self.max_per_platform)
+            self._platforms[platform_id] = platform_sem
+
+        async with platform_sem:
+            async with self._global:
+                yield
+
+
+# 收录检测全局并发限制器
+check_concurrency_limiter = CheckConcurrencyLimiter()
+
+
 class IndexCheckService:
     """
     收录检测服务
@@ -39,89 +92,6 @@ class IndexCheckService:
             "deepseek": DeepSeekChecker("deepseek", AI_PLATFORMS["deepseek"]),
         }
 
-    async def _launch_browser(self, playwright) -> Browser:
-        """
-        启动浏览器（包含自动查找本地Chrome和自动安装逻辑）
-        """
-        # 1. 尝试查找本地 Chrome 路径
-        chrome_paths = [
-            r"C:\Program Files\Google\Chrome\Application\chrome.exe",
-            r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe",
-            os.path.expandvars(r"%LOCALAPPDATA%\Google\Chrome\Application\chrome.exe"),
-        ]
-
-        # Mac OS 支持
-        if sys.platform == "darwin":
-            chrome_paths = [
-                "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
-                os.path.expanduser("~/Applications/Google Chrome.app/Contents/MacOS/Google Chrome"),
-            ]
-
-        executable_path = None
-        for path in chrome_paths:
-            if os.path.exists(path):
-                executable_path = path
-                logger.info(f"✅ [IndexCheck] 找到本地 Chrome 浏览器: {path}")
-                break
-
-        # 准备启动参数
-        launch_options = {"headless": False, "args": BROWSER_ARGS, "timeout": 30000}
-
-        if executable_path:
-            launch_options["executable_path"] = executable_path
-
-        # 启动浏览器
-        logger.info(f"🚀 [IndexCheck] 启动浏览器... Executable: {executable_path}")
-
-        browser = None
-        try:
-            browser = await playwright.chromium.launch(**launch_options)
-        except Exception as browser_error:
-            error_msg = str(browser_error)
-            logger.warning(f"首次启动失败: {error_msg}")
-
-            # 回退尝试：不使用本地Chrome
-            if executable_path:
-                logger.info("尝试使用Playwright内置浏览器...")
-                launch_options.pop("executable_path", None)
-                try:
-                    browser = await playwright.chromium.launch(**launch_options)
-                except Exception as inner_error:
-                    error_msg = str(inner_error)
-                    logger.error(f"内置浏览器启动失败: {error_msg}")
-
-            # 自动安装逻辑
-            if not browser and "Executable doesn't exist" in error_msg:
-                logger.warning("检测到浏览器缺失，尝试自动安装...")
-                try:
-                    logger.info("正在执行: playwright install chromium")
-                    process = await asyncio.create_subprocess_exec(
-                        sys.executable,
-                        "-m",
-                        "playwright",
-                        "install",
-                        "chromium",
-                        stdout=asyncio.subprocess.PIPE,
-                        stderr=asyncio.subprocess.PIPE,
-                    )
-                    stdout, stderr = await process.communicate()
-
-                    if process.returncode == 0:
-                        logger.info("浏览器安装成功，重试启动...")
-                        browser = await playwright.chromium.launch(**launch_options)
-                    else:
-                        logger.error(f"自动安装失败: {stderr.decode()}")
-                        raise Exception("自动安装浏览器失败，请手动执行 'playwright install'")
-
-                except Exception as install_error:
-                    logger.error(f"自动安装过程异常: {install_error}")
-                    raise install_error
-
-            if not browser:
-                raise Exception(f"浏览器启动失败: {error_msg}")
-
-        return browser
-
     async def check_keyword(
         self, keyword_id: int, company_name: str, platforms: Optional[List[str]] = None
     ) -> List[Dict[str, Any]]:
@@ -198,42 +168,32 @@ class IndexCheckService:
         if platforms is None:
             platforms = list(self.checkers.keys())
 
-        # 使用单个Playwright实例处理所有关键词，提高效率
-        async with async_playwright() as p:
-            # 使用统一的启动逻辑
-            browser = await self._launch_browser(p)
-
-            try:
-                for keyword_obj in keywords:
-                    # 获取关键词的问题变体
-                    questions = (
-                        self.db.query(QuestionVariant).filter(QuestionVariant.keyword_id == keyword_obj.id).all()
-                    )
+        # 每个关键词从全局浏览器池租用浏览器，不再重复启动 Chromium
+        for keyword_obj in keywords:
+            # 获取关键词的问题变体
+            questions = self.db.query(QuestionVariant).filter(QuestionVariant.keyword_id == keyword_obj.id).all()
 
-                    if not questions:
-                        # 如果没有问题变体，使用默认问题
-                        questions = [
-                            QuestionVariant(
-                                id=0, keyword_id=keyword_obj.id, question=f"什么是{keyword_obj.keyword}？推荐哪家公司？"
-                            )
-                        ]
-
-                    # 执行检测
-                    results = await self._execute_checks(
-                        keyword_id=keyword_obj.id,
-                        keyword_obj=keyword_obj,
-                        questions=questions,
-                        company_name=project.company_name,
-                        platforms=platforms,
+            if not questions:
+                # 如果没有问题变体，使用默认问题
+                questions = [
+                    QuestionVariant(
+                        id=0, keyword_id=keyword_obj.id, question=f"什么是{keyword_obj.keyword}？推荐哪家公司？"
                     )
+                ]
 
-                    all_results.extend(results)
+            # 执行检测
+            results = await self._execute_checks(
+                keyword_id=keyword_obj.id,
+                keyword_obj=keyword_obj,
+                questions=questions,
+                company_name=project.company_name,
+                platforms=platforms,
+            )
 
-                    # 短暂休息，避免被平台检测为自动化
-                    await asyncio.sleep(2)
+            all_results.extend(results)
 
-            finally:
-                await browser.close()
+            # 短暂休息，避免被平台检测为自动化
+            await asyncio.sleep(2)
 
         logger.info(f"项目关键词批量检测完成: 项目ID={project_id}, 关键词数={len(keywords)}, 检测数={len(all_results)}")
         return all_results
@@ -248,82 +208,166 @@ class IndexCheckService:
     ) -> List[Dict[str, Any]]:
         """
         执行检测的通用方法
+
+        各平台在同一个浏览器的独立上下文中并行检测，并发数受全局和单平台限制；
+        检测记录先缓存在各平台的缓冲区，全部平台完成后按平台顺序一次批量写库。
+        某个平台出错或整个检测被取消时，已完成的检测结果同样会写库
         """
+        platform_ids: List[str] = []
+        buffers: Dict[str, List[Dict[str, Any]]] = {}
+        try:
+            # 从全局浏览器池租用浏览器，检测结束后归还（不关闭）
+            async with index_check_browser_pool.lease() as browser:
+                tasks = []
+                for platform_id in platforms:
+                    checker = self.checkers.get(platform_id)
+                    if not checker:
+                        logger.warning(f"未知的平台: {platform_id}")
+                        continue
+
+                    platform_ids.append(platform_id)
+                    buffers[platform_id] = []
+                    tasks.append(
+                        self._check_platform_in_context(
+                            browser=browser,
+                            keyword_id=keyword_id,
+                            keyword_obj=keyword_obj,
+                            questions=questions,
+                            company_name=company_name,
+                            platform_id=platform_id,
+                            checker=checker,
+                            pending_records=buffers[platform_id],
+                        )
+                    )
+
+                outcomes = await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            # 按传入的平台顺序写库，保证记录顺序与串行检测时一致（取消时也执行）
+            self._save_check_records([row for platform_id in platform_ids for row in buffers[platform_id]])
+
         results = []
+        for platform_id, outcome in zip(platform_ids, outcomes):
+            if isinstance(outcome, BaseException):
+                logger.error(f"平台 {platform_id} 检测失败: {outcome}")
+                continue
+            results.extend(outcome)
+        return results
 
+    async def _check_platform_in_context(
+        self,
+        browser: Any,
+        keyword_id: int,
+        keyword_obj: Keyword,
+        questions: List[QuestionVariant],
+        company_name: str,
+        platform_id: str,
+        checker: Any,
+        pending_records: List[Dict[str, Any]],
+    ) -> List[Dict[str, Any]]:
+        """
+        在独立的浏览器上下文中检测单个平台
+
+        Args:
+            pending_records: 检测记录缓冲区，逐条追加，由调用方统一写库（中途出错时已追加的仍保留）
+
+        Returns:
+            检测结果列表
+        """
         # 临时使用固定的用户ID和项目ID，实际应该从参数传递
         user_id = 1
         project_id = 1
 
         # 导入会话管理器
         from backend.services.session_manager import secure_session_manager
-        # 导入UTC时间处理
 
-        async with async_playwright() as p:
-            # 使用统一的启动逻辑
-            browser = await self._launch_browser(p)
+        async with check_concurrency_limiter.slot(platform_id):
+            logger.info(f"开始检测平台: {checker.name}, 关键词: {keyword_obj.keyword}")
 
-            try:
-                # 为每个平台创建一个新的上下文和页面
-                for platform_id in platforms:
-                    checker = self.checkers.get(platform_id)
-                    if not checker:
-                        logger.warning(f"未知的平台: {platform_id}")
-                        continue
+            # 加载平台的存储状态（授权状态）
+            storage_state = await secure_session_manager.load_session(
+                user_id=user_id, project_id=project_id, platform=platform_id, validate=False
+            )
 
-                    logger.info(f"开始检测平台: {checker.name}, 关键词: {keyword_obj.keyword}")
+            if storage_state:
+                logger.info(f"成功加载平台 {checker.name} 的存储状态")
+            else:
+                logger.warning(f"未找到平台 {checker.name} 的存储状态，将使用新的会话")
 
-                    # 加载平台的存储状态（授权状态）
-                    storage_state = await secure_session_manager.load_session(
-                        user_id=user_id, project_id=project_id, platform=platform_id, validate=False
-                    )
+            # 为每个平台创建新的上下文和页面
+            context = await browser.new_context(storage_state=storage_state, user_agent=DEFAULT_USER_AGENT)
 
-                    if storage_state:
-                        logger.info(f"成功加载平台 {checker.name} 的存储状态")
-                    else:
-                        logger.warning(f"未找到平台 {checker.name} 的存储状态，将使用新的会话")
+            try:
+                # 拦截图片/字体/视频/统计脚本，检测只需要回答文本
+                await resource_blocker.apply(context, platform_id)
 
-                    # 为每个平台创建新的上下文和页面
-                    context = await browser.new_context(storage_state=storage_state, user_agent=DEFAULT_USER_AGENT)
-                    page = await context.new_page()
+                page = await context.new_page()
 
-                    try:
-                        # 执行单个平台的检测
-                        platform_results = await self._execute_checks_for_single_platform(
-                            keyword_id=keyword_id,
-                            keyword_obj=keyword_obj,
-                            questions=questions,
-                            company_name=company_name,
-                            platform_id=platform_id,
-                            checker=checker,
-                            page=page,
-                        )
-                        results.extend(platform_results)
-
-                        # 保存更新后的会话状态（如果登录状态发生了变化）
-                        updated_storage_state = await context.storage_state()
-                        # 保留原始会话中的时间戳信息
-                        if storage_state:
-                            updated_storage_state["created_at"] = storage_state.get("created_at")
-                            updated_storage_state["last_modified"] = storage_state.get("last_modified")
-                        save_result = await secure_session_manager.save_session(
-                            user_id=user_id,
-                            project_id=project_id,
-                            platform=platform_id,
-                            storage_state=updated_storage_state,
-                        )
-                        if save_result:
-                            logger.info(f"成功保存平台 {checker.name} 的更新会话状态")
-                        else:
-                            logger.warning(f"保存平台 {checker.name} 的更新会话状态失败")
-                    finally:
-                        # 等待一段时间后再关闭上下文，让用户有时间看到结果
-                        await asyncio.sleep(2)
-                        await context.close()
+                # 执行单个平台的检测（记录先收集，由调用方统一写库）
+                platform_results = await self._execute_checks_for_single_platform(
+                    keyword_id=keyword_id,
+                    keyword_obj=keyword_obj,
+                    questions=questions,
+                    company_name=company_name,
+                    platform_id=platform_id,
+                    checker=checker,
+                    page=page,
+                    pending_records=pending_records,
+                )
+
+                # 保存更新后的会话状态（如果登录状态发生了变化）
+                updated_storage_state = await context.storage_state()
+                # 保留原始会话中的时间戳信息
+                if storage_state:
+                    updated_storage_state["created_at"] = storage_state.get("created_at")
+                    updated_storage_state["last_modified"] = storage_state.get("last_modified")
+                save_result = await secure_session_manager.save_session(
+                    user_id=user_id,
+                    project_id=project_id,
+                    platform=platform_id,
+                    storage_state=updated_storage_state,
+                )
+                if save_result:
+                    logger.info(f"成功保存平台 {checker.name} 的更新会话状态")
+                else:
+                    logger.warning(f"保存平台 {checker.name} 的更新会话状态失败")
             finally:
-                await browser.close()
+                await context.close()
 
-        return results
+        return platform_results
+
+    def _save_check_records(self, rows: List[Dict[str, Any]]):
+        """
+        按顺序批量保存检测记录（一条批量 INSERT + 一次提交，日汇总在同一事务内更新）
+        """
+        if not rows:
+            return
+
+        try:
+            index_check_stats.insert_check_records(self.db, rows)
+            self.db.commit()
+            list_count_cache.invalidate("index_check_records")
+            logger.debug(f"检测记录已批量写入: {len(rows)} 条")
+        except Exception as db_error:
+            logger.error(f"保存检测结果失败（{len(rows)} 条）: {str(db_error)}")
+            # 回滚事务
+            self.db.rollback()
+
+    @staticmethod
+    def _check_record_row(keyword_id: int, platform_id: str, question: str, check_result: Dict[str, Any]) -> dict:
+        """检测结果 → index_check_records 的一行"""
+        from datetime import timedelta, timezone
+
+        # 强制使用北京时间 (UTC+8)，去除时区信息，直接存为本地时间
+        beijing_time = datetime.now(timezone.utc) + timedelta(hours=8)
+        return {
+            "keyword_id": keyword_id,
+            "platform": platform_id,
+            "question": question,
+            "answer": check_result.get("answer"),
+            "keyword_found": check_result.get("keyword_found", False),
+            "company_found": check_result.get("company_found", False),
+            "check_time": beijing_time.replace(tzinfo=None),
+        }
 
     async def _execute_checks_for_single_platform(
         self,
@@ -334,18 +378,48 @@ class IndexCheckService:
         platform_id: str,
         checker: Any,
         page: Any,
+        pending_records: Optional[List[Dict[str, Any]]] = None,
     ) -> List[Dict[str, Any]]:
         """
         为单个平台执行检测
+
+        Args:
+            pending_records: 传入时检测记录只追加到该列表，由调用方统一写库；
+                否则本次平台检测结束（含出错、被取消）时一次批量写库
         """
         results = []
-        max_retries = 2
 
-        # 导入UTC时间处理
-        from datetime import datetime, timezone
+        own_buffer = pending_records is None
+        if own_buffer:
+            pending_records = []
 
         logger.info(f"开始检测平台: {checker.name}, 关键词: {keyword_obj.keyword}")
 
+        try:
+            await self._check_questions(
+                keyword_id, keyword_obj, questions, company_name, platform_id, checker, page, pending_records, results
+            )
+        finally:
+            if own_buffer:
+                self._save_check_records(pending_records)
+
+        return results
+
+    async def _check_questions(
+        self,
+        keyword_id: int,
+        keyword_obj: Keyword,
+        questions: List[QuestionVariant],
+        company_name: str,
+        platform_id: str,
+        checker: Any,
+        page: Any,
+        pending_records: List[Dict[str, Any]],
+        results: List[Dict[str, Any]],
+    ):
+        """逐个问题检测，记录追加到 pending_records，结果追加到 results"""
+        max_retries = 2
+
         for qv in questions:
             retry_count = 0
             success = False
@@ -392,28 +466,8 @@ class IndexCheckService:
                     "error_msg": "检测超时或多次失败",
                 }
 
-            try:
-                # 保存检测结果，强制使用北京时间 (UTC+8)
-                # 导入UTC时间处理
-                from datetime import datetime, timedelta, timezone
-
-                beijing_time = datetime.now(timezone.utc) + timedelta(hours=8)
-
-                record = IndexCheckRecord(
-                    keyword_id=keyword_id,
-                    platform=platform_id,
-                    question=qv.question,
-                    answer=check_result.get("answer"),
-                    keyword_found=check_result.get("keyword_found", False),
-                    company_found=check_result.get("company_found", False),
-                    check_time=beijing_time.replace(tzinfo=None),  # 去除时区信息，直接存为本地时间
-                )
-                self.db.add(record)
-                self.db.commit()
-            except Exception as db_error:
-                logger.error(f"保存检测结果失败: {str(db_error)}")
-                # 回滚事务
-                self.db.rollback()
+            # 先放进缓冲区，批量写库
+            pending_records.append(self._check_record_row(keyword_id, platform_id, qv.question, check_result))
 
             results.append(
                 {
@@ -431,8 +485,6 @@ class IndexCheckService:
             # 每个问题检测后短暂休息
             await asyncio.sleep(1)
 
-        return results
-
     async def _execute_checks_for_single_keyword(
         self,
         keyword_id: int,
@@ -477,23 +529,32 @@ class IndexCheckService:
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None,
         question: Optional[str] = None,
-    ) -> tuple[List[IndexCheckRecord], int]:
+        cursor: Optional[str] = None,
+        load_options: Sequence = (),
+    ) -> tuple[List[IndexCheckRecord], int, Optional[str]]:
         """
         获取检测记录（支持分页和多维筛选）
 
+        按 (check_time, id) 倒序游标分页，总数走短时缓存
+
         Args:
             keyword_id: 关键词ID筛选
             platform: 平台筛选
             limit: 返回数量限制
-            skip: 跳过数量
+            skip: 跳过数量（没有游标时兼容旧的偏移翻页）
             keyword_found: 关键词命中筛选
             company_found: 公司名命中筛选
             start_date: 开始时间
             end_date: 结束时间
             question: 问题搜索（模糊匹配）
+            cursor: 上一页返回的游标
+            load_options: 加载选项（如延迟加载 answer，见 field_selection.defer_options）
 
         Returns:
-            (记录列表, 总记录数)
+            (记录列表, 总记录数, 下一页游标)
+
+        Raises:
+            ValueError: 游标无效
         """
         query = self.db.query(IndexCheckRecord)
 
@@ -512,10 +573,27 @@ class IndexCheckService:
         if question:
             query = query.filter(IndexCheckRecord.question.ilike(f"%{question}%"))
 
-        total = query.count()
-        records = query.order_by(IndexCheckRecord.check_time.desc()).offset(skip).limit(limit).all()
+        count_key = list_count_cache.key(
+            "index_check_records",
+            keyword_id=keyword_id,
+            platform=platform,
+            keyword_found=keyword_found,
+            company_found=company_found,
+            start_date=start_date,
+            end_date=end_date,
+            question=question,
+        )
+        total = list_count_cache.get(count_key)
+        if total is None:
+            total = query.count()
+            list_count_cache.set(count_key, total)
+
+        query = apply_keyset(query.options(*load_options), IndexCheckRecord.check_time, IndexCheckRecord.id, cursor)
+        if not cursor and skip:
+            query = query.offset(skip)
+        records, next_cursor = split_page(query.limit(limit + 1).all(), limit, "check_time")
 
-        return records, total
+        return records, total, next_cursor
 
     def delete_record(self, record_id: int) -> bool:
         """删除单条记录"""
@@ -524,17 +602,17 @@ class IndexCheckService:
             return False
         self.db.delete(record)
         self.db.commit()
+        list_count_cache.invalidate("index_check_records")
         return True
 
     def batch_delete_records(self, record_ids: List[int]) -> int:
-        """批量删除记录"""
-        count = (
-            self.db.query(IndexCheckRecord)
-            .filter(IndexCheckRecord.id.in_(record_ids))
-            .delete(synchronize_session=False)
-        )
+        """批量删除记录（逐条 delete，保证日汇总同步扣减）"""
+        records = self.db.query(IndexCheckRecord).filter(IndexCheckRecord.id.in_(record_ids)).all()
+        for record in records:
+            self.db.delete(record)
         self.db.commit()
-        return count
+        list_count_cache.invalidate("index_check_records")
+        return len(records)
 
     def get_hit_rate(self, keyword_id: int) -> Dict[str, Any]:
         """
@@ -546,25 +624,18 @@ class IndexCheckService:
         Returns:
             命中率统计
         """
-        records = self.db.query(IndexCheckRecord).filter(IndexCheckRecord.keyword_id == keyword_id).all()
-
-        if not records:
-            return {"hit_rate": 0, "total": 0, "keyword_found": 0, "company_found": 0}
-
-        total = len(records)
-        keyword_found = sum(1 for r in records if r.keyword_found)
-        company_found = sum(1 for r in records if r.company_found)
+        counts = index_check_stats.get_totals(self.db, keyword_ids=[keyword_id])
 
         return {
-            "hit_rate": round((keyword_found + company_found) / (total * 2) * 100, 2),
-            "total": total,
-            "keyword_found": keyword_found,
-            "company_found": company_found,
+            "hit_rate": index_check_stats.hit_rate(counts),
+            "total": counts["total"],
+            "keyword_found": counts["keyword_found"],
+            "company_found": counts["company_found"],
         }
 
     def get_keyword_trend(self, keyword_id: int, days: int = 7) -> Dict[str, Any]:
         """
-        获取关键词收录趋势
+        获取关键词收录趋势（按自然日）
 
         Args:
             keyword_id: 关键词ID
@@ -573,56 +644,28 @@ class IndexCheckService:
         Returns:
             趋势数据
         """
-        from datetime import datetime, timedelta
-
-        # 获取起始时间
-        start_date = datetime.now() - timedelta(days=days)
-
         # 获取关键词信息
         keyword = self.db.query(Keyword).filter(Keyword.id == keyword_id).first()
         if not keyword:
             return {"keyword": None, "trend": []}
 
-        # 按天分组统计
-        trend_data = []
-
-        for day_offset in range(days, 0, -1):
-            day_start = datetime.now() - timedelta(days=day_offset)
-            day_end = day_start + timedelta(days=1)
-
-            # 获取当天的检测记录
-            records = (
-                self.db.query(IndexCheckRecord)
-                .filter(
-                    IndexCheckRecord.keyword_id == keyword_id,
-                    IndexCheckRecord.check_time >= day_start,
-                    IndexCheckRecord.check_time < day_end,
-                )
-                .all()
-            )
-
-            if not records:
-                continue
-
-            # 计算当天的统计数据
-            total = len(records)
-            keyword_found = sum(1 for r in records if r.keyword_found)
-            company_found = sum(1 for r in records if r.company_found)
-
-            # 计算命中率
-            hit_rate = round((keyword_found + company_found) / (total * 2) * 100, 2) if total > 0 else 0
-
-            trend_data.append(
-                {
-                    "date": day_start.strftime("%Y-%m-%d"),
-                    "total": total,
-                    "keyword_found": keyword_found,
-                    "company_found": company_found,
-                    "hit_rate": hit_rate,
-                    "keyword_pct": round((keyword_found / total) * 100, 2) if total > 0 else 0,
-                    "company_pct": round((company_found / total) * 100, 2) if total > 0 else 0,
-                }
-            )
+        # 按天分组统计（没有检测记录的日期不输出）
+        daily = index_check_stats.get_daily_totals(
+            self.db, keyword_ids=[keyword_id], since=index_check_stats.since_days(days)
+        )
+        trend_data = [
+            {
+                "date": day["date"].strftime("%Y-%m-%d"),
+                "total": day["total"],
+                "keyword_found": day["keyword_found"],
+                "company_found": day["company_found"],
+                "hit_rate": index_check_stats.hit_rate(day),
+                "keyword_pct": index_check_stats.pct(day["keyword_found"], day["total"]),
+                "company_pct": index_check_stats.pct(day["company_found"], day["total"]),
+            }
+            for day in daily
+            if day["total"] > 0
+        ]
 
         return {"keyword": keyword.keyword, "trend": trend_data, "total_days": days}
 
@@ -637,8 +680,6 @@ class IndexCheckService:
         Returns:
             项目分析数据
         """
-        from datetime import datetime, timedelta
-
         # 获取项目信息
         project = self.db.query(Project).filter(Project.id == project_id).first()
         if not project:
@@ -656,7 +697,10 @@ class IndexCheckService:
                 "summary": {"total_checks": 0, "avg_hit_rate": 0, "keyword_avg": 0, "company_avg": 0},
             }
 
-        start_date = datetime.now() - timedelta(days=days)
+        # 一次分组查询拿到所有关键词的计数
+        counts_by_keyword = index_check_stats.get_totals_by_keyword(
+            self.db, keyword_ids=[k.id for k in keywords], since=index_check_stats.since_days(days)
+        )
 
         keyword_analytics = []
         total_checks = 0
@@ -665,23 +709,14 @@ class IndexCheckService:
         total_company_avg = 0
 
         for keyword in keywords:
-            # 获取该关键词的检测记录
-            records = (
-                self.db.query(IndexCheckRecord)
-                .filter(IndexCheckRecord.keyword_id == keyword.id, IndexCheckRecord.check_time >= start_date)
-                .all()
-            )
-
-            if not records:
+            counts = counts_by_keyword.get(keyword.id)
+            if not counts or counts["total"] == 0:
                 continue
 
-            total = len(records)
-            keyword_found = sum(1 for r in records if r.keyword_found)
-            company_found = sum(1 for r in records if r.company_found)
-
-            hit_rate = round((keyword_found + company_found) / (total * 2) * 100, 2) if total > 0 else 0
-            keyword_pct = round((keyword_found / total) * 100, 2) if total > 0 else 0
-            company_pct = round((company_found / total) * 100, 2) if total > 0 else 0
+            total = counts["total"]
+            hit_rate = index_check_stats.hit_rate(counts)
+            keyword_pct = index_check_stats.pct(counts["keyword_found"], total)
+            company_pct = index_check_stats.pct(counts["company_found"], total)
 
             keyword_analytics.append(
                 {
@@ -730,70 +765,25 @@ class IndexCheckService:
         Returns:
             平台表现数据
         """
-        from datetime import datetime, timedelta
-
-        start_date = datetime.now() - timedelta(days=days)
-
-        # 构建查询条件
-        query = self.db.query(IndexCheckRecord)
-
-        if project_id:
-            # 通过关键词关联到项目
-            from sqlalchemy import and_
-
-            query = query.join(Keyword).filter(
-                and_(
-                    IndexCheckRecord.check_time >= start_date,
-                    Keyword.project_id == project_id,
-                    Keyword.status == "active",
-                )
-            )
-        else:
-            query = query.filter(IndexCheckRecord.check_time >= start_date)
-
-        records = query.all()
+        # 按平台分组统计（项目维度只统计启用中的关键词）
+        platform_data = index_check_stats.get_totals_by_platform(
+            self.db,
+            project_id=project_id or None,
+            active_only=True,
+            since=index_check_stats.since_days(days),
+        )
+        platform_data = {platform: data for platform, data in platform_data.items() if data["total"] > 0}
 
-        if not records:
+        if not platform_data:
             return {"platforms": [], "summary": {"total_checks": 0}}
 
-        # 按平台分组统计
-        platform_data = {}
-
-        for record in records:
-            platform = record.platform
-            if platform not in platform_data:
-                platform_data[platform] = {
-                    "platform": platform,
-                    "total": 0,
-                    "keyword_found": 0,
-                    "company_found": 0,
-                    "success_count": 0,
-                }
-
-            platform_data[platform]["total"] += 1
-            if record.keyword_found:
-                platform_data[platform]["keyword_found"] += 1
-            if record.company_found:
-                platform_data[platform]["company_found"] += 1
-
-            # 成功检测（有回答）
-            if record.answer and record.answer.strip():
-                platform_data[platform]["success_count"] += 1
-
-        # 计算各平台的命中率和成功率
+        # 计算各平台的命中率和成功率（成功检测 = 有回答）
         platforms = []
         total_checks = 0
         total_success = 0
 
         for platform, data in platform_data.items():
-            hit_rate = (
-                round((data["keyword_found"] + data["company_found"]) / (data["total"] * 2) * 100, 2)
-                if data["total"] > 0
-                else 0
-            )
-            keyword_pct = round((data["keyword_found"] / data["total"]) * 100, 2) if data["total"] > 0 else 0
-            company_pct = round((data["company_found"] / data["total"]) * 100, 2) if data["total"] > 0 else 0
-            success_rate = round((data["success_count"] / data["total"]) * 100, 2) if data["total"] > 0 else 0
+            hit_rate = index_check_stats.hit_rate(data)
 
             platforms.append(
                 {
@@ -801,15 +791,15 @@ class IndexCheckService:
                     "platform_name": self.checkers.get(platform, {}).name if platform in self.checkers else platform,
                     "total_checks": data["total"],
                     "hit_rate": hit_rate,
-                    "keyword_pct": keyword_pct,
-                    "company_pct": company_pct,
-                    "success_rate": success_rate,
+                    "keyword_pct": index_check_stats.pct(data["keyword_found"], data["total"]),
+                    "company_pct": index_check_stats.pct(data["company_found"], data["total"]),
+                    "success_rate": index_check_stats.pct(data["answered"], data["total"]),
                     "status": "good" if hit_rate > 60 else "warning" if hit_rate > 30 else "critical",
                 }
             )
 
             total_checks += data["total"]
-            total_success += data["success_count"]
+            total_success += data["answered"]
 
         # 按命中率排序
         platforms.sort(key=lambda x: x["hit_rate"], reverse=True)
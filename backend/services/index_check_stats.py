@@ -0,0 +1,318 @@
+# -*- coding: utf-8 -*-
+"""
+收录检测日汇总
+维护 index_check_daily_stats（关键词 + 平台 + 日期 的计数），并提供报表用的聚合查询
+
+写入 IndexCheckRecord 时通过 Session after_flush 事件在同一事务内累加计数，
+删除记录时扣减；检测流程用 insert_check_records() 批量写入（不经过 ORM，直接累加）；
+历史数据用 rebuild_daily_stats() 回填（见 backend/scripts/backfill_index_stats.py）
+"""
+
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from loguru import logger
+from sqlalchemy import case, delete, event, func, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from backend.database.models import IndexCheckDailyStat, IndexCheckRecord, Keyword
+
+# (keyword_id, platform, stat_date)
+StatKey = Tuple[int, str, date]
+
+_COUNT_COLUMNS = ("total", "keyword_found", "company_found", "answered")
+
+
+def _stat_date(check_time: Optional[datetime]) -> date:
+    return (check_time or datetime.now()).date()
+
+
+def _counts(keyword_found: Any, company_found: Any, answer: Optional[str]) -> List[int]:
+    """单条记录对应的计数 [total, keyword_found, company_found, answered]"""
+    return [
+        1,
+        1 if keyword_found else 0,
+        1 if company_found else 0,
+        1 if answer and answer.strip() else 0,
+    ]
+
+
+def _record_counts(record: IndexCheckRecord) -> List[int]:
+    return _counts(record.keyword_found, record.company_found, record.answer)
+
+
+def _apply_deltas(connection, deltas: Dict[StatKey, List[int]]):
+    """把计数增量写入汇总表（新增用 upsert，扣减用 update，扣到 0 的行删除）"""
+    table = IndexCheckDailyStat.__table__
+    dialect = connection.dialect.name
+    insert = pg_insert if dialect == "postgresql" else sqlite_insert
+
+    # 新增：所有 key 合成一条 executemany upsert（语句结构固定，可走编译缓存）
+    additions = [
+        {"keyword_id": keyword_id, "platform": platform, "stat_date": stat_date, **dict(zip(_COUNT_COLUMNS, counts))}
+        for (keyword_id, platform, stat_date), counts in deltas.items()
+        if counts[0] > 0
+    ]
+    if additions:
+        stmt = insert(table).values(updated_at=func.now())
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["keyword_id", "platform", "stat_date"],
+            set_={**{col: table.c[col] + stmt.excluded[col] for col in _COUNT_COLUMNS}, "updated_at": func.now()},
+        )
+        connection.execute(stmt, additions)
+
+    # 扣减（删除记录）：逐个 key 更新
+    for (keyword_id, platform, stat_date), counts in deltas.items():
+        if counts[0] > 0:
+            continue
+        values = dict(zip(_COUNT_COLUMNS, counts))
+        connection.execute(
+            update(table)
+            .where(
+                table.c.keyword_id == keyword_id,
+                table.c.platform == platform,
+                table.c.stat_date == stat_date,
+            )
+            .values({**{col: table.c[col] + values[col] for col in _COUNT_COLUMNS}, "updated_at": func.now()})
+        )
+
+        if counts[0] < 0:
+            # 当天记录已全部删除，清掉空行（关键词被删除时也不会留下孤儿汇总）
+            connection.execute(
+                delete(table).where(
+                    table.c.keyword_id == keyword_id,
+                    table.c.platform == platform,
+                    table.c.stat_date == stat_date,
+                    table.c.total <= 0,
+                )
+            )
+
+
+@event.listens_for(Session, "after_flush")
+def _maintain_daily_stats(session: Session, flush_context):
+    """
+    检测记录写入/删除后同步更新日汇总（与记录在同一事务中提交或回滚）
+
+    注意：query(...).delete() 这类批量删除不会触发，删除记录请逐条 session.delete()！
+    """
+    deltas: Dict[StatKey, List[int]] = defaultdict(lambda: [0, 0, 0, 0])
+
+    for obj in session.new:
+        if isinstance(obj, IndexCheckRecord):
+            key = (obj.keyword_id, obj.platform, _stat_date(obj.check_time))
+            for i, n in enumerate(_record_counts(obj)):
+                deltas[key][i] += n
+
+    for obj in session.deleted:
+        if isinstance(obj, IndexCheckRecord):
+            key = (obj.keyword_id, obj.platform, _stat_date(obj.check_time))
+            for i, n in enumerate(_record_counts(obj)):
+                deltas[key][i] -= n
+
+    if deltas:
+        _apply_deltas(session.connection(), deltas)
+
+
+def insert_check_records(db: Session, rows: List[Dict[str, Any]]) -> int:
+    """
+    批量写入检测记录（一条 executemany INSERT）并在同一事务内累加日汇总，由调用方提交
+
+    不构造 ORM 对象、不经过 flush，after_flush 不会触发，所以这里直接累加汇总
+
+    Args:
+        db: 数据库会话
+        rows: IndexCheckRecord 的列字典（keyword_id / platform / question / answer / keyword_found /
+              company_found / check_time）
+
+    Returns:
+        写入的记录数
+    """
+    if not rows:
+        return 0
+
+    deltas: Dict[StatKey, List[int]] = defaultdict(lambda: [0, 0, 0, 0])
+    for row in rows:
+        key = (row["keyword_id"], row["platform"], _stat_date(row.get("check_time")))
+        for i, n in enumerate(_counts(row.get("keyword_found"), row.get("company_found"), row.get("answer"))):
+            deltas[key][i] += n
+
+    connection = db.connection()
+    connection.execute(IndexCheckRecord.__table__.insert(), rows)
+    _apply_deltas(connection, deltas)
+    return len(rows)
+
+
+def rebuild_daily_stats(db: Session, since: Optional[date] = None) -> int:
+    """
+    从原始检测记录重建日汇总
+
+    Args:
+        db: 数据库会话
+        since: 只重建该日期及之后的数据，默认全部
+
+    Returns:
+        写入的汇总行数
+    """
+    stat_day = func.date(IndexCheckRecord.check_time)
+    query = db.query(
+        IndexCheckRecord.keyword_id,
+        IndexCheckRecord.platform,
+        stat_day.label("stat_date"),
+        func.count(IndexCheckRecord.id).label("total"),
+        func.sum(case((IndexCheckRecord.keyword_found == True, 1), else_=0)).label("keyword_found"),  # noqa: E712
+        func.sum(case((IndexCheckRecord.company_found == True, 1), else_=0)).label("company_found"),  # noqa: E712
+        func.sum(case((func.length(func.trim(IndexCheckRecord.answer)) > 0, 1), else_=0)).label("answered"),
+    ).filter(IndexCheckRecord.check_time.isnot(None))
+
+    stale = db.query(IndexCheckDailyStat)
+    if since:
+        query = query.filter(IndexCheckRecord.check_time >= datetime.combine(since, time.min))
+        stale = stale.filter(IndexCheckDailyStat.stat_date >= since)
+
+    rows = query.group_by(IndexCheckRecord.keyword_id, IndexCheckRecord.platform, stat_day).all()
+
+    stale.delete(synchronize_session=False)
+    for row in rows:
+        # SQLite 的 date() 返回字符串
+        stat_date = date.fromisoformat(row.stat_date) if isinstance(row.stat_date, str) else row.stat_date
+        db.add(
+            IndexCheckDailyStat(
+                keyword_id=row.keyword_id,
+                platform=row.platform,
+                stat_date=stat_date,
+                total=row.total or 0,
+                keyword_found=row.keyword_found or 0,
+                company_found=row.company_found or 0,
+                answered=row.answered or 0,
+            )
+        )
+    db.commit()
+
+    logger.info(f"📊 收录检测日汇总已重建: {len(rows)} 行" + (f"（{since} 起）" if since else ""))
+    return len(rows)
+
+
+def ensure_daily_stats(engine, existing_tables: Iterable[str]) -> int:
+    """
+    启动时检查：旧库在本次 init_db 中才建出日汇总表的，从原始检测记录回填
+    （报表、告警都只读汇总表，不回填会全部显示为 0）
+
+    Args:
+        engine: 同步引擎
+        existing_tables: create_all 之前已存在的表名
+
+    Returns:
+        写入的汇总行数
+    """
+    existing_tables = set(existing_tables)
+    if (
+        IndexCheckDailyStat.__tablename__ in existing_tables
+        or IndexCheckRecord.__tablename__ not in existing_tables
+    ):
+        return 0
+    with Session(bind=engine) as db:
+        return rebuild_daily_stats(db)
+
+
+# ==================== 报表查询 ====================
+
+
+def since_days(days: int) -> date:
+    """最近 N 天的起始日期（按自然日统计，含今天共 N 天：since_days(1) 为今天，since_days(7) 为 6 天前）"""
+    return datetime.now().date() - timedelta(days=max(days, 1) - 1)
+
+
+def _sums():
+    return (
+        func.coalesce(func.sum(IndexCheckDailyStat.total), 0).label("total"),
+        func.coalesce(func.sum(IndexCheckDailyStat.keyword_found), 0).label("keyword_found"),
+        func.coalesce(func.sum(IndexCheckDailyStat.company_found), 0).label("company_found"),
+        func.coalesce(func.sum(IndexCheckDailyStat.answered), 0).label("answered"),
+    )
+
+
+def _filtered(
+    query,
+    keyword_ids: Optional[Iterable[int]] = None,
+    project_id: Optional[int] = None,
+    active_only: bool = False,
+    platform: Optional[str] = None,
+    since: Optional[date] = None,
+):
+    if keyword_ids is not None:
+        query = query.filter(IndexCheckDailyStat.keyword_id.in_(keyword_ids))
+    if project_id is not None:
+        query = query.join(Keyword, Keyword.id == IndexCheckDailyStat.keyword_id).filter(
+            Keyword.project_id == project_id
+        )
+        if active_only:
+            query = query.filter(Keyword.status == "active")
+    if platform:
+        query = query.filter(IndexCheckDailyStat.platform == platform)
+    if since:
+        query = query.filter(IndexCheckDailyStat.stat_date >= since)
+    return query
+
+
+def _as_dict(row) -> Dict[str, int]:
+    return {col: int(getattr(row, col) or 0) for col in _COUNT_COLUMNS}
+
+
+def get_totals(db: Session, **filters) -> Dict[str, int]:
+    """
+    汇总计数
+
+    Args:
+        filters: keyword_ids / project_id / active_only / platform / since
+
+    Returns:
+        {total, keyword_found, company_found, answered}
+    """
+    return _as_dict(_filtered(db.query(*_sums()), **filters).one())
+
+
+def get_totals_by_platform(db: Session, **filters) -> Dict[str, Dict[str, int]]:
+    """按平台汇总计数"""
+    rows = _filtered(db.query(IndexCheckDailyStat.platform, *_sums()), **filters).group_by(
+        IndexCheckDailyStat.platform
+    )
+    return {row.platform: _as_dict(row) for row in rows}
+
+
+def get_totals_by_keyword(db: Session, **filters) -> Dict[int, Dict[str, int]]:
+    """按关键词汇总计数"""
+    rows = _filtered(db.query(IndexCheckDailyStat.keyword_id, *_sums()), **filters).group_by(
+        IndexCheckDailyStat.keyword_id
+    )
+    return {row.keyword_id: _as_dict(row) for row in rows}
+
+
+def get_totals_by_project(db: Session, since: Optional[date] = None) -> Dict[int, Dict[str, int]]:
+    """按项目汇总计数"""
+    query = db.query(Keyword.project_id, *_sums()).join(Keyword, Keyword.id == IndexCheckDailyStat.keyword_id)
+    if since:
+        query = query.filter(IndexCheckDailyStat.stat_date >= since)
+    return {row.project_id: _as_dict(row) for row in query.group_by(Keyword.project_id)}
+
+
+def get_daily_totals(db: Session, **filters) -> List[Dict[str, Any]]:
+    """按日期汇总计数（升序）"""
+    rows = (
+        _filtered(db.query(IndexCheckDailyStat.stat_date, *_sums()), **filters)
+        .group_by(IndexCheckDailyStat.stat_date)
+        .order_by(IndexCheckDailyStat.stat_date)
+    )
+    return [{"date": row.stat_date, **_as_dict(row)} for row in rows]
+
+
+def hit_rate(counts: Dict[str, int]) -> float:
+    """综合命中率：(关键词命中 + 公司命中) / (检测次数 × 2)"""
+    total = counts["total"]
+    return round((counts["keyword_found"] + counts["company_found"]) / (total * 2) * 100, 2) if total > 0 else 0
+
+
+def pct(part: int, total: int) -> float:
+    return round(part / total * 100, 2) if total > 0 else 0
@@ -10,8 +10,8 @@ from sqlalchemy.orm import Session
 from loguru import logger
 
 from backend.database.models import KnowledgeCategory, Knowledge
-from backend.services.ragflow_client import RAGFlowClient
-from backend.config import RAGFLOW_BASE_URL, RAGFLOW_API_KEY
+from backend.services.ragflow_client import get_ragflow_client
+from backend.services.ragflow_listing_cache import ragflow_listing_cache
 
 
 class SyncStrategy:
@@ -40,9 +40,10 @@ class KnowledgeSyncService:
             db: 数据库会话
         """
         self.db = db
-        self.ragflow = RAGFlowClient(base_url=RAGFLOW_BASE_URL, api_key=RAGFLOW_API_KEY)
+        # 共享全局客户端的连接池
+        self.ragflow = get_ragflow_client()
 
-    def sync_from_ragflow(self) -> Tuple[int, int]:
+    async def sync_from_ragflow(self) -> Tuple[int, int]:
         """
         从RAGFlow同步所有数据到SQLite缓存
 
@@ -52,15 +53,15 @@ class KnowledgeSyncService:
         logger.info("开始从RAGFlow同步所有数据...")
 
         # 1. 同步所有知识库
-        cat_success, cat_fail = self.sync_all_categories_from_ragflow()
+        cat_success, cat_fail = await self.sync_all_categories_from_ragflow()
 
         # 2. 同步所有文档
-        know_success, know_fail = self.sync_all_knowledge_from_ragflow()
+        know_success, know_fail = await self.sync_all_knowledge_from_ragflow()
 
         logger.info(f"同步完成: 分类({cat_success}成功/{cat_fail}失败), 知识({know_success}成功/{know_fail}失败)")
         return (cat_success + know_success), (cat_fail + know_fail)
 
-    def sync_all_categories_from_ragflow(self) -> Tuple[int, int]:
+    async def sync_all_categories_from_ragflow(self) -> Tuple[int, int]:
         """
         同步所有分类到SQLite缓存
 
@@ -68,7 +69,7 @@ class KnowledgeSyncService:
             (成功数量, 失败数量)
         """
         try:
-            result = self.ragflow.list_datasets()
+            result = await self.ragflow.list_datasets()
             if result.get("code") != 0:
                 logger.error(f"获取RAGFlow知识库失败: {result.get('message')}")
                 return 0, 0
@@ -132,7 +133,7 @@ class KnowledgeSyncService:
             self.db.rollback()
             return False
 
-    def sync_all_knowledge_from_ragflow(self) -> Tuple[int, int]:
+    async def sync_all_knowledge_from_ragflow(self) -> Tuple[int, int]:
         """
         同步所有知识条目到SQLite缓存
 
@@ -150,14 +151,14 @@ class KnowledgeSyncService:
         )
 
         for category in categories:
-            if self.sync_knowledge_from_ragflow(category.ragflow_dataset_id):
+            if await self.sync_knowledge_from_ragflow(category.ragflow_dataset_id):
                 success_count += 1
             else:
                 fail_count += 1
 
         return success_count, fail_count
 
-    def sync_knowledge_from_ragflow(self, dataset_id: str) -> bool:
+    async def sync_knowledge_from_ragflow(self, dataset_id: str) -> bool:
         """
         从RAGFlow同步知识库的文档到SQLite
 
@@ -169,7 +170,7 @@ class KnowledgeSyncService:
         """
         try:
             # 获取RAGFlow中的文档
-            result = self.ragflow.list_documents(dataset_id)
+            result = await self.ragflow.list_documents(dataset_id)
             if result.get("code") != 0:
                 logger.error(f"获取RAGFlow文档失败: {result.get('message')}")
                 return False
@@ -221,7 +222,7 @@ class KnowledgeSyncService:
         logger.warning("sync_knowledge_to_ragflow已废弃，不再使用")
         return True
 
-    def delete_category_from_ragflow(self, category: KnowledgeCategory) -> bool:
+    async def delete_category_from_ragflow(self, category: KnowledgeCategory) -> bool:
         """
         从RAGFlow删除分类
 
@@ -236,9 +237,11 @@ class KnowledgeSyncService:
                 return True  # 未同步过，无需删除
 
             # 从RAGFlow删除知识库
-            result = self.ragflow.delete_dataset(category.ragflow_dataset_id)
+            result = await self.ragflow.delete_dataset(category.ragflow_dataset_id)
 
             if result.get("code") == 0:
+                ragflow_listing_cache.invalidate_datasets()
+                ragflow_listing_cache.invalidate_documents(category.ragflow_dataset_id)
                 # 清空本地同步状态
                 category.ragflow_dataset_id = None
                 category.sync_status = "deleted"
@@ -254,7 +257,7 @@ class KnowledgeSyncService:
             self.db.rollback()
             return False
 
-    def delete_knowledge_from_ragflow(self, knowledge: Knowledge) -> bool:
+    async def delete_knowledge_from_ragflow(self, knowledge: Knowledge) -> bool:
         """
         从RAGFlow删除知识条目
 
@@ -269,9 +272,10 @@ class KnowledgeSyncService:
                 return True  # 未同步过，无需删除
 
             # 从RAGFlow删除文档
-            result = self.ragflow.delete_document(knowledge.ragflow_dataset_id, knowledge.ragflow_document_id)
+            result = await self.ragflow.delete_document(knowledge.ragflow_dataset_id, knowledge.ragflow_document_id)
 
             if result.get("code") == 0:
+                ragflow_listing_cache.invalidate_documents(knowledge.ragflow_dataset_id)
                 # 清空本地同步状态
                 knowledge.ragflow_document_id = None
                 knowledge.sync_status = "deleted"
@@ -330,7 +334,7 @@ class KnowledgeSyncService:
             "sync_progress": f"{synced_knowledges}/{total_knowledges}",
         }
 
-    def search_in_ragflow(
+    async def search_in_ragflow(
         self, query: str, dataset_ids: List[str], top_k: int = 50, similarity_threshold: float = 0.7
     ) -> List[Dict]:
         """
@@ -346,7 +350,7 @@ class KnowledgeSyncService:
             搜索结果列表
         """
         try:
-            result = self.ragflow.retrieve(
+            result = await self.ragflow.retrieve(
                 question=query, dataset_ids=dataset_ids, similarity_threshold=similarity_threshold, top_k=top_k
             )
 
@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+"""
+实时日志推送
+Loguru sink 只把日志追加到环形缓冲（任意线程可调用），后台任务每隔 LOG_STREAM_FLUSH_INTERVAL_MS
+把新日志打成一帧 {"type": "log_batch", "logs": [...]} 广播，不再每条日志建一个 asyncio 任务
+
+- 按模块限流：同一模块每秒超过 LOG_STREAM_MODULE_RATE_LIMIT 条的 INFO 日志被省略，窗口结束时补一条提示
+- 新连接的客户端先收到缓冲中已推送过的历史日志，之后的由定时推送补上
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from backend.config import LOG_STREAM_FLUSH_INTERVAL_MS, LOG_STREAM_HISTORY_SIZE, LOG_STREAM_MODULE_RATE_LIMIT
+
+# WARNING 及以上不限流
+_UNLIMITED_LEVEL_NO = 30
+
+
+class LogStreamer:
+    """日志环形缓冲 + 定时成批推送"""
+
+    def __init__(
+        self,
+        publish: Optional[Callable[[dict], Any]] = None,
+        history_size: int = LOG_STREAM_HISTORY_SIZE,
+        flush_interval_ms: int = LOG_STREAM_FLUSH_INTERVAL_MS,
+        module_rate_limit: int = LOG_STREAM_MODULE_RATE_LIMIT,
+    ):
+        """
+        Args:
+            publish: 广播函数（同步，在事件循环线程中调用），默认 ws_manager.publish
+            history_size: 环形缓冲条数
+            flush_interval_ms: 推送间隔（毫秒）
+            module_rate_limit: 每个模块每秒最多推送的日志条数，0 表示不限
+        """
+        self._publish = publish
+        self.flush_interval = flush_interval_ms / 1000
+        self.module_rate_limit = module_rate_limit
+
+        # (序号, 日志) 的环形缓冲，满了自动丢最旧的
+        self._ring: deque = deque(maxlen=history_size)
+        self._lock = threading.Lock()
+        self._seq = 0
+        self._flushed_seq = 0
+
+        # 限流窗口（按秒）
+        self._window = 0
+        self._window_counts: Dict[str, int] = {}
+        self._suppressed: Dict[str, int] = {}
+
+        self._task: Optional[asyncio.Task] = None
+        self._stats = {"received": 0, "suppressed": 0, "overflowed": 0, "frames": 0}
+
+    # ==================== 写入（任意线程） ====================
+
+    def sink(self, message):
+        """Loguru sink"""
+        record = message.record
+        self.append(
+            {
+                "time": record["time"].strftime("%H:%M:%S"),
+                "level": record["level"].name,
+                "module": record["extra"].get("module", "系统"),
+                "message": record["message"],
+            },
+            level_no=record["level"].no,
+        )
+
+    def append(self, payload: Dict[str, Any], level_no: int = 20):
+        """追加一条日志（超过模块限流的 INFO 日志只计数）"""
+        with self._lock:
+            self._stats["received"] += 1
+            window = int(time.monotonic())
+            if window != self._window:
+                self._roll_window(window)
+
+            module = payload.get("module", "系统")
+            count = self._window_counts.get(module, 0) + 1
+            self._window_counts[module] = count
+            if self.module_rate_limit and count > self.module_rate_limit and level_no < _UNLIMITED_LEVEL_NO:
+                self._suppressed[module] = self._suppressed.get(module, 0) + 1
+                self._stats["suppressed"] += 1
+                return
+            self._push(payload)
+
+    def _push(self, payload: Dict[str, Any]):
+        self._seq += 1
+        self._ring.append((self._seq, payload))
+
+    def _roll_window(self, window: int):
+        """进入新的限流窗口，为上个窗口被省略的日志补一条提示"""
+        for module, count in self._suppressed.items():
+            self._push(
+                {
+                    "time": datetime.now().strftime("%H:%M:%S"),
+                    "level": "WARNING",
+                    "module": module,
+                    "message": f"日志过多，已省略 {count} 条",
+                }
+            )
+        self._window = window
+        self._window_counts = {}
+        self._suppressed = {}
+
+    # ==================== 推送（事件循环） ====================
+
+    def recent(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        缓冲中已推送过的最近日志（旧的在前），用作新客户端的历史回放
+
+        还没推送的日志不算历史：客户端先注册再取历史，这部分会由下一次 flush() 推送，
+        放进历史会让新客户端收到两遍
+        """
+        with self._lock:
+            entries = [payload for seq, payload in self._ring if seq <= self._flushed_seq]
+        return entries[-limit:] if limit else entries
+
+    def flush(self) -> int:
+        """把上次推送之后的新日志打成一帧广播，返回推送条数"""
+        with self._lock:
+            window = int(time.monotonic())
+            if window != self._window and self._suppressed:
+                self._roll_window(window)
+            if self._seq == self._flushed_seq:
+                return 0
+            entries = [(seq, payload) for seq, payload in self._ring if seq > self._flushed_seq]
+            if entries and entries[0][0] > self._flushed_seq + 1:
+                # 两次推送之间的日志超过了缓冲容量，最早的已被覆盖
+                self._stats["overflowed"] += entries[0][0] - self._flushed_seq - 1
+            self._flushed_seq = self._seq
+
+        if entries:
+            publish = self._publish
+            if publish is None:
+                from backend.services.websocket_manager import ws_manager
+
+                publish = ws_manager.publish
+            publish({"type": "log_batch", "logs": [payload for _, payload in entries]})
+            self._stats["frames"] += 1
+        return len(entries)
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                self.flush()
+            except Exception:
+                # 推送失败不能打日志（日志本身会再进缓冲），下一轮重试
+                pass
+
+    def start(self):
+        """启动定时推送（在事件循环中调用）"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="log-stream-flusher")
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        self.flush()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self._stats, "buffered": len(self._ring), "flush_interval_ms": int(self.flush_interval * 1000)}
+
+
+# 全局单例
+log_streamer = LogStreamer()
@@ -0,0 +1,374 @@
+# -*- coding: utf-8 -*-
+"""
+本地近重复检测索引（SimHash + LSH 分段）
+采集文章入库前先查本地索引，明显重复/明显不重复的直接判定，只有临界情况才走 RAGFlow 语义检索
+
+原理：
+- 每篇文章按字符 3-gram 计算 64 位 SimHash，内容越像指纹的汉明距离越小
+- 指纹切成 NEAR_DUPLICATE_BANDS 段，任一段完全相同即为候选（鸽巢原理：
+  距离 < 段数 的文章一定能被找到，所以临界距离必须小于段数），候选再精确比较汉明距离
+- 索引覆盖 ReferenceArticle 和 GeoArticle，持久化到磁盘；每次采集开始时按 updated_at 水位增量同步
+  （软删除也会更新 updated_at，随增量同步清理），物理删除的文章每隔 NEAR_DUPLICATE_PRUNE_INTERVAL 全量核对一次
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from loguru import logger
+from sqlalchemy import literal
+from sqlalchemy.orm import Session
+
+from backend.config import (
+    DATABASE_DIR,
+    NEAR_DUPLICATE_BANDS,
+    NEAR_DUPLICATE_BORDERLINE_DISTANCE,
+    NEAR_DUPLICATE_MAX_DISTANCE,
+    NEAR_DUPLICATE_MIN_LENGTH,
+    NEAR_DUPLICATE_PRUNE_INTERVAL,
+)
+
+FINGERPRINT_BITS = 64
+SHINGLE_SIZE = 3
+INDEX_FILE = DATABASE_DIR / "near_duplicate_index.json"
+INDEX_FORMAT_VERSION = 1
+
+# 判定结果
+DUPLICATE = "duplicate"
+BORDERLINE = "borderline"
+UNIQUE = "unique"
+
+_NON_WORD = re.compile(r"[\W_]+", re.UNICODE)
+
+
+def _normalize(text: str) -> str:
+    """去掉空白和标点并转小写，转载时常见的排版差异不影响指纹"""
+    return _NON_WORD.sub("", text or "").lower()
+
+
+def _hash64(token: str) -> int:
+    # 不用内置 hash()：它按进程随机化，持久化后的指纹会对不上
+    return int.from_bytes(_digest64(token), "big")
+
+
+def _digest64(token: str) -> bytes:
+    return hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
+
+
+# 字节值 -> 把 8 个比特分别放到 8 个 32 位计数槽里的整数，
+# 同一字节位置上所有 shingle 的计数可以一次大整数乘加累计出来
+_LANE_BITS = 32
+_LANE_MASK = (1 << _LANE_BITS) - 1
+_SPREAD = [sum(1 << (bit * _LANE_BITS) for bit in range(8) if value >> bit & 1) for value in range(256)]
+
+
+def simhash(text: str) -> int:
+    """
+    计算 64 位 SimHash 指纹
+
+    不逐个 shingle 逐位累加：按字节位置统计各字节值出现次数，再用计数槽一次性求出每一位为 1 的个数
+    （某一位权重 > 0 等价于该位为 1 的 shingle 超过半数），结果与逐位累加相同
+
+    Args:
+        text: 文章正文
+
+    Returns:
+        指纹（无有效内容时返回 0）
+    """
+    normalized = _normalize(text)
+    if not normalized:
+        return 0
+    if len(normalized) <= SHINGLE_SIZE:
+        shingles = {normalized}
+    else:
+        shingles = {normalized[i : i + SHINGLE_SIZE] for i in range(len(normalized) - SHINGLE_SIZE + 1)}
+
+    digests = b"".join(map(_digest64, shingles))
+    fingerprint = 0
+    for position in range(8):
+        # 大端序：第 position 个字节对应指纹的第 (7 - position) * 8 ~ +7 位
+        lanes = sum(count * _SPREAD[value] for value, count in Counter(digests[position::8]).items())
+        base = (7 - position) * 8
+        for bit in range(8):
+            if 2 * ((lanes >> (bit * _LANE_BITS)) & _LANE_MASK) > len(shingles):
+                fingerprint |= 1 << (base + bit)
+    return fingerprint
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+class NearDuplicateIndex:
+    """
+    近重复检测索引
+
+    文档键格式为 "<来源>:<ID>"，来源为 reference（参考文章）或 geo（生成文章）
+    """
+
+    # 来源 -> (模型名, 是否只索引 status=1 的记录)
+    SOURCES = {"reference": ("ReferenceArticle", True), "geo": ("GeoArticle", False)}
+
+    def __init__(
+        self,
+        path: Optional[Path] = INDEX_FILE,
+        bands: int = NEAR_DUPLICATE_BANDS,
+        max_distance: int = NEAR_DUPLICATE_MAX_DISTANCE,
+        borderline_distance: int = NEAR_DUPLICATE_BORDERLINE_DISTANCE,
+        min_length: int = NEAR_DUPLICATE_MIN_LENGTH,
+        prune_interval: int = NEAR_DUPLICATE_PRUNE_INTERVAL,
+    ):
+        """
+        Args:
+            path: 持久化文件路径（None 则只在内存中）
+            bands: LSH 分段数，距离小于段数的文章保证能成为候选
+            max_distance: 汉明距离不超过该值直接判定为重复
+            borderline_distance: 距离在 (max_distance, borderline_distance] 之间为临界，交给 RAGFlow 判定
+            min_length: 正文（去标点后）短于该长度时指纹不可靠，按临界处理
+            prune_interval: 全量核对物理删除的间隔（秒）
+        """
+        if FINGERPRINT_BITS % bands:
+            raise ValueError(f"分段数必须能整除 {FINGERPRINT_BITS}: {bands}")
+        if borderline_distance >= bands:
+            raise ValueError(f"临界距离必须小于分段数，否则不保证能召回: {borderline_distance} >= {bands}")
+        self.path = Path(path) if path else None
+        self.bands = bands
+        self.band_bits = FINGERPRINT_BITS // bands
+        self.max_distance = max_distance
+        self.borderline_distance = borderline_distance
+        self.min_length = min_length
+        self.prune_interval = prune_interval
+        # 上次全量核对的时间（monotonic），进程内首次同步时核对一次
+        self._last_prune: Optional[float] = None
+
+        self._fingerprints: Dict[str, int] = {}
+        self._buckets: List[Dict[int, Set[str]]] = [defaultdict(set) for _ in range(bands)]
+        self._watermarks: Dict[str, str] = {}
+        self._lock = threading.RLock()
+        # 同一时间只有一个 refresh（在线程池里执行，可能有多次采集同时触发）
+        self._refresh_lock = threading.Lock()
+        self._dirty = False
+        self._loaded = False
+        self._stats = {"duplicate": 0, "borderline": 0, "unique": 0}
+
+    # ==================== 索引维护 ====================
+
+    def _band_values(self, fingerprint: int):
+        mask = (1 << self.band_bits) - 1
+        for band in range(self.bands):
+            yield band, (fingerprint >> (band * self.band_bits)) & mask
+
+    def _put(self, key: str, fingerprint: int):
+        self._drop(key)
+        self._fingerprints[key] = fingerprint
+        for band, value in self._band_values(fingerprint):
+            self._buckets[band][value].add(key)
+
+    def _drop(self, key: str):
+        old = self._fingerprints.pop(key, None)
+        if old is None:
+            return
+        for band, value in self._band_values(old):
+            bucket = self._buckets[band].get(value)
+            if bucket:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[band][value]
+
+    def add(self, source: str, doc_id: int, content: str = "", fingerprint: Optional[int] = None):
+        """新增或更新一篇文章的指纹（已在线程里算好指纹的直接传 fingerprint）"""
+        if fingerprint is None:
+            fingerprint = simhash(content)
+        with self._lock:
+            self._put(f"{source}:{doc_id}", fingerprint)
+            self._dirty = True
+
+    def remove(self, source: str, doc_id: int):
+        """从索引中移除文章"""
+        with self._lock:
+            self._drop(f"{source}:{doc_id}")
+            self._dirty = True
+
+    def __len__(self) -> int:
+        return len(self._fingerprints)
+
+    # ==================== 查询 ====================
+
+    def query(self, content: str, fingerprint: Optional[int] = None) -> Tuple[str, List[Dict]]:
+        """
+        查询近重复文章
+
+        算指纹是纯 CPU 计算，在事件循环里调用时先用 asyncio.to_thread(simhash, ...) 算好再传入
+
+        Args:
+            content: 待检查的正文
+            fingerprint: 已算好的 simhash(content)，不传则现算
+
+        Returns:
+            (判定结果, 相似文章列表)：判定结果为 duplicate / borderline / unique，
+            相似文章按距离升序，包含 key / distance / similarity
+        """
+        if fingerprint is None:
+            fingerprint = simhash(content)
+        with self._lock:
+            candidates: Set[str] = set()
+            for band, value in self._band_values(fingerprint):
+                candidates |= self._buckets[band].get(value, set())
+            matches = []
+            for key in candidates:
+                distance = hamming_distance(fingerprint, self._fingerprints[key])
+                if distance <= self.borderline_distance:
+                    matches.append(
+                        {"key": key, "distance": distance, "similarity": round(1 - distance / FINGERPRINT_BITS, 4)}
+                    )
+        matches.sort(key=lambda m: m["distance"])
+
+        if matches and matches[0]["distance"] <= self.max_distance:
+            verdict = DUPLICATE
+        elif matches or len(_normalize(content)) < self.min_length:
+            verdict = BORDERLINE
+        else:
+            verdict = UNIQUE
+        self._stats[verdict] += 1
+        return verdict, matches
+
+    def get_stats(self) -> Dict:
+        return {
+            "documents": len(self._fingerprints),
+            "bands": self.bands,
+            "max_distance": self.max_distance,
+            "borderline_distance": self.borderline_distance,
+            **self._stats,
+        }
+
+    # ==================== 持久化 ====================
+
+    def load(self) -> bool:
+        """从磁盘加载索引，文件不存在或格式不符时返回 False"""
+        if not self.path or not self.path.exists():
+            return False
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            if data.get("version") != INDEX_FORMAT_VERSION or data.get("bands") != self.bands:
+                logger.info("🔁 近重复索引格式已变化，将全量重建")
+                return False
+            with self._lock:
+                self._fingerprints.clear()
+                self._buckets = [defaultdict(set) for _ in range(self.bands)]
+                for key, fingerprint in data.get("fingerprints", {}).items():
+                    self._put(key, int(fingerprint, 16))
+                self._watermarks = dict(data.get("watermarks", {}))
+                self._dirty = False
+            return True
+        except Exception as e:
+            logger.warning(f"⚠️ 近重复索引加载失败，将全量重建: {e}")
+            return False
+
+    def save(self):
+        """写入磁盘（先写临时文件再替换，避免写一半的文件）"""
+        if not self.path or not self._dirty:
+            return
+        with self._lock:
+            data = {
+                "version": INDEX_FORMAT_VERSION,
+                "bands": self.bands,
+                "watermarks": self._watermarks,
+                "fingerprints": {key: format(fp, "016x") for key, fp in self._fingerprints.items()},
+            }
+            self._dirty = False
+        tmp_path = self.path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(data), encoding="utf-8")
+        os.replace(tmp_path, self.path)
+
+    def refresh(self, db: Session, batch_size: int = 500) -> int:
+        """
+        增量同步数据库（每次采集开始时调用一次，本次采集新入库的文章在保存时直接加入索引）
+
+        首次同步要给全部文章算指纹，耗时与文章数成正比，必须在线程里调用（asyncio.to_thread + 独立会话），
+        不能阻塞事件循环。首次调用先从磁盘加载，再索引 updated_at 晚于水位的文章：仍有效的新增/更新，
+        已软删除的移除；物理删除的文章每隔 prune_interval 全量核对一次
+
+        Args:
+            db: 数据库会话
+            batch_size: 每批读取的行数
+
+        Returns:
+            本次新增/更新的文章数
+        """
+        with self._refresh_lock:
+            return self._refresh(db, batch_size)
+
+    def _refresh(self, db: Session, batch_size: int) -> int:
+        from backend.database import models
+
+        with self._lock:
+            if not self._loaded:
+                self.load()
+                self._loaded = True
+
+        now = time.monotonic()
+        prune = self._last_prune is None or now - self._last_prune >= self.prune_interval
+
+        updated = removed = 0
+        for source, (model_name, active_only) in self.SOURCES.items():
+            model = getattr(models, model_name)
+            watermark = self._watermarks.get(source)
+
+            # 不按 status 过滤：软删除的记录也要读到，才能从索引里移除
+            status_column = model.status if active_only else literal(1)
+            query = db.query(model.id, model.content, model.updated_at, status_column)
+            if watermark:
+                # 往前多读 1 秒：同一秒内更新的记录不能漏（SQLite 里 func.now() 存的是不带微秒的字符串，
+                # 与带 .000000 的参数按字符串比较时同一秒会被判为更小），重复计算一次也没关系
+                query = query.filter(model.updated_at >= datetime.fromisoformat(watermark) - timedelta(seconds=1))
+
+            latest = watermark
+            for doc_id, content, updated_at, status in query.order_by(model.id).yield_per(batch_size):
+                if status != 1:
+                    if f"{source}:{doc_id}" in self._fingerprints:
+                        self.remove(source, doc_id)
+                        removed += 1
+                else:
+                    self.add(source, doc_id, content or "")
+                    updated += 1
+                if updated_at and (latest is None or updated_at.isoformat() > latest):
+                    latest = updated_at.isoformat()
+
+            if prune:
+                removed += self._prune_deleted(db, source, model)
+
+            with self._lock:
+                if latest != watermark:
+                    self._watermarks[source] = latest
+                    self._dirty = True
+
+        if prune:
+            self._last_prune = now
+        self.save()
+        if updated or removed:
+            logger.info(f"🧬 近重复索引已同步: 更新 {updated} 篇，移除 {removed} 篇，共 {len(self)} 篇")
+        return updated
+
+    def _prune_deleted(self, db: Session, source: str, model) -> int:
+        """移除数据库中已不存在的文章（物理删除不会更新水位，只能全量核对 ID）"""
+        live_ids = {row[0] for row in db.query(model.id)}
+        prefix = f"{source}:"
+        removed = 0
+        with self._lock:
+            for key in [k for k in self._fingerprints if k.startswith(prefix)]:
+                if int(key[len(prefix):]) not in live_ids:
+                    self._drop(key)
+                    self._dirty = True
+                    removed += 1
+        return removed
+
+
+# 全局单例
+near_duplicate_index = NearDuplicateIndex()
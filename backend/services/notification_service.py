@@ -7,10 +7,11 @@
 from typing import List, Dict, Any, Optional
 from loguru import logger
 from sqlalchemy.orm import Session
-from datetime import datetime, timedelta
+from datetime import datetime
 from dataclasses import dataclass
 
-from backend.database.models import Project, Keyword, IndexCheckRecord
+from backend.database.models import Project, Keyword
+from backend.services import index_check_stats
 
 
 @dataclass
@@ -90,15 +91,12 @@ class NotificationService:
         """检查单个关键词的预警"""
         alerts = []
 
-        # 获取最近的检测记录（最近7天）
-        seven_days_ago = datetime.now() - timedelta(days=7)
-        records = (
-            self.db.query(IndexCheckRecord)
-            .filter(IndexCheckRecord.keyword_id == keyword.id, IndexCheckRecord.check_time >= seven_days_ago)
-            .all()
+        # 获取最近的检测统计（最近7天，读日汇总）
+        counts = index_check_stats.get_totals(
+            self.db, keyword_ids=[keyword.id], since=index_check_stats.since_days(7)
         )
 
-        if not records:
+        if counts["total"] == 0:
             # 没有检测记录
             alerts.append(
                 {
@@ -114,10 +112,7 @@ class NotificationService:
             return alerts
 
         # 计算命中率
-        total = len(records)
-        keyword_found = sum(1 for r in records if r.keyword_found)
-        company_found = sum(1 for r in records if r.company_found)
-        hit_rate = (keyword_found + company_found) / (total * 2) * 100
+        hit_rate = (counts["keyword_found"] + counts["company_found"]) / (counts["total"] * 2) * 100
 
         # 检查命中率过低
         if self.ALERT_RULES["hit_rate_drop"].enabled and hit_rate < self.ALERT_RULES["hit_rate_drop"].threshold:
@@ -151,18 +146,12 @@ class NotificationService:
         # 检查持续低迷
         if self.ALERT_RULES["consistently_low"].enabled:
             # 获取更长时间的数据（30天）
-            thirty_days_ago = datetime.now() - timedelta(days=30)
-            long_term_records = (
-                self.db.query(IndexCheckRecord)
-                .filter(IndexCheckRecord.keyword_id == keyword.id, IndexCheckRecord.check_time >= thirty_days_ago)
-                .all()
+            lt_counts = index_check_stats.get_totals(
+                self.db, keyword_ids=[keyword.id], since=index_check_stats.since_days(30)
             )
 
-            if long_term_records:
-                lt_total = len(long_term_records)
-                lt_keyword_found = sum(1 for r in long_term_records if r.keyword_found)
-                lt_company_found = sum(1 for r in long_term_records if r.company_found)
-                lt_hit_rate = (lt_keyword_found + lt_company_found) / (lt_total * 2) * 100
+            if lt_counts["total"] > 0:
+                lt_hit_rate = (lt_counts["keyword_found"] + lt_counts["company_found"]) / (lt_counts["total"] * 2) * 100
 
                 if lt_hit_rate < self.ALERT_RULES["consistently_low"].threshold:
                     alerts.append(
@@ -223,20 +212,16 @@ class NotificationService:
 
             summary["total_keywords"] += len(keywords)
 
+            # 简单检查当前状态（最近7天，一次分组查询）
+            counts_by_keyword = index_check_stats.get_totals_by_keyword(
+                self.db, keyword_ids=[k.id for k in keywords], since=index_check_stats.since_days(7)
+            )
+
             for keyword in keywords:
-                # 简单检查当前状态
-                seven_days_ago = datetime.now() - timedelta(days=7)
-                records = (
-                    self.db.query(IndexCheckRecord)
-                    .filter(IndexCheckRecord.keyword_id == keyword.id, IndexCheckRecord.check_time >= seven_days_ago)
-                    .all()
-                )
-
-                if records:
-                    total = len(records)
-                    keyword_found = sum(1 for r in records if r.keyword_found)
-                    company_found = sum(1 for r in records if r.company_found)
-                    hit_rate = (keyword_found + company_found) / (total * 2) * 100
+                counts = counts_by_keyword.get(keyword.id)
+
+                if counts and counts["total"] > 0:
+                    hit_rate = (counts["keyword_found"] + counts["company_found"]) / (counts["total"] * 2) * 100
 
                     if hit_rate < 30:
                         summary["alert_keywords"] += 1
@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+"""
+游标分页（keyset）
+按 (排序时间, id) 倒序翻页：WHERE (排序时间, id) < (上一页最后一条) ORDER BY 排序时间 DESC, id DESC LIMIT n，
+配合 (排序时间, id) 复合索引，翻到第几页都只扫描 n 行；OFFSET 翻页越往后越慢
+
+- 游标对客户端不透明（base64 编码的 排序时间 + id），原样传回即可
+- 排序列不能为空（迁移 0008 已回填旧数据的空值）
+- 总数走短时缓存（LIST_COUNT_CACHE_TTL 秒），不再每翻一页都 COUNT(*)；增删数据后最多延迟一个 TTL
+"""
+
+import base64
+import binascii
+import json
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import DateTime, String, literal, tuple_
+from sqlalchemy.types import TypeDecorator
+
+from backend.config import LIST_COUNT_CACHE_TTL
+
+
+class _CursorDateTime(TypeDecorator):
+    """
+    游标时间的绑定类型
+    SQLite 里时间按字符串比较：func.now() 默认值存成 "YYYY-MM-DD HH:MM:SS"（没有小数秒），
+    而 DateTime 绑定参数总会带 ".000000"，同一秒的行会全部被当成"更早"，翻页时重复出现；
+    这里按行里的原样格式绑定（没有小数秒就不带）
+    """
+
+    impl = DateTime
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "sqlite":
+            return dialect.type_descriptor(String())
+        return dialect.type_descriptor(DateTime())
+
+    def process_bind_param(self, value, dialect):
+        if dialect.name == "sqlite" and isinstance(value, datetime):
+            return value.strftime("%Y-%m-%d %H:%M:%S.%f" if value.microsecond else "%Y-%m-%d %H:%M:%S")
+        return value
+
+
+def encode_cursor(sort_value: datetime, row_id: int) -> str:
+    """生成游标"""
+    payload = json.dumps([sort_value.isoformat(), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    解析游标
+
+    Raises:
+        ValueError: 游标格式不对（被篡改或来自其它接口）
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        sort_value, row_id = json.loads(raw)
+        return datetime.fromisoformat(sort_value), int(row_id)
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError) as e:
+        raise ValueError(f"无效的分页游标: {cursor}") from e
+
+
+def apply_keyset(query, sort_column, id_column, cursor: Optional[str]):
+    """
+    给查询加上排序和游标条件（Query 和 select() 都适用）
+
+    调用方再 .limit(limit + 1)，用 split_page 判断是否还有下一页
+    """
+    query = query.order_by(sort_column.desc(), id_column.desc())
+    if cursor:
+        sort_value, row_id = decode_cursor(cursor)
+        query = query.where(
+            tuple_(sort_column, id_column) < tuple_(literal(sort_value, _CursorDateTime()), literal(row_id))
+        )
+    return query
+
+
+def split_page(rows: Sequence[Any], limit: int, sort_attr: str, id_attr: str = "id") -> Tuple[List[Any], Optional[str]]:
+    """
+    按 limit + 1 条查询结果切出当前页
+
+    Returns:
+        (当前页, 下一页游标)，没有下一页时游标为 None
+    """
+    page = list(rows[:limit])
+    if len(rows) <= limit or not page:
+        return page, None
+    last = page[-1]
+    return page, encode_cursor(getattr(last, sort_attr), getattr(last, id_attr))
+
+
+class CountCache:
+    """列表总数的短时缓存"""
+
+    def __init__(self, ttl: float = LIST_COUNT_CACHE_TTL, max_entries: int = 1000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: Dict[Tuple, Tuple[int, float]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(name: str, **filters) -> Tuple:
+        """按列表名 + 筛选条件生成缓存 key"""
+        return (name, *sorted((k, str(v)) for k, v in filters.items() if v is not None))
+
+    def get(self, key: Tuple) -> Optional[int]:
+        entry = self._entries.get(key)
+        if entry is None or time.monotonic() - entry[1] > self.ttl:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry[0]
+
+    def set(self, key: Tuple, total: int):
+        if len(self._entries) >= self.max_entries:
+            self._entries.clear()
+        self._entries[key] = (total, time.monotonic())
+
+    def invalidate(self, name: str):
+        """清掉某个列表的全部缓存（本系统 API 增删数据后调用）"""
+        for key in [k for k in self._entries if k[0] == name]:
+            del self._entries[key]
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses, "ttl": self.ttl}
+
+
+# 全局单例
+list_count_cache = CountCache()
@@ -4,7 +4,7 @@ AI平台检测器模块
 用这个来检测AI平台的收录情况！
 """
 
-from .base import AIPlatformChecker
+from .base import AIPlatformChecker, get_answer_wait_stats
 from .doubao import DoubaoChecker
 from .qianwen import QianwenChecker
 from .deepseek import DeepSeekChecker
@@ -14,4 +14,5 @@ __all__ = [
     "DoubaoChecker",
     "QianwenChecker",
     "DeepSeekChecker",
+    "get_answer_wait_stats",
 ]
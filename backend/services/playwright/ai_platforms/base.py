@@ -5,13 +5,110 @@ AI平台检测器基类
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from playwright.async_api import Page
 from loguru import logger
 import asyncio
 import time
 import random
 
+from backend.config import ANSWER_WAIT_MODE, ANSWER_QUIET_WINDOW_MS
+
+# 回答最小长度（低于这个长度视为还没开始生成）
+MIN_ANSWER_LENGTH = 100
+
+# 页面内回答完成检测脚本：
+# 监听回答区域的 DOM 变化，静默 quietMs 后若内容已足够长且确实发生过变化则返回
+_ANSWER_OBSERVER_JS = """
+async ({ selector, quietMs, timeoutMs, minLength, initialLength }) => {
+    const target = document.querySelector(selector);
+    if (!target || typeof MutationObserver === 'undefined') {
+        return null;
+    }
+    const textLength = () => (target.innerText || '').trim().length;
+    return await new Promise((resolve) => {
+        let mutations = 0;
+        let quietTimer = null;
+        let hardTimer = null;
+        const observer = new MutationObserver((records) => {
+            mutations += records.length;
+            arm();
+        });
+        const finish = (stable) => {
+            observer.disconnect();
+            clearTimeout(quietTimer);
+            clearTimeout(hardTimer);
+            resolve({ stable, length: textLength(), mutations });
+        };
+        function arm() {
+            clearTimeout(quietTimer);
+            quietTimer = setTimeout(() => {
+                const length = textLength();
+                if (length > minLength && (mutations > 0 || length !== initialLength)) {
+                    finish(true);
+                } else {
+                    arm();
+                }
+            }, quietMs);
+        }
+        observer.observe(target, { childList: true, subtree: true, characterData: true });
+        hardTimer = setTimeout(() => finish(false), timeoutMs);
+        arm();
+    });
+}
+"""
+
+# 各平台回答完成检测耗时统计
+_answer_wait_stats: Dict[str, Dict[str, Any]] = {}
+
+
+def _record_answer_wait(platform_id: str, mode: str, elapsed_ms: float, success: bool):
+    """记录一次回答等待的耗时"""
+    stats = _answer_wait_stats.setdefault(
+        platform_id,
+        {
+            "count": 0,
+            "observer": 0,
+            "polling": 0,
+            "fallback": 0,
+            "failed": 0,
+            "total_ms": 0.0,
+            "max_ms": 0.0,
+            "last_ms": 0.0,
+        },
+    )
+    stats["count"] += 1
+    stats[mode] += 1
+    if not success:
+        stats["failed"] += 1
+    stats["total_ms"] += elapsed_ms
+    stats["last_ms"] = elapsed_ms
+    if elapsed_ms > stats["max_ms"]:
+        stats["max_ms"] = elapsed_ms
+
+
+def get_answer_wait_stats() -> Dict[str, Dict[str, Any]]:
+    """
+    获取各平台回答完成检测的耗时统计
+
+    Returns:
+        {platform_id: {count, observer, polling, fallback, failed, avg_ms, max_ms, last_ms}}
+    """
+    result = {}
+    for platform_id, stats in _answer_wait_stats.items():
+        count = stats["count"]
+        result[platform_id] = {
+            "count": count,
+            "observer": stats["observer"],
+            "polling": stats["polling"],
+            "fallback": stats["fallback"],
+            "failed": stats["failed"],
+            "avg_ms": round(stats["total_ms"] / count, 2) if count else 0,
+            "max_ms": round(stats["max_ms"], 2),
+            "last_ms": round(stats["last_ms"], 2),
+        }
+    return result
+
 
 class AIPlatformChecker(ABC):
     """
@@ -351,23 +448,109 @@ class AIPlatformChecker(ABC):
         """
         增强的智能等待AI回答生成完成
 
+        默认在页面内注入 MutationObserver，回答区域静默一段时间即返回；
+        注入失败（选择器不存在、页面跳转等）时回退到轮询模式
+
         Args:
             page: Playwright Page对象
             initial_content: 初始页面内容
             selector: 要监控的选择器
             timeout: 最大等待时间（毫秒）
-            check_interval: 检查间隔（秒）
+            check_interval: 轮询模式的检查间隔（秒）
+
+        Returns:
+            等待结果信息（mode 字段标明实际使用的检测方式）
+        """
+        start_time = time.time()
+        mode = self.config.get("answer_wait_mode", ANSWER_WAIT_MODE)
+
+        if mode == "observer":
+            result = await self._wait_for_answer_by_observer(page, initial_content, selector, timeout)
+            if result is not None:
+                _record_answer_wait(self.platform_id, "observer", result["elapsed_time"], result["success"])
+                return result
+
+            self._log("warning", "MutationObserver 注入失败，回退到轮询模式")
+            remaining = max(timeout - (time.time() - start_time) * 1000, check_interval * 1000)
+            result = await self._wait_for_answer_by_polling(page, initial_content, selector, remaining, check_interval)
+            result["elapsed_time"] = (time.time() - start_time) * 1000
+            _record_answer_wait(self.platform_id, "fallback", result["elapsed_time"], result["success"])
+            return result
+
+        result = await self._wait_for_answer_by_polling(page, initial_content, selector, timeout, check_interval)
+        _record_answer_wait(self.platform_id, "polling", result["elapsed_time"], result["success"])
+        return result
+
+    async def _wait_for_answer_by_observer(
+        self, page: Page, initial_content: str, selector: str, timeout: int
+    ) -> Optional[Dict[str, Any]]:
+        """
+        事件驱动等待：页面内监听回答区域的 DOM 变化，静默窗口内无变化即视为生成结束
 
         Returns:
-            等待结果信息
+            等待结果信息；注入失败返回 None（由调用方回退轮询）
+        """
+        quiet_ms = int(self.config.get("answer_quiet_ms", ANSWER_QUIET_WINDOW_MS))
+        self._log("info", f"开始事件驱动等待回答生成, 静默窗口: {quiet_ms}ms, 超时时间: {timeout}ms")
+
+        start_time = time.time()
+        try:
+            outcome = await page.evaluate(
+                _ANSWER_OBSERVER_JS,
+                {
+                    "selector": selector,
+                    "quietMs": quiet_ms,
+                    "timeoutMs": int(timeout),
+                    "minLength": MIN_ANSWER_LENGTH,
+                    "initialLength": len(initial_content.strip()),
+                },
+            )
+        except Exception as e:
+            self._log("debug", f"MutationObserver 执行异常: {e}")
+            return None
+
+        if not outcome:
+            return None
+
+        elapsed_time = (time.time() - start_time) * 1000
+        content_length = outcome.get("length", 0)
+        stable = bool(outcome.get("stable"))
+
+        if stable:
+            self._log(
+                "info",
+                f"回答生成完成(事件驱动), 耗时: {elapsed_time:.0f}ms, 内容长度: {content_length}, "
+                f"变更次数: {outcome.get('mutations', 0)}",
+            )
+        else:
+            self._log("warning", f"等待回答超时(事件驱动), 耗时: {elapsed_time:.0f}ms, 内容长度: {content_length}")
+
+        return {
+            "success": content_length > MIN_ANSWER_LENGTH,
+            "content_length": content_length,
+            "elapsed_time": elapsed_time,
+            "stable": stable,
+            "mode": "observer",
+        }
+
+    async def _wait_for_answer_by_polling(
+        self,
+        page: Page,
+        initial_content: str,
+        selector: str = "body",
+        timeout: float = 60000,
+        check_interval: float = 1.0,
+    ) -> Dict[str, Any]:
+        """
+        轮询等待：定时读取页面文本，连续多次不变才视为生成结束
         """
-        self._log("info", f"开始智能等待回答生成, 超时时间: {timeout}ms")
+        self._log("info", f"开始智能等待回答生成, 超时时间: {timeout:.0f}ms")
 
         start_time = time.time()
         last_content = initial_content
         stable_count = 0
         required_stable_checks = 5  # 增加稳定检查次数，防止回答还在生成中就截断
-        min_content_length = 100  # 增加最小内容长度要求
+        min_content_length = MIN_ANSWER_LENGTH  # 增加最小内容长度要求
 
         while (time.time() - start_time) < timeout / 1000:
             try:
@@ -397,6 +580,7 @@ class AIPlatformChecker(ABC):
                             "content_length": content_length,
                             "elapsed_time": elapsed_time,
                             "stable": True,
+                            "mode": "polling",
                         }
 
                     await asyncio.sleep(check_interval)
@@ -419,6 +603,7 @@ class AIPlatformChecker(ABC):
             "content_length": content_length,
             "elapsed_time": elapsed_time,
             "stable": stable_count >= required_stable_checks,
+            "mode": "polling",
         }
 
     async def get_answer_content(self, page: Page, question: str) -> Dict[str, Any]:
@@ -6,10 +6,13 @@ Playwright浏览器管理器 - 工业级完整版
 """
 
 import asyncio
+import hashlib
 import json
 import os
 import sys
+import time
 import uuid
+from collections import OrderedDict
 from datetime import datetime
 from pathlib import Path
 from typing import Optional, Dict, List, Any, Callable
@@ -41,6 +44,9 @@ from backend.config import (
     LOCAL_BROWSER_URL,
     LOCAL_BROWSER_CDP_PORT,
     FORCE_LOCAL_BROWSER,
+    PUBLISH_CONTEXT_CACHE_SIZE,
+    PUBLISH_CONTEXT_IDLE_TTL,
+    PUBLISH_CONTEXT_CACHE_DISABLED_PLATFORMS,
 )
 from backend.services.crypto import encrypt_cookies, encrypt_storage_state, decrypt_cookies, decrypt_storage_state
 from backend.services.cdp_browser_manager import cdp_browser_manager
@@ -68,6 +74,26 @@ class AuthTask:
         self.created_account_id: Optional[int] = None
 
 
+class CachedContext:
+    """发布用的账号上下文缓存项"""
+
+    def __init__(
+        self, account_id: int, platform: str, context: BrowserContext, state_fingerprint: str, browser: Any = None
+    ):
+        self.account_id = account_id
+        self.platform = platform
+        self.context = context
+        # 创建上下文的浏览器，浏览器断开或重建后缓存失效
+        self.browser = browser
+        # 创建上下文时账号 storage_state 的指纹，账号重新授权后指纹变化，缓存失效
+        self.state_fingerprint = state_fingerprint
+        # 已作废但仍有发布在使用：已从缓存摘下，最后一个使用者归还时关闭
+        self.detached = False
+        self.in_use = 0
+        self.uses = 0
+        self.last_used = time.monotonic()
+
+
 class PlaywrightManager:
     """
     Playwright 管理器 (单例模式)
@@ -87,6 +113,19 @@ class PlaywrightManager:
         self._ws_callback: Optional[Callable] = None
         # 是否使用CDP模式
         self._use_cdp = FORCE_LOCAL_BROWSER or bool(LOCAL_BROWSER_URL)
+        # 发布上下文缓存 {account_id: CachedContext}，按最近使用排序（LRU）
+        self._publish_contexts: "OrderedDict[int, CachedContext]" = OrderedDict()
+        self._publish_context_lock: Optional[asyncio.Lock] = None
+        self._context_sweeper: Optional[asyncio.Task] = None
+        self._context_cache_stats = {
+            "hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "invalidations": 0,
+            "writebacks": 0,
+            # 全部上下文都在使用、无法回收到容量以内的次数
+            "over_capacity": 0,
+        }
 
         logger.info(f"PlaywrightManager初始化: CDP模式={self._use_cdp}")
 
@@ -240,6 +279,12 @@ class PlaywrightManager:
         if not self._is_running:
             return
 
+        # 回收发布上下文缓存（写回最新会话状态）
+        if self._context_sweeper:
+            self._context_sweeper.cancel()
+            self._context_sweeper = None
+        await self.clear_publish_contexts()
+
         # 关闭所有上下文
         for context in self._contexts.values():
             await context.close()
@@ -478,6 +523,8 @@ class PlaywrightManager:
                         account.last_auth_time = datetime.now()
                         db.commit()
                         logger.success(f"[Auth] 账号 {account.account_name} 更新成功")
+                        # 重新授权后旧的缓存上下文已过期，直接丢弃（不写回）
+                        await self._drop_publish_context(account.id, write_back=False)
                 else:
                     # 新增
                     name = task.account_name or f"{PLATFORMS[task.platform]['name']}_{username or 'User'}"
@@ -941,10 +988,250 @@ class PlaywrightManager:
 
     # ==================== 发布相关 ====================
 
+    def _build_publish_state(self, account: Any) -> Dict:
+        """解密账号 Session，构建 storage_state"""
+        state_data = {}
+        if account.storage_state:
+            try:
+                decrypted = decrypt_storage_state(account.storage_state)
+                state_data = decrypted if decrypted else json.loads(account.storage_state)
+
+                # 兼容旧数据格式：如果缺少 cookies 字段，从 account.cookies 补充
+                if isinstance(state_data, dict) and "cookies" not in state_data and account.cookies:
+                    logger.warning("storage_state缺少cookies字段，使用独立cookies")
+                    state_data["cookies"] = decrypt_cookies(account.cookies)
+            except:
+                logger.warning(f"账号 {account.account_name} Session 解析失败，尝试裸奔")
+        return state_data
+
+    async def _new_publish_context(self, account: Any) -> BrowserContext:
+        """为账号创建新的发布上下文"""
+        state_data = self._build_publish_state(account)
+        return await self._browser.new_context(
+            storage_state=state_data if state_data else None, viewport={"width": 1280, "height": 800}
+        )
+
+    def _is_context_cache_enabled(self, platform: str) -> bool:
+        """该平台是否启用上下文缓存"""
+        return PUBLISH_CONTEXT_CACHE_SIZE > 0 and platform not in PUBLISH_CONTEXT_CACHE_DISABLED_PLATFORMS
+
+    @staticmethod
+    def _state_fingerprint(account: Any) -> str:
+        """计算账号 storage_state 指纹，用于判断缓存是否过期"""
+        raw = f"{account.storage_state or ''}|{account.cookies or ''}"
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def _get_context_lock(self) -> asyncio.Lock:
+        if self._publish_context_lock is None:
+            self._publish_context_lock = asyncio.Lock()
+        return self._publish_context_lock
+
+    def _stale_reason(self, entry: CachedContext, fingerprint: str) -> Optional[str]:
+        """缓存上下文不能再用的原因，可用时返回 None"""
+        if entry.browser is not self._browser or self._browser is None or not self._browser.is_connected():
+            return "浏览器已断开"
+        if entry.state_fingerprint != fingerprint:
+            return "账号已重新授权或上下文已作废"
+        return None
+
+    async def _acquire_publish_context(self, account: Any) -> CachedContext:
+        """
+        获取账号的发布上下文（命中缓存则复用）
+
+        浏览器已断开、账号重新授权过（或上下文已作废）时不复用：
+        空闲的旧上下文直接关闭；仍在使用的从缓存摘下，最后一个使用者归还时关闭，本次新建上下文
+        """
+        fingerprint = self._state_fingerprint(account)
+
+        async with self._get_context_lock():
+            entry = self._publish_contexts.get(account.id)
+
+            reason = self._stale_reason(entry, fingerprint) if entry else None
+            if reason:
+                self._context_cache_stats["invalidations"] += 1
+                logger.info(f"[Publish] 账号 {account.id} 的缓存上下文作废: {reason}")
+                if entry.in_use:
+                    self._publish_contexts.pop(account.id, None)
+                    entry.detached = True
+                else:
+                    await self._evict_entry(entry, write_back=False)
+                entry = None
+
+            created = entry is None
+            if created:
+                self._context_cache_stats["misses"] += 1
+                context = await self._new_publish_context(account)
+                entry = CachedContext(account.id, account.platform, context, fingerprint, browser=self._browser)
+                self._publish_contexts[account.id] = entry
+            else:
+                self._context_cache_stats["hits"] += 1
+                self._publish_contexts.move_to_end(account.id)
+
+            entry.in_use += 1
+            entry.uses += 1
+            entry.last_used = time.monotonic()
+            if created:
+                # 先标记在用再回收，避免刚建好的上下文被当作空闲项回收
+                await self._enforce_context_cache_size()
+            return entry
+
+    async def _release_publish_context(self, entry: CachedContext, healthy: bool = True):
+        """
+        归还发布上下文
+
+        Args:
+            entry: 缓存项
+            healthy: 本次发布是否成功；失败的上下文作废（不写回），避免带着异常页面状态继续发布
+        """
+        async with self._get_context_lock():
+            entry.in_use = max(0, entry.in_use - 1)
+            entry.last_used = time.monotonic()
+            if not healthy:
+                # 仍有其他发布在用时，下次获取会摘下它并新建
+                entry.state_fingerprint = ""
+            if entry.in_use == 0 and (entry.detached or not healthy):
+                await self._evict_entry(entry, write_back=False)
+
+    async def _enforce_context_cache_size(self):
+        """超过容量时按 LRU 回收空闲上下文（调用方需持有锁）"""
+        for account_id in list(self._publish_contexts.keys()):
+            if len(self._publish_contexts) <= PUBLISH_CONTEXT_CACHE_SIZE:
+                break
+            entry = self._publish_contexts[account_id]
+            if entry.in_use == 0:
+                await self._evict_entry(entry, write_back=True)
+
+        if len(self._publish_contexts) > PUBLISH_CONTEXT_CACHE_SIZE:
+            # 在用的上下文不能回收，暂时超出容量，归还后由下次获取或空闲回收收回
+            self._context_cache_stats["over_capacity"] += 1
+            logger.warning(
+                f"[Publish] 发布上下文缓存超出容量: {len(self._publish_contexts)}/{PUBLISH_CONTEXT_CACHE_SIZE}"
+                f"（全部在使用中，无法回收）"
+            )
+
+    async def _evict_entry(self, entry: CachedContext, write_back: bool = True):
+        """
+        回收缓存上下文（调用方需持有锁）
+
+        Args:
+            entry: 缓存项
+            write_back: 是否把最新的 storage_state 写回账号
+        """
+        # 已摘下的旧上下文不能把同账号新建的缓存项一起删掉
+        if self._publish_contexts.get(entry.account_id) is entry:
+            self._publish_contexts.pop(entry.account_id)
+        self._context_cache_stats["evictions"] += 1
+
+        if write_back:
+            try:
+                storage_state = await entry.context.storage_state()
+                self._write_back_storage_state(entry.account_id, storage_state)
+            except Exception as e:
+                logger.warning(f"[Publish] 账号 {entry.account_id} 上下文状态写回失败: {e}")
+
+        try:
+            await entry.context.close()
+        except Exception:
+            pass
+        logger.debug(f"[Publish] 已回收账号 {entry.account_id} 的缓存上下文 (使用 {entry.uses} 次)")
+
+    def _write_back_storage_state(self, account_id: int, storage_state: Dict):
+        """把上下文最新的会话状态加密写回账号"""
+        if not storage_state or not storage_state.get("cookies"):
+            return
+
+        db = self._get_db()
+        if not db:
+            return
+
+        try:
+            from backend.database.models import Account
+
+            account = db.query(Account).filter(Account.id == account_id).first()
+            if account:
+                account.storage_state = encrypt_storage_state(storage_state)
+                account.cookies = encrypt_cookies(storage_state["cookies"])
+                db.commit()
+                self._context_cache_stats["writebacks"] += 1
+                logger.info(f"[Publish] 账号 {account.account_name} 会话状态已写回")
+        except Exception as e:
+            db.rollback()
+            logger.error(f"[Publish] 写回会话状态失败: {e}")
+        finally:
+            db.close()
+
+    async def _drop_publish_context(self, account_id: int, write_back: bool = True):
+        """丢弃指定账号的缓存上下文"""
+        async with self._get_context_lock():
+            entry = self._publish_contexts.get(account_id)
+            if not entry:
+                return
+            if entry.in_use:
+                # 其他发布仍在使用，标记过期，空闲后下次获取时重建
+                entry.state_fingerprint = ""
+            else:
+                await self._evict_entry(entry, write_back=write_back)
+
+    async def evict_idle_publish_contexts(self) -> int:
+        """
+        回收空闲超过 PUBLISH_CONTEXT_IDLE_TTL 的上下文
+
+        Returns:
+            回收数量
+        """
+        now = time.monotonic()
+        evicted = 0
+        async with self._get_context_lock():
+            for entry in list(self._publish_contexts.values()):
+                if entry.in_use == 0 and now - entry.last_used >= PUBLISH_CONTEXT_IDLE_TTL:
+                    await self._evict_entry(entry, write_back=True)
+                    evicted += 1
+        if evicted:
+            logger.info(f"[Publish] 回收 {evicted} 个空闲发布上下文")
+        return evicted
+
+    async def clear_publish_contexts(self):
+        """回收全部发布上下文（写回会话状态）"""
+        async with self._get_context_lock():
+            for entry in list(self._publish_contexts.values()):
+                await self._evict_entry(entry, write_back=True)
+
+    async def _sweep_publish_contexts(self):
+        """后台定期回收空闲上下文"""
+        interval = max(10, min(PUBLISH_CONTEXT_IDLE_TTL // 2, 60))
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.evict_idle_publish_contexts()
+            except Exception as e:
+                logger.warning(f"[Publish] 回收空闲上下文失败: {e}")
+
+    def _ensure_context_sweeper(self):
+        """按需启动后台回收任务"""
+        if PUBLISH_CONTEXT_CACHE_SIZE <= 0:
+            return
+        if self._context_sweeper is None or self._context_sweeper.done():
+            self._context_sweeper = asyncio.create_task(self._sweep_publish_contexts())
+
+    def get_publish_context_stats(self) -> Dict[str, Any]:
+        """获取发布上下文缓存统计"""
+        return {
+            "enabled": PUBLISH_CONTEXT_CACHE_SIZE > 0,
+            "max_size": PUBLISH_CONTEXT_CACHE_SIZE,
+            "idle_ttl": PUBLISH_CONTEXT_IDLE_TTL,
+            "disabled_platforms": sorted(PUBLISH_CONTEXT_CACHE_DISABLED_PLATFORMS),
+            "size": len(self._publish_contexts),
+            "in_use": sum(1 for e in self._publish_contexts.values() if e.in_use),
+            **self._context_cache_stats,
+        }
+
     async def execute_publish(self, article: Any, account: Any, declare_ai_content: bool = True) -> Dict[str, Any]:
         """
         供 Service 调用的发布执行入口 (核心)
 
+        同一账号的上下文会被缓存复用（见 PUBLISH_CONTEXT_CACHE_SIZE），
+        发布失败时丢弃该上下文，避免带着异常页面状态继续发布。
+
         Args:
             article: 文章对象
             account: 账号对象
@@ -957,26 +1244,21 @@ class PlaywrightManager:
         if not publisher:
             return {"success": False, "error_msg": f"未找到平台 {account.platform} 的适配器"}
 
+        use_cache = self._is_context_cache_enabled(account.platform)
+        if use_cache:
+            self._ensure_context_sweeper()
+
         # 准备上下文
         context = None
+        entry: Optional[CachedContext] = None
+        page = None
+        healthy = False
         try:
-            # 解密 Session
-            state_data = {}
-            if account.storage_state:
-                try:
-                    decrypted = decrypt_storage_state(account.storage_state)
-                    state_data = decrypted if decrypted else json.loads(account.storage_state)
-
-                    # 兼容旧数据格式：如果缺少 cookies 字段，从 account.cookies 补充
-                    if isinstance(state_data, dict) and "cookies" not in state_data and account.cookies:
-                        logger.warning("storage_state缺少cookies字段，使用独立cookies")
-                        state_data["cookies"] = decrypt_cookies(account.cookies)
-                except:
-                    logger.warning(f"账号 {account.account_name} Session 解析失败，尝试裸奔")
-
-            context = await self._browser.new_context(
-                storage_state=state_data if state_data else None, viewport={"width": 1280, "height": 800}
-            )
+            if use_cache:
+                entry = await self._acquire_publish_context(account)
+                context = entry.context
+            else:
+                context = await self._new_publish_context(account)
 
             page = await context.new_page()
 
@@ -985,6 +1267,7 @@ class PlaywrightManager:
                 f"🚀 [Publish] 开始执行发布: {account.platform} - {article.title}, AI声明: {declare_ai_content}"
             )
             result = await publisher.publish(page, article, account, declare_ai_content=declare_ai_content)
+            healthy = bool(result and result.get("success"))
 
             return result
 
@@ -992,7 +1275,14 @@ class PlaywrightManager:
             logger.exception(f"❌ [Publish] 执行异常: {e}")
             return {"success": False, "error_msg": str(e)}
         finally:
-            if context:
+            if entry:
+                if page:
+                    try:
+                        await page.close()
+                    except Exception:
+                        pass
+                await self._release_publish_context(entry, healthy=healthy)
+            elif context:
                 await context.close()
 
 
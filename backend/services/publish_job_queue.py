@@ -0,0 +1,267 @@
+# -*- coding: utf-8 -*-
+"""
+定时发布任务队列
+基于 publish_jobs 表的持久化队列：入队去重、租约认领、心跳续租、租约过期重试
+"""
+
+import os
+import socket
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from loguru import logger
+from sqlalchemy import and_, func, or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from backend.config import PUBLISH_JOB_LEASE_SECONDS, PUBLISH_JOB_MAX_ATTEMPTS
+from backend.database import DB_TYPE
+from backend.database.models import GeoArticle, PublishJob
+
+log = logger.bind(module="发布队列")
+
+
+class PublishJobQueue:
+    """
+    定时发布任务队列
+
+    认领流程：
+    1. PostgreSQL 先用 SELECT ... FOR UPDATE SKIP LOCKED 挑出候选任务，多个 worker 互不阻塞
+    2. 再对每个候选任务做带条件的 UPDATE（状态仍可认领才更新），rowcount=1 即认领成功
+       SQLite 写操作天然串行，只靠第 2 步就能保证同一任务只被一个 worker 认领
+    """
+
+    def __init__(
+        self,
+        lease_seconds: int = PUBLISH_JOB_LEASE_SECONDS,
+        max_attempts: int = PUBLISH_JOB_MAX_ATTEMPTS,
+        worker_id: Optional[str] = None,
+    ):
+        """
+        初始化任务队列
+
+        Args:
+            lease_seconds: 租约时长（秒）
+            max_attempts: 单个任务最多被认领的次数
+            worker_id: 当前 worker 标识，默认 主机名:进程号
+        """
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+
+    @staticmethod
+    def _dedupe_key(article_id: int) -> str:
+        return f"article:{article_id}"
+
+    @staticmethod
+    def _claimable(now: datetime):
+        """可认领条件：到期的待认领任务，或租约已过期的执行中任务"""
+        return or_(
+            and_(PublishJob.status == "pending", PublishJob.run_after <= now),
+            and_(PublishJob.status == "running", PublishJob.lease_expires_at < now),
+        )
+
+    def enqueue_due_articles(self, db: Session, now: Optional[datetime] = None) -> int:
+        """
+        把到期的定时发布文章加入队列（已有活跃任务的文章跳过）
+
+        Returns:
+            新入队的任务数
+        """
+        now = now or datetime.now()
+        due_ids = [
+            row.id
+            for row in db.query(GeoArticle.id).filter(
+                GeoArticle.publish_status == "scheduled",
+                GeoArticle.platform.isnot(None),
+                GeoArticle.account_id.isnot(None),
+                GeoArticle.scheduled_at <= now,
+            )
+        ]
+        if not due_ids:
+            return 0
+
+        active_ids = {
+            row.article_id
+            for row in db.query(PublishJob.article_id).filter(
+                PublishJob.article_id.in_(due_ids), PublishJob.dedupe_key.isnot(None)
+            )
+        }
+
+        created = 0
+        for article_id in due_ids:
+            if article_id in active_ids:
+                continue
+            db.add(
+                PublishJob(
+                    article_id=article_id,
+                    dedupe_key=self._dedupe_key(article_id),
+                    status="pending",
+                    max_attempts=self.max_attempts,
+                    run_after=now,
+                )
+            )
+            try:
+                db.commit()
+                created += 1
+            except IntegrityError:
+                # 其他 worker 刚刚入队了同一篇文章
+                db.rollback()
+        return created
+
+    def claim(self, db: Session, limit: int, now: Optional[datetime] = None) -> List[Tuple[int, int]]:
+        """
+        认领任务
+
+        Args:
+            db: 数据库会话
+            limit: 最多认领数量
+            now: 当前时间（测试用）
+
+        Returns:
+            [(job_id, article_id)]
+        """
+        if limit <= 0:
+            return []
+
+        now = now or datetime.now()
+        query = (
+            db.query(PublishJob.id)
+            .filter(self._claimable(now))
+            .order_by(PublishJob.run_after, PublishJob.id)
+            .limit(limit)
+        )
+        if DB_TYPE == "postgresql":
+            query = query.with_for_update(skip_locked=True)
+        candidate_ids = [row.id for row in query.all()]
+
+        claimed_ids = []
+        for job_id in candidate_ids:
+            updated = (
+                db.query(PublishJob)
+                .filter(PublishJob.id == job_id, self._claimable(now))
+                .update(
+                    {
+                        PublishJob.status: "running",
+                        PublishJob.locked_by: self.worker_id,
+                        PublishJob.lease_expires_at: now + timedelta(seconds=self.lease_seconds),
+                        PublishJob.heartbeat_at: now,
+                        PublishJob.attempts: PublishJob.attempts + 1,
+                    },
+                    synchronize_session=False,
+                )
+            )
+            if updated == 1:
+                claimed_ids.append(job_id)
+        db.commit()
+
+        if not claimed_ids:
+            return []
+
+        claimed = []
+        for job in db.query(PublishJob).filter(PublishJob.id.in_(claimed_ids)).order_by(PublishJob.id):
+            if job.attempts > job.max_attempts:
+                # 租约反复过期（worker 崩溃或发布卡死），放弃并标记文章失败
+                log.error(f"❌ 发布任务 {job.id} 已认领 {job.attempts - 1} 次仍未完成，放弃执行")
+                self._finish(job, "failed", "租约多次过期，放弃执行")
+                article = db.query(GeoArticle).filter(GeoArticle.id == job.article_id).first()
+                if article and article.publish_status in ("scheduled", "publishing"):
+                    article.publish_status = "failed"
+                    article.error_msg = "发布任务多次超时"
+                continue
+            claimed.append((job.id, job.article_id))
+        db.commit()
+        return claimed
+
+    def heartbeat(self, db: Session, job_id: int, now: Optional[datetime] = None) -> bool:
+        """
+        续租
+
+        Returns:
+            是否仍持有租约（False 表示租约已被其他 worker 接管）
+        """
+        now = now or datetime.now()
+        updated = (
+            db.query(PublishJob)
+            .filter(
+                PublishJob.id == job_id,
+                PublishJob.status == "running",
+                PublishJob.locked_by == self.worker_id,
+            )
+            .update(
+                {
+                    PublishJob.heartbeat_at: now,
+                    PublishJob.lease_expires_at: now + timedelta(seconds=self.lease_seconds),
+                },
+                synchronize_session=False,
+            )
+        )
+        db.commit()
+        return updated == 1
+
+    def complete(self, db: Session, job_id: int, success: bool, error: Optional[str] = None) -> bool:
+        """
+        结束任务（仅在仍持有租约时生效）
+        失败时文章若仍为 scheduled / publishing 一并标记失败，重新定时后才会再次入队
+
+        Returns:
+            是否更新成功
+        """
+        job = (
+            db.query(PublishJob)
+            .filter(
+                PublishJob.id == job_id,
+                PublishJob.status == "running",
+                PublishJob.locked_by == self.worker_id,
+            )
+            .first()
+        )
+        if not job:
+            log.warning(f"⚠️ 发布任务 {job_id} 的租约已丢失，结果不再回写")
+            return False
+
+        self._finish(job, "done" if success else "failed", error)
+        if not success:
+            # 发布流程有些失败分支（占位标题、找不到发布器等）直接返回，文章仍停在 scheduled，
+            # 不改状态的话下一分钟又会到期入队，每分钟新增一条失败任务
+            article = db.query(GeoArticle).filter(GeoArticle.id == job.article_id).first()
+            if article and article.publish_status in ("scheduled", "publishing"):
+                article.publish_status = "failed"
+                article.error_msg = article.error_msg or error or "发布任务执行失败"
+                log.warning(f"⚠️ 发布任务 {job_id} 失败，文章 {job.article_id} 标记为失败: {article.error_msg}")
+        db.commit()
+        return True
+
+    @staticmethod
+    def _finish(job: PublishJob, status: str, error: Optional[str]):
+        job.status = status
+        job.dedupe_key = None
+        job.locked_by = None
+        job.lease_expires_at = None
+        job.last_error = error
+
+    def get_stats(self, db: Session) -> Dict[str, Any]:
+        """
+        获取队列统计
+
+        Returns:
+            {worker_id, pending, running, done, failed, expired_leases}
+        """
+        counts = dict(db.query(PublishJob.status, func.count(PublishJob.id)).group_by(PublishJob.status).all())
+        expired = (
+            db.query(func.count(PublishJob.id))
+            .filter(PublishJob.status == "running", PublishJob.lease_expires_at < datetime.now())
+            .scalar()
+        )
+        return {
+            "worker_id": self.worker_id,
+            "pending": counts.get("pending", 0),
+            "running": counts.get("running", 0),
+            "done": counts.get("done", 0),
+            "failed": counts.get("failed", 0),
+            "expired_leases": expired or 0,
+        }
+
+
+# 全局发布任务队列
+publish_job_queue = PublishJobQueue()
@@ -2,13 +2,41 @@
 """
 RAGFlow API 客户端封装
 用于文章向量化和去重检测！
+
+基于 httpx.AsyncClient，所有请求共享一个连接池，不阻塞事件循环
 """
 
+import asyncio
 import os
-import requests
-from typing import List, Dict, Optional, Tuple
+from pathlib import Path
+from typing import Any, List, Dict, Optional, Tuple
+
+import httpx
 from loguru import logger
 
+from backend.config import (
+    RAGFLOW_CHAT_TIMEOUT,
+    RAGFLOW_CONNECT_TIMEOUT,
+    RAGFLOW_MAX_CONNECTIONS,
+    RAGFLOW_MAX_KEEPALIVE_CONNECTIONS,
+    RAGFLOW_RETRIEVAL_TIMEOUT,
+    RAGFLOW_TIMEOUT,
+    RAGFLOW_UPLOAD_TIMEOUT,
+)
+
+# 文件扩展名 -> MIME 类型
+MIME_TYPES = {
+    ".pdf": "application/pdf",
+    ".doc": "application/msword",
+    ".docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    ".xls": "application/vnd.ms-excel",
+    ".xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    ".txt": "text/plain",
+    ".md": "text/markdown",
+    ".html": "text/html",
+    ".htm": "text/html",
+}
+
 
 class RAGFlowClient:
     """
@@ -19,33 +47,99 @@ class RAGFlowClient:
     2. 文档上传与解析
     3. 检索（用于去重）
     4. 聊天对话（用于生成）
+
+    注意：所有接口方法都是协程，必须 await 调用！
     """
 
-    def __init__(self, base_url: str = None, api_key: str = None):
+    def __init__(
+        self,
+        base_url: str = None,
+        api_key: str = None,
+        timeouts: Dict[str, float] = None,
+        transport: httpx.AsyncBaseTransport = None,
+    ):
         """
         初始化 RAGFlow 客户端
 
         Args:
             base_url: RAGFlow 服务地址，默认从环境变量读取
             api_key: API Key，默认从环境变量读取
+            timeouts: 按操作类型覆盖超时（default / upload / retrieval / chat），单位秒
+            transport: 自定义 httpx 传输层（测试用）
         """
-        self.base_url = base_url or os.getenv("RAGFLOW_BASE_URL", "http://localhost:9380")
+        self.base_url = (base_url or os.getenv("RAGFLOW_BASE_URL", "http://localhost:9380")).rstrip("/")
         self.api_key = api_key or os.getenv("RAGFLOW_API_KEY", "")
         self.dataset_id = os.getenv("RAGFLOW_DATASET_ID", "")
 
-        self.session = requests.Session()
-        self.session.headers.update({"Authorization": f"Bearer {self.api_key}", "Content-Type": "application/json"})
-
         # 超时配置
-        self.timeout = 30
+        self.timeouts = {
+            "default": RAGFLOW_TIMEOUT,
+            "upload": RAGFLOW_UPLOAD_TIMEOUT,
+            "retrieval": RAGFLOW_RETRIEVAL_TIMEOUT,
+            "chat": RAGFLOW_CHAT_TIMEOUT,
+            **(timeouts or {}),
+        }
+        self.timeout = self.timeouts["default"]
+
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
 
     def is_configured(self) -> bool:
         """检查是否已配置"""
         return bool(self.api_key and self.base_url)
 
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """
+        共享的 HTTP 客户端（连接池）
+
+        连接绑定在创建它的事件循环上，循环变化时（脚本里多次 asyncio.run）重新创建
+        """
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._client_loop is not loop:
+            # 不设置全局 Content-Type，json / multipart 由 httpx 按请求自动填写
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers={"Authorization": f"Bearer {self.api_key}"},
+                timeout=httpx.Timeout(self.timeout, connect=RAGFLOW_CONNECT_TIMEOUT),
+                limits=httpx.Limits(
+                    max_connections=RAGFLOW_MAX_CONNECTIONS,
+                    max_keepalive_connections=RAGFLOW_MAX_KEEPALIVE_CONNECTIONS,
+                ),
+                transport=self._transport,
+            )
+            self._client_loop = loop
+        return self._client
+
+    async def close(self):
+        """关闭 HTTP 客户端"""
+        if self._client and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+        self._client_loop = None
+
+    async def _request(self, method: str, path: str, operation: str = "default", **kwargs) -> Dict[str, Any]:
+        """
+        发送请求并返回 JSON
+
+        Args:
+            method: HTTP 方法
+            path: 接口路径（以 /api/v1 开头）
+            operation: 操作类型，决定读超时（default / upload / retrieval / chat）
+            **kwargs: 透传给 httpx（json / params / files）
+
+        Raises:
+            httpx.HTTPError: 网络错误或非 2xx 响应
+        """
+        timeout = httpx.Timeout(self.timeouts.get(operation, self.timeout), connect=RAGFLOW_CONNECT_TIMEOUT)
+        resp = await self.client.request(method, path, timeout=timeout, **kwargs)
+        resp.raise_for_status()
+        return resp.json()
+
     # ==================== 知识库管理 ====================
 
-    def create_dataset(self, name: str, description: str = None) -> Dict:
+    async def create_dataset(self, name: str, description: str = None) -> Dict:
         """
         创建知识库
 
@@ -65,16 +159,14 @@ class RAGFlowClient:
             payload["description"] = description
 
         try:
-            resp = self.session.post(f"{self.base_url}/api/v1/datasets", json=payload, timeout=self.timeout)
-            resp.raise_for_status()
-            result = resp.json()
+            result = await self._request("POST", "/api/v1/datasets", json=payload)
             logger.info(f"创建知识库成功: {name}")
             return result
         except Exception as e:
             logger.error(f"创建知识库失败: {e}")
             return {"code": -1, "message": str(e)}
 
-    def list_datasets(self, name: str = None, page: int = 1, page_size: int = 100) -> Dict:
+    async def list_datasets(self, name: str = None, page: int = 1, page_size: int = 100) -> Dict:
         """
         列出知识库
 
@@ -91,14 +183,12 @@ class RAGFlowClient:
             params["name"] = name
 
         try:
-            resp = self.session.get(f"{self.base_url}/api/v1/datasets", params=params, timeout=self.timeout)
-            resp.raise_for_status()
-            return resp.json()
+            return await self._request("GET", "/api/v1/datasets", params=params)
         except Exception as e:
             logger.error(f"列出知识库失败: {e}")
             return {"code": -1, "message": str(e)}
 
-    def get_dataset(self, dataset_id: str) -> Dict:
+    async def get_dataset(self, dataset_id: str) -> Dict:
         """
         获取知识库详情
 
@@ -109,14 +199,12 @@ class RAGFlowClient:
             知识库详情
         """
         try:
-            resp = self.session.get(f"{self.base_url}/api/v1/datasets/{dataset_id}", timeout=self.timeout)
-            resp.raise_for_status()
-            return resp.json()
+            return await self._request("GET", f"/api/v1/datasets/{dataset_id}")
         except Exception as e:
             logger.error(f"获取知识库详情失败: {e}")
             return {"code": -1, "message": str(e)}
 
-    def update_dataset(self, dataset_id: str, name: str = None, description: str = None) -> Dict:
+    async def update_dataset(self, dataset_id: str, name: str = None, description: str = None) -> Dict:
         """
         更新知识库
 
@@ -138,16 +226,14 @@ class RAGFlowClient:
             if not payload:
                 return {"code": 0, "message": "无需更新"}
 
-            resp = self.session.put(f"{self.base_url}/api/v1/datasets/{dataset_id}", json=payload, timeout=self.timeout)
-            resp.raise_for_status()
-            result = resp.json()
+            result = await self._request("PUT", f"/api/v1/datasets/{dataset_id}", json=payload)
             logger.info(f"更新知识库成功: {dataset_id}")
             return result
         except Exception as e:
             logger.error(f"更新知识库失败: {e}")
             return {"code": -1, "message": str(e)}
 
-    def delete_dataset(self, dataset_id: str) -> Dict:
+    async def delete_dataset(self, dataset_id: str) -> Dict:
         """
         删除知识库
 
@@ -158,16 +244,14 @@ class RAGFlowClient:
             API 响应
         """
         try:
-            resp = self.session.delete(f"{self.base_url}/api/v1/datasets/{dataset_id}", timeout=self.timeout)
-            resp.raise_for_status()
-            result = resp.json()
+            result = await self._request("DELETE", f"/api/v1/datasets/{dataset_id}")
             logger.info(f"删除知识库成功: {dataset_id}")
             return result
         except Exception as e:
             logger.error(f"删除知识库失败: {e}")
             return {"code": -1, "message": str(e)}
 
-    def get_or_create_dataset(self, name: str) -> Optional[str]:
+    async def get_or_create_dataset(self, name: str) -> Optional[str]:
         """
         获取或创建知识库
 
@@ -178,7 +262,7 @@ class RAGFlowClient:
             知识库 ID
         """
         # 先尝试查找
-        result = self.list_datasets(name=name)
+        result = await self.list_datasets(name=name)
         if result.get("code") == 0:
             datasets = result.get("data", [])
             for ds in datasets:
@@ -186,7 +270,7 @@ class RAGFlowClient:
                     return ds.get("id")
 
         # 不存在则创建
-        result = self.create_dataset(name, f"{name} - 自动创建")
+        result = await self.create_dataset(name, f"{name} - 自动创建")
         if result.get("code") == 0:
             return result.get("data", {}).get("id")
 
@@ -194,7 +278,29 @@ class RAGFlowClient:
 
     # ==================== 文档管理 ====================
 
-    def upload_document_content(self, dataset_id: str, title: str, content: str) -> Dict:
+    async def _upload(self, dataset_id: str, file_name: str, file_content: bytes, content_type: str) -> Dict:
+        """
+        以 multipart/form-data 上传文件，成功后触发解析
+
+        Raises:
+            httpx.HTTPError: 网络错误或非 2xx 响应
+        """
+        result = await self._request(
+            "POST",
+            f"/api/v1/datasets/{dataset_id}/documents",
+            operation="upload",  # 文件上传可能需要更长时间
+            files={"file": (file_name, file_content, content_type)},
+        )
+
+        if result.get("code") == 0:
+            # 触发解析
+            doc_ids = [doc.get("id") for doc in result.get("data", [])]
+            if doc_ids:
+                await self.parse_documents(dataset_id, doc_ids)
+
+        return result
+
+    async def upload_document_content(self, dataset_id: str, title: str, content: str) -> Dict:
         """
         上传文本内容到知识库（创建为 txt 文档）
 
@@ -207,37 +313,19 @@ class RAGFlowClient:
             API 响应
         """
         try:
-            # 创建临时文件内容
             file_content = f"# {title}\n\n{content}"
             file_name = f"{title[:50]}.txt"
 
-            # 使用 multipart/form-data 上传
-            files = {"file": (file_name, file_content.encode("utf-8"), "text/plain")}
-            headers = {"Authorization": f"Bearer {self.api_key}"}
-
-            resp = requests.post(
-                f"{self.base_url}/api/v1/datasets/{dataset_id}/documents",
-                files=files,
-                headers=headers,
-                timeout=self.timeout,
-            )
-            resp.raise_for_status()
-            result = resp.json()
-
+            result = await self._upload(dataset_id, file_name, file_content.encode("utf-8"), "text/plain")
             if result.get("code") == 0:
                 logger.info(f"文档上传成功: {title}")
-                # 触发解析
-                doc_ids = [doc.get("id") for doc in result.get("data", [])]
-                if doc_ids:
-                    self.parse_documents(dataset_id, doc_ids)
-
             return result
 
         except Exception as e:
             logger.error(f"上传文档失败: {e}")
             return {"code": -1, "message": str(e)}
 
-    def upload_document_file(self, dataset_id: str, file_path: str, file_name: str = None) -> Dict:
+    async def upload_document_file(self, dataset_id: str, file_path: str, file_name: str = None) -> Dict:
         """
         上传二进制文件到知识库（支持PDF、Word、Excel等格式）
 
@@ -250,61 +338,27 @@ class RAGFlowClient:
             API 响应
         """
         try:
-            import os
-            from pathlib import Path
-
             file_path_obj = Path(file_path)
             if not file_path_obj.exists():
                 return {"code": -1, "message": f"文件不存在: {file_path}"}
 
             # 使用自定义文件名或原文件名
             final_file_name = file_name or file_path_obj.name
+            content_type = MIME_TYPES.get(file_path_obj.suffix.lower(), "application/octet-stream")
 
-            # 确定文件MIME类型
-            mime_types = {
-                ".pdf": "application/pdf",
-                ".doc": "application/msword",
-                ".docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-                ".xls": "application/vnd.ms-excel",
-                ".xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                ".txt": "text/plain",
-                ".md": "text/markdown",
-                ".html": "text/html",
-                ".htm": "text/html",
-            }
-            content_type = mime_types.get(file_path_obj.suffix.lower(), "application/octet-stream")
-
-            # 读取二进制文件
-            with open(file_path, "rb") as f:
-                file_content = f.read()
-
-            # 使用 multipart/form-data 上传二进制文件
-            files = {"file": (final_file_name, file_content, content_type)}
-            headers = {"Authorization": f"Bearer {self.api_key}"}
-
-            resp = requests.post(
-                f"{self.base_url}/api/v1/datasets/{dataset_id}/documents",
-                files=files,
-                headers=headers,
-                timeout=self.timeout * 2,  # 文件上传可能需要更长时间
-            )
-            resp.raise_for_status()
-            result = resp.json()
+            # 读取二进制文件（放到线程里，大文件不阻塞事件循环）
+            file_content = await asyncio.to_thread(file_path_obj.read_bytes)
 
+            result = await self._upload(dataset_id, final_file_name, file_content, content_type)
             if result.get("code") == 0:
                 logger.info(f"文件上传成功: {final_file_name}")
-                # 触发解析
-                doc_ids = [doc.get("id") for doc in result.get("data", [])]
-                if doc_ids:
-                    self.parse_documents(dataset_id, doc_ids)
-
             return result
 
         except Exception as e:
             logger.error(f"上传文件失败: {e}")
             return {"code": -1, "message": str(e)}
 
-    def upload_document_bytes(
+    async def upload_document_bytes(
         self, dataset_id: str, file_content: bytes, file_name: str, content_type: str = None
     ) -> Dict:
         """
@@ -320,50 +374,20 @@ class RAGFlowClient:
             API 响应
         """
         try:
-            from pathlib import Path
-
             # 确定文件MIME类型
             if not content_type:
-                mime_types = {
-                    ".pdf": "application/pdf",
-                    ".doc": "application/msword",
-                    ".docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-                    ".xls": "application/vnd.ms-excel",
-                    ".xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                    ".txt": "text/plain",
-                    ".md": "text/markdown",
-                    ".html": "text/html",
-                    ".htm": "text/html",
-                }
-                content_type = mime_types.get(Path(file_name).suffix.lower(), "application/octet-stream")
-
-            # 使用 multipart/form-data 上传二进制文件
-            files = {"file": (file_name, file_content, content_type)}
-            headers = {"Authorization": f"Bearer {self.api_key}"}
-
-            resp = requests.post(
-                f"{self.base_url}/api/v1/datasets/{dataset_id}/documents",
-                files=files,
-                headers=headers,
-                timeout=self.timeout * 2,  # 文件上传可能需要更长时间
-            )
-            resp.raise_for_status()
-            result = resp.json()
+                content_type = MIME_TYPES.get(Path(file_name).suffix.lower(), "application/octet-stream")
 
+            result = await self._upload(dataset_id, file_name, file_content, content_type)
             if result.get("code") == 0:
                 logger.info(f"二进制内容上传成功: {file_name}")
-                # 触发解析
-                doc_ids = [doc.get("id") for doc in result.get("data", [])]
-                if doc_ids:
-                    self.parse_documents(dataset_id, doc_ids)
-
             return result
 
         except Exception as e:
             logger.error(f"上传二进制内容失败: {e}")
             return {"code": -1, "message": str(e)}
 
-    def parse_documents(self, dataset_id: str, document_ids: List[str]) -> Dict:
+    async def parse_documents(self, dataset_id: str, document_ids: List[str]) -> Dict:
         """
         触发文档解析（分块）
 
@@ -375,20 +399,16 @@ class RAGFlowClient:
             API 响应
         """
         try:
-            resp = self.session.post(
-                f"{self.base_url}/api/v1/datasets/{dataset_id}/chunks",
-                json={"document_ids": document_ids},
-                timeout=self.timeout,
+            result = await self._request(
+                "POST", f"/api/v1/datasets/{dataset_id}/chunks", json={"document_ids": document_ids}
             )
-            resp.raise_for_status()
-            result = resp.json()
             logger.info(f"文档解析已触发: {len(document_ids)} 个文档")
             return result
         except Exception as e:
             logger.error(f"文档解析失败: {e}")
             return {"code": -1, "message": str(e)}
 
-    def get_document(self, dataset_id: str, document_id: str) -> Dict:
+    async def get_document(self, dataset_id: str, document_id: str) -> Dict:
         """
         获取文档详情
 
@@ -400,16 +420,12 @@ class RAGFlowClient:
             文档详情
         """
         try:
-            resp = self.session.get(
-                f"{self.base_url}/api/v1/datasets/{dataset_id}/documents/{document_id}", timeout=self.timeout
-            )
-            resp.raise_for_status()
-            return resp.json()
+            return await self._request("GET", f"/api/v1/datasets/{dataset_id}/documents/{document_id}")
         except Exception as e:
             logger.error(f"获取文档详情失败: {e}")
             return {"code": -1, "message": str(e)}
 
-    def get_document_content(self, dataset_id: str, document_id: str) -> Dict:
+    async def get_document_content(self, dataset_id: str, document_id: str) -> Dict:
         """
         获取文档内容
 
@@ -423,7 +439,7 @@ class RAGFlowClient:
         try:
             # RAGFlow可能通过不同的API获取文档内容
             # 这里尝试通过检索API获取
-            result = self.retrieve(
+            result = await self.retrieve(
                 question="获取完整文档内容", dataset_ids=[dataset_id], top_k=1, similarity_threshold=0.0
             )
 
@@ -441,7 +457,7 @@ class RAGFlowClient:
             logger.error(f"获取文档内容失败: {e}")
             return {"code": -1, "message": str(e)}
 
-    def update_document(self, dataset_id: str, document_id: str, title: str = None, content: str = None) -> Dict:
+    async def update_document(self, dataset_id: str, document_id: str, title: str = None, content: str = None) -> Dict:
         """
         更新文档（通过删除旧文档并创建新文档实现）
 
@@ -456,13 +472,13 @@ class RAGFlowClient:
         """
         try:
             # 先删除旧文档
-            delete_result = self.delete_document(dataset_id, document_id)
+            delete_result = await self.delete_document(dataset_id, document_id)
             if delete_result.get("code") != 0:
                 logger.warning(f"删除旧文档失败，可能文档不存在: {document_id}")
 
             # 创建新文档
             if title and content:
-                new_result = self.upload_document_content(dataset_id, title, content)
+                new_result = await self.upload_document_content(dataset_id, title, content)
                 if new_result.get("code") == 0:
                     logger.info(f"更新文档成功: {title}")
                     return new_result
@@ -472,7 +488,7 @@ class RAGFlowClient:
             logger.error(f"更新文档失败: {e}")
             return {"code": -1, "message": str(e)}
 
-    def delete_document(self, dataset_id: str, document_id: str) -> Dict:
+    async def delete_document(self, dataset_id: str, document_id: str) -> Dict:
         """
         删除文档
 
@@ -484,18 +500,14 @@ class RAGFlowClient:
             API 响应
         """
         try:
-            resp = self.session.delete(
-                f"{self.base_url}/api/v1/datasets/{dataset_id}/documents/{document_id}", timeout=self.timeout
-            )
-            resp.raise_for_status()
-            result = resp.json()
+            result = await self._request("DELETE", f"/api/v1/datasets/{dataset_id}/documents/{document_id}")
             logger.info(f"删除文档成功: {document_id}")
             return result
         except Exception as e:
             logger.error(f"删除文档失败: {e}")
             return {"code": -1, "message": str(e)}
 
-    def list_documents(self, dataset_id: str, **kwargs) -> Dict:
+    async def list_documents(self, dataset_id: str, **kwargs) -> Dict:
         """
         列出知识库中的文档
 
@@ -507,18 +519,31 @@ class RAGFlowClient:
             文档列表
         """
         try:
-            resp = self.session.get(
-                f"{self.base_url}/api/v1/datasets/{dataset_id}/documents", params=kwargs, timeout=self.timeout
-            )
-            resp.raise_for_status()
-            return resp.json()
+            return await self._request("GET", f"/api/v1/datasets/{dataset_id}/documents", params=kwargs)
         except Exception as e:
             logger.error(f"列出文档失败: {e}")
             return {"code": -1, "message": str(e)}
 
+    async def list_chunks(self, dataset_id: str, **kwargs) -> Dict:
+        """
+        列出知识库的文档块
+
+        Args:
+            dataset_id: 知识库 ID
+            **kwargs: 其他查询参数（document_id / page / page_size）
+
+        Returns:
+            文档块列表
+        """
+        try:
+            return await self._request("GET", f"/api/v1/datasets/{dataset_id}/chunks", params=kwargs)
+        except Exception as e:
+            logger.error(f"列出文档块失败: {e}")
+            return {"code": -1, "message": str(e)}
+
     # ==================== 检索（去重核心）====================
 
-    def retrieve(
+    async def retrieve(
         self, question: str, dataset_ids: List[str], similarity_threshold: float = 0.85, top_k: int = 1024
     ) -> Dict:
         """
@@ -534,8 +559,10 @@ class RAGFlowClient:
             检索结果
         """
         try:
-            resp = self.session.post(
-                f"{self.base_url}/api/v1/retrieval",
+            return await self._request(
+                "POST",
+                "/api/v1/retrieval",
+                operation="retrieval",
                 json={
                     "question": question,
                     "dataset_ids": dataset_ids,
@@ -545,15 +572,12 @@ class RAGFlowClient:
                     "keyword": True,
                     "highlight": True,
                 },
-                timeout=self.timeout,
             )
-            resp.raise_for_status()
-            return resp.json()
         except Exception as e:
             logger.error(f"检索失败: {e}")
             return {"code": -1, "message": str(e)}
 
-    def check_duplicate(
+    async def check_duplicate(
         self, content: str, dataset_ids: List[str] = None, threshold: float = 0.85
     ) -> Tuple[bool, List[Dict]]:
         """
@@ -579,7 +603,7 @@ class RAGFlowClient:
         logger.debug(f"去重检索摘要: {summary[:50]}...")
         logger.debug(f"检索阈值: {threshold}, 知识库: {dataset_ids}")
 
-        result = self.retrieve(summary, dataset_ids, similarity_threshold=threshold)
+        result = await self.retrieve(summary, dataset_ids, similarity_threshold=threshold)
 
         if result.get("code") != 0:
             logger.warning(f"去重检测失败: {result.get('message')}")
@@ -611,7 +635,7 @@ class RAGFlowClient:
 
     # ==================== 聊天（文章生成）====================
 
-    def create_chat(self, name: str, dataset_ids: List[str], system_prompt: str = None) -> Dict:
+    async def create_chat(self, name: str, dataset_ids: List[str], system_prompt: str = None) -> Dict:
         """
         创建聊天助手
 
@@ -628,14 +652,12 @@ class RAGFlowClient:
             payload["prompt"] = [{"role": "system", "content": system_prompt}]
 
         try:
-            resp = self.session.post(f"{self.base_url}/api/v1/chats", json=payload, timeout=self.timeout)
-            resp.raise_for_status()
-            return resp.json()
+            return await self._request("POST", "/api/v1/chats", json=payload)
         except Exception as e:
             logger.error(f"创建聊天助手失败: {e}")
             return {"code": -1, "message": str(e)}
 
-    def chat_completion(self, chat_id: str, question: str, stream: bool = False) -> Dict:
+    async def chat_completion(self, chat_id: str, question: str, stream: bool = False) -> Dict:
         """
         发送对话请求
 
@@ -648,13 +670,12 @@ class RAGFlowClient:
             API 响应
         """
         try:
-            resp = self.session.post(
-                f"{self.base_url}/api/v1/chats/{chat_id}/completions",
+            return await self._request(
+                "POST",
+                f"/api/v1/chats/{chat_id}/completions",
+                operation="chat",  # 对话可能需要更长时间
                 json={"question": question, "stream": stream},
-                timeout=self.timeout * 2,  # 对话可能需要更长时间
             )
-            resp.raise_for_status()
-            return resp.json()
         except Exception as e:
             logger.error(f"对话请求失败: {e}")
             return {"code": -1, "message": str(e)}
@@ -672,3 +693,9 @@ def get_ragflow_client() -> RAGFlowClient:
 
         _ragflow_client = RAGFlowClient(base_url=RAGFLOW_BASE_URL, api_key=RAGFLOW_API_KEY)
     return _ragflow_client
+
+
+async def close_ragflow_client():
+    """关闭 RAGFlow 客户端连接池（应用关闭时调用）"""
+    if _ragflow_client is not None:
+        await _ragflow_client.close()
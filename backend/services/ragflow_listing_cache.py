@@ -0,0 +1,246 @@
+# -*- coding: utf-8 -*-
+"""
+RAGFlow 列表缓存
+缓存知识库列表和每个知识库的文档列表，避免每次翻页都请求 RAGFlow 并回写 SQLite
+
+- TTL 内直接命中；过期但未超过最大陈旧时间时返回旧数据并在后台刷新
+- 同一个 key 的并发请求只发一次（single-flight）
+- 每份列表带 ETag（内容指纹），列表没变化时调用方可以跳过 SQLite 回写
+- 通过本系统 API 写 RAGFlow 后调用 invalidate_* 让缓存失效
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+from loguru import logger
+
+from backend.config import RAGFLOW_LISTING_CACHE_MAX_STALE, RAGFLOW_LISTING_CACHE_TTL
+from backend.services.ragflow_client import get_ragflow_client
+
+DATASETS_KEY = "datasets"
+
+# 文档列表分页拉取
+DOCUMENT_PAGE_SIZE = 100
+DOCUMENT_MAX_PAGES = 50
+
+
+@dataclass
+class _Entry:
+    items: List[Dict[str, Any]]
+    etag: str
+    fetched_at: float
+    synced_etag: Optional[str] = None
+
+
+@dataclass
+class ListingSnapshot:
+    """一次列表读取的结果"""
+
+    key: str
+    items: List[Dict[str, Any]]
+    etag: str
+    age_seconds: float
+
+
+def _documents_key(dataset_id: str) -> str:
+    return f"documents:{dataset_id}"
+
+
+def _compute_etag(items: List[Dict[str, Any]]) -> str:
+    payload = json.dumps(items, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def _extract_items(data: Any) -> List[Dict[str, Any]]:
+    """兼容 RAGFlow 的两种返回格式：data 直接是列表，或 {docs/list/data: [...], total: n}"""
+    if isinstance(data, list):
+        return data
+    if isinstance(data, dict):
+        return data.get("docs", data.get("list", data.get("data", []))) or []
+    return []
+
+
+class RAGFlowListingCache:
+    """RAGFlow 知识库/文档列表缓存"""
+
+    def __init__(
+        self,
+        ttl: float = RAGFLOW_LISTING_CACHE_TTL,
+        max_stale: float = RAGFLOW_LISTING_CACHE_MAX_STALE,
+        client_factory: Callable[[], Any] = get_ragflow_client,
+    ):
+        """
+        初始化列表缓存
+
+        Args:
+            ttl: 新鲜期（秒）
+            max_stale: 最大陈旧时间（秒），超过后必须同步拉取
+            client_factory: 返回 RAGFlowClient 的工厂（测试可替换）
+        """
+        self.ttl = ttl
+        self.max_stale = max(max_stale, ttl)
+        self._client_factory = client_factory
+        self._entries: Dict[str, _Entry] = {}
+        self._inflight: Dict[str, asyncio.Task] = {}
+        # 失效代数：拉取过程中被失效的结果不写回缓存
+        self._generations: Dict[str, int] = {}
+        self._background: Set[asyncio.Task] = set()
+        self._stats = {"hits": 0, "stale_hits": 0, "misses": 0, "refreshes": 0, "errors": 0, "invalidations": 0}
+
+    # ==================== 读取 ====================
+
+    async def get_datasets(self) -> ListingSnapshot:
+        """获取知识库列表"""
+        return await self._get(DATASETS_KEY, self._fetch_datasets)
+
+    async def get_documents(self, dataset_id: str) -> ListingSnapshot:
+        """获取知识库的全部文档列表"""
+        return await self._get(_documents_key(dataset_id), lambda: self._fetch_documents(dataset_id))
+
+    async def _fetch_datasets(self) -> List[Dict[str, Any]]:
+        result = await self._client_factory().list_datasets()
+        if result.get("code") != 0:
+            raise RuntimeError(result.get("message") or "获取知识库列表失败")
+        return _extract_items(result.get("data"))
+
+    async def _fetch_documents(self, dataset_id: str) -> List[Dict[str, Any]]:
+        client = self._client_factory()
+        items: List[Dict[str, Any]] = []
+        for page in range(1, DOCUMENT_MAX_PAGES + 1):
+            result = await client.list_documents(dataset_id, page=page, page_size=DOCUMENT_PAGE_SIZE)
+            if result.get("code") != 0:
+                raise RuntimeError(result.get("message") or "获取文档列表失败")
+            page_items = _extract_items(result.get("data"))
+            items.extend(page_items)
+            if len(page_items) < DOCUMENT_PAGE_SIZE:
+                break
+        return items
+
+    async def _get(self, key: str, fetch: Callable[[], Awaitable[List[Dict[str, Any]]]]) -> ListingSnapshot:
+        entry = self._entries.get(key)
+        if entry:
+            age = time.monotonic() - entry.fetched_at
+            if age < self.ttl:
+                self._stats["hits"] += 1
+                return self._snapshot(key, entry)
+            if age < self.max_stale:
+                self._stats["stale_hits"] += 1
+                self._refresh_in_background(key, fetch)
+                return self._snapshot(key, entry)
+
+        self._stats["misses"] += 1
+        try:
+            entry = await self._load(key, fetch)
+        except Exception:
+            self._stats["errors"] += 1
+            raise
+        return self._snapshot(key, entry)
+
+    def _load(self, key: str, fetch) -> "asyncio.Future[_Entry]":
+        """同一个 key 同时只有一个拉取任务，其余调用方等待同一结果"""
+        task = self._inflight.get(key)
+        if task is None or task.done():
+            task = asyncio.create_task(self._fetch_entry(key, fetch))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._inflight.pop(key, None) if self._inflight.get(key) is t else None)
+        return asyncio.shield(task)
+
+    async def _fetch_entry(self, key: str, fetch) -> _Entry:
+        generation = self._generations.get(key, 0)
+        items = await fetch()
+        old = self._entries.get(key)
+        entry = _Entry(
+            items=items,
+            etag=_compute_etag(items),
+            fetched_at=time.monotonic(),
+            synced_etag=old.synced_etag if old else None,
+        )
+        if self._generations.get(key, 0) == generation:
+            self._entries[key] = entry
+        return entry
+
+    def _refresh_in_background(self, key: str, fetch):
+        if key in self._inflight:
+            return
+
+        async def refresh():
+            try:
+                await self._load(key, fetch)
+                self._stats["refreshes"] += 1
+            except Exception as e:
+                self._stats["errors"] += 1
+                logger.warning(f"⚠️ RAGFlow 列表后台刷新失败 ({key})，继续使用旧数据: {e}")
+
+        task = asyncio.create_task(refresh())
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    @staticmethod
+    def _snapshot(key: str, entry: _Entry) -> ListingSnapshot:
+        return ListingSnapshot(
+            key=key, items=entry.items, etag=entry.etag, age_seconds=round(time.monotonic() - entry.fetched_at, 1)
+        )
+
+    # ==================== SQLite 回写标记 ====================
+
+    def needs_sync(self, snapshot: ListingSnapshot) -> bool:
+        """列表内容自上次回写 SQLite 后是否变化"""
+        entry = self._entries.get(snapshot.key)
+        return entry is None or entry.synced_etag != snapshot.etag
+
+    def mark_synced(self, snapshot: ListingSnapshot):
+        """记录该版本列表已回写 SQLite"""
+        entry = self._entries.get(snapshot.key)
+        if entry is not None and entry.etag == snapshot.etag:
+            entry.synced_etag = snapshot.etag
+
+    # ==================== 失效 ====================
+
+    def invalidate(self, key: str):
+        self._generations[key] = self._generations.get(key, 0) + 1
+        self._entries.pop(key, None)
+        self._stats["invalidations"] += 1
+
+    def invalidate_datasets(self):
+        """知识库增删改后调用"""
+        self.invalidate(DATASETS_KEY)
+
+    def invalidate_documents(self, dataset_id: Optional[str]):
+        """知识库内文档增删或重新解析后调用"""
+        if dataset_id:
+            self.invalidate(_documents_key(dataset_id))
+
+    def clear(self):
+        """清空全部缓存"""
+        for key in list(self._entries):
+            self.invalidate(key)
+
+    # ==================== 统计 ====================
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        获取缓存统计
+
+        Returns:
+            {hits, stale_hits, misses, refreshes, errors, invalidations, hit_rate, entries, ttl, max_stale}
+        """
+        lookups = self._stats["hits"] + self._stats["stale_hits"] + self._stats["misses"]
+        now = time.monotonic()
+        return {
+            **self._stats,
+            "hit_rate": round((self._stats["hits"] + self._stats["stale_hits"]) / lookups * 100, 2) if lookups else 0,
+            "entries": {
+                key: {"items": len(entry.items), "etag": entry.etag, "age_seconds": round(now - entry.fetched_at, 1)}
+                for key, entry in self._entries.items()
+            },
+            "ttl": self.ttl,
+            "max_stale": self.max_stale,
+        }
+
+
+# 全局 RAGFlow 列表缓存
+ragflow_listing_cache = RAGFlowListingCache()
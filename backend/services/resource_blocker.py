@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+"""
+资源拦截器
+按平台配置拦截图片、字体、视频和统计脚本，只保留页面文本需要的请求
+"""
+
+import re
+from typing import Dict, Any
+
+from loguru import logger
+
+from backend.config import RESOURCE_BLOCKING_ENABLED, RESOURCE_BLOCK_PROFILES
+
+# 被拦截请求的估算大小（字节）：请求被中止后拿不到真实大小，按资源类型估算
+ESTIMATED_RESOURCE_BYTES = {
+    "image": 40 * 1024,
+    "media": 500 * 1024,
+    "font": 50 * 1024,
+    "script": 30 * 1024,
+    "stylesheet": 20 * 1024,
+}
+DEFAULT_ESTIMATED_BYTES = 5 * 1024
+
+
+class ResourceBlocker:
+    """
+    资源拦截器
+
+    注意：开启路由拦截后 Playwright 会禁用该上下文的 HTTP 缓存，
+    所以只用于采集和收录检测这类短生命周期的上下文！
+    """
+
+    def __init__(
+        self,
+        profiles: Dict[str, Dict[str, Any]] = RESOURCE_BLOCK_PROFILES,
+        enabled: bool = RESOURCE_BLOCKING_ENABLED,
+    ):
+        """
+        初始化资源拦截器
+
+        Args:
+            profiles: 平台拦截规则，见 config.RESOURCE_BLOCK_PROFILES
+            enabled: 是否启用
+        """
+        self.enabled = enabled
+        self._profiles: Dict[str, Dict[str, Any]] = {}
+        for platform_id, profile in profiles.items():
+            self._profiles[platform_id] = {
+                "resource_types": set(profile.get("resource_types", [])),
+                "url_patterns": [re.compile(p, re.IGNORECASE) for p in profile.get("url_patterns", [])],
+            }
+        self._stats: Dict[str, Dict[str, Any]] = {}
+
+    def _get_profile(self, platform_id: str) -> Dict[str, Any]:
+        return self._profiles.get(platform_id) or self._profiles.get("default") or {
+            "resource_types": set(),
+            "url_patterns": [],
+        }
+
+    def _platform_stats(self, platform_id: str) -> Dict[str, Any]:
+        return self._stats.setdefault(
+            platform_id,
+            {"allowed": 0, "blocked": 0, "estimated_bytes_saved": 0, "blocked_by_type": {}},
+        )
+
+    def should_block(self, platform_id: str, resource_type: str, url: str) -> bool:
+        """
+        判断请求是否需要拦截
+
+        Args:
+            platform_id: 平台ID
+            resource_type: 资源类型（Playwright request.resource_type）
+            url: 请求地址
+        """
+        profile = self._get_profile(platform_id)
+        if resource_type in profile["resource_types"]:
+            return True
+        return any(pattern.search(url) for pattern in profile["url_patterns"])
+
+    def record(self, platform_id: str, resource_type: str, blocked: bool):
+        """记录一次请求的拦截结果"""
+        stats = self._platform_stats(platform_id)
+        if not blocked:
+            stats["allowed"] += 1
+            return
+        stats["blocked"] += 1
+        stats["estimated_bytes_saved"] += ESTIMATED_RESOURCE_BYTES.get(resource_type, DEFAULT_ESTIMATED_BYTES)
+        stats["blocked_by_type"][resource_type] = stats["blocked_by_type"].get(resource_type, 0) + 1
+
+    async def apply(self, target: Any, platform_id: str) -> bool:
+        """
+        在 BrowserContext 或 Page 上安装拦截路由
+
+        Args:
+            target: BrowserContext 或 Page
+            platform_id: 平台ID（用于选择拦截规则和统计）
+
+        Returns:
+            是否已安装
+        """
+        if not self.enabled:
+            return False
+
+        async def handle_route(route):
+            request = route.request
+            resource_type = request.resource_type
+            blocked = self.should_block(platform_id, resource_type, request.url)
+            self.record(platform_id, resource_type, blocked)
+            try:
+                if blocked:
+                    await route.abort("blockedbyclient")
+                else:
+                    await route.continue_()
+            except Exception as e:
+                # 页面关闭时未完成的路由会报错，忽略即可
+                logger.debug(f"[资源拦截] 路由处理失败（忽略）: {e}")
+
+        try:
+            await target.route("**/*", handle_route)
+            return True
+        except Exception as e:
+            logger.warning(f"[资源拦截] 安装拦截路由失败: {e}")
+            return False
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        获取各平台拦截统计
+
+        Returns:
+            {enabled, platforms: {platform_id: {allowed, blocked, estimated_bytes_saved, blocked_by_type}}}
+        """
+        return {
+            "enabled": self.enabled,
+            "platforms": {
+                platform_id: {**stats, "blocked_by_type": dict(stats["blocked_by_type"])}
+                for platform_id, stats in self._stats.items()
+            },
+        }
+
+
+# 全局资源拦截器
+resource_blocker = ResourceBlocker()
@@ -5,8 +5,10 @@
 """
 
 import asyncio
-from datetime import datetime
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
 from loguru import logger
+from sqlalchemy import and_, func, or_
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 
@@ -16,7 +18,14 @@ try:
 except ImportError:
     timezone = None
 
+from backend.config import (
+    PUBLISH_WORKER_CONCURRENCY,
+    PUBLISH_JOB_HEARTBEAT_SECONDS,
+    INDEX_MONITOR_CONCURRENCY,
+    INDEX_MONITOR_CLAIM_MINUTES,
+)
 from backend.services.geo_article_service import GeoArticleService
+from backend.services.publish_job_queue import publish_job_queue
 from backend.database.models import ScheduledTask, GeoArticle
 
 # 🌟 统一日志绑定
@@ -36,6 +45,11 @@ class SchedulerService:
             },
         )
         self.db_factory = None
+        # 本进程正在执行的发布任务（持有引用，避免任务被回收）
+        self._publish_workers = set()
+        # 本进程正在执行的收录检测
+        self._index_workers = set()
+        self._index_monitor_stats = {"due": 0, "lag_seconds": 0, "in_flight": 0, "dispatched": 0}
 
         # 🌟 任务映射表
         self.task_registry = {
@@ -179,36 +193,31 @@ class SchedulerService:
         3. account_id 不为空（已配置发布账号）
         4. scheduled_at 时间已到
 
+        到期文章先写入 publish_jobs 队列，再按本进程空闲名额认领执行，
+        同一篇文章只会被一个 worker 发布一次（多进程部署同样适用）
+
         注意：不扫描 completed 状态的文章（等待用户在批量发布页面配置）
         """
         if not self.db_factory:
             return
         db = self.db_factory()
         try:
-            now = datetime.now()
-            # 搜索：已配置定时发布 且 平台/账号已配置 且 时间已到
-            # 同时也支持失败重试（failed 且 次数<3）
-            from sqlalchemy import and_
-
-            pending = (
-                db.query(GeoArticle)
-                .filter(
-                    and_(
-                        GeoArticle.publish_status == "scheduled",
-                        GeoArticle.platform.isnot(None),
-                        GeoArticle.account_id.isnot(None),
-                        GeoArticle.scheduled_at <= now,
-                    )
-                )
-                .all()
-            )
-
-            if pending:
-                log.info(f"🔍 [发布扫描] 发现 {len(pending)} 篇定时发布文章，准备触发脚本...")
-                service = GeoArticleService(db)
-                for article in pending:
-                    # 使用 create_task 异步处理，防止多篇文章发布时互相阻塞
-                    asyncio.create_task(service.execute_publish(article.id))
+            enqueued = publish_job_queue.enqueue_due_articles(db)
+            if enqueued:
+                log.info(f"🔍 [发布扫描] 新增 {enqueued} 个定时发布任务")
+
+            free_slots = PUBLISH_WORKER_CONCURRENCY - len(self._publish_workers)
+            if free_slots <= 0:
+                log.debug(f"🔍 [发布扫描] 本进程发布名额已满 ({len(self._publish_workers)})，等待下一轮")
+                return
+
+            jobs = publish_job_queue.claim(db, free_slots)
+            if jobs:
+                log.info(f"🔍 [发布扫描] 认领 {len(jobs)} 个发布任务，准备触发脚本...")
+                for job_id, article_id in jobs:
+                    task = asyncio.create_task(self._run_publish_job(job_id, article_id))
+                    self._publish_workers.add(task)
+                    task.add_done_callback(self._publish_workers.discard)
             else:
                 log.debug("🔍 [发布扫描] 无定时发布文章待处理")
         except Exception as e:
@@ -216,31 +225,150 @@ class SchedulerService:
         finally:
             db.close()
 
+    async def _run_publish_job(self, job_id: int, article_id: int):
+        """执行单个发布任务：独立会话 + 心跳续租，结束后回写任务状态"""
+        db = self.db_factory()
+        heartbeat = asyncio.create_task(self._publish_job_heartbeat(job_id))
+        success = False
+        error = None
+        try:
+            success = await GeoArticleService(db).execute_publish(article_id)
+            if not success:
+                error = "发布失败，详见文章错误信息"
+        except Exception as e:
+            error = str(e)
+            log.error(f"❌ 发布任务 {job_id} 执行异常: {e}")
+        finally:
+            heartbeat.cancel()
+            try:
+                publish_job_queue.complete(db, job_id, success, error)
+            except Exception as e:
+                log.error(f"❌ 发布任务 {job_id} 状态回写失败: {e}")
+            finally:
+                db.close()
+
+    async def _publish_job_heartbeat(self, job_id: int):
+        """定期为执行中的发布任务续租"""
+        while True:
+            await asyncio.sleep(PUBLISH_JOB_HEARTBEAT_SECONDS)
+            db = self.db_factory()
+            try:
+                if not publish_job_queue.heartbeat(db, job_id):
+                    log.warning(f"⚠️ 发布任务 {job_id} 租约已丢失，停止续租")
+                    return
+            except Exception as e:
+                log.warning(f"⚠️ 发布任务 {job_id} 续租失败: {e}")
+            finally:
+                db.close()
+
     async def auto_check_indexing_job(self):
         """
         [Job] 自动监测收录
+
+        只挑选 next_check_at 已到期（或从未检测）的已发布文章，按本进程空闲名额启动检测 worker；
+        每个 worker 检测完一篇后继续领取下一篇到期文章，直到没有到期文章为止，
+        所以并发数不超过 INDEX_MONITOR_CONCURRENCY，但一轮扫描会把积压全部检测完。
+        领取时先把 next_check_at 推后，防止检测未结束时被重复领取
         """
         if not self.db_factory:
             return
         db = self.db_factory()
         try:
-            # 搜索：已发布 但 未被确认收录的文章
-            pending = (
-                db.query(GeoArticle)
-                .filter(GeoArticle.publish_status == "published", GeoArticle.index_status != "indexed")
-                .all()
+            now = datetime.now()
+
+            # 积压情况：到期文章数、最早到期时间
+            due_count, oldest_due = db.query(func.count(GeoArticle.id), func.min(GeoArticle.next_check_at)).filter(
+                self._index_due_filter(now)
+            ).one()
+            lag_seconds = int((now - oldest_due).total_seconds()) if oldest_due else 0
+            self._index_monitor_stats.update(
+                {"due": due_count, "lag_seconds": lag_seconds, "in_flight": len(self._index_workers)}
             )
 
-            if pending:
-                log.info(f"📡 [收录扫描] 发现 {len(pending)} 篇已发布文章需要检测效果...")
-                service = GeoArticleService(db)
-                for article in pending:
-                    asyncio.create_task(service.check_article_index(article.id))
+            free_slots = INDEX_MONITOR_CONCURRENCY - len(self._index_workers)
+            if not due_count or free_slots <= 0:
+                if due_count:
+                    log.debug(f"📡 [收录扫描] 检测 worker 已满（仍在领取积压），积压 {due_count} 篇，落后 {lag_seconds}s")
+                return
+
+            article_ids = self._claim_due_articles(db, free_slots)
+
+            log.info(f"📡 [收录扫描] 到期 {due_count} 篇（落后 {lag_seconds}s），启动 {len(article_ids)} 个检测 worker")
+            for article_id in article_ids:
+                task = asyncio.create_task(self._index_check_worker(article_id))
+                self._index_workers.add(task)
+                task.add_done_callback(self._index_workers.discard)
         except Exception as e:
             log.error(f"监测 Job 运行异常: {e}")
         finally:
             db.close()
 
+    @staticmethod
+    def _index_due_filter(now: datetime):
+        return and_(
+            GeoArticle.publish_status == "published",
+            GeoArticle.index_status != "indexed",
+            or_(GeoArticle.next_check_at.is_(None), GeoArticle.next_check_at <= now),
+        )
+
+    def _claim_due_articles(self, db, limit: int) -> List[int]:
+        """领取到期文章并把 next_check_at 推后（从未检测的优先，其余按到期先后）"""
+        now = datetime.now()
+        article_ids = [
+            row.id
+            for row in db.query(GeoArticle.id)
+            .filter(self._index_due_filter(now))
+            .order_by(GeoArticle.next_check_at.isnot(None), GeoArticle.next_check_at, GeoArticle.id)
+            .limit(limit)
+        ]
+        if article_ids:
+            db.query(GeoArticle).filter(GeoArticle.id.in_(article_ids)).update(
+                {GeoArticle.next_check_at: now + timedelta(minutes=INDEX_MONITOR_CLAIM_MINUTES)},
+                synchronize_session=False,
+            )
+            db.commit()
+        self._index_monitor_stats["dispatched"] += len(article_ids)
+        return article_ids
+
+    async def _index_check_worker(self, article_id: Optional[int]):
+        """检测 worker：检测完一篇后继续领取下一篇到期文章，没有到期文章时退出"""
+        while article_id is not None:
+            await self._run_index_check(article_id)
+
+            db = self.db_factory()
+            try:
+                next_ids = self._claim_due_articles(db, 1)
+            except Exception as e:
+                log.error(f"领取到期文章失败: {e}")
+                return
+            finally:
+                db.close()
+            article_id = next_ids[0] if next_ids else None
+
+    async def _run_index_check(self, article_id: int):
+        """执行单篇文章的收录检测（独立会话）"""
+        db = self.db_factory()
+        try:
+            await GeoArticleService(db).check_article_index(article_id)
+        except Exception as e:
+            log.error(f"❌ 文章 {article_id} 收录检测异常: {e}")
+        finally:
+            db.close()
+
+    def get_index_monitor_stats(self) -> Dict[str, Any]:
+        """
+        获取收录监测积压情况
+
+        Returns:
+            {due, lag_seconds, in_flight, dispatched, concurrency}
+            dispatched 为累计领取的文章数（含 worker 续领的）
+        """
+        return {
+            **self._index_monitor_stats,
+            "in_flight": len(self._index_workers),
+            "concurrency": INDEX_MONITOR_CONCURRENCY,
+        }
+
 
 # 单例模式
 _instance = SchedulerService()
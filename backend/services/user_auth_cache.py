@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""
+JWT 认证的用户缓存
+每个带令牌的请求都要确认用户仍存在、已激活并取角色，缓存 user_id → (用户名, 角色, 是否激活)，
+命中时鉴权不查库
+
+本进程内修改用户状态 / 角色、删除用户后立即失效；
+其它进程（多 worker）的修改最迟在 TTL 后生效
+
+未命中时先取 generation() 再查库，写回时带上它：查库期间发生过失效则不写回，
+避免查库早于管理员提交的请求把旧状态重新缓存一个 TTL
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+from backend.config import USER_AUTH_CACHE_TTL
+
+
+@dataclass(frozen=True)
+class AuthUser:
+    """鉴权所需的用户信息（不是 ORM 对象，不能用来修改数据库）"""
+
+    id: int
+    username: str
+    role: str
+    is_active: bool
+
+
+class UserAuthCache:
+    """用户鉴权信息的短时缓存（同步接口在线程池里执行，读写加锁）"""
+
+    def __init__(self, ttl: float = USER_AUTH_CACHE_TTL, max_entries: int = 10000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: Dict[int, Tuple[AuthUser, float]] = {}
+        self._lock = threading.Lock()
+        # 每次失效 / 清空加一，查库前后不一致说明读到的可能是旧数据
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id: int) -> Optional[AuthUser]:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None or time.monotonic() - entry[1] > self.ttl:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entry[0]
+
+    def generation(self) -> int:
+        """查库前调用，结果传给 set()"""
+        with self._lock:
+            return self._generation
+
+    def set(self, user: AuthUser, generation: Optional[int] = None):
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            if len(self._entries) >= self.max_entries:
+                self._entries.clear()
+            self._entries[user.id] = (user, time.monotonic())
+
+    def invalidate(self, user_id: int):
+        """用户状态 / 角色变更或删除后调用"""
+        with self._lock:
+            self._entries.pop(user_id, None)
+            self._generation += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses, "ttl": self.ttl}
+
+
+# 全局单例
+user_auth_cache = UserAuthCache()
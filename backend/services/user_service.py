@@ -12,6 +12,7 @@ from sqlalchemy.orm import Session
 from loguru import logger
 
 from backend.database.models import User
+from backend.services.user_auth_cache import user_auth_cache
 from backend.config import ENCRYPTION_KEY
 
 
@@ -173,6 +174,7 @@ class UserService:
 
             user.is_active = is_active
             db.commit()
+            user_auth_cache.invalidate(user_id)
 
             logger.info(f"用户状态更新: {user.username} -> {'启用' if is_active else '禁用'}")
             return {"success": True, "message": f"用户已{'启用' if is_active else '禁用'}"}
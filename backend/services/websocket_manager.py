@@ -1,42 +1,317 @@
 # backend/services/websocket_manager.py
-from typing import Dict
+"""
+WebSocket 连接管理
+每个客户端一个有界发送队列 + 独立发送任务，广播只负责入队，不等待任何客户端发送完成
+慢客户端队列满时按 WS_SLOW_CLIENT_POLICY 处理：丢弃最旧消息（drop_oldest）或断开（disconnect）
+
+客户端可以按主题订阅，只接收感兴趣的消息：
+    type:<消息类型>   如 type:publish_progress
+    task:<任务ID>     消息顶层的 task_id
+    module:<模块名>   日志模块
+    level:<级别>      日志 / 预警级别，订阅该级别及以上
+    *                 全部消息
+没有任何订阅的客户端接收全部消息（兼容旧客户端）
+每条消息只序列化一次，没有订阅者就不序列化；log_batch 按订阅过滤其中的日志条目
+"""
+
+import asyncio
+import json
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
 from fastapi import WebSocket
 from loguru import logger
 
+from backend.config import WS_SEND_QUEUE_SIZE, WS_SEND_TIMEOUT, WS_SLOW_CLIENT_POLICY
+
+TOPIC_PREFIXES = ("type", "task", "module", "level")
+ALL_TOPICS = "*"
+
+# 级别顺序（loguru 级别 + SEO 预警的 warning / critical）
+LEVELS = {"TRACE": 5, "DEBUG": 10, "INFO": 20, "SUCCESS": 25, "WARNING": 30, "ERROR": 40, "CRITICAL": 50}
+
+
+def normalize_topic(topic: Any) -> Optional[str]:
+    """规范化订阅主题，不合法返回 None"""
+    if not isinstance(topic, str):
+        return None
+    topic = topic.strip()
+    if topic == ALL_TOPICS:
+        return topic
+    prefix, sep, value = topic.partition(":")
+    prefix, value = prefix.strip().lower(), value.strip()
+    if not sep or not value or prefix not in TOPIC_PREFIXES:
+        return None
+    if prefix == "level":
+        value = value.upper()
+        if value not in LEVELS:
+            return None
+    return f"{prefix}:{value}"
+
+
+def _level_no(level: Any) -> Optional[int]:
+    return LEVELS.get(level.upper()) if isinstance(level, str) else None
+
+
+def message_topics(message: Dict[str, Any]) -> Tuple[Set[str], Optional[int]]:
+    """提取消息所属的主题和级别"""
+    topics = set()
+    if message.get("type"):
+        topics.add(f"type:{message['type']}")
+    if message.get("task_id") is not None:
+        topics.add(f"task:{message['task_id']}")
+    if message.get("module"):
+        topics.add(f"module:{message['module']}")
+    level = message.get("level")
+    data = message.get("data")
+    if level is None and isinstance(data, dict):
+        # seo_alert 的级别在 data 里
+        level = data.get("level")
+    return topics, _level_no(level)
+
+
+def _dumps(message: Dict[str, Any]) -> str:
+    # 与 WebSocket.send_json 的编码方式一致
+    return json.dumps(message, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+class ClientChannel:
+    """单个客户端的发送通道"""
+
+    def __init__(self, client_id: str, websocket: WebSocket, queue_size: int):
+        self.client_id = client_id
+        self.websocket = websocket
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.sender: Optional[asyncio.Task] = None
+        self.connected_at = datetime.now()
+        self.sent = 0
+        self.dropped = 0
+        self.peak_queue_depth = 0
+        self.topics: Set[str] = set()
+        # level:* 订阅中最低的级别，None 表示没有级别订阅
+        self.min_level: Optional[int] = None
+
+    def subscribe(self, topics: Iterable[str]):
+        self.topics.update(topics)
+        self._update_min_level()
+
+    def unsubscribe(self, topics: Iterable[str]):
+        self.topics.difference_update(topics)
+        self._update_min_level()
+
+    def _update_min_level(self):
+        levels = [LEVELS[t[6:]] for t in self.topics if t.startswith("level:")]
+        self.min_level = min(levels) if levels else None
+
+    @property
+    def receives_all(self) -> bool:
+        return not self.topics or ALL_TOPICS in self.topics
+
+    def wants(self, topics: Set[str], level_no: Optional[int]) -> bool:
+        """是否订阅了带这些主题 / 级别的消息"""
+        if self.receives_all or not self.topics.isdisjoint(topics):
+            return True
+        return level_no is not None and self.min_level is not None and level_no >= self.min_level
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "topics": sorted(self.topics),
+            "queue_depth": self.queue.qsize(),
+            "peak_queue_depth": self.peak_queue_depth,
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "connected_at": self.connected_at.isoformat(),
+        }
+
 
 class ConnectionManager:
-    def __init__(self):
-        # 存储活跃的连接 {client_id: WebSocket}
-        self.active_connections: Dict[str, WebSocket] = {}
+    def __init__(
+        self,
+        queue_size: int = WS_SEND_QUEUE_SIZE,
+        policy: str = WS_SLOW_CLIENT_POLICY,
+        send_timeout: float = WS_SEND_TIMEOUT,
+    ):
+        # 活跃连接 {client_id: ClientChannel}
+        self.channels: Dict[str, ClientChannel] = {}
+        self.queue_size = queue_size
+        self.policy = policy
+        self.send_timeout = send_timeout
+        # 因过慢 / 发送失败被断开的客户端数
+        self.evicted = 0
 
-    async def connect(self, websocket: WebSocket, client_id: str):
-        """接受连接"""
+    async def connect(self, websocket: WebSocket, client_id: str, topics: Optional[Iterable[str]] = None):
+        """接受连接（topics 为连接时就订阅的主题）"""
         await websocket.accept()
-        self.active_connections[client_id] = websocket
+        if client_id in self.channels:
+            # 同一 client_id 重连，旧连接作废
+            self.disconnect(client_id)
+        channel = ClientChannel(client_id, websocket, self.queue_size)
+        if topics:
+            channel.subscribe(t for t in map(normalize_topic, topics) if t)
+        channel.sender = asyncio.create_task(self._send_loop(channel), name=f"ws-sender-{client_id}")
+        self.channels[client_id] = channel
         logger.info(f"WebSocket连接建立: {client_id}")
 
-    def disconnect(self, client_id: str):
-        """断开连接"""
-        if client_id in self.active_connections:
-            del self.active_connections[client_id]
-            logger.info(f"WebSocket连接断开: {client_id}")
+    def disconnect(self, client_id: str, websocket: Optional[WebSocket] = None):
+        """
+        断开连接
 
-    async def send_personal(self, message: dict, client_id: str):
-        """🌟 补全此方法：发送消息给指定客户端"""
-        if client_id in self.active_connections:
+        Args:
+            client_id: 客户端ID
+            websocket: 传入时只在该连接仍是当前连接时才断开（避免旧连接退出时把重连的新连接踢掉）
+        """
+        channel = self.channels.get(client_id)
+        if not channel or (websocket is not None and channel.websocket is not websocket):
+            return
+        del self.channels[client_id]
+        if channel.sender and channel.sender is not asyncio.current_task():
+            channel.sender.cancel()
+        logger.info(f"WebSocket连接断开: {client_id}")
+
+    async def _send_loop(self, channel: ClientChannel):
+        """逐条发送该客户端队列中的消息，发送失败或超时即断开"""
+        while True:
+            message = await channel.queue.get()
             try:
-                await self.active_connections[client_id].send_json(message)
+                await asyncio.wait_for(channel.websocket.send_text(message), timeout=self.send_timeout)
+                channel.sent += 1
+            except asyncio.CancelledError:
+                raise
             except Exception as e:
-                logger.error(f"发送个人消息失败: {e}")
+                logger.warning(f"⚠️ WebSocket 发送失败，断开客户端 {channel.client_id}: {type(e).__name__} {e}")
+                self._evict(channel)
+                return
+
+    def _evict(self, channel: ClientChannel):
+        if self.channels.get(channel.client_id) is not channel:
+            return
+        self.evicted += 1
+        self.disconnect(channel.client_id)
+        asyncio.create_task(self._close_quietly(channel.websocket))
+
+    @staticmethod
+    async def _close_quietly(websocket: WebSocket):
+        try:
+            await websocket.close()
+        except Exception:
+            pass
+
+    def _enqueue(self, channel: ClientChannel, message: str):
+        if channel.queue.full():
+            if self.policy == "disconnect":
+                logger.warning(f"⚠️ WebSocket 客户端 {channel.client_id} 消费过慢，已断开")
+                self._evict(channel)
+                return
+            # drop_oldest：丢掉最旧的一条给新消息腾位置
+            # 注意这里不能打 INFO 以上的日志：日志本身会被广播，会形成循环
+            channel.queue.get_nowait()
+            channel.dropped += 1
+            logger.debug(f"WebSocket 客户端 {channel.client_id} 队列已满，丢弃最旧消息")
+        channel.queue.put_nowait(message)
+        channel.peak_queue_depth = max(channel.peak_queue_depth, channel.queue.qsize())
+
+    def publish(self, message: dict):
+        """按订阅分发消息（只入队，立即返回；必须在事件循环线程中调用）"""
+        if message.get("type") == "log_batch":
+            self._publish_log_batch(message)
+            return
+
+        topics, level_no = message_topics(message)
+        text = None
+        for channel in list(self.channels.values()):
+            if channel.wants(topics, level_no):
+                if text is None:
+                    text = _dumps(message)
+                self._enqueue(channel, text)
+
+    def _publish_log_batch(self, message: dict):
+        """日志批次：订阅了部分模块 / 级别的客户端只收到匹配的条目，相同订阅只序列化一次"""
+        logs: List[Dict[str, Any]] = message.get("logs") or []
+        batch_topic = {f"type:{message['type']}"}
+        frames: Dict[Any, Optional[str]] = {}
+        for channel in list(self.channels.values()):
+            key = None if channel.wants(batch_topic, None) else frozenset(channel.topics)
+            if key not in frames:
+                if key is None:
+                    frames[key] = _dumps(message)
+                else:
+                    matched = [entry for entry in logs if channel.wants(*message_topics(entry))]
+                    frames[key] = _dumps({**message, "logs": matched}) if matched else None
+            if frames[key] is not None:
+                self._enqueue(channel, frames[key])
+
+    def subscribe(self, client_id: str, topics: Iterable[Any]) -> List[str]:
+        """
+        订阅主题
+
+        Returns:
+            实际生效（合法）的主题
+        """
+        channel = self.channels.get(client_id)
+        accepted = [t for t in map(normalize_topic, topics) if t]
+        if channel:
+            channel.subscribe(accepted)
+        return accepted
+
+    def unsubscribe(self, client_id: str, topics: Iterable[Any]) -> List[str]:
+        """取消订阅（全部取消后恢复为接收全部消息）"""
+        channel = self.channels.get(client_id)
+        removed = [t for t in map(normalize_topic, topics) if t]
+        if channel:
+            channel.unsubscribe(removed)
+        return removed
+
+    async def handle_client_message(self, client_id: str, raw: str):
+        """
+        处理客户端发来的控制消息：
+            {"action": "subscribe", "topics": ["task:12", "level:WARNING"]}
+            {"action": "unsubscribe", "topics": ["task:12"]}
+        其它内容（心跳等）忽略
+        """
+        try:
+            payload = json.loads(raw)
+        except (TypeError, ValueError):
+            return
+        if not isinstance(payload, dict) or payload.get("action") not in ("subscribe", "unsubscribe"):
+            return
+        topics = payload.get("topics") or []
+        if isinstance(topics, str):
+            topics = [topics]
+        if payload["action"] == "subscribe":
+            self.subscribe(client_id, topics)
+        else:
+            self.unsubscribe(client_id, topics)
+        channel = self.channels.get(client_id)
+        if channel:
+            self._enqueue(channel, _dumps({"type": "subscriptions", "topics": sorted(channel.topics)}))
+
+    async def send_personal(self, message: dict, client_id: str):
+        """发送消息给指定客户端（不受订阅过滤）"""
+        channel = self.channels.get(client_id)
+        if channel:
+            self._enqueue(channel, _dumps(message))
 
     async def broadcast(self, message: dict):
-        """广播消息给所有客户端"""
-        for connection in list(self.active_connections.values()):
-            try:
-                await connection.send_json(message)
-            except Exception:
-                # 忽略已经失效的连接
-                pass
+        """按订阅分发消息（不等待发送完成，慢客户端不会拖慢调用方）"""
+        self.publish(message)
+
+    async def close(self):
+        """关闭所有连接并等待发送任务退出（应用退出时调用）"""
+        channels = list(self.channels.values())
+        for channel in channels:
+            self.disconnect(channel.client_id)
+        await asyncio.gather(*(channel.sender for channel in channels if channel.sender), return_exceptions=True)
+        await asyncio.gather(*(self._close_quietly(channel.websocket) for channel in channels))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """每个客户端的队列深度、已发送、已丢弃数"""
+        return {
+            "connections": len(self.channels),
+            "policy": self.policy,
+            "queue_size": self.queue_size,
+            "evicted": self.evicted,
+            "clients": {client_id: channel.get_stats() for client_id, channel in self.channels.items()},
+        }
 
 
 # 创建全局单例
@@ -114,7 +114,9 @@ export const geoKeywordApi = {
 export const geoArticleApi = {
   // 获取文章列表 (对应 Articles.vue)
   // 支持按 publish_status 和 project_id 过滤，用于批量发布时只获取待发布的文章
-  getArticles: (params?: { limit?: number; publish_status?: string; project_id?: number }) => get('/geo/articles', params),
+  // 列表不含正文等大字段，预览时用 getDetail 取完整内容
+  getArticles: (params?: { limit?: number; publish_status?: string | string[]; project_id?: number; fields?: string }) =>
+    get('/geo/articles', params),
 
   // 生成文章 (5分钟超时) - 新增发布策略参数
   generate: (data: {
@@ -157,8 +159,13 @@ export const indexCheckApi = {
     start_date?: string
     end_date?: string
     question?: string
+    cursor?: string
+    fields?: string
   }) => get<any>('/index-check/records', params),
 
+  // 获取单条记录（含完整 AI 回答，列表默认不返回）
+  getRecord: (id: number) => get<any>(`/index-check/records/${id}`),
+
   // 删除单条记录
   deleteRecord: (id: number) => del<any>(`/index-check/records/${id}`),
 
@@ -9,6 +9,9 @@ import { ElMessage } from 'element-plus'
 type MessageHandler = (data: any) => void
 type ConnectionStatus = 'connecting' | 'connected' | 'disconnected' | 'error'
 
+// 消息类型对应的服务端订阅主题（'*' 为全部消息）
+const topicOf = (type: string) => (type === '*' ? '*' : `type:${type}`)
+
 class WebSocketService {
   private ws: WebSocket | null = null
   private url: string = ''
@@ -44,6 +47,8 @@ class WebSocketService {
         this.status.value = 'connected'
         this.reconnectAttempts = 0
         console.log('WebSocket 连接成功')
+        // 重连后服务端订阅已丢失，重新订阅
+        this.syncSubscriptions()
       }
 
       this.ws.onmessage = (event) => {
@@ -95,20 +100,22 @@ class WebSocketService {
   /**
    * 发送消息
    */
-  send(data: any) {
+  send(data: any, silent = false) {
     if (this.ws?.readyState === WebSocket.OPEN) {
       this.ws.send(JSON.stringify(data))
-    } else {
+    } else if (!silent) {
       console.warn('WebSocket 未连接，无法发送消息')
     }
   }
 
   /**
    * 订阅消息
+   * 同时向服务端订阅 type:<类型> 主题（'*' 订阅全部），服务端只推送有处理器的消息类型
    */
   on(type: string, handler: MessageHandler) {
     if (!this.handlers.has(type)) {
       this.handlers.set(type, new Set())
+      this.send({ action: 'subscribe', topics: [topicOf(type)] }, true)
     }
     this.handlers.get(type)!.add(handler)
 
@@ -120,7 +127,23 @@ class WebSocketService {
    * 取消订阅
    */
   off(type: string, handler: MessageHandler) {
-    this.handlers.get(type)?.delete(handler)
+    const set = this.handlers.get(type)
+    if (!set) return
+    set.delete(handler)
+    if (set.size === 0) {
+      this.handlers.delete(type)
+      this.send({ action: 'unsubscribe', topics: [topicOf(type)] }, true)
+    }
+  }
+
+  /**
+   * 把当前所有处理器的类型同步为服务端订阅（有 '*' 处理器时接收全部消息）
+   */
+  private syncSubscriptions() {
+    const types = [...this.handlers.keys()]
+    if (types.length === 0) return
+    const topics = types.includes('*') ? ['*'] : types.map(topicOf)
+    this.send({ action: 'subscribe', topics }, true)
   }
 
   /**
@@ -86,6 +86,8 @@ export const useArticleStore = defineStore('article', () => {
       if (params.pageSize) queryParams.append('limit', String(params.pageSize))
       if (params.status !== undefined) queryParams.append('status', String(params.status))
       if (params.keyword) queryParams.append('keyword', params.keyword)
+      // 列表默认不返回正文，文章卡片要显示摘要
+      queryParams.append('fields', 'content')
 
       const url = `/api/articles?${queryParams.toString()}`
       const response = await fetch(url)
@@ -20,7 +20,11 @@ if sys.platform == "win32":
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from backend.database import SessionLocal, init_db
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from backend.database import Base, SessionLocal, init_db
 from backend.database.models import (
     Account, PublishRecord, Project, Keyword, ReferenceArticle,
     IndexCheckRecord, GeoArticle, QuestionVariant
@@ -93,6 +97,32 @@ def clean_db(db):
     db.query(Account).delete()
     db.query(ReferenceArticle).delete()
     db.commit()
+    # 批量删除不会把会话里已删除的对象移出身份映射，SQLite 又会复用 id，
+    # 下一个测试插入同 id 的行时可能撞上已被回收的旧对象
+    db.expunge_all()
+
+
+@pytest.fixture
+def memory_engine():
+    """每个测试独立的内存 SQLite 库（已建好全部表，StaticPool 让所有会话共用同一个连接）"""
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def memory_session_factory(memory_engine):
+    """绑定内存库的会话工厂（需要多个会话的测试用）"""
+    return sessionmaker(bind=memory_engine, autoflush=False)
+
+
+@pytest.fixture
+def memory_db(memory_session_factory):
+    """内存库会话"""
+    session = memory_session_factory()
+    yield session
+    session.close()
 
 
 @pytest.fixture(scope="session")
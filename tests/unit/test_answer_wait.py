@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""
+AI回答完成检测测试
+使用假页面验证事件驱动模式、注入失败回退轮询和耗时统计
+"""
+
+import pytest
+
+from backend.services.playwright.ai_platforms import DeepSeekChecker, get_answer_wait_stats
+
+ANSWER = "这是一个足够长的回答。" * 20
+
+
+class ObserverPage:
+    """页面内脚本正常返回"""
+
+    async def evaluate(self, script, arg):
+        assert arg["quietMs"] == 50
+        return {"stable": True, "length": len(ANSWER), "mutations": 12}
+
+    async def inner_text(self, selector):
+        raise AssertionError("事件驱动模式不应读取整页文本")
+
+
+class BrokenObserverPage:
+    """注入失败（如页面跳转导致执行上下文销毁）"""
+
+    def __init__(self):
+        self.reads = 0
+
+    async def evaluate(self, script, arg):
+        raise RuntimeError("Execution context was destroyed")
+
+    async def inner_text(self, selector):
+        self.reads += 1
+        return ANSWER
+
+
+def make_checker(platform_id: str, **config) -> DeepSeekChecker:
+    return DeepSeekChecker(platform_id, {"name": platform_id, "url": "", "answer_quiet_ms": 50, **config})
+
+
+class TestAnswerWait:
+    """回答完成检测测试"""
+
+    @pytest.mark.asyncio
+    async def test_observer_mode(self):
+        """事件驱动模式直接返回页面内检测结果"""
+        checker = make_checker("observer_ok")
+
+        result = await checker.wait_for_answer_generation(ObserverPage(), "", timeout=5000)
+
+        assert result["success"] and result["stable"]
+        assert result["mode"] == "observer"
+        stats = get_answer_wait_stats()["observer_ok"]
+        assert stats["observer"] == 1 and stats["fallback"] == 0
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_polling_when_injection_fails(self):
+        """注入失败时回退轮询"""
+        checker = make_checker("observer_broken")
+        page = BrokenObserverPage()
+
+        result = await checker.wait_for_answer_generation(page, "", timeout=5000, check_interval=0.01)
+
+        assert result["success"] and result["stable"]
+        assert result["mode"] == "polling"
+        assert page.reads >= 5
+        stats = get_answer_wait_stats()["observer_broken"]
+        assert stats["fallback"] == 1 and stats["count"] == 1
+
+    @pytest.mark.asyncio
+    async def test_polling_mode_can_be_forced_per_platform(self):
+        """按平台配置强制使用轮询"""
+        checker = make_checker("polling_only", answer_wait_mode="polling")
+
+        result = await checker.wait_for_answer_generation(BrokenObserverPage(), "", timeout=5000, check_interval=0.01)
+
+        assert result["mode"] == "polling"
+        assert get_answer_wait_stats()["polling_only"]["polling"] == 1
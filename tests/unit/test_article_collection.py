@@ -1151,6 +1151,7 @@ class TestCollectFlowMocked:
         with patch('backend.services.article_collector_service.playwright_mgr') as mock_mgr, \
              patch('backend.services.article_collector_service.get_collector') as mock_get_collector, \
              patch('backend.services.article_collector_service.register_collectors'), \
+             patch('backend.services.article_collector_service.NEAR_DUPLICATE_INDEX_ENABLED', False), \
              patch.object(service._ragflow, 'is_configured', return_value=False):
 
             # 设置 Mock
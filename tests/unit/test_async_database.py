@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""
+异步数据库会话测试
+验证连接串换成异步驱动，以及迁移到异步会话的只读接口（含 run_sync 复用同步服务）结果正确
+"""
+
+from datetime import datetime
+
+import pytest
+import pytest_asyncio
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from backend.api import article, knowledge, reports
+from backend.database import Base, to_async_url
+from backend.database.models import GeoArticle, IndexCheckRecord, Keyword, Knowledge, KnowledgeCategory, Project
+
+
+@pytest_asyncio.fixture
+async def db():
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)()
+    session.add_all(
+        [
+            Project(id=1, name="测试项目", company_name="测试公司"),
+            Keyword(id=1, project_id=1, keyword="GEO"),
+            GeoArticle(keyword_id=1, title="GEO 入门", content="正文", publish_status="published"),
+            GeoArticle(keyword_id=1, title="SEO 对比", content="正文", publish_status="failed"),
+            IndexCheckRecord(
+                keyword_id=1, platform="doubao", question="q", answer="a", keyword_found=True, check_time=datetime.now()
+            ),
+            KnowledgeCategory(id=1, name="企业", ragflow_dataset_id="ds1"),
+            Knowledge(id=1, category_id=1, ragflow_dataset_id="ds1", title="公司介绍", content="我们是一家公司"),
+        ]
+    )
+    await session.commit()
+
+    yield session
+    await session.close()
+    await engine.dispose()
+
+
+class FailingListingCache:
+    """RAGFlow 不可用的列表缓存"""
+
+    async def get_documents(self, dataset_id):
+        raise ConnectionError("RAGFlow 不可用")
+
+
+class TestAsyncDatabase:
+    """异步会话测试"""
+
+    def test_to_async_url(self):
+        """同步连接串换成异步驱动，已是异步驱动的不变"""
+        assert to_async_url("sqlite:////data/app.db") == "sqlite+aiosqlite:////data/app.db"
+        assert to_async_url("postgresql+psycopg2://u:p@h:5432/db") == "postgresql+asyncpg://u:p@h:5432/db"
+        assert to_async_url("postgresql+asyncpg://u:p@h/db") == "postgresql+asyncpg://u:p@h/db"
+
+    @pytest.mark.asyncio
+    async def test_read_endpoints(self, db):
+        """文章列表 / 详情、报表统计（run_sync 复用日汇总）在异步会话上返回正确结果"""
+        listing = await article.get_articles(
+            page=1, limit=20, publish_status=None, keyword="GEO", cursor=None, fields=None, db=db
+        )
+        assert listing.total == 1 and listing.items[0].title == "GEO 入门"
+        # 列表默认不带正文
+        assert listing.items[0].content is None
+
+        with pytest.raises(HTTPException):
+            await article.get_article(999, db=db)
+
+        stats = await reports.get_summary_stats(project_id=1, days=7, db=db)
+        assert (stats.total_articles, stats.publish_success_count, stats.publish_total_count) == (2, 1, 2)
+        assert (stats.keyword_check_count, stats.keyword_hit_count) == (1, 1)
+
+        overview = await reports.get_overview(db=db)
+        assert overview["total_keywords"] == 1 and overview["keyword_found"] == 1
+
+    @pytest.mark.asyncio
+    async def test_knowledge_list_falls_back_after_rollback(self, db, monkeypatch):
+        """RAGFlow 同步失败回滚后仍能返回本地缓存（不会在异步会话里触发隐式加载）"""
+        monkeypatch.setattr(knowledge, "ragflow_listing_cache", FailingListingCache())
+
+        items = await knowledge.get_knowledge_list(1, search=None, full_content=False, db=db)
+
+        assert [item.title for item in items] == ["公司介绍"]
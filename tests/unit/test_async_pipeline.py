@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""
+分阶段流水线测试
+验证阶段重叠、背压、批处理和统计
+"""
+
+import asyncio
+
+import pytest
+
+from backend.services.async_pipeline import Pipeline, PipelineStage
+
+
+class TestAsyncPipeline:
+    """分阶段流水线测试"""
+
+    @pytest.mark.asyncio
+    async def test_stages_overlap_and_batch(self):
+        """下游在上游全部完成前就开始处理，入库阶段按批取出"""
+        events = []
+        saved_batches = []
+
+        async def slow_source(items):
+            await asyncio.sleep(0.01)
+            events.append(("source", items[0]))
+            return items
+
+        async def persist(items):
+            events.append(("persist", items[0]))
+            saved_batches.append(list(items))
+            return []
+
+        pipeline = Pipeline(
+            [
+                PipelineStage("source", slow_source, concurrency=1),
+                PipelineStage("persist", persist, batch_size=10),
+            ]
+        )
+        async with pipeline:
+            for i in range(5):
+                await pipeline.put(i)
+
+        assert sorted(i for batch in saved_batches for i in batch) == [0, 1, 2, 3, 4]
+        # 第一个条目在最后一个条目离开上游之前就已入库
+        assert events.index(("persist", 0)) < events.index(("source", 4))
+
+        stats = pipeline.get_stats()
+        assert stats["source"]["processed"] == 5
+        assert stats["persist"]["processed"] == 5
+
+    @pytest.mark.asyncio
+    async def test_backpressure_and_failures(self):
+        """下游队列满时上游等待；处理失败计入 failed 而不中断流水线"""
+
+        async def passthrough(items):
+            return items
+
+        async def sink(items):
+            await asyncio.sleep(0.005)
+            if items[0] == 3:
+                raise ValueError("坏数据")
+            return []
+
+        pipeline = Pipeline(
+            [
+                PipelineStage("source", passthrough, queue_size=100),
+                PipelineStage("sink", sink, queue_size=2),
+            ]
+        )
+        async with pipeline:
+            for i in range(10):
+                await pipeline.put(i)
+
+        stats = pipeline.get_stats()
+        assert stats["sink"]["peak_queue_depth"] <= 2
+        assert stats["sink"]["failed"] == 1
+        assert stats["sink"]["processed"] == 9
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""
+收录检测浏览器池测试
+使用假浏览器验证租用/归还、重建和等待统计，不需要真实 Chromium
+"""
+
+import asyncio
+
+import pytest
+
+from backend.services.browser_pool import BrowserPool
+
+
+class FakeBrowser:
+    """模拟 Playwright Browser"""
+
+    def __init__(self):
+        self.connected = True
+        self.closed = False
+
+    def is_connected(self):
+        return self.connected
+
+    async def close(self):
+        self.closed = True
+        self.connected = False
+
+
+def make_pool(**kwargs) -> BrowserPool:
+    """创建使用假浏览器的池"""
+    pool = BrowserPool(**kwargs)
+
+    async def fake_playwright():
+        return object()
+
+    async def fake_launch(playwright):
+        return FakeBrowser()
+
+    pool._ensure_playwright = fake_playwright
+    pool._launch_browser = fake_launch
+    return pool
+
+
+class TestBrowserPool:
+    """浏览器池测试"""
+
+    @pytest.mark.asyncio
+    async def test_reuses_browser_between_leases(self):
+        """同一个浏览器在多次租用之间被复用"""
+        pool = make_pool(max_browsers=1, max_uses=10)
+
+        async with pool.lease() as first:
+            pass
+        async with pool.lease() as second:
+            pass
+
+        assert first is second
+        stats = pool.get_stats()
+        assert stats["launches"] == 1
+        assert stats["leases"] == 2
+        assert stats["idle"] == 1
+
+    @pytest.mark.asyncio
+    async def test_recycles_after_max_uses(self):
+        """达到最大使用次数后关闭并重建"""
+        pool = make_pool(max_browsers=1, max_uses=2)
+
+        browsers = []
+        for _ in range(3):
+            async with pool.lease() as browser:
+                browsers.append(browser)
+
+        assert browsers[0] is browsers[1]
+        assert browsers[0].closed
+        assert browsers[2] is not browsers[0]
+        assert pool.get_stats()["recycled"] == 1
+
+    @pytest.mark.asyncio
+    async def test_crashed_browser_is_replaced(self):
+        """崩溃的浏览器不会再被租出"""
+        pool = make_pool(max_browsers=1, max_uses=10)
+
+        with pytest.raises(RuntimeError):
+            async with pool.lease() as browser:
+                browser.connected = False
+                raise RuntimeError("Target closed")
+
+        async with pool.lease() as new_browser:
+            assert new_browser is not browser
+            assert new_browser.is_connected()
+
+        assert pool.get_stats()["crashed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_caps_concurrent_browsers_and_records_wait(self):
+        """超过容量的租用需要排队，并记录等待时间"""
+        pool = make_pool(max_browsers=1, max_uses=10)
+        order = []
+
+        async def worker(name: str):
+            async with pool.lease():
+                order.append(name)
+                await asyncio.sleep(0.05)
+
+        await asyncio.gather(worker("a"), worker("b"))
+
+        stats = pool.get_stats()
+        assert order == ["a", "b"]
+        assert stats["launches"] == 1
+        assert stats["max_wait_ms"] >= 40
+
+    @pytest.mark.asyncio
+    async def test_acquire_timeout(self):
+        """等待超时抛出 TimeoutError"""
+        pool = make_pool(max_browsers=1, max_uses=10, acquire_timeout=0.05)
+
+        async with pool.lease():
+            with pytest.raises(TimeoutError):
+                await pool.acquire()
+
+        assert pool.get_stats()["timeouts"] == 1
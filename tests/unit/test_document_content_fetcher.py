@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""
+文档内容批量获取测试
+验证并发上限、按 文档ID + 版本 缓存和失败降级
+"""
+
+import asyncio
+
+import pytest
+
+from backend.services.document_content_fetcher import DocumentContentFetcher, summarize
+
+
+class FakeRAGFlowClient:
+    """记录并发峰值的假客户端"""
+
+    def __init__(self):
+        self.calls = []
+        self.active = 0
+        self.peak = 0
+
+    async def get_document_content(self, dataset_id, document_id):
+        self.calls.append(document_id)
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        if document_id == "bad":
+            return {"code": -1, "message": "不存在"}
+        return {"code": 0, "data": {"content": f"{document_id} 的正文"}}
+
+
+class TestDocumentContentFetcher:
+    """文档内容批量获取测试"""
+
+    @pytest.mark.asyncio
+    async def test_fetches_concurrently_within_limit(self):
+        """批量获取不超过并发上限，失败的返回 None"""
+        client = FakeRAGFlowClient()
+        fetcher = DocumentContentFetcher(concurrency=3, client_factory=lambda: client)
+
+        docs = [(f"doc{i}", "v1") for i in range(10)] + [("bad", "v1")]
+        contents = await fetcher.fetch_many("ds1", docs)
+
+        assert client.peak == 3
+        assert contents["doc0"] == "doc0 的正文"
+        assert contents["bad"] is None
+        assert fetcher.get_stats()["errors"] == 1
+
+    @pytest.mark.asyncio
+    async def test_cache_keyed_by_version(self):
+        """版本不变时命中缓存，版本变化后重新获取"""
+        client = FakeRAGFlowClient()
+        fetcher = DocumentContentFetcher(client_factory=lambda: client)
+
+        await fetcher.fetch_many("ds1", [("doc1", "v1")])
+        await fetcher.fetch_many("ds1", [("doc1", "v1")])
+        assert client.calls == ["doc1"]
+
+        await fetcher.fetch_many("ds1", [("doc1", "v2")])
+        assert client.calls == ["doc1", "doc1"]
+        assert fetcher.get_stats()["hits"] == 1
+
+    def test_summarize(self):
+        """摘要超长截断"""
+        assert summarize("短文本", limit=10) == "短文本"
+        assert summarize("一" * 20, limit=10) == "一" * 10 + "…"
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""
+列表大字段按需加载测试
+验证列表默认不查询正文 / AI 回答（SQL 里不 SELECT），fields 参数可以要回，详情接口返回完整内容
+"""
+
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import event
+
+from backend.api import geo
+from backend.database.models import GeoArticle, IndexCheckRecord
+from backend.services.field_selection import defer_options, parse_fields
+from backend.services.index_check_service import IndexCheckService
+
+
+@pytest.fixture
+def rows(memory_db):
+    memory_db.add_all(
+        [
+            GeoArticle(id=1, keyword_id=1, title="标题", content="很长的正文" * 100, publish_logs="[]"),
+            IndexCheckRecord(keyword_id=1, platform="doubao", question="q", answer="很长的回答", check_time=datetime.now()),
+        ]
+    )
+    memory_db.commit()
+    memory_db.expunge_all()
+
+
+@pytest.fixture
+def statements(memory_engine):
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        captured.append(statement)
+
+    event.listen(memory_engine, "before_cursor_execute", capture)
+    yield captured
+    event.remove(memory_engine, "before_cursor_execute", capture)
+
+
+class TestFieldSelection:
+    """大字段按需加载测试"""
+
+    def test_parse_fields(self):
+        """all 展开为全部大字段；不支持的字段报错"""
+        assert parse_fields(GeoArticle, None) == set()
+        assert parse_fields(GeoArticle, "all") == {"content", "publish_logs", "index_details"}
+        assert parse_fields(IndexCheckRecord, " answer ") == {"answer"}
+        with pytest.raises(ValueError):
+            parse_fields(GeoArticle, "content,password")
+
+    @pytest.mark.asyncio
+    async def test_geo_list_defers_content(self, rows, memory_db, statements):
+        """列表默认不查正文；fields 要回正文；详情接口返回完整内容"""
+        items = await geo.list_articles(project_id=None, limit=100, publish_status=None, fields=None, db=memory_db)
+        assert items[0]["title"] == "标题" and items[0]["content"] is None
+        assert "geo_articles.content" not in statements[-1]
+
+        memory_db.expunge_all()
+        items = await geo.list_articles(project_id=None, limit=100, publish_status=None, fields="content", db=memory_db)
+        assert items[0]["content"].startswith("很长的正文") and items[0]["publish_logs"] is None
+
+        detail = await geo.get_article_detail(1, db=memory_db)
+        assert detail.data["publish_logs"] == "[]"
+
+        with pytest.raises(HTTPException):
+            await geo.list_articles(project_id=None, limit=100, publish_status=None, fields="secret", db=memory_db)
+
+    def test_check_records_defer_answer(self, rows, memory_db, statements):
+        """检测记录列表不查 AI 回答"""
+        records, total, _ = IndexCheckService(memory_db).get_check_records(
+            load_options=defer_options(IndexCheckRecord, set())
+        )
+        assert total == 1
+        assert "index_check_records.answer" not in statements[-1]
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+全文检索测试
+验证中文二元切分、增删改后索引同步、按相关度排序的搜索接口，以及旧库补建索引
+"""
+
+import pytest
+from sqlalchemy import select, text
+
+from backend.api.article_collection import list_reference_articles, search_reference_articles
+from backend.database.models import GeoArticle, ReferenceArticle
+from backend.services.fulltext_search import (
+    build_match_query,
+    ensure_fulltext_index,
+    match_condition,
+    rebuild_fulltext_index,
+    segment,
+)
+from backend.services.pagination import list_count_cache
+
+
+def _matched_ids(db, model, keyword):
+    return sorted(db.scalars(select(model.id).where(match_condition(model, keyword))).all())
+
+
+class TestFulltextSearch:
+    """全文检索测试"""
+
+    def test_segment_and_match_query(self):
+        """中文切成重叠二元组、英文小写；单个汉字返回 None（退回 LIKE）"""
+        assert segment("GEO优化：人工智能") == "geo 优化 人工 工智 智能"
+        assert build_match_query("工智能 pyth") == '"工智 智能" AND "pyth"*'
+        assert build_match_query("智") is None
+        assert build_match_query("！？") is None
+
+    def test_index_follows_writes(self, memory_db):
+        """新增、修改标题正文、删除后索引同步；结果与子串匹配一致"""
+        memory_db.add_all(
+            [
+                GeoArticle(id=1, keyword_id=1, title="人工智能入门", content="正文讲 Python"),
+                GeoArticle(id=2, keyword_id=1, title="其它", content="生成式人工智能的应用"),
+            ]
+        )
+        memory_db.commit()
+        assert _matched_ids(memory_db, GeoArticle, "工智能") == [1, 2]
+        assert _matched_ids(memory_db, GeoArticle, "python") == [1]
+        # 单字退回 LIKE
+        assert _matched_ids(memory_db, GeoArticle, "智") == [1, 2]
+
+        memory_db.get(GeoArticle, 1).title = "新标题"
+        memory_db.delete(memory_db.get(GeoArticle, 2))
+        memory_db.commit()
+        assert _matched_ids(memory_db, GeoArticle, "工智能") == []
+        assert _matched_ids(memory_db, GeoArticle, "新标题") == [1]
+
+        memory_db.get(GeoArticle, 1).title = "回滚前"
+        memory_db.flush()
+        memory_db.rollback()
+        assert _matched_ids(memory_db, GeoArticle, "回滚前") == []
+
+    @pytest.mark.asyncio
+    async def test_ranked_search_and_list_filter(self, memory_db):
+        """标题命中排在正文命中前面；已删除的不返回；列表按 q 过滤"""
+        memory_db.add_all(
+            [
+                ReferenceArticle(id=1, title="行业观察", url="https://a/1", content="顺带提到搜索优化", platform="zhihu"),
+                ReferenceArticle(id=2, title="搜索优化实战", url="https://a/2", content="搜索优化的方法", platform="zhihu"),
+                ReferenceArticle(id=3, title="搜索优化", url="https://a/3", content="已删除", platform="zhihu", status=0),
+            ]
+        )
+        memory_db.commit()
+        list_count_cache.invalidate("reference_articles")
+
+        result = await search_reference_articles(q="搜索优化", platform=None, limit=20, db=memory_db)
+        assert [item.id for item in result.items] == [2, 1]
+        assert result.items[0].score > result.items[1].score
+
+        listing = await list_reference_articles(
+            platform=None, keyword=None, page=1, page_size=20, cursor=None, q="实战", db=memory_db
+        )
+        assert listing.total == 1 and listing.items[0].id == 2
+
+    def test_ensure_backfills_existing_database(self, memory_engine, memory_db):
+        """旧库（有源表没有索引表）启动时建表并回填"""
+        memory_db.add(GeoArticle(id=1, keyword_id=1, title="知识库搭建", content="正文"))
+        memory_db.commit()
+        memory_db.execute(text("DROP TABLE geo_articles_fts"))
+        memory_db.commit()
+
+        assert ensure_fulltext_index(memory_engine) == {"geo_articles_fts": 1}
+        assert _matched_ids(memory_db, GeoArticle, "知识库") == [1]
+        assert ensure_fulltext_index(memory_engine) == {}
+        assert rebuild_fulltext_index(memory_db, [GeoArticle]) == {"geo_articles_fts": 1}
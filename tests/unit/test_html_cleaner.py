@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""
+HTML 清洗测试
+验证广告块嵌套/未闭合处理、原样文本元素和批量清洗
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from backend.services.html_cleaner import clean_html, clean_html_many
+
+
+class TestHtmlCleaner:
+    """HTML 清洗测试"""
+
+    def test_nested_ad_block_removed_and_header_kept(self):
+        """嵌套的广告块整块去掉，class 里只是包含 ad 字母的容器保留"""
+        html = (
+            '<div class="header"><h1>标题</h1></div>'
+            '<div class="ad-box"><div class="inner">立即购买</div>链接</div>'
+            '<p>正文&nbsp;&ldquo;引用&rdquo;&#8212;结束</p>'
+        )
+        cleaned = clean_html(html)
+
+        assert cleaned == "标题\n\n正文 “引用”—结束"
+
+    def test_unclosed_ad_block_keeps_following_text(self):
+        """未闭合的广告块只去掉开始标签，不吞掉后面的正文"""
+        cleaned = clean_html('<div class="sponsor"><p>第一段</p><p>第二段</p>')
+
+        assert "第一段" in cleaned
+        assert "第二段" in cleaned
+
+    def test_raw_text_elements_and_noise(self):
+        """script 里的标签文本不当作正文，噪声词长词优先删除"""
+        html = '<script>var s = "<p>假段落</p>";</script><!-- 注释 --><p>正文</p><p>点击展开全文</p>'
+
+        assert clean_html(html) == "正文"
+
+    @pytest.mark.asyncio
+    async def test_clean_many_preserves_order(self):
+        """批量清洗（走进程池时）结果顺序与输入一致"""
+        contents = [f"<p>第{i}篇</p>" for i in range(5)] + [None]
+        with patch("backend.services.html_cleaner.HTML_CLEAN_POOL_MIN_CHARS", 0), patch(
+            "backend.services.html_cleaner._get_pool", side_effect=RuntimeError("进程池不可用")
+        ):
+            cleaned = await clean_html_many(contents)
+
+        assert cleaned == [f"第{i}篇" for i in range(5)] + [""]
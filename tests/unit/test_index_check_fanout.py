@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+"""
+收录检测多平台并行测试
+使用假浏览器和假检测器验证并行执行、并发限制、记录写入顺序，以及取消时已完成的记录仍会写库
+"""
+
+import asyncio
+import sys
+from types import SimpleNamespace
+from unittest.mock import patch, AsyncMock
+
+import pytest
+
+from backend.database.models import IndexCheckDailyStat, IndexCheckRecord
+from backend.services.index_check_service import IndexCheckService, CheckConcurrencyLimiter
+from backend.services.session_manager import secure_session_manager
+
+service_module = sys.modules[IndexCheckService.__module__]
+
+
+class FakeContext:
+    async def route(self, pattern, handler):
+        pass
+
+    async def new_page(self):
+        return object()
+
+    async def storage_state(self):
+        return {"cookies": [], "origins": []}
+
+    async def close(self):
+        pass
+
+
+class FakeBrowser:
+    async def new_context(self, **kwargs):
+        return FakeContext()
+
+
+class FakeLease:
+    async def __aenter__(self):
+        return FakeBrowser()
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakePool:
+    def lease(self):
+        return FakeLease()
+
+
+class FakeChecker:
+    """按平台设置不同耗时，记录同时运行的数量"""
+
+    running = 0
+    peak = 0
+    finished = 0
+
+    def __init__(self, name: str, delay: float):
+        self.name = name
+        self.delay = delay
+
+    async def check(self, page, question, keyword, company):
+        FakeChecker.running += 1
+        FakeChecker.peak = max(FakeChecker.peak, FakeChecker.running)
+        await asyncio.sleep(self.delay)
+        FakeChecker.running -= 1
+        FakeChecker.finished += 1
+        return {"success": True, "answer": "ok", "keyword_found": True, "company_found": False}
+
+
+class HangingChecker(FakeChecker):
+    """一直不返回，模拟卡住的平台"""
+
+    def __init__(self, name: str):
+        super().__init__(name, 0)
+
+    async def check(self, page, question, keyword, company):
+        await asyncio.Event().wait()
+
+
+@pytest.fixture
+def service(memory_db):
+    FakeChecker.running = 0
+    FakeChecker.peak = 0
+    FakeChecker.finished = 0
+    svc = IndexCheckService.__new__(IndexCheckService)
+    svc.db = memory_db
+    # 慢的平台排在前面，用于验证写库顺序与完成顺序无关
+    svc.checkers = {
+        "doubao": FakeChecker("豆包", 0.05),
+        "qianwen": FakeChecker("通义千问", 0.01),
+        "deepseek": FakeChecker("DeepSeek", 0.02),
+    }
+    return svc
+
+
+async def run_checks(svc, limiter):
+    questions = [SimpleNamespace(question="问题一"), SimpleNamespace(question="问题二")]
+    with patch.object(service_module, "index_check_browser_pool", FakePool()), patch.object(
+        service_module, "check_concurrency_limiter", limiter
+    ), patch.object(service_module.asyncio, "sleep", new=_fast_sleep), patch.object(
+        secure_session_manager, "load_session", new=AsyncMock(return_value=None)
+    ), patch.object(
+        secure_session_manager, "save_session", new=AsyncMock(return_value=True)
+    ):
+        return await svc._execute_checks(
+            keyword_id=1,
+            keyword_obj=SimpleNamespace(keyword="GEO"),
+            questions=questions,
+            company_name="测试公司",
+            platforms=["doubao", "qianwen", "deepseek"],
+        )
+
+
+_real_sleep = asyncio.sleep
+
+
+async def _fast_sleep(seconds):
+    """跳过检测间隔的固定等待，保留检测器自身的耗时"""
+    await _real_sleep(min(seconds, 0.001))
+
+
+class TestIndexCheckFanout:
+    """多平台并行检测测试"""
+
+    @pytest.mark.asyncio
+    async def test_platforms_run_in_parallel(self, service):
+        """不同平台同时检测"""
+        await run_checks(service, CheckConcurrencyLimiter(max_total=3, max_per_platform=1))
+        assert FakeChecker.peak == 3
+
+    @pytest.mark.asyncio
+    async def test_global_limit_caps_parallelism(self, service):
+        """全局并发上限生效"""
+        await run_checks(service, CheckConcurrencyLimiter(max_total=1, max_per_platform=1))
+        assert FakeChecker.peak == 1
+
+    @pytest.mark.asyncio
+    async def test_records_written_in_platform_order(self, service):
+        """记录按平台顺序写库，与完成先后无关"""
+        results = await run_checks(service, CheckConcurrencyLimiter(max_total=3, max_per_platform=1))
+
+        records = service.db.query(IndexCheckRecord).order_by(IndexCheckRecord.id).all()
+        saved = [(r.platform, r.question) for r in records]
+        assert saved == [
+            ("doubao", "问题一"),
+            ("doubao", "问题二"),
+            ("qianwen", "问题一"),
+            ("qianwen", "问题二"),
+            ("deepseek", "问题一"),
+            ("deepseek", "问题二"),
+        ]
+        assert [r["platform"] for r in results] == ["豆包", "豆包", "通义千问", "通义千问", "DeepSeek", "DeepSeek"]
+
+    @pytest.mark.asyncio
+    async def test_cancel_flushes_completed_records(self, service):
+        """检测被取消时，已完成的记录一次写库，日汇总同步更新"""
+        service.checkers["doubao"] = HangingChecker("豆包")
+        task = asyncio.ensure_future(run_checks(service, CheckConcurrencyLimiter(max_total=3, max_per_platform=1)))
+        # 等其它两个平台检测完，只剩卡住的平台
+        while FakeChecker.finished < 4:
+            await _real_sleep(0.005)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        records = service.db.query(IndexCheckRecord).order_by(IndexCheckRecord.id).all()
+        assert [r.platform for r in records] == ["qianwen", "qianwen", "deepseek", "deepseek"]
+        assert sum(s.total for s in service.db.query(IndexCheckDailyStat).all()) == 4
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""
+收录检测日汇总测试
+验证写入/删除检测记录时汇总同步更新，以及回填结果与原始记录一致
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import inspect
+
+from backend.database import Base
+from backend.database.models import IndexCheckDailyStat, IndexCheckRecord, Keyword
+from backend.services import index_check_stats
+from backend.services.index_check_service import IndexCheckService
+
+TODAY = datetime.now().replace(hour=12, minute=0, second=0, microsecond=0)
+
+
+def _record(keyword_id, platform, check_time, keyword_found=False, company_found=False, answer="回答"):
+    return IndexCheckRecord(
+        keyword_id=keyword_id,
+        platform=platform,
+        question="什么是GEO？",
+        answer=answer,
+        keyword_found=keyword_found,
+        company_found=company_found,
+        check_time=check_time,
+    )
+
+
+@pytest.fixture(autouse=True)
+def keywords(memory_db):
+    memory_db.add_all([Keyword(id=1, project_id=1, keyword="GEO"), Keyword(id=2, project_id=1, keyword="SEO")])
+    memory_db.commit()
+
+
+def _snapshot(db):
+    return {
+        (s.keyword_id, s.platform, s.stat_date): (s.total, s.keyword_found, s.company_found, s.answered)
+        for s in db.query(IndexCheckDailyStat)
+    }
+
+
+class TestIndexCheckDailyStats:
+    """收录检测日汇总测试"""
+
+    def test_insert_accumulates_counts(self, memory_db):
+        """写入检测记录后汇总按 关键词+平台+日期 累加"""
+        memory_db.add_all(
+            [
+                _record(1, "doubao", TODAY, keyword_found=True),
+                _record(1, "doubao", TODAY, company_found=True, answer="  "),
+                _record(1, "qianwen", TODAY - timedelta(days=1), keyword_found=True, company_found=True),
+            ]
+        )
+        memory_db.commit()
+        memory_db.add(_record(1, "doubao", TODAY, keyword_found=True))
+        memory_db.commit()
+
+        snapshot = _snapshot(memory_db)
+        assert snapshot[(1, "doubao", TODAY.date())] == (3, 2, 1, 2)
+        assert snapshot[(1, "qianwen", (TODAY - timedelta(days=1)).date())] == (1, 1, 1, 1)
+
+        hit = IndexCheckService(memory_db).get_hit_rate(1)
+        assert hit["total"] == 4 and hit["keyword_found"] == 3 and hit["hit_rate"] == 62.5
+
+    def test_delete_decrements_counts(self, memory_db):
+        """逐条删除和批量删除检测记录都会扣减汇总"""
+        records = [_record(1, "doubao", TODAY, keyword_found=True) for _ in range(3)]
+        memory_db.add_all(records)
+        memory_db.commit()
+
+        service = IndexCheckService(memory_db)
+        service.delete_record(records[0].id)
+        assert service.batch_delete_records([records[1].id]) == 1
+
+        assert _snapshot(memory_db)[(1, "doubao", TODAY.date())] == (1, 1, 0, 1)
+
+        service.delete_record(records[2].id)
+        assert _snapshot(memory_db) == {}
+
+    def test_rollback_discards_counts(self, memory_db):
+        """事务回滚时汇总也一起回滚"""
+        memory_db.add(_record(1, "doubao", TODAY))
+        memory_db.flush()
+        memory_db.rollback()
+
+        assert _snapshot(memory_db) == {}
+
+    def test_rebuild_matches_incremental(self, memory_db):
+        """回填结果与增量维护一致"""
+        memory_db.add_all(
+            [
+                _record(
+                    kid, platform, TODAY - timedelta(days=day), keyword_found=(day % 2 == 0), company_found=kid == 2
+                )
+                for kid in (1, 2)
+                for platform in ("doubao", "deepseek")
+                for day in range(5)
+            ]
+        )
+        memory_db.commit()
+        incremental = _snapshot(memory_db)
+
+        memory_db.query(IndexCheckDailyStat).delete()
+        memory_db.commit()
+        assert index_check_stats.rebuild_daily_stats(memory_db) == len(incremental)
+        assert _snapshot(memory_db) == incremental
+
+        # 只重建最近两天不影响更早的数据
+        index_check_stats.rebuild_daily_stats(memory_db, since=index_check_stats.since_days(2))
+        assert _snapshot(memory_db) == incremental
+
+        by_keyword = index_check_stats.get_totals_by_keyword(memory_db, since=index_check_stats.since_days(3))
+        assert by_keyword[1]["total"] == 6 and by_keyword[2]["company_found"] == 6
+
+    def test_new_stats_table_backfilled_on_existing_db(self, memory_engine, memory_db):
+        """旧库升级：检测记录已存在、日汇总表在启动时才建出，自动从原始记录回填"""
+        memory_db.add_all([_record(1, "doubao", TODAY, keyword_found=True) for _ in range(5)])
+        memory_db.commit()
+        IndexCheckDailyStat.__table__.drop(memory_engine)
+        existing_tables = inspect(memory_engine).get_table_names()
+        Base.metadata.create_all(memory_engine)
+
+        assert index_check_stats.ensure_daily_stats(memory_engine, existing_tables) == 1
+        hit = IndexCheckService(memory_db).get_hit_rate(1)
+        assert hit["total"] == 5 and hit["keyword_found"] == 5
+
+        # 汇总表已存在时不再重建
+        assert index_check_stats.ensure_daily_stats(memory_engine, inspect(memory_engine).get_table_names()) == 0
+
+    def test_since_days_covers_exactly_n_days(self, memory_db):
+        """最近 N 天含今天共 N 个自然日，正好 N 天前的记录不计入"""
+        memory_db.add_all([_record(1, "doubao", TODAY - timedelta(days=day)) for day in (0, 6, 7)])
+        memory_db.commit()
+
+        assert index_check_stats.since_days(1) == TODAY.date()
+        assert index_check_stats.since_days(7) == (TODAY - timedelta(days=6)).date()
+        totals = index_check_stats.get_totals_by_keyword(memory_db, since=index_check_stats.since_days(7))
+        assert totals[1]["total"] == 2
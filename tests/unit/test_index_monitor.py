@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""
+收录监测调度测试
+验证指数退避，以及按到期时间领取、在并发名额内一轮检测完积压
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+
+from backend.database.models import GeoArticle
+from backend.services.geo_article_service import GeoArticleService, compute_next_check_at
+from backend.services.scheduler_service import SchedulerService
+
+
+@pytest.fixture
+def session_factory(memory_session_factory):
+    """预置文章的内存库会话工厂"""
+
+    now = datetime.now()
+    db = memory_session_factory()
+    db.add_all(
+        [
+            # 从未检测（优先）
+            GeoArticle(id=1, keyword_id=1, content="a", publish_status="published", index_status="uncheck"),
+            # 已到期
+            GeoArticle(
+                id=2, keyword_id=1, content="b", publish_status="published", index_status="not_indexed",
+                next_check_at=now - timedelta(minutes=30),
+            ),
+            GeoArticle(
+                id=3, keyword_id=1, content="c", publish_status="published", index_status="not_indexed",
+                next_check_at=now - timedelta(minutes=5),
+            ),
+            # 未到期
+            GeoArticle(
+                id=4, keyword_id=1, content="d", publish_status="published", index_status="not_indexed",
+                next_check_at=now + timedelta(hours=1),
+            ),
+            # 已收录
+            GeoArticle(id=5, keyword_id=1, content="e", publish_status="published", index_status="indexed"),
+        ]
+    )
+    db.commit()
+    db.close()
+    return memory_session_factory
+
+
+class TestIndexMonitor:
+    """收录监测调度测试"""
+
+    def test_backoff_doubles_and_caps(self):
+        """检测间隔按 2 的幂增长且有上限"""
+        now = datetime(2026, 1, 1)
+        with patch("backend.services.geo_article_service.INDEX_MONITOR_BASE_INTERVAL_MINUTES", 10), patch(
+            "backend.services.geo_article_service.INDEX_MONITOR_MAX_INTERVAL_MINUTES", 60
+        ):
+            assert compute_next_check_at(0, now) == now + timedelta(minutes=10)
+            assert compute_next_check_at(2, now) == now + timedelta(minutes=40)
+            assert compute_next_check_at(10, now) == now + timedelta(minutes=60)
+
+    @pytest.mark.asyncio
+    async def test_sweeper_drains_due_articles_within_limit(self, session_factory):
+        """到期文章多于并发名额时一轮全部检测完，同时检测数不超过名额；未到期、已收录的不检测"""
+        checked = []
+        running = 0
+        peak = 0
+
+        async def fake_check(self, article_id):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            checked.append(article_id)
+
+        scheduler = SchedulerService()
+        scheduler.set_db_factory(session_factory)
+        with patch("backend.services.scheduler_service.INDEX_MONITOR_CONCURRENCY", 2), patch.object(
+            GeoArticleService, "check_article_index", fake_check
+        ):
+            await scheduler.auto_check_indexing_job()
+            await asyncio.gather(*list(scheduler._index_workers))
+
+            stats = scheduler.get_index_monitor_stats()
+            assert sorted(checked) == [1, 2, 3]
+            assert peak == 2
+            assert stats["due"] == 3
+            assert stats["dispatched"] == 3
+            assert stats["lag_seconds"] >= 30 * 60
+
+            # 已检测的文章被推后，下一轮没有到期文章
+            await scheduler.auto_check_indexing_job()
+            assert not scheduler._index_workers
+            assert sorted(checked) == [1, 2, 3]
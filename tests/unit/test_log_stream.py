@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""
+实时日志推送测试
+验证成批推送、按模块限流和历史回放
+"""
+
+from unittest.mock import patch
+
+from backend.services.log_stream import LogStreamer
+
+
+def _log(module: str, message: str) -> dict:
+    return {"time": "12:00:00", "level": "INFO", "module": module, "message": message}
+
+
+class TestLogStreamer:
+    """日志推送测试"""
+
+    def test_flush_sends_one_frame_per_interval(self):
+        """两次推送之间的日志合成一帧，已推送的不重复推送"""
+        frames = []
+        streamer = LogStreamer(publish=frames.append, history_size=100, module_rate_limit=0)
+
+        for i in range(5):
+            streamer.append(_log("发布器", f"第{i}条"))
+        assert streamer.flush() == 5
+        assert streamer.flush() == 0
+
+        streamer.append(_log("发布器", "第5条"))
+        streamer.flush()
+
+        assert [len(frame["logs"]) for frame in frames] == [5, 1]
+        assert frames[0]["type"] == "log_batch"
+        # 历史回放包含全部日志
+        assert [entry["message"] for entry in streamer.recent(2)] == ["第4条", "第5条"]
+
+    def test_history_excludes_unflushed_logs(self):
+        """历史回放只含已推送的日志，未推送的由下一帧送达，新客户端不会收到两遍"""
+        frames = []
+        streamer = LogStreamer(publish=frames.append, history_size=100, module_rate_limit=0)
+        streamer.append(_log("发布器", "已推送"))
+        streamer.flush()
+        streamer.append(_log("发布器", "未推送"))
+
+        history = [entry["message"] for entry in streamer.recent()]
+        streamer.flush()
+
+        assert history == ["已推送"]
+        assert [entry["message"] for entry in frames[-1]["logs"]] == ["未推送"]
+
+    def test_module_rate_limit(self):
+        """单个模块刷屏时超出部分被省略并补一条提示，其他模块和 WARNING 不受影响"""
+        frames = []
+        streamer = LogStreamer(publish=frames.append, history_size=100, module_rate_limit=3)
+
+        with patch("backend.services.log_stream.time.monotonic", return_value=100.0):
+            for i in range(10):
+                streamer.append(_log("采集", f"刷屏{i}"))
+            streamer.append(_log("调度中心", "正常"))
+            streamer.append({**_log("采集", "出错了"), "level": "ERROR"}, level_no=40)
+            streamer.flush()
+
+        with patch("backend.services.log_stream.time.monotonic", return_value=101.0):
+            streamer.flush()
+
+        messages = [entry["message"] for frame in frames for entry in frame["logs"]]
+        assert messages == ["刷屏0", "刷屏1", "刷屏2", "正常", "出错了", "日志过多，已省略 7 条"]
+        assert streamer.get_stats()["suppressed"] == 7
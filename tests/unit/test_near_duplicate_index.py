@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""
+本地近重复索引测试
+验证 SimHash 判定与实现一致性、增量同步、删除清理、配置校验和持久化
+"""
+
+import pytest
+from sqlalchemy import delete
+
+from backend.database.models import ReferenceArticle
+from backend.services.near_duplicate_index import (
+    BORDERLINE,
+    DUPLICATE,
+    UNIQUE,
+    NearDuplicateIndex,
+    _hash64,
+    _normalize,
+    hamming_distance,
+    simhash,
+)
+
+ARTICLE = (
+    "生成式引擎优化（GEO）是让品牌内容被AI搜索引擎引用的一套方法。与传统SEO关注排名不同，"
+    "GEO关注的是内容能否被大模型理解、信任并在回答中引用。企业需要持续输出结构清晰、"
+    "事实准确、来源可靠的内容，并在多个平台建立一致的品牌信息。"
+)
+OTHER = (
+    "今天给大家分享一道家常红烧肉的做法。五花肉切块后冷水下锅焯水，捞出沥干，"
+    "锅中放少许油和冰糖小火炒出糖色，再放入肉块翻炒上色，加入生抽老抽和开水，小火慢炖一小时即可。"
+)
+
+
+class TestNearDuplicateIndex:
+    """近重复索引测试"""
+
+    def test_repost_is_duplicate_and_unrelated_is_unique(self):
+        """转载（仅排版差异）判为重复，无关文章判为不重复，过短文本交给 RAGFlow"""
+        index = NearDuplicateIndex(path=None)
+        index.add("reference", 1, ARTICLE)
+
+        repost = "【转载】" + ARTICLE.replace("，", ", ").replace("。", "。\n")
+        assert hamming_distance(simhash(ARTICLE), simhash(repost)) <= index.max_distance
+
+        verdict, matches = index.query(repost)
+        assert verdict == DUPLICATE
+        assert matches[0]["key"] == "reference:1"
+
+        assert index.query(OTHER)[0] == UNIQUE
+        assert index.query("GEO是什么")[0] == BORDERLINE
+
+    def test_simhash_matches_bitwise_definition(self):
+        """按字节计数的实现与逐个 shingle 逐位累加的定义结果一致（持久化的指纹不用重建）"""
+
+        def reference(text):
+            normalized = _normalize(text)
+            if not normalized:
+                return 0
+            shingles = {normalized[i : i + 3] for i in range(max(len(normalized) - 2, 1))}
+            weights = [0] * 64
+            for shingle in shingles:
+                h = _hash64(shingle)
+                for bit in range(64):
+                    weights[bit] += 1 if (h >> bit) & 1 else -1
+            return sum(1 << bit for bit, weight in enumerate(weights) if weight > 0)
+
+        for text in ["", "G", "GEO", "GEO是什么", ARTICLE, OTHER, ARTICLE * 20]:
+            assert simhash(text) == reference(text)
+
+        index = NearDuplicateIndex(path=None)
+        index.add("reference", 1, fingerprint=simhash(ARTICLE))
+        assert index.query(ARTICLE, simhash(ARTICLE)) == index.query(ARTICLE)
+
+    def test_refresh_is_incremental_and_persisted(self, memory_db, tmp_path):
+        """增量同步数据库、清理软删除的文章，并能从磁盘恢复"""
+        memory_db.add_all(
+            [
+                ReferenceArticle(id=1, title="a", url="u1", content=ARTICLE, platform="zhihu", status=1),
+                ReferenceArticle(id=2, title="b", url="u2", content=OTHER, platform="zhihu", status=1),
+            ]
+        )
+        memory_db.commit()
+
+        path = tmp_path / "index.json"
+        index = NearDuplicateIndex(path=path)
+        assert index.refresh(memory_db) == 2
+        assert len(index) == 2
+
+        memory_db.get(ReferenceArticle, 2).status = 0
+        memory_db.commit()
+        index.refresh(memory_db)
+        assert len(index) == 1
+        assert index.query(OTHER)[0] == UNIQUE
+
+        restored = NearDuplicateIndex(path=path)
+        assert restored.load()
+        assert restored.query(ARTICLE)[0] == DUPLICATE
+
+    def test_hard_delete_pruned_periodically(self, memory_db):
+        """物理删除的文章不在每次同步时全量核对，到了核对间隔才移除"""
+        memory_db.add(ReferenceArticle(id=1, title="a", url="u1", content=ARTICLE, platform="zhihu", status=1))
+        memory_db.commit()
+        index = NearDuplicateIndex(path=None, prune_interval=3600)
+        index.refresh(memory_db)
+
+        memory_db.execute(delete(ReferenceArticle).where(ReferenceArticle.id == 1))
+        memory_db.commit()
+        index.refresh(memory_db)
+        assert len(index) == 1
+
+        index._last_prune -= 3600
+        index.refresh(memory_db)
+        assert len(index) == 0
+
+    def test_borderline_must_be_below_bands(self):
+        """临界距离不小于分段数时无法保证召回，直接报错"""
+        with pytest.raises(ValueError):
+            NearDuplicateIndex(path=None, bands=8, borderline_distance=8)
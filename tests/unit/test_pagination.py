@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""
+游标分页测试
+验证按游标逐页翻完不重复不遗漏（含同一秒写入的行）、游标校验、总数缓存
+"""
+
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+
+from backend.api.article_collection import list_reference_articles
+from backend.database.models import ReferenceArticle
+from backend.services.pagination import CountCache, decode_cursor, encode_cursor, list_count_cache
+
+
+@pytest.fixture
+def articles(memory_db):
+    # collected_at 走 func.now() 默认值：同一秒写入、没有小数秒
+    memory_db.add_all(
+        [ReferenceArticle(title=f"文章{i}", url=f"https://example.com/{i}", content="正文", platform="zhihu")
+         for i in range(7)]
+    )
+    memory_db.commit()
+    list_count_cache.invalidate("reference_articles")
+
+
+class TestKeysetPagination:
+    """游标分页测试"""
+
+    def test_cursor_roundtrip_and_invalid(self):
+        """游标可还原；被篡改的游标报错"""
+        value = datetime(2026, 10, 17, 8, 30, 0, 123456)
+        assert decode_cursor(encode_cursor(value, 42)) == (value, 42)
+        with pytest.raises(ValueError):
+            decode_cursor("not-a-cursor")
+
+    @pytest.mark.asyncio
+    async def test_walk_all_pages(self, articles, memory_db):
+        """逐页翻完：不重复、不遗漏、最后一页没有游标；与旧的页码翻页结果一致"""
+        seen, cursor = [], None
+        while True:
+            page = await list_reference_articles(page=1, page_size=3, cursor=cursor, q=None, db=memory_db)
+            seen.extend(item.id for item in page.items)
+            assert page.total == 7
+            cursor = page.next_cursor
+            if not cursor:
+                break
+
+        assert seen == list(range(7, 0, -1))
+
+        legacy = await list_reference_articles(page=2, page_size=3, cursor=None, q=None, db=memory_db)
+        assert [item.id for item in legacy.items] == seen[3:6]
+
+        with pytest.raises(HTTPException):
+            await list_reference_articles(page=1, page_size=3, cursor="bad", q=None, db=memory_db)
+
+    def test_count_cache(self, monkeypatch):
+        """总数在 TTL 内命中缓存，失效后重新统计"""
+        cache = CountCache(ttl=30)
+        key = cache.key("reference_articles", platform="zhihu", keyword=None)
+        assert cache.get(key) is None
+        cache.set(key, 10)
+        assert cache.get(key) == 10
+
+        cache.invalidate("reference_articles")
+        assert cache.get(key) is None
+
+        cache.set(key, 10)
+        monkeypatch.setattr("backend.services.pagination.time.monotonic", lambda: 1e12)
+        assert cache.get(key) is None
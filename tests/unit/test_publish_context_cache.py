@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+"""
+发布上下文缓存测试
+使用假浏览器验证 LRU 容量、空闲回收、写回、失效重建和按平台关闭
+"""
+
+import sys
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from backend.services.playwright_mgr import PlaywrightManager
+
+# backend.services 导出了同名的单例，这里直接取模块对象
+mgr_module = sys.modules[PlaywrightManager.__module__]
+
+
+class FakePage:
+    async def close(self):
+        pass
+
+
+class FakeContext:
+    def __init__(self):
+        self.closed = False
+
+    async def new_page(self):
+        return FakePage()
+
+    async def storage_state(self):
+        return {"cookies": [{"name": "sid", "value": "new"}], "origins": []}
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.contexts = []
+        self.connected = True
+
+    def is_connected(self):
+        return self.connected
+
+    async def new_context(self, **kwargs):
+        context = FakeContext()
+        self.contexts.append(context)
+        return context
+
+
+def make_account(account_id: int, platform: str = "zhihu", state: str = "state"):
+    return SimpleNamespace(
+        id=account_id, platform=platform, account_name=f"acc{account_id}", storage_state=state, cookies=None
+    )
+
+
+@pytest.fixture
+def manager():
+    mgr = PlaywrightManager()
+    mgr._browser = FakeBrowser()
+    mgr._is_running = True
+    mgr._build_publish_state = lambda account: {}
+    mgr.written_back = []
+    mgr._write_back_storage_state = lambda account_id, state: mgr.written_back.append(account_id)
+    return mgr
+
+
+class TestPublishContextCache:
+    """发布上下文缓存测试"""
+
+    @pytest.mark.asyncio
+    async def test_reuses_context_for_same_account(self, manager):
+        """同一账号连续获取命中缓存"""
+        account = make_account(1)
+
+        first = await manager._acquire_publish_context(account)
+        await manager._release_publish_context(first)
+        second = await manager._acquire_publish_context(account)
+        await manager._release_publish_context(second)
+
+        assert first.context is second.context
+        stats = manager.get_publish_context_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+
+    @pytest.mark.asyncio
+    async def test_lru_eviction_writes_back_state(self, manager):
+        """超过容量时回收最久未用的上下文并写回会话"""
+        with patch.object(mgr_module, "PUBLISH_CONTEXT_CACHE_SIZE", 2):
+            for account_id in (1, 2, 3):
+                entry = await manager._acquire_publish_context(make_account(account_id))
+                await manager._release_publish_context(entry)
+
+        assert list(manager._publish_contexts.keys()) == [2, 3]
+        assert manager.written_back == [1]
+        assert manager._browser.contexts[0].closed
+
+    @pytest.mark.asyncio
+    async def test_idle_ttl_eviction(self, manager):
+        """空闲超过 TTL 的上下文被回收"""
+        entry = await manager._acquire_publish_context(make_account(1))
+        await manager._release_publish_context(entry)
+        entry.last_used -= 10_000
+
+        evicted = await manager.evict_idle_publish_contexts()
+
+        assert evicted == 1
+        assert manager._publish_contexts == {}
+        assert manager.written_back == [1]
+
+    @pytest.mark.asyncio
+    async def test_reauthorized_account_invalidates_context(self, manager):
+        """账号 storage_state 变化后重建上下文且不写回旧状态"""
+        entry = await manager._acquire_publish_context(make_account(1, state="old"))
+        await manager._release_publish_context(entry)
+
+        fresh = await manager._acquire_publish_context(make_account(1, state="new"))
+
+        assert fresh.context is not entry.context
+        assert entry.context.closed
+        assert manager.written_back == []
+        assert manager.get_publish_context_stats()["invalidations"] == 1
+
+    @pytest.mark.asyncio
+    async def test_disconnected_browser_invalidates_context(self, manager):
+        """浏览器断开后缓存上下文不再命中"""
+        entry = await manager._acquire_publish_context(make_account(1))
+        await manager._release_publish_context(entry)
+
+        manager._browser.connected = False
+        manager._browser = FakeBrowser()
+        fresh = await manager._acquire_publish_context(make_account(1))
+
+        assert fresh.context is not entry.context
+        assert manager.get_publish_context_stats()["hits"] == 0
+        assert manager.get_publish_context_stats()["invalidations"] == 1
+
+    @pytest.mark.asyncio
+    async def test_stale_context_in_use_is_not_reused(self, manager):
+        """旧上下文仍在使用时账号重新授权：新建上下文，旧的在归还时关闭"""
+        old = await manager._acquire_publish_context(make_account(1, state="old"))
+        fresh = await manager._acquire_publish_context(make_account(1, state="new"))
+
+        assert fresh.context is not old.context
+        assert manager._publish_contexts[1] is fresh
+        assert not old.context.closed
+
+        await manager._release_publish_context(old)
+        assert old.context.closed
+        assert manager._publish_contexts[1] is fresh
+
+    @pytest.mark.asyncio
+    async def test_over_capacity_is_reported(self, manager):
+        """全部在用无法回收时记录超出容量"""
+        with patch.object(mgr_module, "PUBLISH_CONTEXT_CACHE_SIZE", 1):
+            await manager._acquire_publish_context(make_account(1))
+            second = await manager._acquire_publish_context(make_account(2))
+
+        # 刚建好的上下文不会被当作空闲项回收
+        assert not second.context.closed
+        assert manager.get_publish_context_stats()["over_capacity"] == 1
+
+    def test_cache_can_be_disabled_per_platform(self, manager):
+        """按平台关闭缓存"""
+        with patch.object(mgr_module, "PUBLISH_CONTEXT_CACHE_DISABLED_PLATFORMS", {"xiaohongshu"}):
+            assert manager._is_context_cache_enabled("zhihu")
+            assert not manager._is_context_cache_enabled("xiaohongshu")
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""
+定时发布任务队列测试
+使用独立的内存 SQLite 验证入队去重、认领互斥、租约过期重试和结果回写
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from backend.database.models import GeoArticle, PublishJob
+from backend.services.publish_job_queue import PublishJobQueue
+
+NOW = datetime(2026, 1, 1, 12, 0, 0)
+
+
+@pytest.fixture
+def session_factory(memory_session_factory):
+    """预置文章的内存库会话工厂"""
+    db = memory_session_factory()
+    db.add_all(
+        [
+            GeoArticle(
+                id=1, keyword_id=1, content="a", publish_status="scheduled", platform="zhihu", account_id=1,
+                scheduled_at=NOW - timedelta(minutes=1),
+            ),
+            GeoArticle(
+                id=2, keyword_id=1, content="b", publish_status="scheduled", platform="zhihu", account_id=1,
+                scheduled_at=NOW + timedelta(hours=1),
+            ),
+        ]
+    )
+    db.commit()
+    db.close()
+    return memory_session_factory
+
+
+class TestPublishJobQueue:
+    """发布任务队列测试"""
+
+    def test_enqueue_only_due_articles_once(self, session_factory):
+        """只入队到期文章，重复扫描不会重复入队"""
+        queue = PublishJobQueue(worker_id="w1")
+        db = session_factory()
+
+        assert queue.enqueue_due_articles(db, now=NOW) == 1
+        assert queue.enqueue_due_articles(db, now=NOW) == 0
+        assert db.query(PublishJob).count() == 1
+
+    def test_job_claimed_by_single_worker(self, session_factory):
+        """同一任务只能被一个 worker 认领"""
+        w1, w2 = PublishJobQueue(worker_id="w1"), PublishJobQueue(worker_id="w2")
+        db1, db2 = session_factory(), session_factory()
+        w1.enqueue_due_articles(db1, now=NOW)
+
+        assert w1.claim(db1, 5, now=NOW) == [(1, 1)]
+        assert w2.claim(db2, 5, now=NOW) == []
+
+    def test_expired_lease_is_reclaimed(self, session_factory):
+        """租约过期后其他 worker 可以接管，原 worker 的结果不再回写"""
+        w1 = PublishJobQueue(worker_id="w1", lease_seconds=60)
+        w2 = PublishJobQueue(worker_id="w2", lease_seconds=60)
+        db = session_factory()
+        w1.enqueue_due_articles(db, now=NOW)
+        w1.claim(db, 5, now=NOW)
+
+        later = NOW + timedelta(seconds=120)
+        assert w2.claim(db, 5, now=later) == [(1, 1)]
+        assert not w1.heartbeat(db, 1, now=later)
+        assert not w1.complete(db, 1, success=True)
+        assert w2.complete(db, 1, success=True)
+
+        job = db.query(PublishJob).first()
+        assert job.status == "done" and job.attempts == 2 and job.dedupe_key is None
+
+    def test_gives_up_after_max_attempts(self, session_factory):
+        """租约反复过期超过最大次数后标记失败"""
+        queue = PublishJobQueue(worker_id="w1", lease_seconds=60, max_attempts=1)
+        db = session_factory()
+        queue.enqueue_due_articles(db, now=NOW)
+        queue.claim(db, 5, now=NOW)
+
+        assert queue.claim(db, 5, now=NOW + timedelta(seconds=120)) == []
+        db.expire_all()
+        assert db.query(PublishJob).first().status == "failed"
+        assert db.get(GeoArticle, 1).publish_status == "failed"
+
+    def test_failed_job_marks_scheduled_article_failed(self, session_factory):
+        """发布返回失败但文章仍为 scheduled 时标记失败，下一轮扫描不再重复入队"""
+        queue = PublishJobQueue(worker_id="w1")
+        db = session_factory()
+        queue.enqueue_due_articles(db, now=NOW)
+        queue.claim(db, 5, now=NOW)
+        queue.complete(db, 1, success=False, error="发布失败，详见文章错误信息")
+
+        article = db.get(GeoArticle, 1)
+        assert article.publish_status == "failed"
+        assert article.error_msg == "发布失败，详见文章错误信息"
+        assert queue.enqueue_due_articles(db, now=NOW + timedelta(minutes=1)) == 0
+        assert db.query(PublishJob).count() == 1
+
+    def test_finished_article_can_be_requeued(self, session_factory):
+        """任务结束后文章再次定时发布可以重新入队"""
+        queue = PublishJobQueue(worker_id="w1")
+        db = session_factory()
+        queue.enqueue_due_articles(db, now=NOW)
+        queue.claim(db, 5, now=NOW)
+        queue.complete(db, 1, success=False, error="失败")
+
+        db.get(GeoArticle, 1).publish_status = "scheduled"
+        db.commit()
+        assert queue.enqueue_due_articles(db, now=NOW) == 1
+        assert queue.get_stats(db)["failed"] == 1
+        assert queue.get_stats(db)["pending"] == 1
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+RAGFlow 异步客户端测试
+用 httpx.MockTransport 代替真实服务，验证请求构造、超时分类和连接池复用
+"""
+
+import json
+
+import httpx
+import pytest
+
+from backend.services.ragflow_client import RAGFlowClient
+
+
+def _make_client(handler, **kwargs):
+    return RAGFlowClient(
+        base_url="http://ragflow.test", api_key="key", transport=httpx.MockTransport(handler), **kwargs
+    )
+
+
+class TestRAGFlowClient:
+    """RAGFlow 异步客户端测试"""
+
+    @pytest.mark.asyncio
+    async def test_upload_uses_multipart_and_triggers_parse(self):
+        """上传走共享客户端（multipart + 鉴权头），成功后触发解析"""
+        requests = []
+
+        def handler(request: httpx.Request):
+            requests.append(request)
+            if request.url.path.endswith("/documents"):
+                return httpx.Response(200, json={"code": 0, "data": [{"id": "doc1"}]})
+            return httpx.Response(200, json={"code": 0})
+
+        client = _make_client(handler)
+        result = await client.upload_document_content("ds1", "标题", "正文")
+        await client.close()
+
+        assert result["data"][0]["id"] == "doc1"
+        upload, parse = requests
+        assert upload.headers["Authorization"] == "Bearer key"
+        assert upload.headers["Content-Type"].startswith("multipart/form-data")
+        assert upload.extensions["timeout"]["read"] == client.timeouts["upload"]
+        assert parse.url.path == "/api/v1/datasets/ds1/chunks"
+        assert json.loads(parse.content) == {"document_ids": ["doc1"]}
+
+    @pytest.mark.asyncio
+    async def test_operation_timeouts_are_configurable(self):
+        """检索和对话使用各自的超时配置"""
+        timeouts = {}
+
+        def handler(request: httpx.Request):
+            timeouts[request.url.path] = request.extensions["timeout"]["read"]
+            return httpx.Response(200, json={"code": 0, "data": {"chunks": []}})
+
+        client = _make_client(handler, timeouts={"retrieval": 7, "chat": 90})
+        await client.retrieve("问题", ["ds1"])
+        await client.chat_completion("chat1", "问题")
+        await client.list_datasets()
+        await client.close()
+
+        assert timeouts == {
+            "/api/v1/retrieval": 7,
+            "/api/v1/chats/chat1/completions": 90,
+            "/api/v1/datasets": client.timeout,
+        }
+
+    @pytest.mark.asyncio
+    async def test_errors_are_returned_as_result(self):
+        """HTTP 错误不抛出，按原约定返回 code=-1"""
+        client = _make_client(lambda request: httpx.Response(500, json={}))
+        http_client = client.client
+
+        result = await client.get_dataset("ds1")
+        is_dup, similar = await client.check_duplicate("内容", dataset_ids=["ds1"])
+
+        assert result["code"] == -1
+        assert (is_dup, similar) == (False, [])
+        # 同一事件循环内复用同一个连接池
+        assert client.client is http_client
+        await client.close()
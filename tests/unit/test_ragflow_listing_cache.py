@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""
+RAGFlow 列表缓存测试
+用假客户端验证 TTL 命中、后台刷新、并发合并、失效和 ETag 回写标记
+"""
+
+import asyncio
+
+import pytest
+
+from backend.services.ragflow_listing_cache import RAGFlowListingCache
+
+
+class FakeRAGFlowClient:
+    """记录调用次数的假客户端"""
+
+    def __init__(self):
+        self.datasets = [{"id": "ds1", "name": "知识库1"}]
+        self.calls = 0
+        self.delay = 0
+
+    async def list_datasets(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return {"code": 0, "data": list(self.datasets)}
+
+    async def list_documents(self, dataset_id, page=1, page_size=100):
+        self.calls += 1
+        docs = [{"id": f"doc{i}"} for i in range(150)]
+        return {"code": 0, "data": {"docs": docs[(page - 1) * page_size : page * page_size], "total": len(docs)}}
+
+
+def _make_cache(ttl=60, max_stale=600):
+    client = FakeRAGFlowClient()
+    return RAGFlowListingCache(ttl=ttl, max_stale=max_stale, client_factory=lambda: client), client
+
+
+class TestRAGFlowListingCache:
+    """RAGFlow 列表缓存测试"""
+
+    @pytest.mark.asyncio
+    async def test_hits_within_ttl_and_single_flight(self):
+        """TTL 内命中缓存，并发未命中只请求一次"""
+        cache, client = _make_cache()
+        client.delay = 0.01
+
+        first, second = await asyncio.gather(cache.get_datasets(), cache.get_datasets())
+        await cache.get_datasets()
+
+        assert client.calls == 1
+        assert first.etag == second.etag
+        stats = cache.get_stats()
+        assert stats["misses"] == 2 and stats["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_stale_entry_served_while_refreshing(self):
+        """过期后先返回旧数据，后台刷新后返回新数据"""
+        cache, client = _make_cache(ttl=0, max_stale=600)
+        old = await cache.get_datasets()
+
+        client.datasets.append({"id": "ds2", "name": "知识库2"})
+        stale = await cache.get_datasets()
+        assert stale.etag == old.etag
+        await asyncio.sleep(0)
+        await asyncio.gather(*cache._background)
+
+        cache.ttl = 60
+        fresh = await cache.get_datasets()
+        assert len(fresh.items) == 2
+        assert cache.get_stats()["refreshes"] >= 1
+
+    @pytest.mark.asyncio
+    async def test_etag_controls_sync_and_invalidate_refetches(self):
+        """列表未变化时不需要回写；失效后重新拉取"""
+        cache, client = _make_cache()
+        listing = await cache.get_datasets()
+        assert cache.needs_sync(listing)
+        cache.mark_synced(listing)
+        assert not cache.needs_sync(await cache.get_datasets())
+
+        cache.invalidate_datasets()
+        again = await cache.get_datasets()
+        assert client.calls == 2
+        assert cache.needs_sync(again)
+
+    @pytest.mark.asyncio
+    async def test_documents_are_paged_and_keyed_by_dataset(self):
+        """文档列表按知识库分别缓存，并拉取全部分页"""
+        cache, client = _make_cache()
+        docs = await cache.get_documents("ds1")
+        await cache.get_documents("ds1")
+        await cache.get_documents("ds2")
+
+        assert len(docs.items) == 150
+        assert client.calls == 4
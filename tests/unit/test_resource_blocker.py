@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""
+资源拦截器测试
+验证按平台的类型/URL 拦截规则和统计
+"""
+
+import pytest
+
+from backend.services.resource_blocker import ResourceBlocker, ESTIMATED_RESOURCE_BYTES
+
+PROFILES = {
+    "default": {"resource_types": ["image"], "url_patterns": []},
+    "zhihu": {"resource_types": ["image", "font"], "url_patterns": [r"hm\.baidu\.com"]},
+}
+
+
+class FakeRequest:
+    def __init__(self, url: str, resource_type: str):
+        self.url = url
+        self.resource_type = resource_type
+
+
+class FakeRoute:
+    def __init__(self, url: str, resource_type: str):
+        self.request = FakeRequest(url, resource_type)
+        self.action = None
+
+    async def abort(self, error_code=None):
+        self.action = "abort"
+
+    async def continue_(self):
+        self.action = "continue"
+
+
+class FakeContext:
+    def __init__(self):
+        self.handler = None
+
+    async def route(self, pattern, handler):
+        self.handler = handler
+
+
+class TestResourceBlocker:
+    """资源拦截器测试"""
+
+    def test_block_rules_per_platform(self):
+        """按平台规则拦截，未配置平台使用 default"""
+        blocker = ResourceBlocker(PROFILES, enabled=True)
+
+        assert blocker.should_block("zhihu", "font", "https://static.zhihu.com/a.woff")
+        assert blocker.should_block("zhihu", "script", "https://hm.baidu.com/hm.js")
+        assert not blocker.should_block("zhihu", "script", "https://static.zhihu.com/app.js")
+        assert blocker.should_block("doubao", "image", "https://x.com/a.png")
+        assert not blocker.should_block("doubao", "font", "https://x.com/a.woff")
+
+    @pytest.mark.asyncio
+    async def test_route_handler_aborts_and_counts(self):
+        """路由处理器中止命中请求并统计"""
+        blocker = ResourceBlocker(PROFILES, enabled=True)
+        context = FakeContext()
+        assert await blocker.apply(context, "zhihu")
+
+        image = FakeRoute("https://pic.zhihu.com/a.jpg", "image")
+        document = FakeRoute("https://www.zhihu.com/search", "document")
+        await context.handler(image)
+        await context.handler(document)
+
+        assert image.action == "abort"
+        assert document.action == "continue"
+        stats = blocker.get_stats()["platforms"]["zhihu"]
+        assert stats["blocked"] == 1 and stats["allowed"] == 1
+        assert stats["blocked_by_type"] == {"image": 1}
+        assert stats["estimated_bytes_saved"] == ESTIMATED_RESOURCE_BYTES["image"]
+
+    @pytest.mark.asyncio
+    async def test_disabled_blocker_installs_nothing(self):
+        """关闭时不安装路由"""
+        blocker = ResourceBlocker(PROFILES, enabled=False)
+        context = FakeContext()
+
+        assert not await blocker.apply(context, "zhihu")
+        assert context.handler is None
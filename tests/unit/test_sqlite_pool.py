@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""
+SQLite 连接池测试
+验证连接复用（PRAGMA 只在新建物理连接时执行）、PRAGMA 取值、多线程下连接数不超过上限，以及连接池统计
+"""
+
+import threading
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.orm import sessionmaker
+
+import backend.database as database
+from backend.config import SQLITE_CACHE_SIZE, SQLITE_MMAP_SIZE
+
+
+@pytest.fixture
+def pooled(tmp_path):
+    """与线上同一套配置的 SQLite 引擎（临时文件库）"""
+    with patch.object(database, "DATABASE_URL", f"sqlite:///{tmp_path / 'pool.db'}"), patch.object(
+        database, "SQLITE_POOL_SIZE", 2
+    ), patch.object(database, "SQLITE_MAX_OVERFLOW", 0):
+        engine = database.create_database_engine()
+    event.listen(engine, "first_connect", database.set_sqlite_journal_mode)
+    event.listen(engine, "connect", database.set_sqlite_pragma)
+    metrics = database.PoolMetrics("test")
+    metrics.attach(engine)
+    yield engine, metrics
+    engine.dispose()
+
+
+class TestSqlitePool:
+    """SQLite 连接池测试"""
+
+    def test_sessions_reuse_connection(self, pooled):
+        """连续打开会话复用同一个物理连接，PRAGMA 已生效"""
+        engine, metrics = pooled
+        factory = sessionmaker(bind=engine)
+        for _ in range(20):
+            with factory() as db:
+                db.execute(text("SELECT 1"))
+
+        with factory() as db:
+            pragma = lambda name: db.execute(text(f"PRAGMA {name}")).scalar()  # noqa: E731
+            assert pragma("journal_mode") == "wal"
+            assert pragma("foreign_keys") == 1
+            assert pragma("cache_size") == SQLITE_CACHE_SIZE
+            assert pragma("mmap_size") == SQLITE_MMAP_SIZE
+
+        stats = metrics.get_stats()
+        assert stats["connects"] == 1
+        assert stats["checkouts"] == 21
+        assert stats["checked_out"] == 0 and stats["checked_in"] == 1
+
+    def test_threads_bounded_by_pool_size(self, pooled):
+        """多线程并发时物理连接数不超过连接池上限"""
+        engine, metrics = pooled
+        factory = sessionmaker(bind=engine)
+        errors = []
+
+        def worker():
+            try:
+                for _ in range(10):
+                    with factory() as db:
+                        db.execute(text("SELECT count(*) FROM sqlite_master")).scalar()
+            except Exception as e:  # pragma: no cover - 失败时收集异常
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert errors == []
+        stats = metrics.get_stats()
+        assert stats["connects"] <= 2
+        assert stats["checkouts"] == 80
+        assert stats["overflow"] <= 0
+
+    def test_default_overflow_never_blocks(self, tmp_path):
+        """默认配置下同时持有的会话数超过 pool_size 也能立即借到连接，归还后只保留 pool_size 个"""
+        with patch.object(database, "DATABASE_URL", f"sqlite:///{tmp_path / 'overflow.db'}"), patch.object(
+            database, "SQLITE_POOL_SIZE", 2
+        ), patch.object(database, "DB_POOL_TIMEOUT", 0.1):
+            engine = database.create_database_engine()
+        factory = sessionmaker(bind=engine)
+        try:
+            sessions = [factory() for _ in range(10)]
+            for session in sessions:
+                session.execute(text("SELECT 1"))
+            assert engine.pool.checkedout() == 10
+
+            for session in sessions:
+                session.close()
+            assert engine.pool.checkedin() == 2
+        finally:
+            engine.dispose()
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""
+JWT 认证用户缓存测试
+验证缓存命中时鉴权不查库，管理员修改用户状态 / 删除用户后缓存立即失效
+"""
+
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy import event
+
+from backend.api.user import (
+    UserUpdateRequest,
+    create_access_token,
+    delete_user,
+    get_current_principal,
+    require_admin,
+    update_user_status,
+)
+from backend.database.models import User
+from backend.services.user_auth_cache import AuthUser, user_auth_cache
+from backend.services.user_service import UserService
+
+
+@pytest.fixture(autouse=True)
+def users(memory_db):
+    memory_db.add_all(
+        [
+            User(id=1, username="admin", password_hash="x", role="admin", is_active=True),
+            User(id=2, username="alice", password_hash="x", role="user", is_active=True),
+        ]
+    )
+    memory_db.commit()
+    user_auth_cache.clear()
+    yield
+    user_auth_cache.clear()
+
+
+@pytest.fixture
+def queries(memory_engine):
+    """记录执行的 SQL 条数"""
+    executed = []
+    event.listen(memory_engine, "before_cursor_execute", lambda *args: executed.append(args[2]))
+    return executed
+
+
+def _credentials(user_id: int, username: str) -> HTTPAuthorizationCredentials:
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=create_access_token(user_id, username))
+
+
+class TestUserAuthCache:
+    """JWT 认证用户缓存测试"""
+
+    def test_cached_principal_skips_database(self, memory_db, queries):
+        """第一次鉴权查库，之后命中缓存不再查询"""
+        token = _credentials(1, "admin")
+        first = get_current_principal(credentials=token, db=memory_db)
+        assert len(queries) == 1
+
+        for _ in range(5):
+            assert require_admin(get_current_principal(credentials=token, db=memory_db)) == first
+        assert len(queries) == 1
+        assert first.role == "admin" and first.is_active
+
+    @pytest.mark.asyncio
+    async def test_status_change_and_delete_invalidate(self, memory_db):
+        """禁用后下一次请求即返回 403，删除后返回 401"""
+        admin = get_current_principal(credentials=_credentials(1, "admin"), db=memory_db)
+        token = _credentials(2, "alice")
+        assert get_current_principal(credentials=token, db=memory_db).is_active
+
+        await update_user_status(
+            user_id=2, request=UserUpdateRequest(is_active=False), db=memory_db, current_user=admin
+        )
+        with pytest.raises(HTTPException) as exc:
+            get_current_principal(credentials=token, db=memory_db)
+        assert exc.value.status_code == 403
+
+        await update_user_status(
+            user_id=2, request=UserUpdateRequest(is_active=True), db=memory_db, current_user=admin
+        )
+        assert get_current_principal(credentials=token, db=memory_db).is_active
+
+        await delete_user(user_id=2, db=memory_db, current_user=admin)
+        with pytest.raises(HTTPException) as exc:
+            get_current_principal(credentials=token, db=memory_db)
+        assert exc.value.status_code == 401
+
+    @pytest.mark.asyncio
+    async def test_user_service_toggle_invalidates(self, memory_db):
+        """通过 UserService 禁用用户同样立即生效"""
+        token = _credentials(2, "alice")
+        assert get_current_principal(credentials=token, db=memory_db).is_active
+
+        result = await UserService().toggle_user_status(memory_db, 2, False)
+        assert result["success"]
+        with pytest.raises(HTTPException) as exc:
+            get_current_principal(credentials=token, db=memory_db)
+        assert exc.value.status_code == 403
+
+    def test_invalidate_during_miss_wins(self, memory_db):
+        """未命中查库期间发生失效时，查到的旧状态不写回缓存"""
+        generation = user_auth_cache.generation()
+        stale = AuthUser(id=2, username="alice", role="user", is_active=True)
+        user_auth_cache.invalidate(2)  # 管理员在这次查库之后提交了禁用
+        user_auth_cache.set(stale, generation)
+        assert user_auth_cache.get(2) is None
+
+        user_auth_cache.set(stale, user_auth_cache.generation())
+        assert user_auth_cache.get(2) == stale
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""
+WebSocket 广播测试
+验证慢客户端不阻塞广播、队列满时的丢弃/断开策略，以及按主题订阅
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from backend.services.websocket_manager import ConnectionManager
+
+
+class FakeWebSocket:
+    """可控制发送速度的假连接"""
+
+    def __init__(self, delay: float = 0):
+        self.delay = delay
+        self.received = []
+        self.closed = False
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, message):
+        await asyncio.sleep(self.delay)
+        self.received.append(json.loads(message))
+
+    async def close(self):
+        self.closed = True
+
+
+class TestConnectionManager:
+    """WebSocket 连接管理测试"""
+
+    @pytest.mark.asyncio
+    async def test_slow_client_does_not_block_others(self):
+        """慢客户端只丢弃自己的旧消息，正常客户端全部收到"""
+        manager = ConnectionManager(queue_size=3, policy="drop_oldest", send_timeout=5)
+        fast, slow = FakeWebSocket(), FakeWebSocket(delay=1)
+        await manager.connect(fast, "fast")
+        await manager.connect(slow, "slow")
+
+        for i in range(10):
+            await asyncio.wait_for(manager.broadcast({"n": i}), timeout=0.01)
+        await asyncio.sleep(0.05)
+
+        stats = manager.get_stats()["clients"]
+        assert [m["n"] for m in fast.received] == list(range(10))
+        assert stats["fast"]["dropped"] == 0
+        assert stats["slow"]["dropped"] > 0
+        assert stats["slow"]["queue_depth"] <= 3
+
+        await manager.close()
+
+    @pytest.mark.asyncio
+    async def test_disconnect_policy_and_send_timeout(self):
+        """disconnect 策略下队列满即断开；发送超时的半死连接被移除"""
+        manager = ConnectionManager(queue_size=2, policy="disconnect", send_timeout=0.02)
+        stuck, hung = FakeWebSocket(delay=1), FakeWebSocket(delay=1)
+        await manager.connect(stuck, "stuck")
+
+        for i in range(5):
+            await manager.broadcast({"n": i})
+        assert "stuck" not in manager.channels
+
+        await manager.connect(hung, "hung")
+        await manager.send_personal({"n": 0}, "hung")
+        await asyncio.sleep(0.1)
+        assert "hung" not in manager.channels
+        assert hung.closed
+        assert manager.get_stats()["evicted"] == 2
+        await asyncio.sleep(0)
+
+    @pytest.mark.asyncio
+    async def test_topic_subscriptions(self):
+        """只推送给订阅了对应任务 / 类型 / 级别的客户端，未订阅的客户端接收全部"""
+        manager = ConnectionManager(queue_size=50, policy="drop_oldest", send_timeout=5)
+        legacy, task_watcher, alert_watcher = FakeWebSocket(), FakeWebSocket(), FakeWebSocket()
+        await manager.connect(legacy, "legacy")
+        await manager.connect(task_watcher, "task", topics=["task:7"])
+        await manager.connect(alert_watcher, "alert")
+        await manager.handle_client_message("alert", json.dumps({"action": "subscribe", "topics": ["level:warning", "bad"]}))
+
+        await manager.broadcast({"type": "publish_progress", "task_id": 7, "data": {}})
+        await manager.broadcast({"type": "publish_progress", "task_id": 8, "data": {}})
+        await manager.broadcast({"type": "seo_alert", "data": {"level": "critical"}})
+        await manager.broadcast({"type": "seo_alert", "data": {"level": "info"}})
+        await asyncio.sleep(0.01)
+
+        assert len(legacy.received) == 4
+        assert [m.get("task_id") for m in task_watcher.received] == [7]
+        assert alert_watcher.received[0] == {"type": "subscriptions", "topics": ["level:WARNING"]}
+        assert [m["data"]["level"] for m in alert_watcher.received[1:]] == ["critical"]
+
+        # 全部取消后恢复接收全部消息
+        manager.unsubscribe("task", ["task:7"])
+        await manager.broadcast({"type": "auth_complete", "task_id": "x"})
+        await asyncio.sleep(0.01)
+        assert task_watcher.received[-1]["type"] == "auth_complete"
+
+        await manager.close()
+
+    @pytest.mark.asyncio
+    async def test_log_batch_filtered_per_subscription(self):
+        """日志批次按模块 / 级别过滤条目，没有匹配条目的客户端不推送"""
+        manager = ConnectionManager(queue_size=50, policy="drop_oldest", send_timeout=5)
+        everything, publish_only, errors_only = FakeWebSocket(), FakeWebSocket(), FakeWebSocket()
+        await manager.connect(everything, "all", topics=["*"])
+        await manager.connect(publish_only, "publish", topics=["module:发布"])
+        await manager.connect(errors_only, "errors", topics=["level:ERROR"])
+
+        logs = [
+            {"level": "INFO", "module": "发布", "message": "a"},
+            {"level": "WARNING", "module": "采集", "message": "b"},
+        ]
+        manager.publish({"type": "log_batch", "logs": logs})
+        await asyncio.sleep(0.01)
+
+        assert everything.received[0]["logs"] == logs
+        assert [e["message"] for e in publish_only.received[0]["logs"]] == ["a"]
+        assert errors_only.received == []
+
+        await manager.close()